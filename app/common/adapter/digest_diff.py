@@ -0,0 +1,210 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.common.logger.logger import get_logger
+from app.common.serialization.json_codec import get_json_codec
+
+logger = get_logger(__name__)
+
+# DIGEST_DIFF_MODE values: always send the full digest, skip unchanged digests, or
+# also send only what changed
+MODES = ("off", "skip", "changes")
+
+# Task fields whose change makes a task count as updated. editado (last_edited_time)
+# also covers the page body; it has minute granularity, hence the other fields.
+FINGERPRINT_FIELDS = ("titulo", "fecha", "notas", "editado")
+
+
+def task_hash(task: Dict[str, Any]) -> str:
+    """
+    Returns a short hash of the fields a task is rendered from.
+
+    Args:
+        task: The mapped task.
+
+    Returns:
+        str: 16 hex digits.
+    """
+    content = "\x1f".join(str(task.get(name) or "") for name in FINGERPRINT_FIELDS)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+@dataclass
+class DigestDiff:
+    """
+    Changes of the pending tasks since the previous digest.
+
+    Attributes:
+        added: Tasks that became pending.
+        rescheduled: Tasks still pending whose Fecha changed.
+        updated: Tasks still pending whose other fields changed.
+        removed: Tasks no longer pending (completed, moved past today or deleted),
+            as id, titulo and fecha from the previous digest.
+    """
+
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    rescheduled: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def changed_tasks(self) -> List[Dict[str, Any]]:
+        """Returns the pending tasks that are new or changed."""
+        return self.added + self.rescheduled + self.updated
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the number of tasks per kind of change."""
+        return {
+            "added": len(self.added),
+            "rescheduled": len(self.rescheduled),
+            "updated": len(self.updated),
+            "removed": len(self.removed),
+        }
+
+
+@dataclass(frozen=True)
+class DigestSnapshot:
+    """
+    Compact record of a sent digest: a hash per task and a fingerprint of the set.
+
+    Attributes:
+        fingerprint: Hash of every task id with its task_hash; equal fingerprints
+            mean the same tasks with the same content.
+        tasks: (fecha, titulo, hash) per task id.
+    """
+
+    fingerprint: str
+    tasks: Dict[str, Tuple[Optional[str], str, str]]
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]]) -> "DigestSnapshot":
+        """
+        Builds the snapshot of a list of pending tasks.
+
+        Args:
+            tasks: The mapped tasks.
+
+        Returns:
+            DigestSnapshot: The snapshot.
+        """
+        entries = {
+            task["id"]: (task.get("fecha"), task.get("titulo") or "", task_hash(task))
+            for task in tasks
+        }
+        return cls(_fingerprint(entries), entries)
+
+    def without(self, task_ids: Iterable[str]) -> "DigestSnapshot":
+        """
+        Returns the snapshot without some tasks, e.g. those just marked notified.
+
+        They left the pending tasks because of the digest itself, so the next
+        diff must not list them as removed.
+
+        Args:
+            task_ids: The task IDs to drop.
+
+        Returns:
+            DigestSnapshot: The snapshot of the remaining tasks.
+        """
+        dropped = set(task_ids)
+        entries = {
+            task_id: entry
+            for task_id, entry in self.tasks.items()
+            if task_id not in dropped
+        }
+        return DigestSnapshot(_fingerprint(entries), entries)
+
+    def diff(self, tasks: List[Dict[str, Any]]) -> DigestDiff:
+        """
+        Compares this (previous) snapshot with the current pending tasks.
+
+        Args:
+            tasks: The current pending tasks, in digest order.
+
+        Returns:
+            DigestDiff: The changes, each list in digest order.
+        """
+        diff = DigestDiff()
+        current = set()
+        for task in tasks:
+            current.add(task["id"])
+            previous = self.tasks.get(task["id"])
+            if previous is None:
+                diff.added.append(task)
+            elif previous[0] != task.get("fecha"):
+                diff.rescheduled.append(task)
+            elif previous[2] != task_hash(task):
+                diff.updated.append(task)
+        diff.removed.extend(
+            {"id": task_id, "fecha": fecha, "titulo": titulo}
+            for task_id, (fecha, titulo, _) in self.tasks.items()
+            if task_id not in current
+        )
+        return diff
+
+
+def _fingerprint(entries: Dict[str, Tuple[Optional[str], str, str]]) -> str:
+    """Hashes every task id with its task_hash, in id order."""
+    digest = hashlib.sha256()
+    for task_id in sorted(entries):
+        digest.update(f"{task_id}:{entries[task_id][2]}\n".encode())
+    return digest.hexdigest()
+
+
+class DigestState:
+    """
+    Stores the snapshot of the last digest sent, in a JSON file.
+
+    The file must outlive the container to compare daily digests: put it on EFS,
+    or accept that a cold start in /tmp sends the full digest again. Read and
+    write failures are logged and treated as no previous digest.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the DigestState.
+
+        Args:
+            path: The JSON file.
+        """
+        self.path = Path(path)
+
+    def load(self) -> Optional[DigestSnapshot]:
+        """
+        Reads the snapshot of the last digest.
+
+        Returns:
+            Optional[DigestSnapshot]: The snapshot, or None if there is none.
+        """
+        if not self.path.exists():
+            return None
+        try:
+            data = get_json_codec().loads(self.path.read_bytes())
+            tasks = {task_id: tuple(entry) for task_id, entry in data["tasks"].items()}
+            return DigestSnapshot(data["fingerprint"], tasks)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable digest state {self.path}: {str(e)}")
+            return None
+
+    def save(self, snapshot: DigestSnapshot):
+        """
+        Writes the snapshot of the digest just sent.
+
+        Args:
+            snapshot: The snapshot.
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(
+                    get_json_codec().dumps(
+                        {"fingerprint": snapshot.fingerprint, "tasks": snapshot.tasks}
+                    )
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save digest state {self.path}: {str(e)}")
@@ -1,24 +1,83 @@
 import html
-import re
-from datetime import datetime
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from app.common.adapter.digest_diff import DigestDiff
+from app.common.adapter.linkify import linkify
+from app.common.adapter.row_cache import RowFragmentCache
+from app.common.adapter.template_compiler import COMPILED_PATH, SOURCE_PATH
+from app.common.dates.date_service import DateService, get_date_service
+
+# Templates read from disk, by path. Shared by every adapter of the process
+_template_cache: Dict[Path, str] = {}
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    """
+    A digest ready to send.
+
+    Attributes:
+        subject: The email subject.
+        html_body: The HTML part.
+        text_body: The plain-text alternative.
+    """
+
+    subject: str
+    html_body: str
+    text_body: str
 
 
 class EmailAdapter:
     """
     Adapter to convert Notion tasks into HTML email format.
 
-    This class generates styled HTML emails ready for sending via AWS SES.
+    This class generates styled HTML emails ready for sending via AWS SES,
+    together with a plain-text alternative rendered in the same pass.
     """
 
-    TEMPLATE_PATH = (
-        Path(__file__).parent.parent.parent / "resources" / "email_template.html"
+    # Built by app.common.adapter.template_compiler; the source template is used
+    # when the compiled one is missing, e.g. in a checkout that was never built
+    TEMPLATE_PATH = COMPILED_PATH
+    SOURCE_TEMPLATE_PATH = SOURCE_PATH
+
+    TEXT_TEMPLATE = (
+        "Task Digest\n"
+        "You have {task_count} pending {item_word} in your queue.\n"
+        "\n"
+        "{task_rows}\n"
+        "\n"
+        "Generated via AWS Lambda \u2022 {year} Personal Automation\n"
+    )
+
+    # Heading of a section of the changes email, spanning both columns
+    SECTION_ROW = (
+        '<tr><td colspan="2" style="padding:18px 30px 0;font-size:12px;'
+        "font-weight:700;color:#6B7280;text-transform:uppercase;"
+        'letter-spacing:0.5px">{heading}</td></tr>'
     )
 
-    def __init__(self):
-        """Initializes the EmailAdapter."""
+    # Bump when the output of _generate_task_row or _generate_text_row changes,
+    # so cached rows are not reused
+    ROW_TEMPLATE_VERSION = "5"
+
+    def __init__(
+        self,
+        row_cache: Optional[RowFragmentCache] = None,
+        date_service: Optional[DateService] = None,
+    ):
+        """
+        Initializes the EmailAdapter.
+
+        Args:
+            row_cache: Cache of rendered rows. Every row is rendered when omitted.
+            date_service: Formats dates. Defaults to the service for the configured TIMEZONE.
+        """
         self._template = None
+        self.row_cache = row_cache
+        self.date_service = date_service or get_date_service()
+        # Date labels depend on the timezone, so rows are cached per timezone
+        self.row_version = f"{self.ROW_TEMPLATE_VERSION}|{self.date_service.timezone}"
 
     def convert_to_email_format(self, tasks: List[Dict[str, Any]]) -> tuple[str, str]:
         """
@@ -30,67 +89,219 @@ class EmailAdapter:
         Returns:
             tuple[str, str]: A tuple containing (subject, html_body).
         """
-        task_rows = self._generate_task_rows(tasks)
-        task_count = len(tasks)
+        email = self.render_digest(tasks)
+        return email.subject, email.html_body
+
+    def render_digest(self, tasks: List[Dict[str, Any]]) -> RenderedEmail:
+        """
+        Renders the subject, HTML body and plain-text body of the digest.
+
+        Both bodies are built in one pass over the tasks: each row's date label
+        and fields are read once and used for both parts.
+
+        Args:
+            tasks: List of task dictionaries.
+
+        Returns:
+            RenderedEmail: The subject and both bodies.
+        """
+        html_rows, text_rows = self._generate_task_rows(tasks)
+        html_body, text_body = self._fill_templates(len(tasks), html_rows, text_rows)
+        item_word = "item" if len(tasks) == 1 else "items"
+        subject = f"Task List: {len(tasks)} {item_word.capitalize()} Pending"
+        return RenderedEmail(subject, html_body, text_body)
+
+    def render_changes(self, diff: DigestDiff, task_count: int) -> RenderedEmail:
+        """
+        Renders an email listing only what changed since the previous digest.
+
+        Only the new and changed tasks are rendered (through the row cache), one
+        section per kind of change; tasks no longer pending are listed by title
+        and date.
+
+        Args:
+            diff: The changes of the pending tasks.
+            task_count: Number of pending tasks, shown in the header.
+
+        Returns:
+            RenderedEmail: The subject and both bodies.
+        """
+        html_parts, text_parts = [], []
+        sections = (
+            ("New", diff.added),
+            ("Rescheduled", diff.rescheduled),
+            ("Updated", diff.updated),
+            ("No longer pending", diff.removed),
+        )
+        for label, tasks in sections:
+            if not tasks:
+                continue
+            heading = f"{label} ({len(tasks)})"
+            # Removed tasks have no editado, so their rows are not cached
+            html_rows, text_rows = self._generate_task_rows(tasks)
+            html_parts.append(self.SECTION_ROW.format(heading=html.escape(heading)))
+            html_parts.append(html_rows)
+            text_parts.append(f"{heading}\n{text_rows}")
+
+        html_body, text_body = self._fill_templates(
+            task_count, "".join(html_parts), "\n\n".join(text_parts)
+        )
+        changes = ", ".join(
+            f"{len(tasks)} {label.lower()}" for label, tasks in sections if tasks
+        )
         item_word = "item" if task_count == 1 else "items"
+        subject = (
+            f"Task List: {task_count} {item_word.capitalize()} Pending ({changes})"
+        )
+        return RenderedEmail(subject, html_body, text_body)
+
+    def _fill_templates(
+        self, task_count: int, html_rows: str, text_rows: str
+    ) -> Tuple[str, str]:
+        """
+        Fills the HTML and plain-text templates and saves the row cache.
+
+        Args:
+            task_count: Number of pending tasks, shown in the header.
+            html_rows: The HTML rows.
+            text_rows: The plain-text rows.
+
+        Returns:
+            Tuple[str, str]: The HTML body and the plain-text body.
+        """
+        item_word = "item" if task_count == 1 else "items"
+        year = str(self.date_service.today().year)
 
         template = self._load_template()
 
         html_body = (
             template.replace("{{task_count}}", str(task_count))
             .replace("{{item_word}}", item_word)
-            .replace("{{task_rows}}", task_rows)
-            .replace("{{year}}", str(datetime.now().year))
+            .replace("{{task_rows}}", html_rows)
+            .replace("{{year}}", year)
+        )
+        text_body = self.TEXT_TEMPLATE.format(
+            task_count=task_count, item_word=item_word, task_rows=text_rows, year=year
         )
 
-        subject = f"Task List: {task_count} {item_word.capitalize()} Pending"
-        return subject, html_body
+        if self.row_cache is not None:
+            self.row_cache.save()
+        return html_body, text_body
 
     def _load_template(self) -> str:
         """
-        Loads the HTML template from the templates directory.
+        Loads the compiled HTML template, reading it from disk once per process.
 
         Returns:
             str: The HTML template content.
         """
-        with open(self.TEMPLATE_PATH, "r", encoding="utf-8") as f:
-            return f.read()
+        if self._template is None:
+            path = Path(self.TEMPLATE_PATH)
+            if not path.exists():
+                path = Path(self.SOURCE_TEMPLATE_PATH)
+            if path not in _template_cache:
+                with open(path, "r", encoding="utf-8") as f:
+                    _template_cache[path] = f.read()
+            self._template = _template_cache[path]
+        return self._template
 
-    def _generate_task_rows(self, tasks: List[Dict[str, Any]]) -> str:
+    def _generate_task_rows(self, tasks: List[Dict[str, Any]]) -> Tuple[str, str]:
         """
-        Generates HTML rows for all tasks.
+        Generates the HTML and plain-text rows for all tasks.
 
         Args:
             tasks: List of task dictionaries.
 
         Returns:
-            str: HTML string containing all task rows.
+            Tuple[str, str]: The HTML rows and the plain-text rows.
+        """
+        render = self._render_task if self.row_cache is None else self._cached_task_row
+        html_rows = []
+        text_rows = []
+        for task in tasks:
+            html_row, text_row = render(task)
+            html_rows.append(html_row)
+            text_rows.append(text_row)
+        return "".join(html_rows), "\n\n".join(text_rows)
+
+    def _cached_task_row(self, task: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Returns the cached rows of an unchanged task, rendering and caching them otherwise.
+
+        Args:
+            task: Task dictionary with id and editado (last_edited_time).
+
+        Returns:
+            Tuple[str, str]: The HTML row and the plain-text row.
+        """
+        row = self.row_cache.get(task, self.row_version)
+        if row is None:
+            row = self._render_task(task)
+            self.row_cache.set(task, self.row_version, row)
+        return row
+
+    def _render_task(self, task: Dict[str, Any]) -> Tuple[str, str]:
         """
-        return "\n".join(self._generate_task_row(task) for task in tasks)
+        Renders both representations of a task, formatting its date once.
 
-    def _generate_task_row(self, task: Dict[str, Any]) -> str:
+        Args:
+            task: Task dictionary with id, titulo, fecha, and notas.
+
+        Returns:
+            Tuple[str, str]: The HTML row and the plain-text row.
+        """
+        date_display = self._format_date(task.get("fecha"))
+        return (
+            self._generate_task_row(task, date_display),
+            self._generate_text_row(task, date_display),
+        )
+
+    def _generate_task_row(
+        self, task: Dict[str, Any], date_display: Optional[str] = None
+    ) -> str:
         """
         Generates an HTML row for a single task.
 
         Args:
             task: Task dictionary with id, titulo, fecha, and notas.
+            date_display: The formatted date, if already computed.
 
         Returns:
             str: HTML string for the task row.
         """
-        date_display = self._format_date(task.get("fecha"))
+        if date_display is None:
+            date_display = self._format_date(task.get("fecha"))
         title = html.escape(task.get("titulo"))
         notes = task.get("notas", "")
+        content = task.get("contenido", "")
 
         notes_html = self._generate_notes_html(notes) if notes else ""
-        return f"""<tr class="task-row">
-                        <td class="date-cell">
-                            <span class="date-pill">{date_display}</span>
-                        </td>
-                        <td>
-                            <span class="task-title">{title}</span>{notes_html}
-                        </td>
-                    </tr>"""
+        if content:
+            notes_html += self._generate_content_html(content)
+        return (
+            f'<tr class="task-row"><td class="date-cell">'
+            f'<span class="date-pill">{date_display}</span></td>'
+            f'<td><span class="task-title">{title}</span>{notes_html}</td></tr>'
+        )
+
+    def _generate_text_row(self, task: Dict[str, Any], date_display: str) -> str:
+        """
+        Generates the plain-text entry for a single task.
+
+        Notes and page content are indented under the title, one line per line.
+
+        Args:
+            task: Task dictionary with titulo, notas, and contenido.
+            date_display: The formatted date.
+
+        Returns:
+            str: The plain-text entry.
+        """
+        lines = [f"- [{date_display}] {task.get('titulo')}"]
+        for text in (task.get("notas"), task.get("contenido")):
+            if text:
+                lines.extend(f"    {line}" for line in text.splitlines())
+        return "\n".join(lines)
 
     def _generate_notes_html(self, notes: str) -> str:
         """
@@ -102,36 +313,30 @@ class EmailAdapter:
         Returns:
             str: HTML string for the notes section.
         """
-        escaped_notes = html.escape(notes)
+        return f'<div class="task-notes">{linkify(notes)}</div>'
 
-        # Detect URLs and convert them to links
-        url_pattern = r'(https?://[^\s<>"]+|www\.[^\s<>"]+)'
-
-        def replace_url(match):
-            url = match.group(1)
-            href = url if url.startswith("http") else f"https://{url}"
-            return f'<a href="{href}" class="link-text">{url}</a>'
+    def _generate_content_html(self, content: str) -> str:
+        """
+        Generates HTML for the page body summary, keeping its line breaks.
 
-        notes_with_links = re.sub(url_pattern, replace_url, escaped_notes)
+        Args:
+            content: The plain-text page body summary.
 
-        return f"""
-        <div class="task-notes">{notes_with_links}</div>"""
+        Returns:
+            str: HTML string for the content section.
+        """
+        content_html = linkify(content).replace("\n", "<br>")
+        return f'<div class="task-notes task-content">{content_html}</div>'
 
     def _format_date(self, date_str: Optional[str]) -> str:
         """
-        Formats a date string from YYYY-MM-DD to "Mon DD" format.
+        Formats a Notion date as "Mon DD", or a datetime as "Mon DD HH:MM".
 
         Args:
-            date_str: Date in YYYY-MM-DD format, or None.
+            date_str: Date in YYYY-MM-DD format, an ISO datetime, or None.
 
         Returns:
-            str: Formatted date string like "Nov 24", or "No Date" if None.
+            str: Formatted date string like "Nov 24", "No Date" if None, or
+                "Invalid" if the value cannot be parsed.
         """
-        if not date_str:
-            return "No Date"
-
-        try:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            return date_obj.strftime("%b %d")
-        except ValueError:
-            return "Invalid"
+        return self.date_service.label(date_str)
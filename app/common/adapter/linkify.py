@@ -0,0 +1,83 @@
+import re
+from html import escape
+
+# Compiled once at import. Matches up to whitespace or a character that cannot be
+# part of a URL in running text; trailing punctuation is trimmed afterwards.
+URL_PATTERN = re.compile(r'(?:https?://|www\.)[^\s<>"]+')
+
+# Characters that end a sentence rather than a URL, e.g. "see https://x.com."
+TRAILING_PUNCTUATION = ".,;:!?'"
+
+# Closing brackets that are only part of the URL when they close one inside it,
+# e.g. https://en.wikipedia.org/wiki/Python_(programming_language)
+BRACKETS = {")": "(", "]": "["}
+
+URL_PREFIXES = ("https://", "http://", "www.")
+
+
+def linkify(text: str) -> str:
+    """
+    HTML-escapes text and wraps the URLs in it in links, in a single pass.
+
+    Candidate URLs are located with str.find, which is much faster than letting
+    the regex engine try every position, and only confirmed with URL_PATTERN at
+    those positions. Text between URLs is escaped as it is copied. URLs start with
+    http://, https:// or www. (linked as https://); trailing sentence punctuation
+    and unbalanced closing brackets are left out of the link.
+
+    Args:
+        text: Plain text.
+
+    Returns:
+        str: The escaped text with <a class="link-text"> links.
+    """
+    http = text.find("http")
+    www = text.find("www.")
+    # Most notes have no URL at all
+    if http < 0 and www < 0:
+        return escape(text)
+
+    parts = []
+    position = 0
+    match_url = URL_PATTERN.match
+    while http >= 0 or www >= 0:
+        start = www if http < 0 or 0 <= www < http else http
+        match = match_url(text, start)
+        resume = start + 1
+        if match is not None:
+            parts.append(escape(text[position:start]))
+            parts.append(_link(match.group()))
+            position = resume = match.end()
+        if 0 <= http < resume:
+            http = text.find("http", resume)
+        if 0 <= www < resume:
+            www = text.find("www.", resume)
+    parts.append(escape(text[position:]))
+    return "".join(parts)
+
+
+def _link(candidate: str) -> str:
+    """Renders a matched URL as a link, followed by any trimmed trailing text."""
+    url = _trim_url(candidate)
+    if url in URL_PREFIXES:
+        return escape(candidate)
+    escaped_url = escape(url)
+    href = escaped_url if url.startswith("http") else f"https://{escaped_url}"
+    link = f'<a href="{href}" class="link-text">{escaped_url}</a>'
+    cut = len(url)
+    if cut == len(candidate):
+        return link
+    return link + escape(candidate[cut:])
+
+
+def _trim_url(url: str) -> str:
+    """Removes trailing punctuation and unbalanced closing brackets from a URL."""
+    while url:
+        last = url[-1]
+        if last in TRAILING_PUNCTUATION:
+            url = url[:-1]
+        elif last in BRACKETS and url.count(BRACKETS[last]) < url.count(last):
+            url = url[:-1]
+        else:
+            break
+    return url
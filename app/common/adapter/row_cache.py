@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from app.common.cache.lru_cache import CacheStats, LRUCache
+from app.common.environment.environment_handler import environment_handler
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Task fields a row is rendered from. A cached row is only reused when they are
+# unchanged, because last_edited_time has minute granularity and an edit made in
+# the same minute as the previous run would otherwise be missed.
+ROW_FIELDS = ("titulo", "fecha", "notas", "contenido")
+
+
+class RowFragmentCache:
+    """
+    Bounded cache of rendered task rows (the HTML row and its plain-text entry).
+
+    Rows are keyed by (task id, last_edited_time, template version), so only tasks
+    edited since they were last rendered, or rows of a changed template, are
+    rendered again. The cache lives in module state across warm invocations and,
+    with a path, is saved to a JSON file (e.g. in /tmp) so a new process in the
+    same sandbox starts warm. Persistence failures are logged and ignored.
+    """
+
+    def __init__(self, max_entries: int = 5000, path: Optional[str] = None):
+        """
+        Initialize the RowFragmentCache.
+
+        Args:
+            max_entries: Maximum number of rows kept; least recently used rows are dropped.
+            path: JSON file the rows are loaded from and saved to.
+        """
+        self.path = Path(path) if path else None
+        self._rows = LRUCache(max_entries=max_entries)
+        self._dirty = False
+        self._load()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Returns the hit/miss statistics."""
+        return self._rows.stats
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def key(task: Dict[str, Any], template_version: str) -> Optional[Tuple[str, ...]]:
+        """
+        Builds the cache key of a task row.
+
+        Args:
+            task: The mapped task.
+            template_version: Version of the row markup.
+
+        Returns:
+            Optional[Tuple[str, ...]]: The key, or None when the task has no id or
+                last_edited_time and cannot be cached.
+        """
+        if not task.get("id") or not task.get("editado"):
+            return None
+        return task["id"], task["editado"], template_version
+
+    def get(self, task: Dict[str, Any], template_version: str) -> Optional[Any]:
+        """
+        Returns the cached row of task, if it was rendered from the same content.
+
+        Args:
+            task: The mapped task.
+            template_version: Version of the row markup.
+
+        Returns:
+            Optional[Any]: The rendered row, or None on a miss.
+        """
+        key = self.key(task, template_version)
+        if key is None:
+            return None
+        entry = self._rows.get(key)
+        if entry is None or entry[0] != _fields(task):
+            return None
+        return entry[1]
+
+    def set(self, task: Dict[str, Any], template_version: str, row: Any):
+        """
+        Stores the rendered row of task.
+
+        Args:
+            task: The mapped task.
+            template_version: Version of the row markup.
+            row: The rendered row: a string or a tuple of strings, e.g. (html, text).
+        """
+        key = self.key(task, template_version)
+        if key is None:
+            return
+        self._rows.set(key, (_fields(task), row))
+        self._dirty = True
+
+    def save(self):
+        """Writes the rows to the cache file if they changed since the last save."""
+        if self.path is None or not self._dirty:
+            return
+        rows = []
+        for key in self._rows.keys():
+            entry = self._rows.get(key, record=False)
+            if entry is not None:
+                rows.append([list(key), list(entry[0]), entry[1]])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"rows": rows}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save row cache {self.path}: {str(e)}")
+
+    def clear(self):
+        """Drops all rows from memory. The cache file is rewritten on the next save."""
+        self._rows.clear()
+        self._dirty = True
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f).get("rows", [])
+            for key, fields, row in rows:
+                # JSON has no tuples; multi-part rows come back as lists
+                row = tuple(row) if isinstance(row, list) else row
+                self._rows.set(tuple(key), (tuple(fields), row))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable row cache {self.path}: {str(e)}")
+            self._rows.clear()
+
+
+def _fields(task: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(task.get(field) or "" for field in ROW_FIELDS)
+
+
+# Lazy singleton - rows are shared between invocations of a warm container
+_row_cache_instance = None
+
+
+def get_row_cache() -> Optional[RowFragmentCache]:
+    """
+    Get the shared RowFragmentCache instance.
+
+    Returns:
+        Optional[RowFragmentCache]: The cache, or None when EMAIL_ROW_CACHE_ENABLED is false.
+    """
+    global _row_cache_instance
+    settings = environment_handler.settings
+    if not settings.email_row_cache_enabled:
+        return None
+    if _row_cache_instance is None:
+        _row_cache_instance = RowFragmentCache(
+            max_entries=settings.email_row_cache_max_entries,
+            path=settings.email_row_cache_path,
+        )
+    return _row_cache_instance
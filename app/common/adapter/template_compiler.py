@@ -0,0 +1,355 @@
+"""
+Compiles app/resources/email_template.html into the minified template sent at runtime.
+
+The stylesheet is inlined into the elements of the template it applies to, and the
+rules left over (those for the task rows rendered at runtime, pseudo-classes and
+!important declarations) are kept in a minified <style> block. Indentation,
+comments and redundant whitespace are removed.
+
+Usage:
+    python -m app.common.adapter.template_compiler [--check]
+"""
+
+import argparse
+import re
+import sys
+from html import escape
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+RESOURCES_DIR = Path(__file__).parent.parent.parent / "resources"
+SOURCE_PATH = RESOURCES_DIR / "email_template.html"
+COMPILED_PATH = RESOURCES_DIR / "email_template.min.html"
+
+# Elements without an end tag
+VOID_ELEMENTS = {"br", "hr", "img", "input", "link", "meta"}
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.S)
+RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# Spaces around CSS punctuation carry no meaning
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{}:;,>])\s*")
+SIMPLE_SELECTOR_PATTERN = re.compile(r"^([a-z][a-z0-9]*)?((?:\.[\w-]+)*)$", re.I)
+
+
+class CssRule:
+    """A rule of the stylesheet with a single selector."""
+
+    def __init__(self, selector: str, declarations: str, order: int):
+        """
+        Initialize the CssRule.
+
+        Args:
+            selector: The selector, e.g. ".header h1".
+            declarations: The minified declarations, without braces.
+            order: Position of the rule in the stylesheet.
+        """
+        self.selector = selector
+        self.declarations = declarations
+        self.order = order
+        self.compounds = _parse_selector(selector)
+        self.matched = False
+
+    @property
+    def inlinable(self) -> bool:
+        """Whether the rule can be moved into style attributes."""
+        return self.compounds is not None and "!important" not in self.declarations
+
+    @property
+    def specificity(self) -> Tuple[int, int, int]:
+        """The (specificity, order) sort key of the rule."""
+        classes = sum(len(classes) for _, classes in self.compounds)
+        tags = sum(1 for tag, _ in self.compounds if tag)
+        return classes, tags, self.order
+
+    @property
+    def removable(self) -> bool:
+        """
+        Whether the rule can be left out of the <style> block once inlined.
+
+        Rules for classes only match the template's own elements; a rule for a bare
+        tag such as td could also style the rows added at runtime, so it is kept,
+        except for the document's single html and body elements.
+        """
+        if not self.matched:
+            return False
+        has_classes = any(classes for _, classes in self.compounds)
+        return has_classes or self.compounds[-1][0] in ("html", "body")
+
+    def matches(self, stack: List[Tuple[str, set]]) -> bool:
+        """
+        Whether the rule applies to the last element of stack.
+
+        Args:
+            stack: (tag, classes) of the open elements, outermost first.
+
+        Returns:
+            bool: True when the element matches the selector.
+        """
+        *ancestors, target = self.compounds
+        if not _compound_matches(target, stack[-1]):
+            return False
+        position = len(stack) - 1
+        for compound in reversed(ancestors):
+            position -= 1
+            while position >= 0 and not _compound_matches(compound, stack[position]):
+                position -= 1
+            if position < 0:
+                return False
+        return True
+
+
+def _parse_selector(selector: str) -> Optional[List[Tuple[str, set]]]:
+    """
+    Splits a descendant selector into (tag, classes) compounds.
+
+    Returns:
+        Optional[List[Tuple[str, set]]]: The compounds, or None for selectors with
+            other combinators, pseudo-classes, ids or attributes.
+    """
+    compounds = []
+    for part in selector.split():
+        match = SIMPLE_SELECTOR_PATTERN.match(part)
+        if match is None:
+            return None
+        tag, classes = match.groups()
+        compounds.append(((tag or "").lower(), set(filter(None, classes.split(".")))))
+    return compounds or None
+
+
+def _compound_matches(compound: Tuple[str, set], element: Tuple[str, set]) -> bool:
+    tag, classes = compound
+    return (not tag or tag == element[0]) and classes <= element[1]
+
+
+def minify_css(css: str) -> str:
+    """
+    Removes comments and redundant whitespace from a stylesheet.
+
+    Args:
+        css: The stylesheet.
+
+    Returns:
+        str: The minified stylesheet.
+    """
+    css = WHITESPACE_PATTERN.sub(" ", COMMENT_PATTERN.sub("", css))
+    return CSS_PUNCTUATION_PATTERN.sub(r"\1", css).replace(";}", "}").strip()
+
+
+def parse_rules(css: str) -> List[CssRule]:
+    """
+    Parses a stylesheet into rules, one per selector of each selector list.
+
+    Args:
+        css: The stylesheet.
+
+    Returns:
+        List[CssRule]: The rules in stylesheet order.
+    """
+    rules = []
+    for selectors, declarations in RULE_PATTERN.findall(minify_css(css)):
+        for selector in selectors.split(","):
+            rules.append(
+                CssRule(selector.strip(), declarations.rstrip(";"), len(rules))
+            )
+    return rules
+
+
+class _TemplateCompiler(HTMLParser):
+    """Re-emits a template with its stylesheet inlined and whitespace collapsed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        # Start tags are kept as (tag, attributes) until the unused classes are known
+        self.parts: List[Union[str, Tuple[str, Dict[str, Optional[str]]]]] = []
+        self.stack: List[Tuple[str, set]] = []
+        self.rules: List[CssRule] = []
+        self._in_style = False
+        self._style_index: Optional[int] = None
+        self._css: List[str] = []
+
+    def handle_decl(self, decl):
+        self.parts.append(f"<!{decl}>")
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "style":
+            self._in_style = True
+            self._style_index = len(self.parts)
+            self.parts.append("")
+            return
+        attributes = dict(attrs)
+        element = (tag, set((attributes.get("class") or "").split()))
+        self.stack.append(element)
+        style = self._inline_style(attributes.get("style"))
+        if style:
+            attributes["style"] = style
+        self.parts.append((tag, attributes))
+        if tag in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "style":
+            self._in_style = False
+            self.rules = parse_rules("".join(self._css))
+            return
+        if self.stack and self.stack[-1][0] == tag:
+            self.stack.pop()
+        self.parts.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if self._in_style:
+            self._css.append(data)
+        elif data.strip():
+            self.parts.append(_collapse_whitespace(data))
+        elif "\n" not in data:
+            # A space between inline elements is significant; indentation is not
+            self.parts.append(" ")
+
+    def handle_entityref(self, name):
+        self.parts.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self.parts.append(f"&#{name};")
+
+    def _inline_style(self, style: Optional[str]) -> str:
+        """Returns the declarations of the rules matching the current element."""
+        matching = [
+            rule for rule in self.rules if rule.inlinable and rule.matches(self.stack)
+        ]
+        matching.sort(key=lambda rule: rule.specificity)
+        declarations = []
+        for rule in matching:
+            rule.matched = True
+            declarations.append(rule.declarations)
+        if style:
+            # Existing style attributes win, as they would in the browser
+            declarations.append(minify_css(style).rstrip(";"))
+        return ";".join(declarations)
+
+    def result(self) -> str:
+        """Returns the compiled template."""
+        remaining = [rule for rule in self.rules if not rule.removable]
+        if self._style_index is not None and remaining:
+            css = "".join(
+                f"{rule.selector}{{{rule.declarations}}}" for rule in remaining
+            )
+            self.parts[self._style_index] = f"<style>{css}</style>"
+        # Classes only referenced by inlined rules are dropped
+        used_classes = {
+            name
+            for rule in remaining
+            for name in re.findall(r"\.([\w-]+)", rule.selector)
+        }
+        html = []
+        for part in self.parts:
+            if isinstance(part, tuple):
+                tag, attributes = part
+                part = f"<{tag}{_attributes(attributes, used_classes)}>"
+            html.append(part)
+        return "".join(html).strip()
+
+
+def _collapse_whitespace(data: str) -> str:
+    """Collapses whitespace runs, dropping the leading and trailing indentation."""
+    text = WHITESPACE_PATTERN.sub(" ", data)
+    if "\n" in data[: len(data) - len(data.lstrip())]:
+        text = text.lstrip()
+    end = len(data.rstrip())
+    if "\n" in data[end:]:
+        text = text.rstrip()
+    return text
+
+
+def _attributes(attributes: Dict[str, Optional[str]], used_classes: set) -> str:
+    rendered = []
+    for name, value in attributes.items():
+        if name == "class":
+            value = " ".join(c for c in (value or "").split() if c in used_classes)
+            if not value:
+                continue
+        if value is None:
+            rendered.append(f" {name}")
+        else:
+            rendered.append(f' {name}="{escape(value, quote=True)}"')
+    return "".join(rendered)
+
+
+def compile_template(source: str) -> str:
+    """
+    Inlines the stylesheet of an HTML template and minifies it.
+
+    Rules with a tag, class or descendant selector are copied into the style
+    attribute of every element they match, ordered by specificity, before the
+    element's own style. Rules that matched nothing (they style the rows rendered
+    at runtime), pseudo-class rules and !important rules stay in the <style> block.
+    Placeholders such as {{task_rows}} are kept as text.
+
+    Args:
+        source: The template HTML.
+
+    Returns:
+        str: The compiled template.
+    """
+    compiler = _TemplateCompiler()
+    compiler.feed(source)
+    compiler.close()
+    return compiler.result()
+
+
+def build(source_path: Path = SOURCE_PATH, compiled_path: Path = COMPILED_PATH) -> str:
+    """
+    Compiles the template file and writes the result.
+
+    Args:
+        source_path: The template to compile.
+        compiled_path: Where the compiled template is written.
+
+    Returns:
+        str: The compiled template.
+    """
+    compiled = compile_template(source_path.read_text(encoding="utf-8"))
+    compiled_path.write_text(compiled + "\n", encoding="utf-8")
+    return compiled
+
+
+def is_up_to_date(
+    source_path: Path = SOURCE_PATH, compiled_path: Path = COMPILED_PATH
+) -> bool:
+    """Whether the compiled template matches its source."""
+    if not compiled_path.exists():
+        return False
+    expected = compile_template(source_path.read_text(encoding="utf-8")) + "\n"
+    return compiled_path.read_text(encoding="utf-8") == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Fail if the compiled template is missing or outdated instead of writing it",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if not is_up_to_date():
+            print(f"{COMPILED_PATH} is outdated; run {parser.prog}", file=sys.stderr)
+            raise SystemExit(1)
+        return
+
+    source_size = SOURCE_PATH.stat().st_size
+    compiled = build()
+    print(
+        f"Compiled {SOURCE_PATH.name} ({source_size} bytes) -> "
+        f"{COMPILED_PATH.name} ({len(compiled.encode('utf-8')) + 1} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from .disk_cache import DiskCache
+from .lru_cache import CacheStats, LRUCache
+from .single_flight import SingleFlight
+
+__all__ = ["CacheStats", "DiskCache", "LRUCache", "SingleFlight"]
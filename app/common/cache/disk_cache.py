@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskCache:
+    """
+    JSON file cache, intended for Lambda's /tmp.
+
+    /tmp survives warm invocations of the same container, so this tier keeps
+    entries that were evicted from memory or that belong to a fresh process
+    in the same sandbox. Values must be JSON serializable. Write failures are
+    logged and ignored: the disk tier is an optimization, never a requirement.
+    """
+
+    def __init__(self, directory: str, clock: Callable[[], float] = time.time):
+        """
+        Initialize the DiskCache.
+
+        Args:
+            directory: Directory the cache files are written to. Created if missing.
+            clock: Wall-clock time source, injectable for tests.
+        """
+        self.directory = Path(directory)
+        self.clock = clock
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the cached value for key, or default if missing, expired or unreadable.
+
+        Args:
+            key: The cache key.
+            default: Value returned on a miss.
+
+        Returns:
+            Any: The cached value or default.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return default
+
+        expires_at = record.get("expires_at")
+        if record.get("key") != key or (
+            expires_at is not None and self.clock() >= expires_at
+        ):
+            self._unlink(path)
+            return default
+        return record.get("value")
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a value atomically.
+
+        Args:
+            key: The cache key.
+            value: A JSON serializable value.
+            ttl: Seconds the entry stays valid, or None for no expiry.
+        """
+        record = {
+            "key": key,
+            "value": value,
+            "expires_at": self.clock() + ttl if ttl is not None else None,
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write disk cache entry: {str(e)}")
+
+    def delete(self, key: str):
+        """
+        Removes an entry if present.
+
+        Args:
+            key: The cache key.
+        """
+        self._unlink(self._path(key))
+
+    def delete_where(self, predicate: Callable[[str], bool]) -> int:
+        """
+        Removes every entry whose key matches predicate.
+
+        Scans the directory, so it is meant for invalidation, not the hot path.
+
+        Args:
+            predicate: Called with each stored key; matching entries are removed.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    key = json.load(f).get("key")
+            except (OSError, ValueError):
+                continue
+            if key is not None and predicate(key):
+                self._unlink(path)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Removes all entries."""
+        for path in self.directory.glob("*.json"):
+            self._unlink(path)
+
+    def _unlink(self, path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
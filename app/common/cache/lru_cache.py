@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterator, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit/miss counters for a cache.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that found no usable entry.
+        evictions: Entries dropped to respect the size bound.
+        expirations: Entries dropped because their TTL elapsed.
+        invalidations: Entries dropped explicitly.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Returns hits / lookups, or 0.0 when nothing was looked up yet."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        """Returns the counters as a plain dict, e.g. for logging."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with optional per-entry TTL.
+
+    Lives in module state, so entries survive warm Lambda invocations.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the LRUCache.
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted.
+            default_ttl: Seconds an entry stays valid, or None for no expiry.
+            clock: Time source, injectable for tests.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, record=False) is not None
+
+    def get(self, key: Hashable, default: Any = None, record: bool = True) -> Any:
+        """
+        Returns the cached value for key, or default if missing or expired.
+
+        Args:
+            key: The cache key.
+            default: Value returned on a miss.
+            record: Whether the lookup counts towards the hit/miss statistics.
+
+        Returns:
+            Any: The cached value or default.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1] is not None and self.clock() >= item[1]:
+                del self._entries[key]
+                self.stats.expirations += 1
+                item = None
+
+            if item is None:
+                if record:
+                    self.stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            if record:
+                self.stats.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl: Seconds the entry stays valid. Defaults to default_ttl.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = self.clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Removes an entry.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.stats.invalidations += 1
+            return True
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Removes every entry whose key matches predicate.
+
+        Args:
+            predicate: Called with each key; matching entries are removed.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Removes all entries. Statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> Iterator[Hashable]:
+        """Returns a snapshot of the keys, least recently used first."""
+        with self._lock:
+            return iter(list(self._entries))
@@ -0,0 +1,3 @@
+from .date_service import DateService, get_date_service
+
+__all__ = ["DateService", "get_date_service"]
@@ -0,0 +1,138 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.common.environment.environment_handler import environment_handler
+
+# Locale-independent month abbreviations, as strftime("%b") gives in the C locale
+MONTHS = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+
+class DateService:
+    """
+    Date parsing, formatting and "today" in the configured timezone.
+
+    Lambda runs in UTC, so "today" is computed in the user's timezone instead of
+    with a naive datetime.now(). Notion dates (2025-01-01) take a fast path that
+    avoids strptime; datetimes (2025-01-01T10:00:00.000+02:00) are converted to
+    the configured timezone. Labels are memoized per distinct value, since a
+    digest only holds a handful of distinct dates.
+    """
+
+    def __init__(
+        self,
+        timezone: str = "UTC",
+        now: Optional[Callable[[ZoneInfo], datetime]] = None,
+        max_labels: int = 1024,
+    ):
+        """
+        Initialize the DateService.
+
+        Args:
+            timezone: IANA timezone name, e.g. "Europe/Madrid".
+            now: Returns the current time in the given zone. Defaults to datetime.now;
+                injectable for tests.
+            max_labels: Number of distinct values whose labels are memoized.
+
+        Raises:
+            ValueError: If the timezone is unknown.
+        """
+        try:
+            self.tz = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Unknown timezone '{timezone}'") from e
+        self.timezone = timezone
+        self._now = now or datetime.now
+        self.label = lru_cache(maxsize=max_labels)(self._label)
+
+    def now(self) -> datetime:
+        """Returns the current time in the configured timezone."""
+        return self._now(self.tz)
+
+    def today(self) -> date:
+        """Returns the current date in the configured timezone."""
+        return self.now().date()
+
+    def today_iso(self) -> str:
+        """Returns the current date in the configured timezone as YYYY-MM-DD."""
+        return self.today().isoformat()
+
+    def parse(self, value: str) -> Union[date, datetime]:
+        """
+        Parses a Notion date or datetime.
+
+        Args:
+            value: YYYY-MM-DD, or an ISO 8601 datetime with optional offset.
+
+        Returns:
+            Union[date, datetime]: A date, or a datetime in the configured timezone.
+                Datetimes without an offset are taken to be in the configured timezone.
+
+        Raises:
+            ValueError: If the value is not a valid ISO date or datetime.
+        """
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            return date(int(value[:4]), int(value[5:7]), int(value[8:]))
+
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=self.tz)
+        return parsed.astimezone(self.tz)
+
+    def _label(self, value: Optional[str]) -> str:
+        """
+        Formats a Notion date for the digest, e.g. "Nov 24" or "Nov 24 10:00".
+
+        Memoized per value through self.label.
+
+        Args:
+            value: A Notion date or datetime, or None.
+
+        Returns:
+            str: The label, "No Date" if value is empty, or "Invalid" if it cannot be parsed.
+        """
+        if not value:
+            return "No Date"
+        try:
+            parsed = self.parse(value)
+        except ValueError:
+            return "Invalid"
+
+        label = f"{MONTHS[parsed.month - 1]} {parsed.day:02d}"
+        if isinstance(parsed, datetime):
+            label += f" {parsed.hour:02d}:{parsed.minute:02d}"
+        return label
+
+
+# Lazy singleton - one service per configured timezone
+_date_service_instance = None
+
+
+def get_date_service() -> DateService:
+    """
+    Get the DateService for the configured TIMEZONE.
+
+    Returns:
+        DateService: The service.
+
+    Raises:
+        ValueError: If TIMEZONE is not a known timezone.
+    """
+    global _date_service_instance
+    timezone = environment_handler.settings.timezone
+    if _date_service_instance is None or _date_service_instance.timezone != timezone:
+        _date_service_instance = DateService(timezone)
+    return _date_service_instance
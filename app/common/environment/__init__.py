@@ -1,3 +1,3 @@
-from .environment_handler import EnvironmentHandler, environment_handler
+from .environment_handler import EnvironmentHandler, Settings, environment_handler
 
-__all__ = ["EnvironmentHandler", "environment_handler"]
+__all__ = ["EnvironmentHandler", "Settings", "environment_handler"]
@@ -1,83 +1,391 @@
 import os
+from dataclasses import dataclass
+from pathlib import Path
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
 
+# The .env file lives at the project root, next to app/. Resolving it from this
+# file keeps local runs independent of the current working directory.
+DOTENV_PATH = Path(__file__).resolve().parent.parent.parent.parent / ".env"
+
+REQUIRED_VARS = (
+    "NOTION_API_KEY",
+    "NOTION_DATABASE_ID",
+    "SES_SENDER_EMAIL",
+    "SES_RECEIVER_EMAIL",
+)
+
+
+def _strip(value: Optional[str]) -> Optional[str]:
+    return value.strip() if value else None
+
+
+def _split(value: Optional[str]) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in (value or "").split(",") if item.strip())
+
+
+def _flag(value: Optional[str], default: bool) -> bool:
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _number(env, invalid: List[str], name: str, cast: Callable[[str], float], default):
+    # A malformed value falls back to the default and is reported by validate()
+    value = _strip(env.get(name))
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        invalid.append(name)
+        return default
+
+
+def _ttls(env, invalid: List[str], name: str) -> Optional[str]:
+    # segment=seconds pairs, read by ResponseCache.parse_ttls; a malformed value
+    # falls back to the default TTLs and is reported by validate()
+    value = _strip(env.get(name))
+    try:
+        for item in _split(value):
+            _, sep, seconds = item.partition("=")
+            if not sep:
+                raise ValueError(item)
+            float(seconds)
+    except ValueError:
+        invalid.append(name)
+        return None
+    return value
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Immutable snapshot of the service configuration.
+
+    Built once from the process environment by EnvironmentHandler and shared
+    for the lifetime of the container until EnvironmentHandler.reload() is called.
+    """
+
+    environment: str
+    log_level: str
+    notion_api_key: Optional[str]
+    notion_version: str
+    notion_base_url: str
+    notion_database_id: Optional[str]
+    notion_database_filter_properties: str
+    ses_sender_email: Optional[str]
+    ses_receiver_email: Optional[str]
+    region: str
+    notion_api_key_source: Optional[str] = None
+    secrets_cache_ttl: float = 300
+    notion_cache_enabled: bool = True
+    notion_cache_max_entries: int = 256
+    notion_cache_ttls: Optional[str] = None
+    notion_cache_dir: Optional[str] = None
+    notion_query_cache_ttl: float = 0
+    notion_database_ids: Tuple[str, ...] = ()
+    notion_rate_limit: float = 3.0
+    notion_max_workers: int = 3
+    notion_notified_status: Optional[str] = None
+    notion_update_checkpoint: Optional[str] = None
+    notion_page_content_enabled: bool = False
+    notion_page_content_max_depth: int = 2
+    notion_page_content_max_chars: int = 1000
+    notion_streaming_parse: bool = False
+    json_codec: str = "auto"
+    notion_typed_decoding: bool = False
+    notion_scan_partitions: int = 1
+    notion_scan_days: int = 365
+    email_row_cache_enabled: bool = True
+    email_row_cache_max_entries: int = 5000
+    email_row_cache_path: Optional[str] = None
+    timezone: str = "UTC"
+    cassette_path: Optional[str] = None
+    cassette_mode: str = "replay"
+    task_index_path: Optional[str] = None
+    task_index_full_sync_hours: int = 24
+    notion_webhook_verification_token: Optional[str] = None
+    notion_webhook_automation_secret: Optional[str] = None
+    notion_urgent_days: Optional[int] = None
+    notion_urgent_debounce_seconds: float = 900
+    digest_diff_mode: str = "off"
+    digest_state_path: str = "/tmp/notion-digest-state.json"
+    missing_vars: Tuple[str, ...] = ()
+    invalid_vars: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_environ(cls, environ=None) -> "Settings":
+        """
+        Builds a snapshot from a mapping of environment variables.
+
+        Args:
+            environ: Mapping to read from. Defaults to os.environ.
+
+        Returns:
+            Settings: The configuration snapshot.
+        """
+        env = os.environ if environ is None else environ
+
+        environment = env.get("ENVIRONMENT")
+        if not environment:
+            # If running in Lambda (and ENVIRONMENT not set), default to PRODUCTION
+            environment = (
+                "PRODUCTION" if env.get("AWS_LAMBDA_FUNCTION_NAME") else "LOCAL"
+            )
+
+        default_level = "INFO" if environment == "PRODUCTION" else "DEBUG"
+
+        # NOTION_API_KEY is only required when the key is not resolved from a secret backend
+        api_key_source = _strip(env.get("NOTION_API_KEY_SOURCE"))
+        database_ids = _split(env.get("NOTION_DATABASE_IDS")) or _split(
+            env.get("NOTION_DATABASE_ID")
+        )
+        satisfied = {
+            "NOTION_API_KEY": bool(api_key_source),
+            "NOTION_DATABASE_ID": bool(database_ids),
+        }
+        required_vars = [
+            var
+            for var in REQUIRED_VARS
+            if not env.get(var) and not satisfied.get(var, False)
+        ]
+
+        invalid_vars = []
+        number = partial(_number, env, invalid_vars)
+
+        return cls(
+            environment=environment,
+            log_level=env.get("LOG_LEVEL", default_level),
+            notion_api_key=env.get("NOTION_API_KEY"),
+            notion_version=env.get("NOTION_VERSION", "2022-06-28"),
+            notion_base_url=env.get("NOTION_BASE_URL", "https://api.notion.com/v1"),
+            notion_database_id=env.get("NOTION_DATABASE_ID")
+            or (database_ids[0] if database_ids else None),
+            notion_database_filter_properties=env.get(
+                "NOTION_DATABASE_FILTER_PROPERTIES", "Notas,Tarea,Fecha"
+            ),
+            ses_sender_email=_strip(env.get("SES_SENDER_EMAIL")),
+            ses_receiver_email=_strip(env.get("SES_RECEIVER_EMAIL")),
+            region=env.get("AWS_REGION", "us-east-1"),
+            notion_api_key_source=api_key_source,
+            secrets_cache_ttl=number("SECRETS_CACHE_TTL", float, 300.0),
+            notion_cache_enabled=_flag(env.get("NOTION_CACHE_ENABLED"), True),
+            notion_cache_max_entries=number("NOTION_CACHE_MAX_ENTRIES", int, 256),
+            notion_cache_ttls=_ttls(env, invalid_vars, "NOTION_CACHE_TTLS"),
+            notion_cache_dir=_strip(env.get("NOTION_CACHE_DIR")),
+            notion_query_cache_ttl=number("NOTION_QUERY_CACHE_TTL", float, 0.0),
+            notion_database_ids=database_ids,
+            notion_rate_limit=number("NOTION_RATE_LIMIT", float, 3.0),
+            notion_max_workers=number("NOTION_MAX_WORKERS", int, 3),
+            notion_notified_status=_strip(env.get("NOTION_NOTIFIED_STATUS")),
+            notion_update_checkpoint=_strip(env.get("NOTION_UPDATE_CHECKPOINT")),
+            notion_page_content_enabled=_flag(
+                env.get("NOTION_PAGE_CONTENT_ENABLED"), False
+            ),
+            notion_page_content_max_depth=number(
+                "NOTION_PAGE_CONTENT_MAX_DEPTH", int, 2
+            ),
+            notion_page_content_max_chars=number(
+                "NOTION_PAGE_CONTENT_MAX_CHARS", int, 1000
+            ),
+            notion_streaming_parse=_flag(env.get("NOTION_STREAMING_PARSE"), False),
+            json_codec=env.get("JSON_CODEC", "auto"),
+            notion_typed_decoding=_flag(env.get("NOTION_TYPED_DECODING"), False),
+            notion_scan_partitions=number("NOTION_SCAN_PARTITIONS", int, 1),
+            notion_scan_days=number("NOTION_SCAN_DAYS", int, 365),
+            email_row_cache_enabled=_flag(env.get("EMAIL_ROW_CACHE_ENABLED"), True),
+            email_row_cache_max_entries=number(
+                "EMAIL_ROW_CACHE_MAX_ENTRIES", int, 5000
+            ),
+            email_row_cache_path=_strip(env.get("EMAIL_ROW_CACHE_PATH")),
+            timezone=_strip(env.get("TIMEZONE")) or "UTC",
+            cassette_path=_strip(env.get("CASSETTE_PATH")),
+            cassette_mode=(_strip(env.get("CASSETTE_MODE")) or "replay").lower(),
+            task_index_path=_strip(env.get("TASK_INDEX_PATH")),
+            task_index_full_sync_hours=number("TASK_INDEX_FULL_SYNC_HOURS", int, 24),
+            notion_webhook_verification_token=_strip(
+                env.get("NOTION_WEBHOOK_VERIFICATION_TOKEN")
+            ),
+            notion_webhook_automation_secret=_strip(
+                env.get("NOTION_WEBHOOK_AUTOMATION_SECRET")
+            ),
+            notion_urgent_days=number("NOTION_URGENT_DAYS", int, None),
+            notion_urgent_debounce_seconds=number(
+                "NOTION_URGENT_DEBOUNCE_SECONDS", float, 900.0
+            ),
+            digest_diff_mode=(_strip(env.get("DIGEST_DIFF_MODE")) or "off").lower(),
+            digest_state_path=_strip(env.get("DIGEST_STATE_PATH"))
+            or "/tmp/notion-digest-state.json",
+            missing_vars=tuple(required_vars),
+            invalid_vars=tuple(invalid_vars),
+        )
+
 
 class EnvironmentHandler:
-    def __init__(self):
-        if os.path.exists(".env"):
-            load_dotenv()
+    """
+    Provides access to the service configuration.
+
+    Environment variables are read once into a frozen Settings snapshot the first
+    time any value is requested. Call reload() to pick up changed variables.
+    """
+
+    def __init__(self, dotenv_path: Path = DOTENV_PATH):
+        self.dotenv_path = dotenv_path
+        self._settings = None
+        self._secrets_providers = {}
 
     @property
-    def environment(self):
-        """Returns the current environment (LOCAL, PRODUCTION, etc)."""
-        # If ENVIRONMENT is explicitly set, use it
-        if os.getenv("ENVIRONMENT"):
-            return os.getenv("ENVIRONMENT")
+    def settings(self) -> Settings:
+        """Returns the current configuration snapshot, building it on first use."""
+        if self._settings is None:
+            self._settings = self._build_settings()
+        return self._settings
 
-        # If running in Lambda (and ENVIRONMENT not set), default to PRODUCTION
-        if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
-            return "PRODUCTION"
+    def reload(self) -> Settings:
+        """
+        Discards the current snapshot and builds a new one.
+
+        Useful in tests and when settings are rotated without a new container.
 
-        # Default to LOCAL
-        return "LOCAL"
+        Returns:
+            Settings: The new configuration snapshot.
+        """
+        self._settings = self._build_settings()
+        for provider in self._secrets_providers.values():
+            provider.invalidate()
+        return self._settings
+
+    def reset_secrets_providers(self):
+        """
+        Drops the secrets providers, with their cached values and AWS clients.
+
+        Used after a snapshot restore, so credentials fetched before the snapshot
+        are not reused past their expiry and each restored copy opens its own
+        connections.
+        """
+        self._secrets_providers = {}
+
+    def _build_settings(self) -> Settings:
+        if self.dotenv_path.exists():
+            load_dotenv(self.dotenv_path)
+        return Settings.from_environ()
+
+    @property
+    def environment(self):
+        """Returns the current environment (LOCAL, PRODUCTION, etc)."""
+        return self.settings.environment
 
     @property
     def log_level(self):
         """Returns the configured log level based on environment."""
-        default_level = "INFO" if self.environment == "PRODUCTION" else "DEBUG"
-        return os.getenv("LOG_LEVEL", default_level)
+        return self.settings.log_level
 
     @property
     def notion_api_key(self):
-        """Returns the Notion API key."""
-        return os.getenv("NOTION_API_KEY")
+        """
+        Returns the Notion API key.
+
+        When NOTION_API_KEY_SOURCE is set (e.g. "secretsmanager:notion/api-key",
+        "ssm:/notion/api-key", "file:/mnt/secrets/notion", "env:OTHER_VAR"), the key
+        is resolved through a cached secrets provider instead of NOTION_API_KEY.
+        """
+        source = self.settings.notion_api_key_source
+        if not source:
+            return self.settings.notion_api_key
+
+        from app.common.secrets.secrets_provider import parse_secret_source
+
+        kind, name = parse_secret_source(source, "NOTION_API_KEY")
+        return self._get_secrets_provider(kind).get(name)
+
+    def _get_secrets_provider(self, kind: str):
+        # Imported lazily: the secrets module logs through get_logger, which
+        # depends on this module.
+        from app.common.secrets.secrets_provider import create_secrets_provider
+
+        if kind not in self._secrets_providers:
+            self._secrets_providers[kind] = create_secrets_provider(
+                kind, self.settings.region, self.settings.secrets_cache_ttl
+            )
+        return self._secrets_providers[kind]
 
     @property
     def notion_version(self):
         """Returns the Notion API version."""
-        return os.getenv("NOTION_VERSION", "2022-06-28")
+        return self.settings.notion_version
 
     @property
     def notion_base_url(self):
         """Returns the Notion API base URL."""
-        return os.getenv("NOTION_BASE_URL", "https://api.notion.com/v1")
+        return self.settings.notion_base_url
 
     @property
     def notion_database_id(self):
         """Returns the Notion database ID."""
-        return os.getenv("NOTION_DATABASE_ID")
+        return self.settings.notion_database_id
 
     @property
     def notion_database_filter_properties(self):
         """Returns the Notion database filter properties."""
-        return os.getenv("NOTION_DATABASE_FILTER_PROPERTIES", "Notas,Tarea,Fecha")
+        return self.settings.notion_database_filter_properties
 
     @property
     def ses_sender_and_receiver(self):
         """Returns the sender and receiver email addresses."""
-        sender = os.getenv("SES_SENDER_EMAIL")
-        receiver = os.getenv("SES_RECEIVER_EMAIL")
-        return (sender.strip() if sender else None), (
-            receiver.strip() if receiver else None
-        )
+        return self.settings.ses_sender_email, self.settings.ses_receiver_email
 
     @property
     def region(self):
         """Returns the AWS region."""
-        return os.getenv("AWS_REGION", "us-east-1")
+        return self.settings.region
 
     def validate(self):
         """
         Validates that required environment variables are present.
-        Raises ValueError if any required variable is missing.
+        Raises ValueError if any required variable is missing, a numeric variable
+        is malformed, the NOTION_API_KEY_SOURCE backend is unknown, TIMEZONE is not
+        a known timezone, or CASSETTE_MODE or DIGEST_DIFF_MODE is unknown.
         """
-        required_vars = ["SES_SENDER_EMAIL", "SES_RECEIVER_EMAIL"]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = self.settings.missing_vars
 
         if missing_vars:
             raise ValueError(
                 f"Missing required environment variables: {', '.join(missing_vars)}"
             )
 
+        invalid_vars = self.settings.invalid_vars
+        if invalid_vars:
+            raise ValueError(
+                f"Invalid numeric environment variables: {', '.join(invalid_vars)}"
+            )
+
+        if self.settings.notion_api_key_source:
+            from app.common.secrets.secrets_provider import parse_secret_source
+
+            parse_secret_source(self.settings.notion_api_key_source, "NOTION_API_KEY")
+
+        try:
+            ZoneInfo(self.settings.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown TIMEZONE: {self.settings.timezone}")
+
+        if self.settings.cassette_path:
+            from app.common.integrations.cassette.cassette import MODES
+
+            if self.settings.cassette_mode not in MODES:
+                raise ValueError(
+                    f"Unknown CASSETTE_MODE: {self.settings.cassette_mode}"
+                )
+
+        from app.common.adapter.digest_diff import MODES as DIGEST_DIFF_MODES
+
+        if self.settings.digest_diff_mode not in DIGEST_DIFF_MODES:
+            raise ValueError(
+                f"Unknown DIGEST_DIFF_MODE: {self.settings.digest_diff_mode}"
+            )
+
 
 environment_handler = EnvironmentHandler()
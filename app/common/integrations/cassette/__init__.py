@@ -0,0 +1,3 @@
+from .cassette import Cassette, CassetteError, get_cassette, scrub_emails
+
+__all__ = ["Cassette", "CassetteError", "get_cassette", "scrub_emails"]
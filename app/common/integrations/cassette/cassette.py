@@ -0,0 +1,377 @@
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+import requests
+from app.common.environment.environment_handler import environment_handler
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+
+MODES = ("record", "replay", "replay_realtime")
+
+REDACTED = "<redacted>"
+
+# Request headers kept in the cassette; Authorization is kept redacted
+RECORDED_REQUEST_HEADERS = ("Notion-Version", "Content-Type", "If-None-Match")
+RECORDED_RESPONSE_HEADERS = ("Content-Type", "ETag", "Retry-After")
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+class CassetteError(Exception):
+    """Raised when a replayed request has no recorded interaction left."""
+
+
+def scrub_emails(text: str) -> str:
+    """
+    Replaces email addresses with stable placeholders.
+
+    The same address always maps to the same placeholder, so replayed data keeps
+    its shape (e.g. sender and receiver stay distinct).
+
+    Args:
+        text: Any text, e.g. a JSON body.
+
+    Returns:
+        str: The text with addresses like redacted-1a2b3c4d@example.invalid.
+    """
+
+    def placeholder(match):
+        digest = hashlib.sha256(match.group().lower().encode("utf-8")).hexdigest()
+        return f"redacted-{digest[:8]}@example.invalid"
+
+    return EMAIL_PATTERN.sub(placeholder, text)
+
+
+def _scrub_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return scrub_emails(value)
+    if isinstance(value, dict):
+        return {key: _scrub_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_scrub_value(item) for item in value]
+    return value
+
+
+def _encode_body(body: Optional[bytes]) -> Optional[Dict[str, str]]:
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        return {"text": scrub_emails(body.decode("utf-8"))}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def _body_hash(body: Optional[Dict[str, str]]) -> Optional[str]:
+    """Returns a hash of an encoded request body, ignoring JSON key order."""
+    if not body:
+        return None
+    content = body.get("text")
+    if content is None:
+        content = body["base64"]
+    else:
+        try:
+            content = json.dumps(
+                json.loads(content), sort_keys=True, separators=(",", ":")
+            )
+        except ValueError:
+            pass
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _decode_body(body: Optional[Dict[str, str]]) -> bytes:
+    if not body:
+        return b""
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body["text"].encode("utf-8")
+
+
+class Cassette:
+    """
+    Records HTTP interactions with Notion and SES calls, and replays them offline.
+
+    In "record" mode calls go to the real services and each request/response pair is
+    kept with its start offset and duration; save() writes them to a gzip-compressed
+    JSON file. Authorization headers are redacted and email addresses are replaced by
+    stable placeholders before anything is stored. In "replay" mode responses come
+    from the cassette without network access, as fast as possible; "replay_realtime"
+    also waits the recorded duration of each call. A replayed call takes the first
+    unused interaction with the same service, method, URL and request body (JSON
+    compared regardless of key order), so paginated and partitioned queries get the
+    response recorded for their payload and concurrent requests may arrive in any
+    order.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", sleep: Callable = time.sleep):
+        """
+        Initialize the Cassette.
+
+        Args:
+            path: The cassette file, e.g. "cassettes/digest.json.gz".
+            mode: "record", "replay" or "replay_realtime".
+            sleep: Sleep function used for realtime replay, injectable for tests.
+
+        Raises:
+            ValueError: If the mode is unknown.
+            FileNotFoundError: If a cassette to replay does not exist.
+        """
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown cassette mode '{mode}'. Expected one of: {', '.join(MODES)}"
+            )
+        self.path = Path(path)
+        self.mode = mode
+        self.sleep = sleep
+        self.interactions: List[Dict[str, Any]] = []
+        self._used: List[bool] = []
+        self._body_hashes: List[Optional[str]] = []
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        if self.replaying:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        """Whether responses come from the cassette."""
+        return self.mode != "record"
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def notion_transport(self, send: Callable[..., requests.Response] = None):
+        """
+        Returns a transport for NotionClient with the signature of requests.request.
+
+        Args:
+            send: The real transport used when recording. Defaults to requests.request.
+
+        Returns:
+            Callable[..., requests.Response]: The recording or replaying transport.
+        """
+
+        def transport(method: str, url: str, headers=None, data=None, **kwargs):
+            if self.replaying:
+                return self._replay_http(method, url, data)
+            start = time.monotonic()
+            response = (send or requests.request)(
+                method, url, headers=headers, data=data, **kwargs
+            )
+            self._record_http(method, url, headers or {}, data, response, start)
+            return response
+
+        return transport
+
+    def wrap_ses(self, client):
+        """
+        Wraps a boto3 SES client so its API calls are recorded or replayed.
+
+        Args:
+            client: The boto3 client. Not called when replaying.
+
+        Returns:
+            _CassetteAwsClient: A client exposing the same operations.
+        """
+        return _CassetteAwsClient(self, "ses", client)
+
+    def save(self):
+        """Writes the recorded interactions to the cassette file atomically."""
+        if self.replaying:
+            return
+        with self._lock:
+            document = {
+                "version": CASSETTE_VERSION,
+                "interactions": list(self.interactions),
+            }
+        data = gzip.compress(
+            json.dumps(document, separators=(",", ":")).encode("utf-8")
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        logger.info(
+            f"Saved {len(document['interactions'])} interactions to {self.path}"
+        )
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version in {self.path}")
+        self.interactions = document["interactions"]
+        self._used = [False] * len(self.interactions)
+        self._body_hashes = [
+            _body_hash(interaction["request"].get("body"))
+            for interaction in self.interactions
+        ]
+
+    def _append(self, interaction: Dict[str, Any], start: float):
+        interaction["offset"] = round(start - self._started_at, 6)
+        interaction["duration"] = round(time.monotonic() - start, 6)
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def _record_http(self, method, url, headers, body, response, start):
+        request_headers = {
+            k: headers[k] for k in RECORDED_REQUEST_HEADERS if k in headers
+        }
+        if "Authorization" in headers:
+            request_headers["Authorization"] = REDACTED
+        self._append(
+            {
+                "service": "notion",
+                "method": method,
+                "url": url,
+                "request": {"headers": request_headers, "body": _encode_body(body)},
+                "response": {
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": {
+                        k: response.headers[k]
+                        for k in RECORDED_RESPONSE_HEADERS
+                        if k in response.headers
+                    },
+                    # Reading the content also works for streamed responses
+                    "body": _encode_body(response.content),
+                },
+            },
+            start,
+        )
+
+    def _record_call(self, service: str, operation: str, kwargs, result, error, start):
+        self._append(
+            {
+                "service": service,
+                "method": operation,
+                "url": "",
+                "request": {"params": _scrub_value(kwargs)},
+                "response": {"result": _scrub_value(result), "error": error},
+            },
+            start,
+        )
+
+    def _next(
+        self, service: str, method: str, url: str, body_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        path = urlsplit(url)._replace(scheme="", netloc="").geturl()
+        with self._lock:
+            for index, interaction in enumerate(self.interactions):
+                if self._used[index] or interaction["service"] != service:
+                    continue
+                if interaction["method"] != method:
+                    continue
+                if service == "notion" and self._body_hashes[index] != body_hash:
+                    continue
+                recorded = (
+                    urlsplit(interaction["url"])._replace(scheme="", netloc="").geturl()
+                )
+                if recorded == path:
+                    self._used[index] = True
+                    break
+            else:
+                raise CassetteError(
+                    f"No recorded {service} interaction for {method} {url}"
+                )
+        if self.mode == "replay_realtime":
+            self.sleep(interaction["duration"])
+        return interaction
+
+    def _replay_http(self, method: str, url: str, body=None) -> requests.Response:
+        # Hashed as recorded, so scrubbed emails in filters still match
+        body_hash = _body_hash(_encode_body(body))
+        recorded = self._next("notion", method, url, body_hash)["response"]
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers.update(recorded["headers"])
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = _decode_body(recorded["body"])
+        response._content_consumed = True
+        return response
+
+    def _replay_call(self, service: str, operation: str):
+        recorded = self._next(service, operation, "")["response"]
+        if recorded["error"]:
+            raise CassetteError(
+                f"Recorded {service} {operation} error: {recorded['error']}"
+            )
+        return recorded["result"]
+
+
+class _CassetteAwsClient:
+    """Proxy of a boto3 client recording or replaying its API operations."""
+
+    def __init__(self, cassette: Cassette, service: str, client):
+        self._cassette = cassette
+        self._service = service
+        self._client = client
+
+    def __getattr__(self, operation: str):
+        if operation.startswith("_") or operation in ("meta", "exceptions"):
+            return getattr(self._client, operation)
+
+        def call(**kwargs):
+            if self._cassette.replaying:
+                return self._cassette._replay_call(self._service, operation)
+            start = time.monotonic()
+            try:
+                result = getattr(self._client, operation)(**kwargs)
+            except Exception as e:
+                self._cassette._record_call(
+                    self._service,
+                    operation,
+                    kwargs,
+                    None,
+                    f"{type(e).__name__}: {e}",
+                    start,
+                )
+                raise
+            # ResponseMetadata holds request ids and headers, not needed for replay
+            result = {k: v for k, v in result.items() if k != "ResponseMetadata"}
+            self._cassette._record_call(
+                self._service, operation, kwargs, result, None, start
+            )
+            return result
+
+        return call
+
+
+# Lazy singleton - one cassette per process, configured by CASSETTE_PATH/CASSETTE_MODE
+_cassette_instance = None
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Get the cassette configured by CASSETTE_PATH and CASSETTE_MODE.
+
+    A recording cassette is saved when the process exits.
+
+    Returns:
+        Optional[Cassette]: The cassette, or None when CASSETTE_PATH is not set.
+    """
+    global _cassette_instance
+    settings = environment_handler.settings
+    if not settings.cassette_path:
+        return None
+    if _cassette_instance is None:
+        _cassette_instance = Cassette(settings.cassette_path, settings.cassette_mode)
+        if not _cassette_instance.replaying:
+            atexit.register(_cassette_instance.save)
+    return _cassette_instance
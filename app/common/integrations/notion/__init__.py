@@ -1,4 +1,13 @@
 from .notion_client import NotionClient, get_notion_client
+from .query_builder import Property, Query
+from .response_cache import ResponseCache
 from .task_repository import TaskRepository
 
-__all__ = ["NotionClient", "get_notion_client", "TaskRepository"]
+__all__ = [
+    "NotionClient",
+    "get_notion_client",
+    "Property",
+    "Query",
+    "ResponseCache",
+    "TaskRepository",
+]
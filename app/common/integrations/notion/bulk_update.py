@@ -0,0 +1,279 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+from app.common.logger.logger import get_logger
+from app.common.integrations.notion.exceptions import NotionApiError
+
+logger = get_logger(__name__)
+
+# Conflicts, rate limiting, server errors and connection errors (no status) are transient
+RETRYABLE_STATUS_CODES = {None, 409, 429, 500, 502, 503, 504}
+
+_HASH_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+
+def status_update(status: str) -> Dict[str, Any]:
+    """
+    Builds a page PATCH payload that sets the Status property.
+
+    Args:
+        status: The status option name, e.g. "Notified".
+
+    Returns:
+        Dict[str, Any]: The PATCH payload.
+    """
+    return {"properties": {"Status": {"status": {"name": status}}}}
+
+
+def date_update(start: str) -> Dict[str, Any]:
+    """
+    Builds a page PATCH payload that sets the Fecha property.
+
+    Args:
+        start: The new date in ISO format.
+
+    Returns:
+        Dict[str, Any]: The PATCH payload.
+    """
+    return {"properties": {"Fecha": {"date": {"start": start}}}}
+
+
+@dataclass
+class BulkUpdateResult:
+    """
+    Outcome of a bulk update.
+
+    Attributes:
+        succeeded: Page IDs updated in this run.
+        failed: Error message per page ID that could not be updated.
+        skipped: Page IDs already updated with the same payload, according to the
+            checkpoint.
+    """
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Returns True when no page failed."""
+        return not self.failed
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the counts per outcome."""
+        return {
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "skipped": len(self.skipped),
+        }
+
+
+def payload_hash(payload: Mapping[str, Any]) -> str:
+    """
+    Returns a short hash of a PATCH payload, independent of key order.
+
+    Args:
+        payload: The PATCH payload.
+
+    Returns:
+        str: 16 hex digits.
+    """
+    content = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+class UpdateCheckpoint:
+    """
+    Records which page updates of a bulk update have already been applied.
+
+    Entries are keyed by page ID and a hash of the payload, so re-running with a
+    different payload (e.g. another NOTION_NOTIFIED_STATUS) applies it again. With
+    a path (e.g. in /tmp or on EFS), completed entries are appended to the file as
+    "<page_id> <payload_hash>" lines, flush_every at a time and when the run ends,
+    so re-running the same update after a partial failure only sends the remaining
+    PATCHes. If the process dies mid-run, at most the unflushed entries are sent
+    again, which is harmless for idempotent PATCHes. Without a path, progress is
+    kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_every: int = 50):
+        """
+        Initialize the UpdateCheckpoint.
+
+        Args:
+            path: File the completed updates are appended to.
+            flush_every: Completed updates buffered before they are written.
+        """
+        self.path = Path(path) if path else None
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self.completed: Set[Tuple[str, str]] = self._load()
+
+    def _load(self) -> Set[Tuple[str, str]]:
+        if self.path is None or not self.path.exists():
+            return set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = [tuple(line.split()) for line in f]
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {str(e)}")
+            return set()
+        # Lines cut short by a crash, or not written by this class, are ignored
+        return {
+            entry
+            for entry in entries
+            if len(entry) == 2 and _HASH_PATTERN.fullmatch(entry[1])
+        }
+
+    def is_done(self, page_id: str, payload: Mapping[str, Any]) -> bool:
+        """Returns True if the page was already updated with this payload."""
+        return (page_id, payload_hash(payload)) in self.completed
+
+    def mark_done(self, page_id: str, payload: Mapping[str, Any]):
+        """
+        Records a successful page update, writing it out every flush_every updates.
+
+        Args:
+            page_id: The updated page.
+            payload: The payload it was updated with.
+        """
+        key = (page_id, payload_hash(payload))
+        with self._lock:
+            self.completed.add(key)
+            if self.path is not None:
+                self._pending.append(" ".join(key))
+                if len(self._pending) >= self.flush_every:
+                    self._flush()
+
+    def flush(self):
+        """Writes the buffered completed updates to the file."""
+        with self._lock:
+            self._flush()
+
+    def clear(self):
+        """Forgets all progress, e.g. once an update finished without failures."""
+        with self._lock:
+            self.completed.clear()
+            self._pending.clear()
+            if self.path is not None and self.path.exists():
+                self.path.unlink()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{line}\n" for line in self._pending))
+        except OSError as e:
+            logger.warning(f"Could not write checkpoint {self.path}: {str(e)}")
+        self._pending.clear()
+
+
+class BulkUpdater:
+    """
+    Applies page PATCHes through a bounded worker pool.
+
+    Throughput is governed by the RateLimiter of the shared NotionClient; the
+    worker count only needs to be large enough to keep requests in flight while
+    others wait on the network. Transient errors are retried with backoff,
+    honoring Retry-After on rate-limited responses.
+    """
+
+    def __init__(
+        self,
+        notion_client,
+        max_workers: int = 3,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the BulkUpdater.
+
+        Args:
+            notion_client: The NotionClient instance for API calls.
+            max_workers: Maximum number of PATCH requests in flight.
+            max_retries: Retries per page for transient errors.
+            backoff_seconds: Base delay of the exponential backoff.
+            sleep: Sleep function, injectable for tests.
+        """
+        self.notion_client = notion_client
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.sleep = sleep
+
+    def run(
+        self,
+        updates: Mapping[str, Dict[str, Any]],
+        checkpoint: Optional[UpdateCheckpoint] = None,
+    ) -> BulkUpdateResult:
+        """
+        Updates every page in updates.
+
+        Args:
+            updates: PATCH payload per page ID.
+            checkpoint: Progress record; completed pages are skipped.
+
+        Returns:
+            BulkUpdateResult: Successes, failures and skipped pages.
+        """
+        checkpoint = checkpoint or UpdateCheckpoint()
+        result = BulkUpdateResult()
+        pending = {}
+        for page_id, payload in updates.items():
+            if checkpoint.is_done(page_id, payload):
+                result.skipped.append(page_id)
+            else:
+                pending[page_id] = payload
+
+        logger.info(
+            f"Updating {len(pending)} pages ({len(result.skipped)} already done)"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._update_page, page_id, payload): page_id
+                for page_id, payload in pending.items()
+            }
+            for future in as_completed(futures):
+                page_id = futures[future]
+                try:
+                    future.result()
+                except NotionApiError as e:
+                    result.failed[page_id] = str(e)
+                    continue
+                checkpoint.mark_done(page_id, pending[page_id])
+                result.succeeded.append(page_id)
+
+        checkpoint.flush()
+        if result.complete:
+            checkpoint.clear()
+        else:
+            logger.warning(f"Bulk update incomplete: {result.summary()}")
+        return result
+
+    def _update_page(self, page_id: str, payload: Dict[str, Any]):
+        attempt = 0
+        while True:
+            try:
+                self.notion_client.patch(f"pages/{page_id}", payload)
+                return
+            except NotionApiError as e:
+                if (
+                    attempt >= self.max_retries
+                    or e.status_code not in RETRYABLE_STATUS_CODES
+                ):
+                    raise
+                delay = e.retry_after or self.backoff_seconds * (2**attempt)
+                logger.debug(f"Retrying page {page_id} in {delay}s: {str(e)}")
+                self.sleep(delay)
+                attempt += 1
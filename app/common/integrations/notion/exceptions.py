@@ -15,11 +15,16 @@ class NotionApiError(Exception):
     Attributes:
         message: A description of the error.
         status_code: The HTTP status code from the API response (if available).
+        retry_after: Seconds to wait before retrying, from the Retry-After header
+            of rate-limited responses (if available).
     """
 
-    def __init__(self, message: str, status_code: int = None):
+    def __init__(
+        self, message: str, status_code: int = None, retry_after: float = None
+    ):
         self.message = message
         self.status_code = status_code
+        self.retry_after = retry_after
         super().__init__(self.message)
 
     def __str__(self):
@@ -0,0 +1,132 @@
+import heapq
+import threading
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+from app.common.logger.logger import get_logger
+from app.common.integrations.notion.bulk_update import (
+    BulkUpdateResult,
+    UpdateCheckpoint,
+)
+from app.common.integrations.notion.exceptions import NotionDataNotFoundError
+from app.common.integrations.notion.query_cache import QueryResultCache
+from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.integrations.notion.task_stream import TaskStream, fecha_sort_key
+
+logger = get_logger(__name__)
+
+
+class MultiDatabaseTaskRepository:
+    """
+    Repository for tasks spread across several Notion databases.
+
+    Each database is queried concurrently through its own TaskRepository. Requests
+    go through the shared NotionClient, so its RateLimiter applies to all of them.
+    Every database returns tasks sorted by Fecha; the streams are k-way merged
+    with heapq.merge, so the combined result is ordered without sorting it again.
+    """
+
+    def __init__(
+        self,
+        notion_client,
+        database_ids: Sequence[str],
+        filter_properties: str = "Fecha,Tarea,Notas",
+        query_cache: Optional[QueryResultCache] = None,
+        max_buffered: int = 200,
+        streaming: bool = False,
+        typed_decoding: bool = False,
+        scan_partitions: int = 1,
+        scan_days: int = 365,
+    ):
+        """
+        Initialize the MultiDatabaseTaskRepository.
+
+        Args:
+            notion_client: The NotionClient instance shared by all databases.
+            database_ids: The Notion database IDs containing tasks.
+            filter_properties: Comma-separated list of properties to filter in the response.
+            query_cache: Optional cache of mapped query results.
+            max_buffered: Tasks read ahead per database before its reader waits.
+            streaming: Decode query responses incrementally (see TaskRepository).
+            typed_decoding: Decode query responses into structs (see TaskRepository).
+            scan_partitions: Concurrent Fecha ranges per database (see TaskRepository).
+            scan_days: Days the Fecha ranges are spread over (see TaskRepository).
+        """
+        if not database_ids:
+            raise ValueError("At least one database ID is required.")
+        self.repositories = [
+            TaskRepository(
+                notion_client,
+                database_id,
+                filter_properties,
+                query_cache,
+                streaming,
+                typed_decoding,
+                scan_partitions,
+                scan_days,
+            )
+            for database_id in database_ids
+        ]
+        self.max_buffered = max_buffered
+        self.logger = logger
+
+    @property
+    def database_ids(self) -> List[str]:
+        """Returns the queried database IDs."""
+        return [repository.database_id for repository in self.repositories]
+
+    def get_pending_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Gets pending tasks from all databases as one list ordered by Fecha.
+
+        Returns:
+            List[Dict[str, Any]]: List of mapped tasks with id, titulo, fecha, and notas.
+
+        Raises:
+            NotionApiError: If any API request fails.
+            NotionDataNotFoundError: If no database has pending tasks.
+        """
+        tasks = list(self.iter_pending_tasks())
+        if not tasks:
+            raise NotionDataNotFoundError("No tasks found in Notion")
+        return tasks
+
+    def iter_pending_tasks(self) -> Iterator[Dict[str, Any]]:
+        """
+        Streams pending tasks from all databases, merged in Fecha order.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks.
+
+        Raises:
+            NotionApiError: If any API request fails.
+        """
+        self.logger.info(
+            f"Fetching pending tasks from {len(self.repositories)} Notion databases"
+        )
+        stop_event = threading.Event()
+        streams = [
+            TaskStream(
+                repository.iter_pending_tasks,
+                f"notion-db-{repository.database_id}",
+                self.max_buffered,
+                stop_event,
+            ).start()
+            for repository in self.repositories
+        ]
+        try:
+            yield from heapq.merge(*streams, key=fecha_sort_key)
+        finally:
+            stop_event.set()
+
+    def bulk_update(
+        self,
+        updates: Mapping[str, Dict[str, Any]],
+        checkpoint: Optional[UpdateCheckpoint] = None,
+        max_workers: int = 3,
+    ) -> BulkUpdateResult:
+        """
+        Updates many task pages concurrently, whichever database they belong to.
+
+        Pages are addressed by ID, so the update is delegated to the first
+        repository. See TaskRepository.bulk_update.
+        """
+        return self.repositories[0].bulk_update(updates, checkpoint, max_workers)
@@ -1,8 +1,17 @@
+import json
 import requests
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, Iterator
+from app.common.integrations.cassette.cassette import get_cassette
 from app.common.logger.logger import get_logger
 from app.common.environment.environment_handler import environment_handler
 from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.rate_limiter import RateLimiter
+from app.common.integrations.notion.response_cache import ResponseCache
+from app.common.serialization.json_codec import JsonCodec, get_json_codec
+from app.common.serialization.json_stream import JsonArrayStream
+
+# Size of the reads from the socket when streaming a response
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class NotionClient:
@@ -13,25 +22,58 @@ class NotionClient:
     It is designed to be extended or used as a utility for specific Notion operations.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_codec: Optional[JsonCodec] = None,
+        transport: Optional[Callable[..., requests.Response]] = None,
+    ):
         """
         Initialize the NotionClient.
 
         Configuration is loaded from the EnvironmentHandler.
 
+        Args:
+            response_cache (Optional[ResponseCache]): Cache for GET responses.
+                GET requests always go to the API when omitted.
+            rate_limiter (Optional[RateLimiter]): Limiter shared by all threads using
+                this client. Requests are not throttled when omitted.
+            json_codec (Optional[JsonCodec]): Codec for request and response bodies.
+                Defaults to the codec selected by JSON_CODEC.
+            transport (Optional[Callable[..., requests.Response]]): Sends the HTTP
+                requests, with the signature of requests.request (e.g. a cassette
+                transport). Defaults to requests.request.
+
         Raises:
             ValueError: If the API key is not configured.
         """
 
-        self.api_key = environment_handler.notion_api_key
         if not self.api_key:
             raise ValueError("Notion API key must be configured in environment.")
 
         self.notion_version = environment_handler.notion_version
         self.base_url = environment_handler.notion_base_url
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.json_codec = json_codec or get_json_codec()
+        self.transport = transport
         self.logger = get_logger(__name__)
 
-        self.headers = {
+    @property
+    def api_key(self) -> str:
+        """
+        Returns the current Notion API key.
+
+        Read on every request so a rotated key is picked up from the
+        cached secrets provider without rebuilding the client.
+        """
+        return environment_handler.notion_api_key
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Returns the request headers, including the current API key."""
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Notion-Version": self.notion_version,
             "Content-Type": "application/json",
@@ -52,22 +94,69 @@ class NotionClient:
         Returns:
             Dict[str, Any]: The JSON response from the API.
 
+        Raises:
+            NotionApiError: If the request fails or the body is not valid JSON.
+        """
+        return self._decode(self._send(method, endpoint, payload).content)
+
+    def _decode(self, content: bytes) -> Dict[str, Any]:
+        """Decodes a response body, raising NotionApiError if it is not JSON."""
+        try:
+            return self.json_codec.loads(content)
+        except ValueError as e:
+            self.logger.error(f"Invalid JSON in Notion response: {str(e)}")
+            raise NotionApiError(f"Invalid JSON in Notion response: {str(e)}")
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Sends an HTTP request to the Notion API and returns the raw response.
+
+        Args:
+            method (str): HTTP method (GET, POST, PATCH, DELETE).
+            endpoint (str): The API endpoint, without the base URL.
+            payload (Optional[Dict[str, Any]]): The JSON payload for the request.
+            extra_headers (Optional[Dict[str, str]]): Headers added to the defaults.
+            stream (bool): Leave the body unread so it can be consumed incrementally.
+
+        Returns:
+            requests.Response: The successful (2xx or 304) response.
+
         Raises:
             NotionApiError: If the request fails.
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = {**self.headers, **extra_headers} if extra_headers else self.headers
+
+        # Encoded by the codec so the body is sent as bytes without another pass
+        body = self.json_codec.dumps(payload) if payload is not None else None
+        request_kwargs = {"headers": headers, "data": body}
+        if stream:
+            request_kwargs["stream"] = True
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
 
         try:
             self.logger.debug(f"Making {method} request to {url}")
-            response = requests.request(method, url, headers=self.headers, json=payload)
+            send = self.transport or requests.request
+            response = send(method, url, **request_kwargs)
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.HTTPError as e:
             self.logger.error(f"Notion API request failed: {str(e)}")
             status_code = e.response.status_code if e.response is not None else None
             error_message = e.response.text if e.response is not None else str(e)
             raise NotionApiError(
-                f"Notion API request failed: {error_message}", status_code=status_code
+                f"Notion API request failed: {error_message}",
+                status_code=status_code,
+                retry_after=_retry_after(e.response),
             )
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Notion API request failed: {str(e)}")
@@ -77,13 +166,36 @@ class NotionClient:
         """
         Perform a GET request to the Notion API.
 
+        When a response cache is configured, fresh cached responses are returned
+        without a request, and stale ones carrying an ETag are revalidated with
+        If-None-Match.
+
         Args:
             endpoint (str): The API endpoint.
 
         Returns:
             Dict[str, Any]: The JSON response.
         """
-        return self._make_request("GET", endpoint)
+        if self.response_cache is None:
+            return self._make_request("GET", endpoint)
+
+        cached, etag = self.response_cache.lookup(endpoint, self.notion_version)
+        if cached is not None:
+            return cached
+
+        extra_headers = {"If-None-Match": etag} if etag else None
+        response = self._send("GET", endpoint, extra_headers=extra_headers)
+        if response.status_code == 304:
+            revalidated = self.response_cache.revalidate(endpoint, self.notion_version)
+            if revalidated is not None:
+                return revalidated
+            response = self._send("GET", endpoint)
+
+        body = self._decode(response.content)
+        self.response_cache.store(
+            endpoint, self.notion_version, body, response.headers.get("ETag")
+        )
+        return body
 
     def post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -98,6 +210,43 @@ class NotionClient:
         """
         return self._make_request("POST", endpoint, payload)
 
+    def post_raw(self, endpoint: str, payload: Dict[str, Any]) -> bytes:
+        """
+        Perform a POST request and return the undecoded response body.
+
+        Args:
+            endpoint (str): The API endpoint.
+            payload (Dict[str, Any]): The JSON payload.
+
+        Returns:
+            bytes: The raw JSON response, for decoders working on bytes.
+        """
+        return self._send("POST", endpoint, payload).content
+
+    def post_stream(
+        self, endpoint: str, payload: Dict[str, Any], array_key: str = "results"
+    ) -> JsonArrayStream:
+        """
+        Perform a POST request and decode the response's array as it is received.
+
+        Only one element of the array is held in memory at a time. The other
+        top-level members (next_cursor, has_more, ...) are available through the
+        returned stream's metadata once it has been fully iterated.
+
+        Args:
+            endpoint (str): The API endpoint.
+            payload (Dict[str, Any]): The JSON payload.
+            array_key (str): The top-level member whose array is streamed.
+
+        Returns:
+            JsonArrayStream: The elements of the array, decoded lazily.
+
+        Raises:
+            NotionApiError: If the request fails or the body is not valid JSON.
+        """
+        response = self._send("POST", endpoint, payload, stream=True)
+        return _ClosingJsonArrayStream(response, array_key)
+
     def patch(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Perform a PATCH request to the Notion API.
@@ -109,7 +258,9 @@ class NotionClient:
         Returns:
             Dict[str, Any]: The JSON response.
         """
-        return self._make_request("PATCH", endpoint, payload)
+        response = self._make_request("PATCH", endpoint, payload)
+        self.invalidate(endpoint)
+        return response
 
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """
@@ -121,7 +272,42 @@ class NotionClient:
         Returns:
             Dict[str, Any]: The JSON response.
         """
-        return self._make_request("DELETE", endpoint)
+        response = self._make_request("DELETE", endpoint)
+        self.invalidate(endpoint)
+        return response
+
+    def invalidate(self, endpoint: str):
+        """Drops cached GET responses for the object modified through endpoint."""
+        if self.response_cache is not None:
+            self.response_cache.invalidate_resource(endpoint)
+
+
+class _ClosingJsonArrayStream(JsonArrayStream):
+    """JsonArrayStream over a streamed response, released once iteration ends."""
+
+    def __init__(self, response: requests.Response, array_key: str):
+        super().__init__(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE), array_key=array_key
+        )
+        self.response = response
+
+    def _parse(self) -> Iterator[Any]:
+        try:
+            yield from super()._parse()
+        except json.JSONDecodeError as e:
+            raise NotionApiError(f"Invalid JSON in Notion response: {str(e)}")
+        finally:
+            self.response.close()
+
+
+def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Returns the Retry-After header in seconds, if present and numeric."""
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
 
 
 # Lazy singleton - only created when first accessed
@@ -140,5 +326,49 @@ def get_notion_client() -> NotionClient:
     """
     global _notion_client_instance
     if _notion_client_instance is None:
-        _notion_client_instance = NotionClient()
+        cassette = get_cassette()
+        _notion_client_instance = NotionClient(
+            response_cache=_build_response_cache(),
+            rate_limiter=_build_rate_limiter(),
+            transport=cassette.notion_transport() if cassette else None,
+        )
     return _notion_client_instance
+
+
+def reset_notion_client():
+    """
+    Drops the singleton NotionClient so the next get_notion_client() builds a new one.
+
+    Used after a snapshot restore, where the rate limiter and cache timestamps taken
+    from the monotonic clock of the snapshotted environment are not reliable.
+    """
+    global _notion_client_instance
+    _notion_client_instance = None
+
+
+def _build_response_cache() -> Optional[ResponseCache]:
+    """
+    Builds the GET response cache from the environment configuration.
+
+    Returns:
+        Optional[ResponseCache]: The cache, or None when NOTION_CACHE_ENABLED is false.
+    """
+    settings = environment_handler.settings
+    if not settings.notion_cache_enabled:
+        return None
+    return ResponseCache(
+        max_entries=settings.notion_cache_max_entries,
+        ttls=ResponseCache.parse_ttls(settings.notion_cache_ttls),
+        disk_directory=settings.notion_cache_dir,
+    )
+
+
+def _build_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Builds the shared rate limiter from the environment configuration.
+
+    Returns:
+        Optional[RateLimiter]: The limiter, or None when NOTION_RATE_LIMIT is 0.
+    """
+    rate = environment_handler.settings.notion_rate_limit
+    return RateLimiter(rate_per_second=rate) if rate > 0 else None
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from app.common.cache.lru_cache import LRUCache
+from app.common.logger.logger import get_logger
+from app.common.integrations.notion.exceptions import NotionApiError
+
+logger = get_logger(__name__)
+
+# Block types whose text lives in a rich_text array, with the prefix used in the summary
+TEXT_BLOCK_PREFIXES = {
+    "paragraph": "",
+    "heading_1": "",
+    "heading_2": "",
+    "heading_3": "",
+    "bulleted_list_item": "• ",
+    "numbered_list_item": "- ",
+    "quote": "> ",
+    "callout": "",
+    "toggle": "",
+    "code": "",
+}
+
+
+class PageContentFetcher:
+    """
+    Reads the body of task pages (blocks/{page_id}/children) as plain text.
+
+    Pages are fetched concurrently, nested blocks are followed up to max_depth,
+    and each summary is capped at max_blocks blocks and max_chars characters.
+    Summaries are cached by (page id, last_edited_time), so unchanged pages cost
+    no request on later runs in the same container.
+    """
+
+    def __init__(
+        self,
+        notion_client,
+        max_depth: int = 2,
+        max_blocks: int = 100,
+        max_chars: int = 1000,
+        max_workers: int = 3,
+        cache: Optional[LRUCache] = None,
+    ):
+        """
+        Initialize the PageContentFetcher.
+
+        Args:
+            notion_client: The NotionClient instance for API calls.
+            max_depth: Levels of nested blocks to read; 1 reads top-level blocks only.
+            max_blocks: Maximum blocks read per page.
+            max_chars: Maximum characters of the summary; longer text is truncated.
+            max_workers: Pages fetched concurrently.
+            cache: Summary cache keyed by (page id, last_edited_time).
+        """
+        self.notion_client = notion_client
+        self.max_depth = max_depth
+        self.max_blocks = max_blocks
+        self.max_chars = max_chars
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+
+    def enrich(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Adds the page body summary to each task under "contenido".
+
+        Pages that cannot be read get an empty summary; enrichment never fails
+        the digest.
+
+        Args:
+            tasks: Mapped tasks with id and editado (last_edited_time).
+
+        Returns:
+            List[Dict[str, Any]]: The same tasks, enriched in place.
+        """
+        if not tasks:
+            return tasks
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            summaries = executor.map(self._summary_for, tasks)
+            for task, summary in zip(tasks, summaries):
+                task["contenido"] = summary
+        return tasks
+
+    def _summary_for(self, task: Dict[str, Any]) -> str:
+        key = (task.get("id"), task.get("editado"))
+        if self.cache is not None and key[1] is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            summary = self.fetch(task["id"])
+        except NotionApiError as e:
+            logger.warning(f"Could not read content of page {task['id']}: {str(e)}")
+            return ""
+
+        if self.cache is not None and key[1] is not None:
+            self.cache.set(key, summary)
+        return summary
+
+    def fetch(self, page_id: str) -> str:
+        """
+        Reads a page body as plain text.
+
+        Args:
+            page_id: The page (or block) ID.
+
+        Returns:
+            str: One line per text block, indented by nesting level.
+
+        Raises:
+            NotionApiError: If a request fails.
+        """
+        lines: List[str] = []
+        self._collect(page_id, 0, lines)
+        return self._truncate("\n".join(line for line in lines if line.strip()))
+
+    def _collect(self, block_id: str, depth: int, lines: List[str]):
+        for block in self._iter_children(block_id):
+            if len(lines) >= self.max_blocks:
+                return
+            lines.append("  " * depth + self._block_text(block))
+            if block.get("has_children") and depth + 1 < self.max_depth:
+                self._collect(block["id"], depth + 1, lines)
+            if sum(len(line) for line in lines) > self.max_chars:
+                return
+
+    def _iter_children(self, block_id: str):
+        cursor = None
+        while True:
+            endpoint = f"blocks/{block_id}/children?page_size=100"
+            if cursor:
+                endpoint += f"&start_cursor={cursor}"
+            response = self.notion_client.get(endpoint)
+            yield from response.get("results", [])
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+    def _block_text(self, block: Dict[str, Any]) -> str:
+        block_type = block.get("type")
+        content = block.get(block_type) or {}
+        text = "".join(
+            item.get("plain_text", "") for item in content.get("rich_text", [])
+        )
+        if block_type == "to_do":
+            return ("[x] " if content.get("checked") else "[ ] ") + text
+        return TEXT_BLOCK_PREFIXES.get(block_type, "") + text
+
+    def _truncate(self, text: str) -> str:
+        if len(text) <= self.max_chars:
+            return text
+        return text[: self.max_chars].rstrip() + "…"
+
+
+# Lazy singleton - summaries are shared between invocations of a warm container
+_content_cache_instance = None
+
+
+def get_page_content_cache() -> LRUCache:
+    """
+    Get the shared page content cache.
+
+    Returns:
+        LRUCache: Summaries keyed by (page id, last_edited_time).
+    """
+    global _content_cache_instance
+    if _content_cache_instance is None:
+        _content_cache_instance = LRUCache(max_entries=1024)
+    return _content_cache_instance
@@ -0,0 +1,113 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - exercised when msgspec is not installed
+    msgspec = None
+
+
+def typed_decoding_available() -> bool:
+    """Returns True if msgspec is installed."""
+    return msgspec is not None
+
+
+if msgspec is not None:
+
+    class RichText(msgspec.Struct):
+        plain_text: str = ""
+
+    class TitleProperty(msgspec.Struct):
+        title: List[RichText] = []
+
+    class DateValue(msgspec.Struct):
+        start: Optional[str] = None
+
+    class DateProperty(msgspec.Struct):
+        date: Optional[DateValue] = None
+
+    class RichTextProperty(msgspec.Struct):
+        rich_text: List[RichText] = []
+
+    class TaskProperties(msgspec.Struct, rename=str.capitalize):
+        # Encoded as the Tarea, Fecha and Notas database properties
+        tarea: TitleProperty = msgspec.field(default_factory=TitleProperty)
+        fecha: DateProperty = msgspec.field(default_factory=DateProperty)
+        notas: RichTextProperty = msgspec.field(default_factory=RichTextProperty)
+
+    class TaskPage(msgspec.Struct):
+        id: Optional[str] = None
+        last_edited_time: Optional[str] = None
+        properties: TaskProperties = msgspec.field(default_factory=TaskProperties)
+
+    class QueryResponse(msgspec.Struct):
+        results: List[TaskPage] = []
+        next_cursor: Optional[str] = None
+        has_more: bool = False
+
+
+class TypedQueryDecoder:
+    """
+    Decodes database query responses straight into task records with msgspec.
+
+    Only the fields the digest uses are declared as structs; msgspec skips
+    everything else (parent, icon, cover, URLs, annotations, ...) while decoding,
+    so the raw response bytes never become an intermediate dict tree. The records
+    are identical to the ones built by TaskRepository.map_task.
+    """
+
+    def __init__(self):
+        """
+        Initialize the TypedQueryDecoder.
+
+        Raises:
+            ImportError: If msgspec is not installed.
+        """
+        if msgspec is None:
+            raise ImportError("Typed decoding requires msgspec")
+        self._decoder = msgspec.json.Decoder(QueryResponse)
+
+    def decode(self, body: bytes) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Decodes one query response.
+
+        Args:
+            body: The raw response bytes.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Any]]: The mapped tasks, and the
+                pagination members (next_cursor, has_more).
+
+        Raises:
+            ValueError: If body is not a valid query response.
+        """
+        try:
+            response = self._decoder.decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+        tasks = [self.to_task(page) for page in response.results]
+        return tasks, {
+            "next_cursor": response.next_cursor,
+            "has_more": response.has_more,
+        }
+
+    @staticmethod
+    def to_task(page: "TaskPage") -> Dict[str, Any]:
+        """
+        Converts a decoded page into a task record.
+
+        Args:
+            page: The decoded page.
+
+        Returns:
+            Dict[str, Any]: Task with id, titulo, fecha, notas, and editado.
+        """
+        properties = page.properties
+        title = properties.tarea.title
+        date = properties.fecha.date
+        return {
+            "id": page.id,
+            "titulo": title[0].plain_text if title else "",
+            "fecha": date.start if date else None,
+            "notas": "".join(item.plain_text for item in properties.notas.rich_text),
+            "editado": page.last_edited_time,
+        }
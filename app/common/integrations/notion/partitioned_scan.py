@@ -0,0 +1,167 @@
+import heapq
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from app.common.integrations.notion.query_builder import Predicate, Property, Query
+from app.common.integrations.notion.task_stream import TaskStream
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Format of created_time/last_edited_time, so boundaries compare like Notion's values
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+
+def date_partitions(
+    name: str,
+    start: date,
+    end: date,
+    count: int,
+    include_empty: bool = False,
+) -> List[Predicate]:
+    """
+    Splits a date property into disjoint ranges covering every value.
+
+    The first range is open below and the last one open above, so values outside
+    [start, end) are still read; only the balance between ranges depends on them.
+
+    Args:
+        name: The date property, e.g. "Fecha".
+        start: Start of the range the values are expected in.
+        end: End of that range.
+        count: Number of ranges.
+        include_empty: Add a partition for pages without a date (needed unless the
+            query already excludes them).
+
+    Returns:
+        List[Predicate]: One predicate per partition, in ascending date order.
+    """
+    prop = Property.date(name)
+    span = max(1, (end - start).days)
+    # Whole days; with more partitions than days some would be empty and are merged
+    points = sorted(
+        {
+            (start + timedelta(days=span * i // count)).isoformat()
+            for i in range(1, count)
+        }
+    )
+    partitions = _ranges(prop, points)
+    if include_empty:
+        partitions.append(prop.is_empty())
+    return partitions
+
+
+def created_time_partitions(
+    start: datetime, end: datetime, count: int
+) -> List[Predicate]:
+    """
+    Splits created_time into disjoint windows covering every page.
+
+    Args:
+        start: Expected creation time of the oldest pages.
+        end: Expected creation time of the newest pages, e.g. now.
+        count: Number of windows.
+
+    Returns:
+        List[Predicate]: One predicate per window, oldest first.
+    """
+    step = (end - start) / count
+    points = [
+        (start + step * i).astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        for i in range(1, count)
+    ]
+    return _ranges(Property.created_time(), points)
+
+
+def _ranges(prop: Property, points: Sequence[str]) -> List[Predicate]:
+    if not points:
+        return [prop.is_not_empty()]
+    partitions: List[Predicate] = [prop.before(points[0])]
+    for low, high in zip(points, points[1:]):
+        partitions.append(prop.on_or_after(low) & prop.before(high))
+    partitions.append(prop.on_or_after(points[-1]))
+    return partitions
+
+
+class PartitionedScan:
+    """
+    Reads a query as concurrent cursor chains over disjoint partitions.
+
+    A single query is paginated serially: each request needs the previous
+    next_cursor. Splitting it into partitions (date ranges or created_time
+    windows, see date_partitions and created_time_partitions) gives independent
+    chains that run in parallel threads. Requests go through the repository's
+    NotionClient, so its RateLimiter bounds the combined rate. Pages seen in two
+    partitions (e.g. edited during the scan) are returned once. Each chain reads
+    at most max_buffered tasks ahead of the consumer, so memory stays bounded by
+    partitions x max_buffered rather than the whole result.
+    """
+
+    def __init__(
+        self,
+        repository,
+        partitions: Sequence[Predicate],
+        merge_key: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        max_buffered: int = 200,
+    ):
+        """
+        Initialize the PartitionedScan.
+
+        Args:
+            repository: The TaskRepository whose iter_tasks reads each partition.
+            partitions: Disjoint predicates together covering every page.
+            merge_key: Sort key the partitions are merged by, when each partition
+                is sorted by it. Without it partitions are returned one after the
+                other, which keeps the order when they follow the query's sort
+                (e.g. date_partitions of the sorted date property).
+            max_buffered: Tasks read ahead per partition before its chain waits.
+        """
+        if not partitions:
+            raise ValueError("At least one partition is required.")
+        self.repository = repository
+        self.partitions = list(partitions)
+        self.merge_key = merge_key
+        self.max_buffered = max_buffered
+        self.logger = logger
+
+    def iter_tasks(self, query: Query) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the tasks matching the query from every partition.
+
+        Args:
+            query: The query; each partition's predicate is added to its filter.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks, each page once.
+
+        Raises:
+            NotionApiError: If any API request fails.
+        """
+        self.logger.info(
+            f"Scanning {self.repository.database_id} in {len(self.partitions)} partitions"
+        )
+        stop_event = threading.Event()
+        streams = [
+            TaskStream(
+                lambda partition=partition: self.repository.iter_tasks(
+                    query.where(partition)
+                ),
+                f"notion-scan-{index}",
+                self.max_buffered,
+                stop_event,
+            ).start()
+            for index, partition in enumerate(self.partitions)
+        ]
+        if self.merge_key is None:
+            tasks = (task for stream in streams for task in stream)
+        else:
+            tasks = heapq.merge(*streams, key=self.merge_key)
+        seen = set()
+        try:
+            for task in tasks:
+                if task["id"] in seen:
+                    continue
+                seen.add(task["id"])
+                yield task
+        finally:
+            stop_event.set()
@@ -0,0 +1,598 @@
+import operator
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+EMPTINESS_CONDITIONS = {"is_empty", "is_not_empty"}
+TEXT_CONDITIONS = {
+    "equals",
+    "does_not_equal",
+    "contains",
+    "does_not_contain",
+    "starts_with",
+    "ends_with",
+}
+DATE_CONDITIONS = {"equals", "before", "after", "on_or_before", "on_or_after"}
+OPTION_CONDITIONS = {"equals", "does_not_equal"}
+
+# Conditions Notion accepts for each property type (and for timestamps)
+PUSHDOWN_CONDITIONS = {
+    "title": TEXT_CONDITIONS | EMPTINESS_CONDITIONS,
+    "rich_text": TEXT_CONDITIONS | EMPTINESS_CONDITIONS,
+    "date": DATE_CONDITIONS | EMPTINESS_CONDITIONS,
+    "timestamp": DATE_CONDITIONS | EMPTINESS_CONDITIONS,
+    "status": OPTION_CONDITIONS | EMPTINESS_CONDITIONS,
+    "select": OPTION_CONDITIONS | EMPTINESS_CONDITIONS,
+    "people": {"contains", "does_not_contain"} | EMPTINESS_CONDITIONS,
+    "number": {
+        "equals",
+        "does_not_equal",
+        "greater_than",
+        "less_than",
+        "greater_than_or_equal_to",
+        "less_than_or_equal_to",
+    }
+    | EMPTINESS_CONDITIONS,
+    "checkbox": OPTION_CONDITIONS,
+}
+
+# Negation of each condition; ordered comparisons never match empty values in Notion
+INVERSE_CONDITIONS = {
+    "equals": "does_not_equal",
+    "does_not_equal": "equals",
+    "contains": "does_not_contain",
+    "does_not_contain": "contains",
+    "is_empty": "is_not_empty",
+    "is_not_empty": "is_empty",
+    "before": "on_or_after",
+    "after": "on_or_before",
+    "on_or_before": "after",
+    "on_or_after": "before",
+    "greater_than": "less_than_or_equal_to",
+    "less_than": "greater_than_or_equal_to",
+    "greater_than_or_equal_to": "less_than",
+    "less_than_or_equal_to": "greater_than",
+}
+ORDERED_CONDITIONS = {
+    "before",
+    "after",
+    "on_or_before",
+    "on_or_after",
+    "greater_than",
+    "less_than",
+    "greater_than_or_equal_to",
+    "less_than_or_equal_to",
+}
+
+# Notion accepts compound filters nested two levels deep
+MAX_COMPOUND_DEPTH = 2
+
+# Notion's maximum page_size for database queries
+MAX_PAGE_SIZE = 100
+
+
+class UnsupportedFilterError(ValueError):
+    """Raised when a filter cannot be evaluated."""
+
+
+@dataclass(frozen=True)
+class RelativeDate:
+    """A date relative to today, resolved when the query is compiled."""
+
+    days: int = 0
+
+    def resolve(self, today: str) -> str:
+        """Returns the ISO date days after today (an ISO date)."""
+        return (date.fromisoformat(today) + timedelta(days=self.days)).isoformat()
+
+
+def today() -> RelativeDate:
+    """Returns today's date, resolved in the configured TIMEZONE at compile time."""
+    return RelativeDate(0)
+
+
+def days_from_today(days: int) -> RelativeDate:
+    """Returns the date days after today (before it when negative)."""
+    return RelativeDate(days)
+
+
+# Client-side evaluation of Notion filter JSON
+
+
+def _plain_text(items: Optional[List[Dict[str, Any]]]) -> str:
+    return "".join(item.get("plain_text", "") for item in items or [])
+
+
+def property_value(prop: Optional[Dict[str, Any]]) -> Any:
+    """
+    Returns the comparable value of a page property.
+
+    Args:
+        prop: A property object of a Notion page, or None when it is absent.
+
+    Returns:
+        Any: The plain text, the date start, the option name, the user ids, the
+        number or the checkbox; None when empty.
+    """
+    if not prop:
+        return None
+    kind = prop.get("type")
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return _plain_text(value)
+    if kind == "date":
+        return value["start"] if value else None
+    if kind in ("status", "select"):
+        return value["name"] if value else None
+    if kind == "people":
+        return [person["id"] for person in value or []]
+    return value
+
+
+def _ordered(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def test(value, expected):
+        if value is None:
+            return False
+        if isinstance(expected, str):
+            # Dates compare at the precision of the filter value (day or timestamp)
+            value = value[: len(expected)]
+        return compare(value, expected)
+
+    return test
+
+
+CONDITIONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "equals": lambda value, expected: value == expected,
+    "does_not_equal": lambda value, expected: value != expected,
+    "contains": lambda value, expected: value is not None and expected in value,
+    "does_not_contain": lambda value, expected: value is None or expected not in value,
+    "starts_with": lambda value, expected: (value or "").startswith(expected),
+    "ends_with": lambda value, expected: (value or "").endswith(expected),
+    "is_empty": lambda value, _: value is None or value == "" or value == [],
+    "is_not_empty": lambda value, _: not (value is None or value == "" or value == []),
+    "before": _ordered(operator.lt),
+    "after": _ordered(operator.gt),
+    "on_or_before": _ordered(operator.le),
+    "on_or_after": _ordered(operator.ge),
+    "less_than": _ordered(operator.lt),
+    "greater_than": _ordered(operator.gt),
+    "less_than_or_equal_to": _ordered(operator.le),
+    "greater_than_or_equal_to": _ordered(operator.ge),
+    # Client-side only
+    "matches": lambda value, pattern: re.search(pattern, value or "") is not None,
+}
+
+
+def evaluate_filter(condition: Dict[str, Any], page: Dict[str, Any]) -> bool:
+    """
+    Evaluates a Notion database query filter against a page, as Notion would.
+
+    Args:
+        condition: The filter JSON: a compound (and/or), a property filter or a
+            timestamp filter.
+        page: A page object from a query response.
+
+    Returns:
+        bool: True if the page matches.
+
+    Raises:
+        UnsupportedFilterError: If the filter uses an unknown condition.
+    """
+    if "and" in condition:
+        return all(evaluate_filter(part, page) for part in condition["and"])
+    if "or" in condition:
+        return any(evaluate_filter(part, page) for part in condition["or"])
+    if "timestamp" in condition:
+        kind = condition["timestamp"]
+        value = page.get(kind)
+    else:
+        kind = next((key for key in condition if key != "property"), None)
+        value = property_value(
+            page.get("properties", {}).get(condition.get("property"))
+        )
+    predicate = condition.get(kind)
+    if not isinstance(predicate, dict) or len(predicate) != 1:
+        raise UnsupportedFilterError(f"Unsupported filter: {condition}")
+    name, expected = next(iter(predicate.items()))
+    if name not in CONDITIONS:
+        raise UnsupportedFilterError(f"Unsupported filter condition: {name}")
+    return CONDITIONS[name](value, expected)
+
+
+# Predicates
+
+
+class Predicate(ABC):
+    """A filter on database pages. Combine with &, | and ~."""
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return self.negate()
+
+    def negate(self) -> "Predicate":
+        """Returns the opposite predicate, pushed down where Notion can express it."""
+        return Not(self)
+
+    def compile(
+        self, today: str, depth: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional["Predicate"]]:
+        """
+        Splits the predicate into a Notion filter and a client-side remainder.
+
+        Args:
+            today: Today's ISO date, for relative dates.
+            depth: Compound filters enclosing this predicate.
+
+        Returns:
+            tuple: (filter JSON or None, predicate still to evaluate client-side
+            or None). The filter matches a superset of the pages the predicate
+            matches, so applying both gives the exact result.
+        """
+        return None, self
+
+    @abstractmethod
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        """Evaluates the predicate against a page object."""
+
+
+@dataclass(frozen=True)
+class Condition(Predicate):
+    """A condition on one property (or timestamp), e.g. Status equals "Done"."""
+
+    name: str
+    kind: str
+    condition: str
+    value: Any = True
+
+    def negate(self) -> Predicate:
+        inverse = INVERSE_CONDITIONS.get(self.condition)
+        if inverse is None:
+            return super().negate()
+        negated = replace(self, condition=inverse)
+        if inverse in ORDERED_CONDITIONS:
+            return Or(negated, replace(self, condition="is_empty", value=True))
+        return negated
+
+    @property
+    def pushable(self) -> bool:
+        """Whether Notion can evaluate this condition."""
+        return self.condition in PUSHDOWN_CONDITIONS.get(self.kind, ())
+
+    def to_filter(self, today: str) -> Dict[str, Any]:
+        """Returns the Notion filter JSON of this condition."""
+        value = (
+            self.value.resolve(today)
+            if isinstance(self.value, RelativeDate)
+            else self.value
+        )
+        if self.kind == "timestamp":
+            return {"timestamp": self.name, self.name: {self.condition: value}}
+        return {"property": self.name, self.kind: {self.condition: value}}
+
+    def compile(self, today: str, depth: int):
+        if self.pushable:
+            return self.to_filter(today), None
+        return None, self
+
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        return evaluate_filter(self.to_filter(today), page)
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.condition} {self.value!r}"
+
+
+class _Compound(Predicate):
+    key = ""
+
+    def __init__(self, *parts: Predicate):
+        # Nested compounds of the same kind are flattened: (a & b) & c == a & b & c
+        self.parts: Tuple[Predicate, ...] = tuple(
+            item
+            for part in parts
+            for item in (part.parts if type(part) is type(self) else (part,))
+        )
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and other.parts == self.parts
+
+    def __hash__(self) -> int:
+        return hash((self.key, self.parts))
+
+    def __str__(self) -> str:
+        return "(" + f" {self.key} ".join(str(part) for part in self.parts) + ")"
+
+    def _compile_parts(self, today: str, depth: int):
+        if depth >= MAX_COMPOUND_DEPTH:
+            return None
+        return [part.compile(today, depth + 1) for part in self.parts]
+
+
+class And(_Compound):
+    """Matches pages matching every part."""
+
+    key = "and"
+
+    def negate(self) -> Predicate:
+        return Or(*(part.negate() for part in self.parts))
+
+    def compile(self, today: str, depth: int):
+        compiled = self._compile_parts(today, depth)
+        if compiled is None:
+            return None, self
+        # Pushing down the pushable parts narrows the results; the rest runs locally
+        pushed = [filter_ for filter_, _ in compiled if filter_ is not None]
+        remaining = [rest for _, rest in compiled if rest is not None]
+        filter_json = None
+        if pushed:
+            filter_json = pushed[0] if len(pushed) == 1 else {"and": pushed}
+        rest = None
+        if remaining:
+            rest = remaining[0] if len(remaining) == 1 else And(*remaining)
+        return filter_json, rest
+
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        return all(part.matches(page, today) for part in self.parts)
+
+
+class Or(_Compound):
+    """Matches pages matching any part."""
+
+    key = "or"
+
+    def negate(self) -> Predicate:
+        return And(*(part.negate() for part in self.parts))
+
+    def compile(self, today: str, depth: int):
+        compiled = self._compile_parts(today, depth)
+        if compiled is None:
+            return None, self
+        pushed = [filter_ for filter_, _ in compiled]
+        if None in pushed:
+            # A part Notion cannot narrow at all: every page has to be checked
+            return None, self
+        filter_json = {"or": pushed}
+        if any(rest is not None for _, rest in compiled):
+            # Each pushed part is a superset of its part, so the whole Or is checked
+            return filter_json, self
+        return filter_json, None
+
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        return any(part.matches(page, today) for part in self.parts)
+
+
+@dataclass(frozen=True)
+class Not(Predicate):
+    """Matches pages the predicate does not match. Evaluated client-side."""
+
+    predicate: Predicate
+
+    def negate(self) -> Predicate:
+        return self.predicate
+
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        return not self.predicate.matches(page, today)
+
+    def __str__(self) -> str:
+        return f"not {self.predicate}"
+
+
+@dataclass(frozen=True)
+class Where(Predicate):
+    """A Python test on the page object. Always evaluated client-side."""
+
+    test: Callable[[Dict[str, Any]], bool]
+    description: str = "custom predicate"
+
+    def matches(self, page: Dict[str, Any], today: str) -> bool:
+        return bool(self.test(page))
+
+    def __str__(self) -> str:
+        return self.description
+
+
+class Property:
+    """A database property (or page timestamp) to build conditions on."""
+
+    def __init__(self, name: str, kind: str):
+        """
+        Initialize the Property.
+
+        Args:
+            name: The property name, e.g. "Fecha", or the timestamp for "timestamp".
+            kind: The property type: title, rich_text, date, status, select,
+                people, number, checkbox or timestamp.
+        """
+        self.name = name
+        self.kind = kind
+
+    @classmethod
+    def title(cls, name: str) -> "Property":
+        return cls(name, "title")
+
+    @classmethod
+    def rich_text(cls, name: str) -> "Property":
+        return cls(name, "rich_text")
+
+    @classmethod
+    def date(cls, name: str) -> "Property":
+        return cls(name, "date")
+
+    @classmethod
+    def status(cls, name: str) -> "Property":
+        return cls(name, "status")
+
+    @classmethod
+    def select(cls, name: str) -> "Property":
+        return cls(name, "select")
+
+    @classmethod
+    def people(cls, name: str) -> "Property":
+        return cls(name, "people")
+
+    @classmethod
+    def number(cls, name: str) -> "Property":
+        return cls(name, "number")
+
+    @classmethod
+    def checkbox(cls, name: str) -> "Property":
+        return cls(name, "checkbox")
+
+    @classmethod
+    def created_time(cls) -> "Property":
+        return cls("created_time", "timestamp")
+
+    @classmethod
+    def last_edited_time(cls) -> "Property":
+        return cls("last_edited_time", "timestamp")
+
+    def _condition(self, condition: str, value: Any = True) -> Condition:
+        return Condition(self.name, self.kind, condition, value)
+
+    def equals(self, value: Any) -> Condition:
+        return self._condition("equals", value)
+
+    def does_not_equal(self, value: Any) -> Condition:
+        return self._condition("does_not_equal", value)
+
+    def contains(self, value: Any) -> Condition:
+        return self._condition("contains", value)
+
+    def does_not_contain(self, value: Any) -> Condition:
+        return self._condition("does_not_contain", value)
+
+    def starts_with(self, value: str) -> Condition:
+        return self._condition("starts_with", value)
+
+    def ends_with(self, value: str) -> Condition:
+        return self._condition("ends_with", value)
+
+    def is_empty(self) -> Condition:
+        return self._condition("is_empty")
+
+    def is_not_empty(self) -> Condition:
+        return self._condition("is_not_empty")
+
+    def before(self, value: Union[str, RelativeDate]) -> Condition:
+        return self._condition("before", value)
+
+    def after(self, value: Union[str, RelativeDate]) -> Condition:
+        return self._condition("after", value)
+
+    def on_or_before(self, value: Union[str, RelativeDate]) -> Condition:
+        return self._condition("on_or_before", value)
+
+    def on_or_after(self, value: Union[str, RelativeDate]) -> Condition:
+        return self._condition("on_or_after", value)
+
+    def greater_than(self, value: float) -> Condition:
+        return self._condition("greater_than", value)
+
+    def less_than(self, value: float) -> Condition:
+        return self._condition("less_than", value)
+
+    def matches(self, pattern: str) -> Condition:
+        """A regular expression search on the text. Not supported by Notion."""
+        return self._condition("matches", pattern)
+
+
+# Queries
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """A query split into the Notion request and the client-side remainder."""
+
+    payload: Dict[str, Any]
+    filter_properties: Optional[Tuple[str, ...]]
+    client_predicate: Optional[Predicate]
+    today: str
+
+    def matches(self, page: Dict[str, Any]) -> bool:
+        """Applies the client-side remainder to a page returned by Notion."""
+        return self.client_predicate is None or self.client_predicate.matches(
+            page, self.today
+        )
+
+
+@dataclass(frozen=True)
+class Query:
+    """
+    An immutable description of a database query, compiled to Notion's filter JSON.
+
+    Every builder method returns a new Query. Conditions Notion supports are sent
+    in the request so the filtering happens server-side; the rest (regular
+    expressions, negations Notion cannot express, Python tests, compounds nested
+    too deep) is reported with a warning and applied to the returned pages.
+    """
+
+    predicate: Optional[Predicate] = None
+    sorts: Tuple[Dict[str, str], ...] = ()
+    properties: Optional[Tuple[str, ...]] = None
+    size: Optional[int] = None
+
+    def where(self, *predicates: Predicate) -> "Query":
+        """Adds predicates, all of which must match."""
+        parts = ((self.predicate,) if self.predicate is not None else ()) + predicates
+        return replace(self, predicate=parts[0] if len(parts) == 1 else And(*parts))
+
+    def sort_by(self, name: str, descending: bool = False) -> "Query":
+        """Sorts by a property; call again for secondary sorts."""
+        direction = "descending" if descending else "ascending"
+        return replace(
+            self, sorts=self.sorts + ({"property": name, "direction": direction},)
+        )
+
+    def sort_by_timestamp(
+        self, timestamp: str = "last_edited_time", descending: bool = False
+    ) -> "Query":
+        """Sorts by created_time or last_edited_time."""
+        direction = "descending" if descending else "ascending"
+        return replace(
+            self, sorts=self.sorts + ({"timestamp": timestamp, "direction": direction},)
+        )
+
+    def select(self, *names: str) -> "Query":
+        """Returns only these properties (filter_properties)."""
+        return replace(self, properties=tuple(names))
+
+    def page_size(self, size: int) -> "Query":
+        """Sets the number of results per request (at most 100)."""
+        if not 1 <= size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        return replace(self, size=size)
+
+    def compile(self, today: str) -> CompiledQuery:
+        """
+        Compiles the query to a Notion request body.
+
+        Args:
+            today: Today's ISO date, which relative dates are resolved against.
+
+        Returns:
+            CompiledQuery: The payload, the projection and the client-side remainder.
+        """
+        payload: Dict[str, Any] = {}
+        client_predicate = None
+        if self.predicate is not None:
+            filter_json, client_predicate = self.predicate.compile(today, 0)
+            if filter_json is not None:
+                payload["filter"] = filter_json
+            if client_predicate is not None:
+                logger.warning(
+                    f"Filter cannot be pushed down to Notion and runs client-side: {client_predicate}"
+                )
+        if self.sorts:
+            payload["sorts"] = [dict(sort) for sort in self.sorts]
+        if self.size is not None:
+            payload["page_size"] = self.size
+        return CompiledQuery(payload, self.properties, client_predicate, today)
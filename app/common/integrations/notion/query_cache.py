@@ -0,0 +1,129 @@
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+from app.common.cache.lru_cache import CacheStats, LRUCache
+from app.common.cache.single_flight import SingleFlight
+from app.common.environment.environment_handler import environment_handler
+
+
+class QueryResultCache:
+    """
+    Short-lived cache of mapped database query results.
+
+    Keys are a canonical hash of the database id, filter, sorts and
+    filter_properties, so identical queries from several digests or from
+    invocations a few minutes apart share one Notion round trip. Concurrent
+    identical queries are coalesced with SingleFlight while the first is in flight.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 120,
+        max_entries: int = 64,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the QueryResultCache.
+
+        Args:
+            ttl_seconds: How long a query result is reused.
+            max_entries: Maximum number of distinct queries kept.
+            clock: Time source, injectable for tests.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._results = LRUCache(
+            max_entries=max_entries, default_ttl=ttl_seconds, clock=clock
+        )
+        self._flights = SingleFlight()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Returns the hit/miss statistics."""
+        return self._results.stats
+
+    @staticmethod
+    def make_key(
+        database_id: str, payload: Dict[str, Any], filter_properties: str
+    ) -> str:
+        """
+        Builds the canonical cache key of a query.
+
+        Dict key order and the order of filter_properties do not change the key.
+
+        Args:
+            database_id: The queried database.
+            payload: The query body (filter, sorts, ...).
+            filter_properties: Comma-separated projected properties.
+
+        Returns:
+            str: A SHA-256 hex digest.
+        """
+        canonical = json.dumps(
+            {
+                "database_id": database_id,
+                "filter": payload.get("filter"),
+                "sorts": payload.get("sorts"),
+                "filter_properties": sorted(
+                    prop.strip() for prop in filter_properties.split(",")
+                ),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the cached result for key, fetching it once if needed.
+
+        Args:
+            key: The key built by make_key.
+            fetch: Runs the query and returns the mapped tasks.
+
+        Returns:
+            List[Dict[str, Any]]: A copy of the mapped tasks.
+        """
+        cached = self._results.get(key)
+        if cached is None:
+            cached = self._flights.do(key, lambda: self._fetch_and_store(key, fetch))
+        return [dict(task) for task in cached]
+
+    def _fetch_and_store(
+        self, key: str, fetch: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        # Another flight may have completed between the cache miss and this call
+        cached = self._results.get(key, record=False)
+        if cached is not None:
+            return cached
+        result = fetch()
+        self._results.set(key, result)
+        return result
+
+    def clear(self):
+        """Drops all cached results."""
+        self._results.clear()
+
+
+# Lazy singleton - shared by every TaskRepository in the container
+_query_cache_instance = None
+
+
+def get_query_cache() -> Optional[QueryResultCache]:
+    """
+    Get the shared QueryResultCache instance.
+
+    Returns:
+        Optional[QueryResultCache]: The cache, or None when NOTION_QUERY_CACHE_TTL is
+            not set or 0.
+    """
+    global _query_cache_instance
+    ttl = environment_handler.settings.notion_query_cache_ttl
+    if ttl <= 0:
+        return None
+    if _query_cache_instance is None:
+        _query_cache_instance = QueryResultCache(ttl_seconds=ttl)
+    return _query_cache_instance
@@ -0,0 +1,63 @@
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting requests per second.
+
+    A single instance is shared by every thread that talks to Notion, so
+    concurrent fan-out stays within the API's average rate limit (about three
+    requests per second per integration). Callers reserve a token and sleep
+    outside the lock until their slot, which keeps waiting threads in FIFO order.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 3.0,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            rate_per_second: Sustained number of requests allowed per second.
+            burst: Requests allowed back to back when the bucket is full.
+                Defaults to the rounded-up rate.
+            clock: Monotonic time source, injectable for tests.
+            sleep: Sleep function, injectable for tests.
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1, math.ceil(rate_per_second))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        Returns:
+            float: The number of seconds the caller waited.
+        """
+        with self._lock:
+            now = self.clock()
+            elapsed = now - self._updated_at
+            self._tokens = min(
+                self.burst, self._tokens + elapsed * self.rate_per_second
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self.sleep(wait)
+        return wait
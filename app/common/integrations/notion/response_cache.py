@@ -0,0 +1,222 @@
+import copy
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.common.cache.disk_cache import DiskCache
+from app.common.cache.lru_cache import CacheStats, LRUCache
+
+# Seconds a GET response stays fresh, keyed by the first path segment of the endpoint.
+# Database schemas and users change rarely; pages and blocks are edited more often.
+DEFAULT_TTLS = {"databases": 3600, "users": 3600, "pages": 300, "blocks": 300}
+DEFAULT_TTL = 60
+
+
+def _normalize(endpoint: str) -> str:
+    return endpoint.strip().lstrip("/")
+
+
+def _resource_id(endpoint: str) -> Optional[str]:
+    """Returns the object id of an endpoint such as "pages/<id>/properties/<p>"."""
+    path = _normalize(endpoint).split("?", 1)[0]
+    parts = path.split("/")
+    return parts[1] if len(parts) > 1 and parts[1] else None
+
+
+class ResponseCache:
+    """
+    Cache for Notion GET responses.
+
+    Entries are keyed by endpoint and Notion-Version, held in a bounded in-memory
+    LRU and optionally mirrored to a disk tier (e.g. /tmp). Each entry is fresh for
+    a TTL chosen by endpoint type. Stale entries that carried an ETag are kept so
+    the client can revalidate them with If-None-Match instead of refetching.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        disk_directory: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            max_entries: Size bound of the in-memory tier.
+            ttls: Per-endpoint TTLs keyed by first path segment (e.g. "databases").
+            default_ttl: TTL for endpoints not listed in ttls.
+            disk_directory: Directory for the optional disk tier.
+            clock: Wall-clock time source, injectable for tests.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.memory = LRUCache(max_entries=max_entries, clock=clock)
+        self.disk = DiskCache(disk_directory, clock=clock) if disk_directory else None
+        self.stats = CacheStats()
+
+    @staticmethod
+    def parse_ttls(value: Optional[str]) -> Dict[str, float]:
+        """
+        Parses a TTL override string such as "databases=3600,pages=120".
+
+        Entries are merged over DEFAULT_TTLS.
+
+        Args:
+            value: Comma-separated segment=seconds pairs, or None.
+
+        Returns:
+            Dict[str, float]: The TTLs per endpoint segment.
+
+        Raises:
+            ValueError: If an entry is malformed.
+        """
+        ttls = dict(DEFAULT_TTLS)
+        for item in filter(None, (part.strip() for part in (value or "").split(","))):
+            segment, sep, seconds = item.partition("=")
+            if not sep:
+                raise ValueError(f"Invalid cache TTL entry '{item}'")
+            ttls[segment.strip()] = float(seconds)
+        return ttls
+
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        Returns the TTL for an endpoint.
+
+        Args:
+            endpoint: The API endpoint, e.g. "databases/<id>".
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        segment = _normalize(endpoint).split("/", 1)[0].split("?", 1)[0]
+        return self.ttls.get(segment, self.default_ttl)
+
+    def key(self, endpoint: str, notion_version: str) -> str:
+        """Returns the cache key for an endpoint and API version."""
+        return f"{notion_version}|{_normalize(endpoint)}"
+
+    def lookup(
+        self, endpoint: str, notion_version: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Looks up a cached response.
+
+        Args:
+            endpoint: The API endpoint.
+            notion_version: The Notion-Version header value.
+
+        Returns:
+            Tuple: (body, None) for a fresh hit, (None, etag) for a stale entry that
+            can be revalidated, and (None, None) for a miss.
+        """
+        key = self.key(endpoint, notion_version)
+        entry = self._load(key)
+
+        if entry is None:
+            self.stats.misses += 1
+            return None, None
+
+        if self.clock() < entry["expires_at"]:
+            self.stats.hits += 1
+            return copy.deepcopy(entry["body"]), None
+
+        self.stats.misses += 1
+        if entry.get("etag"):
+            return None, entry["etag"]
+
+        self._delete(key)
+        self.stats.expirations += 1
+        return None, None
+
+    def store(
+        self,
+        endpoint: str,
+        notion_version: str,
+        body: Dict[str, Any],
+        etag: Optional[str] = None,
+    ):
+        """
+        Stores a response body.
+
+        Args:
+            endpoint: The API endpoint.
+            notion_version: The Notion-Version header value.
+            body: The decoded JSON response.
+            etag: The ETag response header, if any.
+        """
+        entry = {
+            "body": copy.deepcopy(body),
+            "etag": etag,
+            "expires_at": self.clock() + self.ttl_for(endpoint),
+        }
+        key = self.key(endpoint, notion_version)
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, entry)
+
+    def revalidate(
+        self, endpoint: str, notion_version: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Marks a stale entry as fresh again after a 304 Not Modified response.
+
+        Args:
+            endpoint: The API endpoint.
+            notion_version: The Notion-Version header value.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached body, or None if it was evicted meanwhile.
+        """
+        entry = self._load(self.key(endpoint, notion_version))
+        if entry is None:
+            return None
+        self.store(endpoint, notion_version, entry["body"], entry.get("etag"))
+        return copy.deepcopy(entry["body"])
+
+    def invalidate_resource(self, endpoint: str) -> int:
+        """
+        Drops every cached response that refers to the same object as endpoint.
+
+        Called after PATCH and DELETE so a following GET sees the change. The
+        object id is matched across endpoint types because a page is also a
+        block in Notion ("pages/<id>" and "blocks/<id>/children").
+
+        Args:
+            endpoint: The endpoint that was modified, e.g. "pages/<id>".
+
+        Returns:
+            int: The number of in-memory entries removed.
+        """
+        resource_id = _resource_id(endpoint)
+        if resource_id is None:
+            return 0
+
+        def matches(key: str) -> bool:
+            return _resource_id(key.split("|", 1)[1]) == resource_id
+
+        removed = self.memory.delete_where(matches)
+        if self.disk is not None:
+            self.disk.delete_where(matches)
+        self.stats.invalidations += removed
+        return removed
+
+    def clear(self):
+        """Removes all cached responses from every tier."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.memory.get(key, record=False)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def _delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
@@ -0,0 +1,558 @@
+import sqlite3
+import threading
+from functools import partial
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from app.common.dates.date_service import get_date_service
+from app.common.environment.environment_handler import environment_handler
+from app.common.integrations.notion.bulk_update import (
+    BulkUpdateResult,
+    UpdateCheckpoint,
+)
+from app.common.integrations.notion.exceptions import NotionDataNotFoundError
+from app.common.integrations.notion.query_builder import (
+    Property,
+    Query,
+    property_value,
+)
+from app.common.integrations.notion.task_repository import PENDING_STATUS
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columns of a mapped task (TaskRepository.map_task), in the order they are stored
+TASK_FIELDS = ("id", "titulo", "fecha", "notas", "editado")
+
+# Properties read in addition to the repository's filter_properties
+INDEXED_PROPERTIES = ("Status", "Responsable")
+
+
+def task_row(repository, page: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps a page to an index row: the repository's task plus status and assignees.
+
+    Args:
+        repository: The TaskRepository whose map_task shapes the task.
+        page: A page object with the Status and Responsable properties.
+
+    Returns:
+        Dict[str, Any]: The mapped task with status and responsables (user IDs).
+    """
+    properties = page.get("properties", {})
+    return {
+        **repository.map_task(page),
+        "status": property_value(properties.get("Status")),
+        "responsables": property_value(properties.get("Responsable")) or [],
+    }
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    database_id TEXT NOT NULL,
+    titulo TEXT,
+    fecha TEXT,
+    notas TEXT,
+    editado TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_status_fecha ON tasks (database_id, status, fecha);
+CREATE INDEX IF NOT EXISTS tasks_fecha ON tasks (database_id, fecha);
+CREATE TABLE IF NOT EXISTS task_assignees (
+    task_id TEXT NOT NULL,
+    assignee TEXT NOT NULL,
+    PRIMARY KEY (task_id, assignee)
+);
+CREATE INDEX IF NOT EXISTS task_assignees_assignee ON task_assignees (assignee, task_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    last_edited_time TEXT,
+    full_synced_at TEXT
+);
+"""
+
+
+class TaskIndex:
+    """
+    Local SQLite copy of the task databases, kept current by incremental sync.
+
+    Each sync reads only the pages edited since the newest last_edited_time seen
+    (on or after it: the timestamps have minute granularity, so pages of that
+    minute are read again and upserted). Pages deleted or moved out of a database
+    are not returned by such queries; they are dropped by a full sync, which runs
+    on the first sync and then every full_sync_hours.
+
+    The file can live in /tmp (per container) or on EFS (shared). SQLite's
+    default rollback journal is used because WAL needs shared memory, which
+    network file systems do not provide; concurrent writers wait on the file lock
+    for up to timeout seconds.
+    """
+
+    def __init__(self, path: str, full_sync_hours: float = 24, timeout: float = 30):
+        """
+        Initialize the TaskIndex.
+
+        Args:
+            path: The SQLite file; its directory is created if needed.
+            full_sync_hours: Hours after which a sync reads every page again; 0
+                for incremental syncs only.
+            timeout: Seconds to wait for another writer's lock.
+        """
+        self.path = path
+        self.full_sync_hours = full_sync_hours
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+        self.logger = logger
+
+    def close(self):
+        """Closes the database connection."""
+        self._connection.close()
+
+    def sync(self, repository, full: bool = False) -> int:
+        """
+        Brings the rows of a repository's database up to date.
+
+        Pages are read first and then written in one transaction, so other
+        containers sharing the file are only blocked for the writes. If a request
+        fails the index keeps its previous state and the next sync starts from the
+        same watermark.
+
+        Args:
+            repository: The TaskRepository of the database.
+            full: Read every page and drop rows of pages no longer returned.
+
+        Returns:
+            int: Number of pages read.
+
+        Raises:
+            NotionApiError: If an API request fails.
+        """
+        database_id = repository.database_id
+        state = self._sync_state(database_id)
+        now = datetime.now(timezone.utc)
+        full = full or self._full_sync_due(state, now)
+
+        properties = repository.filter_properties.split(",")
+        query = (
+            Query()
+            .sort_by_timestamp("last_edited_time")
+            .select(
+                *properties, *(p for p in INDEXED_PROPERTIES if p not in properties)
+            )
+        )
+        if not full:
+            query = query.where(
+                Property.last_edited_time().on_or_after(state["last_edited_time"])
+            )
+
+        self.logger.info(
+            f"{'Full' if full else 'Incremental'} index sync of {database_id}"
+        )
+        # Read before the transaction, so neither the thread lock nor the file's
+        # write lock is held across requests
+        tasks = list(
+            repository.iter_tasks(query, map_page=partial(task_row, repository))
+        )
+        with self._lock, self._connection as connection:
+            seen, watermark = self._upsert(connection, database_id, tasks)
+            if full:
+                self._delete_missing(connection, database_id, seen)
+            if watermark is None and state is not None:
+                watermark = state["last_edited_time"]
+            connection.execute(
+                "INSERT INTO sync_state (database_id, last_edited_time, full_synced_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (database_id) DO UPDATE SET "
+                "last_edited_time = excluded.last_edited_time, "
+                "full_synced_at = COALESCE(?, full_synced_at)",
+                (
+                    database_id,
+                    watermark,
+                    now.isoformat() if full else None,
+                    now.isoformat() if full else None,
+                ),
+            )
+        self.logger.info(f"Index sync of {database_id} read {len(seen)} pages")
+        return len(seen)
+
+    def pending_tasks(
+        self,
+        database_ids: Sequence[str],
+        today: str,
+        status: str = PENDING_STATUS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the tasks with a status and a Fecha on or before today.
+
+        Args:
+            database_ids: The databases to read.
+            today: The current date in ISO format.
+            status: The status of pending tasks.
+
+        Returns:
+            List[Dict[str, Any]]: Mapped tasks sorted by Fecha, shaped like
+                TaskRepository's.
+        """
+        # Fecha may hold a time; anything before the next day is on or before today
+        tomorrow = (date.fromisoformat(today) + timedelta(days=1)).isoformat()
+        rows = self._select(
+            "status = ? AND fecha < ?", [status, tomorrow], database_ids
+        )
+        return [{field: row[field] for field in TASK_FIELDS} for row in rows]
+
+    def tasks(
+        self,
+        database_ids: Optional[Sequence[str]] = None,
+        status: Optional[str] = None,
+        assignee: Optional[str] = None,
+        fecha_from: Optional[str] = None,
+        fecha_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the indexed tasks matching every given criterion.
+
+        Args:
+            database_ids: The databases to read; all of them when None.
+            status: The status name.
+            assignee: A user ID of Responsable.
+            fecha_from: Earliest Fecha, inclusive.
+            fecha_to: Latest Fecha (a date), inclusive.
+
+        Returns:
+            List[Dict[str, Any]]: Mapped tasks sorted by Fecha, with their status
+                and assignees.
+        """
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if assignee is not None:
+            conditions.append(
+                "id IN (SELECT task_id FROM task_assignees WHERE assignee = ?)"
+            )
+            params.append(assignee)
+        if fecha_from is not None:
+            conditions.append("fecha >= ?")
+            params.append(fecha_from)
+        if fecha_to is not None:
+            conditions.append("fecha < ?")
+            params.append(
+                (date.fromisoformat(fecha_to) + timedelta(days=1)).isoformat()
+            )
+        rows = self._select(" AND ".join(conditions) or "1", params, database_ids)
+        assignees = self._assignees([row["id"] for row in rows])
+        return [
+            {
+                **{field: row[field] for field in TASK_FIELDS},
+                "status": row["status"],
+                "responsables": assignees.get(row["id"], []),
+            }
+            for row in rows
+        ]
+
+    def counts(
+        self, by: str = "status", database_ids: Optional[Sequence[str]] = None
+    ) -> Dict[Optional[str], int]:
+        """
+        Counts the indexed tasks per status or per assignee.
+
+        Args:
+            by: "status" or "assignee"; unassigned tasks are not counted per assignee.
+            database_ids: The databases to count; all of them when None.
+
+        Returns:
+            Dict[Optional[str], int]: Number of tasks per value.
+
+        Raises:
+            ValueError: If by is not "status" or "assignee".
+        """
+        if by == "status":
+            sql = "SELECT status AS value, COUNT(*) AS total FROM tasks"
+        elif by == "assignee":
+            sql = (
+                "SELECT assignee AS value, COUNT(*) AS total FROM task_assignees "
+                "JOIN tasks ON tasks.id = task_assignees.task_id"
+            )
+        else:
+            raise ValueError(f"Cannot count tasks by {by}")
+        params: List[Any] = []
+        if database_ids is not None:
+            sql += f" WHERE database_id IN ({', '.join('?' * len(database_ids))})"
+            params.extend(database_ids)
+        rows = self._connection.execute(f"{sql} GROUP BY value", params).fetchall()
+        return {row["value"]: row["total"] for row in rows}
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the indexed row of a task.
+
+        Args:
+            task_id: The page ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The mapped task with status and responsables,
+                or None when it is not indexed.
+        """
+        row = self._connection.execute(
+            "SELECT * FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            **{field: row[field] for field in TASK_FIELDS},
+            "status": row["status"],
+            "responsables": self._assignees([task_id]).get(task_id, []),
+        }
+
+    def upsert(self, database_id: str, rows: Sequence[Dict[str, Any]]):
+        """
+        Stores rows read outside a sync, e.g. pages named by webhook events.
+
+        The sync watermark is left unchanged, so the next sync still reads every
+        page edited since the previous one.
+
+        Args:
+            database_id: The database the pages belong to.
+            rows: Rows built with task_row.
+        """
+        with self._lock, self._connection as connection:
+            self._upsert(connection, database_id, rows)
+
+    def delete(self, task_ids: Sequence[str]):
+        """
+        Removes tasks from the index, e.g. pages deleted in Notion.
+
+        Args:
+            task_ids: The page IDs.
+        """
+        with self._lock, self._connection as connection:
+            self._delete(connection, task_ids)
+
+    def set_status(self, task_ids: Sequence[str], status: str):
+        """
+        Records a status change made through the API, ahead of the next sync.
+
+        Args:
+            task_ids: The updated pages.
+            status: Their new status.
+        """
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                "UPDATE tasks SET status = ? WHERE id = ?",
+                [(status, task_id) for task_id in task_ids],
+            )
+
+    def _sync_state(self, database_id: str) -> Optional[sqlite3.Row]:
+        return self._connection.execute(
+            "SELECT last_edited_time, full_synced_at FROM sync_state "
+            "WHERE database_id = ?",
+            (database_id,),
+        ).fetchone()
+
+    def _full_sync_due(self, state: Optional[sqlite3.Row], now: datetime) -> bool:
+        # Without a watermark (e.g. the database was empty) there is nothing to
+        # sync from incrementally
+        if state is None or not state["last_edited_time"]:
+            return True
+        if not state["full_synced_at"]:
+            return True
+        if not self.full_sync_hours:
+            return False
+        age = now - datetime.fromisoformat(state["full_synced_at"])
+        return age >= timedelta(hours=self.full_sync_hours)
+
+    @staticmethod
+    def _upsert(connection, database_id: str, tasks: Iterable[Dict[str, Any]]):
+        seen = set()
+        watermark = None
+        for task in tasks:
+            seen.add(task["id"])
+            if task["editado"] and (watermark is None or task["editado"] > watermark):
+                watermark = task["editado"]
+            connection.execute(
+                "INSERT OR REPLACE INTO tasks "
+                "(id, database_id, titulo, fecha, notas, editado, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    task["id"],
+                    database_id,
+                    task["titulo"],
+                    task["fecha"],
+                    task["notas"],
+                    task["editado"],
+                    task["status"],
+                ),
+            )
+            connection.execute(
+                "DELETE FROM task_assignees WHERE task_id = ?", (task["id"],)
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO task_assignees (task_id, assignee) VALUES (?, ?)",
+                [(task["id"], assignee) for assignee in task["responsables"]],
+            )
+        return seen, watermark
+
+    @staticmethod
+    def _delete_missing(connection, database_id: str, seen: set):
+        stored = connection.execute(
+            "SELECT id FROM tasks WHERE database_id = ?", (database_id,)
+        ).fetchall()
+        TaskIndex._delete(
+            connection, [row["id"] for row in stored if row["id"] not in seen]
+        )
+
+    @staticmethod
+    def _delete(connection, task_ids: Sequence[str]):
+        params = [(task_id,) for task_id in task_ids]
+        connection.executemany("DELETE FROM tasks WHERE id = ?", params)
+        connection.executemany("DELETE FROM task_assignees WHERE task_id = ?", params)
+
+    def _select(
+        self,
+        where: str,
+        params: List[Any],
+        database_ids: Optional[Sequence[str]],
+    ) -> List[sqlite3.Row]:
+        if database_ids is not None:
+            where += f" AND database_id IN ({', '.join('?' * len(database_ids))})"
+            params = [*params, *database_ids]
+        return self._connection.execute(
+            f"SELECT * FROM tasks WHERE {where} ORDER BY fecha IS NULL, fecha, id",
+            params,
+        ).fetchall()
+
+    def _assignees(self, task_ids: Sequence[str]) -> Dict[str, List[str]]:
+        assignees: Dict[str, List[str]] = {}
+        # Stay below SQLite's limit on bound parameters
+        for start in range(0, len(task_ids), 500):
+            end = start + 500
+            chunk = task_ids[start:end]
+            rows = self._connection.execute(
+                "SELECT task_id, assignee FROM task_assignees "
+                f"WHERE task_id IN ({', '.join('?' * len(chunk))}) ORDER BY assignee",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                assignees.setdefault(row["task_id"], []).append(row["assignee"])
+        return assignees
+
+
+class IndexedTaskRepository:
+    """
+    Serves pending tasks from a TaskIndex, syncing it from Notion first.
+
+    Wraps the TaskRepository of every configured database. A digest costs one
+    incremental query per database (a single request when nothing changed) plus
+    a local indexed query, instead of a scan of the pending tasks.
+    """
+
+    def __init__(self, repositories: Sequence, index: TaskIndex):
+        """
+        Initialize the IndexedTaskRepository.
+
+        Args:
+            repositories: The TaskRepository of each database.
+            index: The local index the tasks are served from.
+        """
+        if not repositories:
+            raise ValueError("At least one repository is required.")
+        self.repositories = list(repositories)
+        self.index = index
+        self.logger = logger
+
+    @property
+    def database_ids(self) -> List[str]:
+        """Returns the indexed database IDs."""
+        return [repository.database_id for repository in self.repositories]
+
+    def sync(self):
+        """
+        Syncs the index with every database.
+
+        Raises:
+            NotionApiError: If an API request fails.
+        """
+        for repository in self.repositories:
+            self.index.sync(repository)
+
+    def get_pending_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Gets pending tasks from the synced index, ordered by Fecha.
+
+        Returns:
+            List[Dict[str, Any]]: List of mapped tasks with id, titulo, fecha, and notas.
+
+        Raises:
+            NotionApiError: If the sync fails.
+            NotionDataNotFoundError: If no tasks are found.
+        """
+        tasks = list(self.iter_pending_tasks())
+        if not tasks:
+            raise NotionDataNotFoundError("No tasks found in Notion")
+        return tasks
+
+    def iter_pending_tasks(self) -> Iterator[Dict[str, Any]]:
+        """
+        Streams pending tasks from the synced index, ordered by Fecha.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks.
+
+        Raises:
+            NotionApiError: If the sync fails.
+        """
+        self.sync()
+        today = get_date_service().today_iso()
+        yield from self.index.pending_tasks(self.database_ids, today)
+
+    def bulk_update(
+        self,
+        updates: Mapping[str, Dict[str, Any]],
+        checkpoint: Optional[UpdateCheckpoint] = None,
+        max_workers: int = 3,
+    ) -> BulkUpdateResult:
+        """
+        Updates task pages and applies status changes to the index.
+
+        See TaskRepository.bulk_update. Updated rows are corrected locally so a
+        digest served before the next sync does not list notified tasks again.
+        """
+        result = self.repositories[0].bulk_update(updates, checkpoint, max_workers)
+        by_status: Dict[str, List[str]] = {}
+        for page_id in result.succeeded:
+            status = updates[page_id].get("properties", {}).get("Status") or {}
+            name = (status.get("status") or {}).get("name")
+            if name is not None:
+                by_status.setdefault(name, []).append(page_id)
+        for status, page_ids in by_status.items():
+            self.index.set_status(page_ids, status)
+        return result
+
+
+# Lazy singleton - the connection is reused across warm invocations
+_task_index_instance = None
+
+
+def get_task_index() -> Optional[TaskIndex]:
+    """
+    Get the shared TaskIndex instance.
+
+    Returns:
+        Optional[TaskIndex]: The index, or None when TASK_INDEX_PATH is not set.
+    """
+    global _task_index_instance
+    settings = environment_handler.settings
+    if not settings.task_index_path:
+        return None
+    if _task_index_instance is None:
+        _task_index_instance = TaskIndex(
+            settings.task_index_path,
+            full_sync_hours=settings.task_index_full_sync_hours,
+        )
+    return _task_index_instance
@@ -1,10 +1,33 @@
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
+from functools import partial
+from typing import Callable, Dict, Any, Generator, Iterator, List, Mapping, Optional
+from app.common.dates.date_service import get_date_service
 from app.common.logger.logger import get_logger
-from app.common.integrations.notion.exceptions import NotionDataNotFoundError
+from app.common.integrations.notion.bulk_update import (
+    BulkUpdater,
+    BulkUpdateResult,
+    UpdateCheckpoint,
+)
+from app.common.integrations.notion.exceptions import (
+    NotionApiError,
+    NotionDataNotFoundError,
+)
+from app.common.integrations.notion.page_structs import (
+    TypedQueryDecoder,
+    typed_decoding_available,
+)
+from app.common.integrations.notion.partitioned_scan import (
+    PartitionedScan,
+    date_partitions,
+)
+from app.common.integrations.notion.query_builder import Property, Query, today
+from app.common.integrations.notion.query_cache import QueryResultCache
 
 logger = get_logger(__name__)
 
+# Status of the tasks listed in the digest
+PENDING_STATUS = "Not Started"
+
 
 class TaskRepository:
     """
@@ -19,6 +42,11 @@ class TaskRepository:
         notion_client,
         database_id: str,
         filter_properties: str = "Fecha,Tarea,Notas",
+        query_cache: Optional[QueryResultCache] = None,
+        streaming: bool = False,
+        typed_decoding: bool = False,
+        scan_partitions: int = 1,
+        scan_days: int = 365,
     ):
         """
         Initialize the TaskRepository.
@@ -27,10 +55,30 @@ class TaskRepository:
             notion_client: The NotionClient instance for API calls.
             database_id: The Notion database ID containing tasks.
             filter_properties: Comma-separated list of properties to filter in the response.
+            query_cache: Optional cache of mapped query results shared between repositories.
+            streaming: Decode query responses incrementally, mapping each page as it
+                is parsed instead of loading the whole response first.
+            typed_decoding: Decode query responses into msgspec structs (see
+                page_structs). Ignored with a warning when msgspec is not installed;
+                streaming takes precedence when both are enabled.
+            scan_partitions: Read pending tasks as this many concurrent Fecha
+                ranges (see PartitionedScan) instead of one serial cursor chain.
+            scan_days: Days before today the Fecha ranges are spread over; older
+                tasks are all read by the first range.
         """
         self.notion_client = notion_client
         self.database_id = database_id
         self.filter_properties = filter_properties
+        self.query_cache = query_cache
+        self.streaming = streaming
+        self.scan_partitions = scan_partitions
+        self.scan_days = scan_days
+        self.typed_decoder = None
+        if typed_decoding and not streaming:
+            if typed_decoding_available():
+                self.typed_decoder = TypedQueryDecoder()
+            else:
+                logger.warning("msgspec is not installed; typed decoding disabled")
         self.logger = logger
 
     def get_pending_tasks(self) -> List[Dict[str, Any]]:
@@ -49,29 +97,320 @@ class TaskRepository:
         self.logger.info("Fetching pending tasks from Notion")
         payload = self._create_pending_tasks_payload()
 
-        # NotionClient raises NotionApiError on HTTP errors
-        response = self.notion_client.post(
-            f"databases/{self.database_id}/query?{self._get_request_filters()}", payload
+        if self.scan_partitions > 1:
+            fetch = self._scan_pending_tasks
+        else:
+            fetch = partial(self._query_tasks, payload)
+
+        if self.query_cache is None:
+            return fetch()
+
+        key = QueryResultCache.make_key(
+            self.database_id, payload, self.filter_properties
         )
+        return self.query_cache.get_or_fetch(key, fetch)
 
-        self.logger.debug(f"Response: {response}")
+    def iter_pending_tasks(self) -> Iterator[Dict[str, Any]]:
+        """
+        Streams pending tasks from the Notion database, sorted by Fecha.
+
+        Follows next_cursor so databases with more than one page of results are
+        read completely, mapping each page as it arrives. When a query cache is
+        configured the whole result is read into the cache and streamed from it,
+        so memory grows with the result.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks with id, titulo, fecha, and notas.
+
+        Raises:
+            NotionApiError: If the API request fails.
+        """
+        if self.query_cache is not None:
+            try:
+                yield from self.get_pending_tasks()
+            except NotionDataNotFoundError:
+                return
+            return
+
+        if self.scan_partitions > 1:
+            yield from self._iter_scan()
+            return
+        yield from self._iter_query(self._create_pending_tasks_payload())
+
+    def iter_tasks(
+        self,
+        query: Query,
+        map_page: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the tasks matching a query, following pagination cursors.
+
+        The query's filter is compiled to Notion's filter JSON so pages are filtered
+        server-side. Predicates Notion cannot evaluate are logged with a warning and
+        applied to each returned page before mapping; the response is then read
+        whole (not streamed or typed-decoded) and every property is requested.
+
+        Args:
+            query: The filter, sorts and projection. Without a projection the
+                repository's filter_properties are requested.
+            map_page: Maps each page object instead of map_task (the response is
+                then read whole).
+
+        Yields:
+            Dict[str, Any]: Mapped tasks with id, titulo, fecha, and notas.
+
+        Raises:
+            NotionApiError: If the API request fails.
+        """
+        compiled = query.compile(self._get_current_date())
+        if compiled.client_predicate is None:
+            yield from self._iter_query(
+                compiled.payload, compiled.filter_properties, map_page=map_page
+            )
+            return
+        # The client-side predicate may read properties outside the projection
+        yield from self._iter_query(
+            compiled.payload, (), page_filter=compiled.matches, map_page=map_page
+        )
+
+    def pending_tasks_query(self) -> Query:
+        """
+        Builds the query of pending tasks.
+
+        Returns:
+            Query: Tasks "Not Started" with a Fecha on or before today, by Fecha.
+        """
+        return (
+            Query()
+            .where(
+                Property.status("Status").equals(PENDING_STATUS),
+                Property.date("Fecha").on_or_before(today()),
+            )
+            .sort_by("Fecha")
+        )
+
+    def _iter_scan(self) -> Iterator[Dict[str, Any]]:
+        """
+        Streams pending tasks with a partitioned scan over Fecha ranges.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks sorted by Fecha, each page once.
+        """
+        end = date.fromisoformat(self._get_current_date()) + timedelta(days=1)
+        partitions = date_partitions(
+            "Fecha", end - timedelta(days=self.scan_days), end, self.scan_partitions
+        )
+        # Ranges follow the Fecha sort, so reading them in order keeps it
+        scan = PartitionedScan(self, partitions)
+        return scan.iter_tasks(self.pending_tasks_query())
+
+    def _scan_pending_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Reads pending tasks with a partitioned scan.
+
+        Returns:
+            List[Dict[str, Any]]: List of mapped tasks.
+
+        Raises:
+            NotionApiError: If an API request fails.
+            NotionDataNotFoundError: If no tasks are found.
+        """
+        tasks = list(self._iter_scan())
+        if not tasks:
+            raise NotionDataNotFoundError("No tasks found in Notion")
+        return tasks
+
+    def _query_tasks(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Queries the database and maps the results.
+
+        Args:
+            payload: The query body.
+
+        Returns:
+            List[Dict[str, Any]]: List of mapped tasks.
+
+        Raises:
+            NotionApiError: If the API request fails.
+            NotionDataNotFoundError: If no tasks are found.
+        """
+        tasks = list(self._iter_query(payload))
 
         # Check for empty results
-        if not response.get("results"):
+        if not tasks:
             raise NotionDataNotFoundError("No tasks found in Notion")
 
-        return self._map_response(response)
+        return tasks
+
+    def _iter_query(
+        self,
+        payload: Dict[str, Any],
+        properties: Optional[tuple] = None,
+        page_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        map_page: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Runs a database query, following pagination cursors.
 
-    def _get_request_filters(self) -> str:
+        Args:
+            payload: The query body. start_cursor is added for subsequent pages.
+            properties: Properties to return; the repository's filter_properties
+                when None, all of them when empty.
+            page_filter: Test applied to each page before mapping.
+            map_page: Maps each page object instead of map_task.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks in the order returned by Notion.
+        """
+        endpoint = f"databases/{self.database_id}/query"
+        filters = self._get_request_filters(properties)
+        if filters:
+            endpoint = f"{endpoint}?{filters}"
+        body = payload
+        if page_filter is not None or map_page is not None:
+            read_page = partial(
+                self._read_page, page_filter=page_filter, map_page=map_page
+            )
+        elif self.streaming:
+            read_page = self._stream_page
+        elif self.typed_decoder is not None:
+            read_page = self._decode_page
+        else:
+            read_page = self._read_page
+
+        while True:
+            # NotionClient raises NotionApiError on HTTP errors
+            response = yield from read_page(endpoint, body)
+
+            next_cursor = response.get("next_cursor")
+            if not response.get("has_more") or not next_cursor:
+                return
+            body = {**payload, "start_cursor": next_cursor}
+
+    def _read_page(
+        self,
+        endpoint: str,
+        body: Dict[str, Any],
+        page_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        map_page: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """
+        Reads one page of query results and maps it.
+
+        Args:
+            endpoint: The query endpoint.
+            body: The query body.
+            page_filter: Test applied to each page before mapping.
+            map_page: Maps each page object instead of map_task.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks.
+
+        Returns:
+            Dict[str, Any]: The decoded response.
+        """
+        response = self.notion_client.post(endpoint, body)
+        self.logger.debug(f"Response: {response}")
+        results = response.get("results", [])
+        if page_filter is not None:
+            results = [page for page in results if page_filter(page)]
+        map_page = map_page or self.map_task
+        for page in results:
+            yield map_page(page)
+        return response
+
+    def _decode_page(
+        self, endpoint: str, body: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """
+        Reads one page of query results, decoding the raw bytes into structs.
+
+        Args:
+            endpoint: The query endpoint.
+            body: The query body.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks.
+
+        Returns:
+            Dict[str, Any]: The pagination members (next_cursor, has_more).
+        """
+        try:
+            tasks, metadata = self.typed_decoder.decode(
+                self.notion_client.post_raw(endpoint, body)
+            )
+        except ValueError as e:
+            raise NotionApiError(f"Invalid JSON in Notion response: {str(e)}")
+        yield from tasks
+        return metadata
+
+    def _stream_page(
+        self, endpoint: str, body: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """
+        Streams one page of query results, mapping each task as it is decoded.
+
+        Only the page being mapped is held as a dict, so memory stays bounded by
+        the largest page rather than the whole response.
+
+        Args:
+            endpoint: The query endpoint.
+            body: The query body.
+
+        Yields:
+            Dict[str, Any]: Mapped tasks.
+
+        Returns:
+            Dict[str, Any]: The response members other than results (next_cursor, has_more).
+        """
+        stream = self.notion_client.post_stream(endpoint, body)
+        for task in stream:
+            yield self.map_task(task)
+        return stream.metadata
+
+    def bulk_update(
+        self,
+        updates: Mapping[str, Dict[str, Any]],
+        checkpoint: Optional[UpdateCheckpoint] = None,
+        max_workers: int = 3,
+    ) -> BulkUpdateResult:
+        """
+        Updates many task pages concurrently.
+
+        PATCH requests are pipelined through a bounded worker pool and throttled
+        by the NotionClient's rate limiter. Pages recorded in the checkpoint are
+        skipped, so a failed run can be resumed with the same checkpoint. Cached
+        query results are dropped once any page changed, so the next query does
+        not return the tasks as they were before the update.
+
+        Args:
+            updates: PATCH payload per page ID (see bulk_update.status_update).
+            checkpoint: Progress record used to resume after a partial failure.
+            max_workers: Maximum number of PATCH requests in flight.
+
+        Returns:
+            BulkUpdateResult: Successes and failures per page.
+        """
+        updater = BulkUpdater(self.notion_client, max_workers=max_workers)
+        result = updater.run(updates, checkpoint)
+        if result.succeeded and self.query_cache is not None:
+            self.query_cache.clear()
+        return result
+
+    def _get_request_filters(self, properties: Optional[tuple] = None) -> str:
         """
         Gets the request filters for the Notion API.
 
+        Args:
+            properties: Properties to return; the repository's filter_properties
+                when None, all of them when empty.
+
         Returns:
             str: The request filters for the Notion API.
         """
-        return "&".join(
-            [f"filter_properties={prop}" for prop in self.filter_properties.split(",")]
-        )
+        if properties is None:
+            properties = self.filter_properties.split(",")
+        return "&".join([f"filter_properties={prop}" for prop in properties])
 
     def _map_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -86,9 +425,9 @@ class TaskRepository:
             List[Dict[str, Any]]: List of mapped tasks with fecha, notas, and titulo.
         """
         results = response.get("results", [])
-        return [self._map_task(task) for task in results]
+        return [self.map_task(task) for task in results]
 
-    def _map_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+    def map_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Maps a single task from the Notion API response.
 
@@ -96,7 +435,8 @@ class TaskRepository:
             task: A single page/task object from Notion.
 
         Returns:
-            Dict[str, Any]: Mapped task with id, fecha, notas, and titulo.
+            Dict[str, Any]: Mapped task with id, fecha, notas, titulo, and editado
+                (the page's last_edited_time).
         """
         properties = task.get("properties", {})
 
@@ -105,6 +445,7 @@ class TaskRepository:
             "titulo": self._extract_title(properties),
             "fecha": self._extract_date(properties),
             "notas": self._extract_notes(properties),
+            "editado": task.get("last_edited_time"),
         }
 
     def _extract_title(self, properties: Dict[str, Any]) -> str:
@@ -162,24 +503,13 @@ class TaskRepository:
         Returns:
             Dict[str, Any]: The filter and sort configuration for the query.
         """
-        return {
-            "filter": {
-                "and": [
-                    {"property": "Status", "status": {"equals": "Not Started"}},
-                    {
-                        "property": "Fecha",
-                        "date": {"on_or_before": self._get_current_date()},
-                    },
-                ]
-            },
-            "sorts": [{"property": "Fecha", "direction": "ascending"}],
-        }
+        return self.pending_tasks_query().compile(self._get_current_date()).payload
 
     def _get_current_date(self) -> str:
         """
-        Gets the current date in ISO format.
+        Gets the current date in ISO format, in the configured TIMEZONE.
 
         Returns:
             str: Current date in YYYY-MM-DD format.
         """
-        return datetime.now().strftime("%Y-%m-%d")
+        return get_date_service().today_iso()
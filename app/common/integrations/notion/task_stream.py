@@ -0,0 +1,78 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def fecha_sort_key(task: Dict[str, Any]) -> Tuple[bool, str]:
+    """Orders tasks by Fecha ascending, with undated tasks last."""
+    fecha = task.get("fecha")
+    return fecha is None, fecha or ""
+
+
+class TaskStream:
+    """
+    Reads tasks in a background thread into a buffer.
+
+    Iterating the stream yields tasks in the order the source produced them and
+    re-raises any error from the producer thread.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Iterator[Dict[str, Any]]],
+        name: str,
+        max_buffered: int,
+        stop_event: threading.Event,
+    ):
+        """
+        Initialize the TaskStream.
+
+        Args:
+            source: Returns the task iterator, called in the producer thread.
+            name: Name of the producer thread.
+            max_buffered: Tasks read ahead before the producer waits; 0 for no limit.
+            stop_event: Set by the consumer to stop the producer early.
+        """
+        self.source = source
+        self.stop_event = stop_event
+        self.buffer: "queue.Queue[Any]" = queue.Queue(maxsize=max_buffered)
+        self.thread = threading.Thread(target=self._produce, name=name, daemon=True)
+
+    def start(self) -> "TaskStream":
+        self.thread.start()
+        return self
+
+    def _produce(self):
+        try:
+            for task in self.source():
+                if not self._put(task):
+                    return
+            self._put(_DONE)
+        except Exception as e:
+            self._put(_Failure(e))
+
+    def _put(self, item: Any) -> bool:
+        # Poll so a producer blocked on a full buffer notices when the consumer stops
+        while not self.stop_event.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            item = self.buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
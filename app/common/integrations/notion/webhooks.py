@@ -0,0 +1,285 @@
+import base64
+import hashlib
+import hmac
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from app.common.serialization.json_codec import get_json_codec
+
+# Webhook subscription events about pages; other events (comments, databases) are ignored
+PAGE_EVENT_TYPES = frozenset(
+    {
+        "page.created",
+        "page.properties_updated",
+        "page.content_updated",
+        "page.moved",
+        "page.undeleted",
+        "page.deleted",
+    }
+)
+SIGNATURE_HEADER = "x-notion-signature"
+# Custom header set on an automation's "Send webhook" action, which is not signed
+AUTOMATION_SECRET_HEADER = "x-webhook-secret"
+
+
+class WebhookError(ValueError):
+    """
+    Raised for a webhook delivery that is not authenticated or not JSON.
+
+    Attributes:
+        message: A description of the error.
+        status_code: The HTTP status code to answer the delivery with.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
+
+
+@dataclass(frozen=True)
+class PageEvent:
+    """
+    A change to one page, from a webhook subscription or an automation.
+
+    The page itself is always read from the API: event payloads only say which
+    page to read.
+
+    Attributes:
+        page_id: The changed page.
+        timestamp: When the change happened (ISO 8601), used to order events; empty
+            when the payload has none.
+        deleted: Whether the page was deleted.
+        database_id: The page's database, when the event names it.
+        automation: Whether the event came from an automation, whose timestamp is
+            the page's last_edited_time (minute precision).
+    """
+
+    page_id: str
+    timestamp: str
+    deleted: bool = False
+    database_id: Optional[str] = None
+    automation: bool = False
+
+    @property
+    def edited_minute(self) -> Optional[datetime]:
+        """The timestamp truncated to the minute (see edit_minute)."""
+        return edit_minute(self.timestamp)
+
+
+def edit_minute(timestamp: Optional[str]) -> Optional[datetime]:
+    """
+    Parses an event timestamp, truncated to the minute.
+
+    Subscription events are timestamped to the millisecond, automation events
+    with the page's last_edited_time, to the minute. Only minutes compare
+    correctly across both.
+
+    Args:
+        timestamp: An ISO 8601 timestamp.
+
+    Returns:
+        Optional[datetime]: The minute of the change, or None if the timestamp is
+        missing or malformed.
+    """
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return parsed.replace(second=0, microsecond=0)
+
+
+def normalize_id(notion_id: Optional[str]) -> Optional[str]:
+    """
+    Returns a Notion ID without dashes, so both spellings of an ID compare equal.
+
+    Args:
+        notion_id: An ID with or without dashes.
+
+    Returns:
+        Optional[str]: The lowercase ID without dashes, or None.
+    """
+    return notion_id.replace("-", "").lower() if notion_id else None
+
+
+def verify_signature(body: bytes, signature: Optional[str], token: str):
+    """
+    Checks the X-Notion-Signature of a webhook delivery.
+
+    Args:
+        body: The raw request body.
+        signature: The header value, "sha256=<hex digest>".
+        token: The subscription's verification token, the HMAC key.
+
+    Raises:
+        WebhookError: If the signature is missing or does not match.
+    """
+    digest = hmac.new(token.encode(), body, hashlib.sha256).hexdigest()
+    if not signature or not hmac.compare_digest(
+        f"sha256={digest}".encode(), signature.encode()
+    ):
+        raise WebhookError("Invalid webhook signature", status_code=401)
+
+
+def read_deliveries(
+    event: Mapping[str, Any],
+    verification_token: Optional[str] = None,
+    automation_secret: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Returns the webhook payloads carried by a Lambda event.
+
+    HTTP events (Function URL or API Gateway) carry one delivery. It must carry
+    either the automation secret in X-Webhook-Secret or a valid X-Notion-Signature
+    made with the verification token. Until a token is configured, only the
+    subscription's verification request is accepted. SQS events carry one
+    delivery per record; they are authenticated by whatever enqueued them, and the
+    queue's batching window coalesces bursts into one invocation.
+
+    Args:
+        event: The Lambda event.
+        verification_token: The subscription's verification token.
+        automation_secret: The secret sent by automation webhooks.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: The decoded payloads, or None when the
+            event is not a webhook delivery (e.g. the scheduled digest).
+
+    Raises:
+        WebhookError: If a delivery is not authenticated or not JSON.
+    """
+    records = event.get("Records")
+    if records is not None:
+        bodies = [r["body"] for r in records if r.get("eventSource") == "aws:sqs"]
+        return [_decode(body) for body in bodies] if bodies else None
+
+    if "body" not in event or "headers" not in event:
+        return None
+    body = event.get("body") or ""
+    body = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode()
+    headers = {name.lower(): value for name, value in event["headers"].items()}
+    if _authenticate(body, headers, verification_token, automation_secret):
+        return [_decode(body)]
+
+    payload = _decode(body)
+    if not isinstance(payload, dict) or set(payload) != {"verification_token"}:
+        raise WebhookError("Unauthenticated webhook delivery", status_code=401)
+    return [payload]
+
+
+def _authenticate(
+    body: bytes,
+    headers: Mapping[str, str],
+    verification_token: Optional[str],
+    automation_secret: Optional[str],
+) -> bool:
+    secret = headers.get(AUTOMATION_SECRET_HEADER)
+    if automation_secret and secret is not None:
+        if not hmac.compare_digest(secret.encode(), automation_secret.encode()):
+            raise WebhookError("Invalid webhook secret", status_code=401)
+        return True
+    if verification_token:
+        verify_signature(body, headers.get(SIGNATURE_HEADER), verification_token)
+        return True
+    return False
+
+
+def _decode(body):
+    try:
+        return get_json_codec().loads(body)
+    except ValueError:
+        raise WebhookError("Webhook body is not JSON")
+
+
+def parse_page_events(payload: Mapping[str, Any]) -> List[PageEvent]:
+    """
+    Extracts the page changes from a webhook payload.
+
+    Subscription events name the page (entity) and, for pages in a database, its
+    parent. Automation webhooks ("Send webhook" action) carry the page object in
+    data; only its id, parent and edit time are used.
+
+    Args:
+        payload: A decoded delivery.
+
+    Returns:
+        List[PageEvent]: The page changes; empty for other events.
+    """
+    if "entity" in payload:
+        entity = payload["entity"] or {}
+        if payload.get("type") not in PAGE_EVENT_TYPES or entity.get("type") != "page":
+            return []
+        parent = (payload.get("data") or {}).get("parent") or {}
+        return [
+            PageEvent(
+                page_id=entity["id"],
+                timestamp=payload.get("timestamp") or "",
+                deleted=payload["type"] == "page.deleted",
+                database_id=(
+                    parent.get("id") if parent.get("type") == "database" else None
+                ),
+            )
+        ]
+
+    page = payload.get("data")
+    if isinstance(page, dict) and page.get("object") == "page":
+        return [
+            PageEvent(
+                page_id=page["id"],
+                timestamp=page.get("last_edited_time") or "",
+                database_id=page_database_id(page),
+                automation=True,
+            )
+        ]
+    return []
+
+
+def page_database_id(page: Mapping[str, Any]) -> Optional[str]:
+    """
+    Returns the database a page belongs to.
+
+    Args:
+        page: A page object.
+
+    Returns:
+        Optional[str]: The parent database ID, or None for other parents.
+    """
+    parent = page.get("parent") or {}
+    return parent.get("database_id")
+
+
+def coalesce(events: Iterable[PageEvent]) -> List[PageEvent]:
+    """
+    Keeps the latest event of every page.
+
+    A burst of edits to one page then costs one read. Subscription events are
+    ordered by their timestamps; an automation event only by its minute, so
+    within that minute the event received last is kept. An event without a
+    timestamp is always kept, since it cannot be ordered.
+
+    Args:
+        events: Events in the order they were received.
+
+    Returns:
+        List[PageEvent]: One event per page, in the order pages first appeared.
+    """
+    latest: Dict[str, PageEvent] = {}
+    for event in events:
+        key = normalize_id(event.page_id)
+        current = latest.get(key)
+        if current is None or _supersedes(event, current):
+            latest[key] = event
+    return list(latest.values())
+
+
+def _supersedes(event: PageEvent, current: PageEvent) -> bool:
+    minute, current_minute = event.edited_minute, current.edited_minute
+    if current_minute is None:
+        return False
+    if minute is None or minute != current_minute:
+        return minute is None or minute > current_minute
+    if event.automation or current.automation:
+        return True
+    return datetime.fromisoformat(event.timestamp) >= datetime.fromisoformat(
+        current.timestamp
+    )
@@ -1,3 +1,3 @@
-from .ses_client import SesClient
+from .ses_client import SesClient, get_ses_client, reset_ses_client
 
-__all__ = ["SesClient"]
+__all__ = ["SesClient", "get_ses_client", "reset_ses_client"]
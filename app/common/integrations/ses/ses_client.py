@@ -1,12 +1,34 @@
 import boto3
 from app.common.environment.environment_handler import environment_handler
+from app.common.integrations.cassette.cassette import get_cassette
+
+# Text part sent when no plain-text alternative is provided
+DEFAULT_TEXT_BODY = "Your email client does not support HTML."
 
 
 class SesClient:
-    def __init__(self):
-        self.client = boto3.client("ses", region_name=environment_handler.region)
+    def __init__(self, client=None):
+        """
+        Initialize the SesClient.
+
+        Args:
+            client: The boto3 SES client. Created for the configured region when omitted.
+        """
+        self.client = client or boto3.client(
+            "ses", region_name=environment_handler.region
+        )
+
+    def send_email(self, sender, receiver, subject, body, text_body=None):
+        """
+        Sends an email with an HTML part and a plain-text alternative.
 
-    def send_email(self, sender, receiver, subject, body):
+        Args:
+            sender: The source address.
+            receiver: List of destination addresses.
+            subject: The subject line.
+            body: The HTML body.
+            text_body: The plain-text body. Defaults to DEFAULT_TEXT_BODY.
+        """
         self.client.send_email(
             Source=sender,
             Destination={"ToAddresses": receiver},
@@ -15,9 +37,41 @@ class SesClient:
                 "Body": {
                     "Html": {"Data": body, "Charset": "UTF-8"},
                     "Text": {
-                        "Data": "Your email client does not support HTML.",
+                        "Data": text_body or DEFAULT_TEXT_BODY,
                         "Charset": "UTF-8",
                     },
                 },
             },
         )
+
+
+# Lazy singleton - the boto3 client and its connection pool are reused by warm invocations
+_ses_client_instance = None
+
+
+def get_ses_client() -> SesClient:
+    """
+    Get the shared SesClient instance.
+
+    Returns:
+        SesClient: The client, created on first use.
+    """
+    global _ses_client_instance
+    if _ses_client_instance is None:
+        client = boto3.client("ses", region_name=environment_handler.region)
+        cassette = get_cassette()
+        _ses_client_instance = SesClient(
+            cassette.wrap_ses(client) if cassette else client
+        )
+    return _ses_client_instance
+
+
+def reset_ses_client():
+    """
+    Drops the shared SesClient so the next get_ses_client() builds a new one.
+
+    Used after a snapshot restore: pooled connections of the snapshotted client
+    cannot be shared by the restored copies.
+    """
+    global _ses_client_instance
+    _ses_client_instance = None
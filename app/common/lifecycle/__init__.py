@@ -0,0 +1,3 @@
+from .lifecycle import Lifecycle, lifecycle, runtime_hooks_available
+
+__all__ = ["Lifecycle", "lifecycle", "runtime_hooks_available"]
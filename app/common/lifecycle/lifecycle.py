@@ -0,0 +1,100 @@
+import time
+from typing import Callable, List
+from app.common.logger.logger import get_logger
+
+try:
+    import snapshot_restore_py
+except ImportError:  # pragma: no cover - provided by Lambda runtimes with SnapStart
+    snapshot_restore_py = None
+
+logger = get_logger(__name__)
+
+Hook = Callable[[], None]
+
+
+def runtime_hooks_available() -> bool:
+    """Returns True if the Lambda runtime provides snapshot_restore_py (SnapStart)."""
+    return snapshot_restore_py is not None
+
+
+class Lifecycle:
+    """
+    Ordered before-snapshot and after-restore hooks, in the style of SnapStart runtime hooks.
+
+    Before-snapshot hooks run once during initialization and build what is worth
+    keeping in the snapshot (clients, templates, configuration). After-restore hooks
+    run in every restored environment and rebuild what cannot be shared between
+    copies of a snapshot: connection pools, random state and expiring credentials.
+    Without SnapStart, run_before_snapshot() still warms the container during init.
+    A failing hook raises, which fails the snapshot or the restore so Lambda
+    retries it with a fresh environment.
+    """
+
+    def __init__(self):
+        """Initialize the Lifecycle without hooks."""
+        self.before_snapshot_hooks: List[Hook] = []
+        self.after_restore_hooks: List[Hook] = []
+
+    def before_snapshot(self, hook: Hook) -> Hook:
+        """
+        Registers a hook run before the snapshot is taken. Usable as a decorator.
+
+        Args:
+            hook: Callable without arguments.
+
+        Returns:
+            Hook: The hook, unchanged.
+        """
+        self.before_snapshot_hooks.append(hook)
+        return hook
+
+    def after_restore(self, hook: Hook) -> Hook:
+        """
+        Registers a hook run after the environment is restored. Usable as a decorator.
+
+        Args:
+            hook: Callable without arguments.
+
+        Returns:
+            Hook: The hook, unchanged.
+        """
+        self.after_restore_hooks.append(hook)
+        return hook
+
+    def run_before_snapshot(self):
+        """Runs the before-snapshot hooks in registration order."""
+        self._run("before-snapshot", self.before_snapshot_hooks)
+
+    def run_after_restore(self):
+        """Runs the after-restore hooks in registration order."""
+        self._run("after-restore", self.after_restore_hooks)
+
+    def install(self) -> bool:
+        """
+        Registers run_before_snapshot and run_after_restore with the Lambda runtime.
+
+        Returns:
+            bool: True if the runtime supports SnapStart hooks.
+        """
+        if snapshot_restore_py is None:
+            return False
+        snapshot_restore_py.register_before_snapshot(self.run_before_snapshot)
+        snapshot_restore_py.register_after_restore(self.run_after_restore)
+        return True
+
+    @staticmethod
+    def _run(phase: str, hooks: List[Hook]):
+        for hook in hooks:
+            name = getattr(hook, "__qualname__", repr(hook))
+            start = time.perf_counter()
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"{phase} hook {name} failed: {str(e)}")
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"{phase} hook {name} took {elapsed_ms:.1f} ms")
+
+
+# Shared by the service; hooks are registered by app.logic.function.lifecycle_hooks
+lifecycle = Lifecycle()
@@ -0,0 +1,23 @@
+from .exceptions import SecretNotFoundError
+from .secrets_provider import (
+    CachedSecretsProvider,
+    EnvSecretBackend,
+    FileSecretBackend,
+    SecretBackend,
+    SecretsManagerBackend,
+    SsmParameterBackend,
+    create_secrets_provider,
+    parse_secret_source,
+)
+
+__all__ = [
+    "CachedSecretsProvider",
+    "EnvSecretBackend",
+    "FileSecretBackend",
+    "SecretBackend",
+    "SecretNotFoundError",
+    "SecretsManagerBackend",
+    "SsmParameterBackend",
+    "create_secrets_provider",
+    "parse_secret_source",
+]
@@ -0,0 +1,21 @@
+"""
+Custom exceptions for secret resolution.
+
+This module defines the exception raised when a secret cannot be
+retrieved from its configured backend.
+"""
+
+
+class SecretNotFoundError(Exception):
+    """
+    Exception raised when a secret cannot be resolved.
+
+    Attributes:
+        message: A description of the error.
+        name: The name or identifier of the secret that was requested.
+    """
+
+    def __init__(self, message: str, name: str = None):
+        self.message = message
+        self.name = name
+        super().__init__(self.message)
@@ -0,0 +1,261 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from app.common.logger.logger import get_logger
+from app.common.secrets.exceptions import SecretNotFoundError
+
+logger = get_logger(__name__)
+
+
+class SecretBackend(ABC):
+    """
+    Base class for secret backends.
+
+    A backend knows how to fetch the current value of a secret by name.
+    Caching is handled by CachedSecretsProvider, so backends always hit the source.
+    """
+
+    @abstractmethod
+    def fetch(self, name: str) -> str:
+        """
+        Fetches the current value of a secret.
+
+        Args:
+            name: The backend-specific secret identifier.
+
+        Returns:
+            str: The secret value.
+
+        Raises:
+            SecretNotFoundError: If the secret does not exist or is empty.
+        """
+
+
+class EnvSecretBackend(SecretBackend):
+    """Reads secrets from environment variables."""
+
+    def fetch(self, name: str) -> str:
+        value = os.getenv(name)
+        if not value:
+            raise SecretNotFoundError(f"Environment variable {name} is not set", name)
+        return value
+
+
+class FileSecretBackend(SecretBackend):
+    """Reads secrets from files, e.g. mounted from EFS or written by an extension."""
+
+    def fetch(self, name: str) -> str:
+        path = Path(name)
+        if not path.is_file():
+            raise SecretNotFoundError(f"Secret file {name} not found", name)
+        value = path.read_text(encoding="utf-8").strip()
+        if not value:
+            raise SecretNotFoundError(f"Secret file {name} is empty", name)
+        return value
+
+
+class SecretsManagerBackend(SecretBackend):
+    """Reads secrets from AWS Secrets Manager."""
+
+    def __init__(self, region: str, client=None):
+        if client is None:
+            import boto3
+
+            client = boto3.client("secretsmanager", region_name=region)
+        self.client = client
+
+    def fetch(self, name: str) -> str:
+        try:
+            response = self.client.get_secret_value(SecretId=name)
+        except self.client.exceptions.ResourceNotFoundException:
+            raise SecretNotFoundError(f"Secret {name} not found", name)
+        value = response.get("SecretString")
+        if not value:
+            raise SecretNotFoundError(f"Secret {name} has no string value", name)
+        return value
+
+
+class SsmParameterBackend(SecretBackend):
+    """Reads secrets from SSM Parameter Store (SecureString parameters are decrypted)."""
+
+    def __init__(self, region: str, client=None):
+        if client is None:
+            import boto3
+
+            client = boto3.client("ssm", region_name=region)
+        self.client = client
+
+    def fetch(self, name: str) -> str:
+        try:
+            response = self.client.get_parameter(Name=name, WithDecryption=True)
+        except self.client.exceptions.ParameterNotFound:
+            raise SecretNotFoundError(f"Parameter {name} not found", name)
+        return response["Parameter"]["Value"]
+
+
+BACKENDS = {
+    "env": lambda region: EnvSecretBackend(),
+    "file": lambda region: FileSecretBackend(),
+    "secretsmanager": lambda region: SecretsManagerBackend(region),
+    "ssm": lambda region: SsmParameterBackend(region),
+}
+
+
+def parse_secret_source(source: str, default_name: str) -> Tuple[str, str]:
+    """
+    Parses a secret source reference of the form "<backend>:<name>".
+
+    A bare backend name (e.g. "env") uses default_name as the secret name.
+
+    Args:
+        source: The source reference, e.g. "ssm:/notion/api-key".
+        default_name: The name to use when the reference has none.
+
+    Returns:
+        Tuple[str, str]: The backend kind and the secret name.
+
+    Raises:
+        ValueError: If the backend kind is unknown.
+    """
+    kind, _, name = source.partition(":")
+    kind = kind.strip().lower()
+    if kind not in BACKENDS:
+        raise ValueError(
+            f"Unknown secret backend '{kind}'. Expected one of: {', '.join(BACKENDS)}"
+        )
+    return kind, (name.strip() or default_name)
+
+
+@dataclass
+class _CacheEntry:
+    value: str
+    expires_at: float
+
+
+class CachedSecretsProvider:
+    """
+    In-memory TTL cache in front of a SecretBackend.
+
+    Values are fetched synchronously only on first use or after they have expired.
+    Once a value enters its refresh window (the last refresh_ahead seconds of its TTL),
+    the next read returns the cached value immediately and refreshes it in a
+    background thread, so rotation does not add a fetch to the request path.
+    """
+
+    def __init__(
+        self,
+        backend: SecretBackend,
+        ttl_seconds: float = 300,
+        refresh_ahead_seconds: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the CachedSecretsProvider.
+
+        Args:
+            backend: The backend secrets are fetched from.
+            ttl_seconds: How long a fetched value is considered valid.
+            refresh_ahead_seconds: How long before expiry a background refresh starts.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = min(refresh_ahead_seconds, ttl_seconds)
+        self.clock = clock
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> str:
+        """
+        Returns the value of a secret, using the cache when possible.
+
+        Args:
+            name: The backend-specific secret identifier.
+
+        Returns:
+            str: The secret value.
+
+        Raises:
+            SecretNotFoundError: If the secret must be fetched and cannot be resolved.
+        """
+        entry = self._entries.get(name)
+        now = self.clock()
+
+        if entry is None or now >= entry.expires_at:
+            return self.refresh(name)
+
+        if now >= entry.expires_at - self.refresh_ahead_seconds:
+            self._schedule_refresh(name)
+
+        return entry.value
+
+    def refresh(self, name: str) -> str:
+        """
+        Fetches a secret from the backend and stores it in the cache.
+
+        Args:
+            name: The backend-specific secret identifier.
+
+        Returns:
+            str: The fresh secret value.
+        """
+        value = self.backend.fetch(name)
+        self._entries[name] = _CacheEntry(value, self.clock() + self.ttl_seconds)
+        return value
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Drops one cached secret, or all of them when no name is given.
+
+        Args:
+            name: The secret to drop, or None to clear the cache.
+        """
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def _schedule_refresh(self, name: str):
+        with self._lock:
+            running = self._refreshing.get(name)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._background_refresh, args=(name,), daemon=True
+            )
+            self._refreshing[name] = thread
+            thread.start()
+
+    def _background_refresh(self, name: str):
+        try:
+            self.refresh(name)
+            logger.debug(f"Refreshed secret {name} in the background")
+        except Exception as e:
+            # Keep serving the cached value; the next read after expiry retries synchronously
+            logger.warning(f"Background refresh of secret {name} failed: {str(e)}")
+
+
+def create_secrets_provider(
+    kind: str, region: str, ttl_seconds: float = 300
+) -> CachedSecretsProvider:
+    """
+    Creates a CachedSecretsProvider for the given backend kind.
+
+    Args:
+        kind: One of "env", "file", "secretsmanager" or "ssm".
+        region: The AWS region for AWS-backed secrets.
+        ttl_seconds: How long fetched values are cached.
+
+    Returns:
+        CachedSecretsProvider: The provider.
+    """
+    return CachedSecretsProvider(
+        BACKENDS[kind](region),
+        ttl_seconds=ttl_seconds,
+        refresh_ahead_seconds=ttl_seconds / 5,
+    )
@@ -0,0 +1,4 @@
+from .json_codec import JsonCodec, create_json_codec, get_json_codec
+from .json_stream import JsonArrayStream
+
+__all__ = ["JsonArrayStream", "JsonCodec", "create_json_codec", "get_json_codec"]
@@ -0,0 +1,167 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+from app.common.environment.environment_handler import environment_handler
+
+
+class JsonCodec(ABC):
+    """
+    Encodes and decodes JSON documents.
+
+    Implementations wrap one JSON library. Encoding always produces UTF-8 bytes so
+    request bodies can be sent as-is, and decoding accepts bytes or str so
+    response bodies are never decoded to text first.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes obj as compact UTF-8 JSON.
+
+        Args:
+            obj: The value to encode.
+
+        Returns:
+            bytes: The encoded document.
+        """
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes a JSON document.
+
+        Args:
+            data: The encoded document.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: If data is not valid JSON.
+        """
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """
+        Encodes obj as indented JSON text for logs, keeping non-ASCII characters.
+
+        Args:
+            obj: The value to encode.
+
+        Returns:
+            str: The indented document.
+        """
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+class StdlibJsonCodec(JsonCodec):
+    """Codec using the standard library json module. Always available."""
+
+    name = "stdlib"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec using orjson, which encodes straight to bytes."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2).decode("utf-8")
+
+
+class MsgspecJsonCodec(JsonCodec):
+    """Codec using msgspec.json with reusable encoder and decoder instances."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._format = msgspec.json.format
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._format(self._encoder.encode(obj), indent=2).decode("utf-8")
+
+
+# Preferred order when JSON_CODEC is "auto"
+CODECS: Dict[str, type] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecJsonCodec,
+    "stdlib": StdlibJsonCodec,
+}
+
+
+def create_json_codec(name: str = "auto") -> JsonCodec:
+    """
+    Creates the codec with the given name.
+
+    Args:
+        name: "orjson", "msgspec", "stdlib", or "auto" for the fastest installed one.
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If name is unknown.
+        ImportError: If the requested library is not installed.
+    """
+    name = (name or "auto").strip().lower()
+    if name == "auto":
+        for codec_class in CODECS.values():
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown JSON codec '{name}'. Expected auto or one of: {', '.join(CODECS)}"
+        )
+    return CODECS[name]()
+
+
+# Lazy singleton - the library is chosen once per container
+_json_codec_instance: Optional[JsonCodec] = None
+
+
+def get_json_codec() -> JsonCodec:
+    """
+    Get the shared JsonCodec selected by JSON_CODEC.
+
+    Returns:
+        JsonCodec: The codec.
+    """
+    global _json_codec_instance
+    if _json_codec_instance is None:
+        _json_codec_instance = create_json_codec(
+            environment_handler.settings.json_codec
+        )
+    return _json_codec_instance
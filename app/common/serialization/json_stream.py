@@ -0,0 +1,139 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStream:
+    """
+    Incrementally decodes one array member of a top-level JSON object.
+
+    Iterating the stream yields the elements of the array under array_key one at
+    a time, decoding them from the chunks as they arrive, so only the element
+    being decoded is held in memory rather than the whole document. The other
+    top-level members (e.g. next_cursor and has_more of a Notion query response)
+    are collected in metadata, which is complete once iteration has finished.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        array_key: str = "results",
+        encoding: str = "utf-8",
+    ):
+        """
+        Initialize the JsonArrayStream.
+
+        Args:
+            chunks: The raw document, e.g. requests' Response.iter_content().
+            array_key: The top-level member whose array is streamed.
+            encoding: Character encoding of the chunks.
+        """
+        self.array_key = array_key
+        self.metadata: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._consumed:
+            raise RuntimeError("JsonArrayStream can only be iterated once")
+        self._consumed = True
+        return self._parse()
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if key == self.array_key and self._peek() == "[":
+                yield from self._parse_array()
+            else:
+                self.metadata[key] = self._decode_value()
+
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                self._fail("Expecting ',' delimiter")
+
+    def _parse_array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                self._fail("Expecting ',' delimiter")
+
+    def _decode_value(self) -> Any:
+        """Decodes the next complete value, reading more chunks until it is."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._grow()
+                continue
+            # A number or literal ending exactly at the buffer end may continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                self._grow()
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self) -> Optional[str]:
+        """Skips whitespace and returns the next character, or None at the end."""
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return None
+            self._grow()
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            self._fail(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _grow(self):
+        """
+        Drops the consumed prefix and reads chunks until the unread part doubles.
+
+        Doubling keeps retries of a partial value amortized linear in its size.
+        """
+        consumed, self._pos = self._pos, 0
+        self._buffer = self._buffer[consumed:]
+        target = max(2 * len(self._buffer), 1)
+        while len(self._buffer) < target and not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._buffer += self._decoder.decode(b"", final=True)
+                self._eof = True
+            else:
+                self._buffer += self._decoder.decode(chunk)
+
+    def _fail(self, message: str):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
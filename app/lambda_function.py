@@ -1,10 +1,22 @@
 from .logic.function import NotionLambda
 from .common.integrations.notion.notion_client import get_notion_client
+from .common.integrations.notion.webhooks import WebhookError, read_deliveries
 from .common.logger.logger import get_logger
 from .common.environment.environment_handler import environment_handler
+from .common.lifecycle.lifecycle import lifecycle
+from .logic.function import lifecycle_hooks  # noqa: F401 - registers the hooks
 
 logger = get_logger(__name__)
 
+# With SnapStart the warm-up runs before the snapshot and the restore hooks in every
+# restored environment; otherwise it runs now, in the init phase. There it is best
+# effort: whatever failed is built on first use, and the handler reports the error.
+if not lifecycle.install():
+    try:
+        lifecycle.run_before_snapshot()
+    except Exception as e:
+        logger.warning(f"Warm-up failed, continuing without it: {str(e)}")
+
 
 def lambda_handler(event, context):
     """
@@ -21,8 +33,24 @@ def lambda_handler(event, context):
         logger.error(f"Environment validation failed: {str(e)}")
         raise e
 
+    # Webhook deliveries (Function URL or SQS) update single tasks; other events
+    # (the schedule) build the digest
+    settings = environment_handler.settings
+    try:
+        deliveries = read_deliveries(
+            event,
+            settings.notion_webhook_verification_token,
+            settings.notion_webhook_automation_secret,
+        )
+    except WebhookError as e:
+        logger.warning(f"Rejected webhook delivery: {e}")
+        return {"statusCode": e.status_code, "body": {"message": str(e)}}
+
     try:
-        return NotionLambda(get_notion_client()).notion_lambda_function()
+        notion_lambda = NotionLambda(get_notion_client())
+        if deliveries is not None:
+            return notion_lambda.notion_lambda_webhook(deliveries)
+        return notion_lambda.notion_lambda_function()
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
         raise e
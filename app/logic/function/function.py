@@ -1,10 +1,29 @@
-import json
+from app.common.adapter.digest_diff import DigestSnapshot, DigestState
 from app.common.adapter.email_adapter import EmailAdapter
-from app.common.integrations.ses.ses_client import SesClient
+from app.common.adapter.row_cache import get_row_cache
+from app.common.integrations.ses.ses_client import get_ses_client
 from app.common.environment.environment_handler import environment_handler
+from app.common.integrations.notion.bulk_update import UpdateCheckpoint, status_update
+from app.common.integrations.notion.multi_database_repository import (
+    MultiDatabaseTaskRepository,
+)
+from app.common.integrations.notion.page_content import (
+    PageContentFetcher,
+    get_page_content_cache,
+)
+from app.common.integrations.notion.query_cache import get_query_cache
+from app.common.integrations.notion.task_index import (
+    IndexedTaskRepository,
+    get_task_index,
+)
 from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.integrations.notion.webhooks import parse_page_events
 from app.common.logger.logger import get_logger
-
+from app.logic.function.page_events import (
+    PageEventProcessor,
+    get_urgent_notifications,
+)
+from app.common.serialization.json_codec import get_json_codec
 
 logger = get_logger(__name__)
 
@@ -17,13 +36,61 @@ class NotionLambda:
     def __init__(self, notion_client):
         self.notion_client = notion_client
         self.env_handler = environment_handler
-        self.task_repository = TaskRepository(
-            notion_client,
+        self.task_index = get_task_index()
+        self.task_repository = self._create_task_repository()
+        self.email_adapter = EmailAdapter(row_cache=get_row_cache())
+        self.ses_client = get_ses_client()
+
+    def _create_task_repository(self):
+        """
+        Creates the repository for the configured databases.
+
+        A single database uses TaskRepository; several databases listed in
+        NOTION_DATABASE_IDS are queried concurrently and merged into one digest.
+        With TASK_INDEX_PATH set, the databases are synced into a local index and
+        the digest is read from it.
+        """
+        repository = self._create_notion_repository()
+        if self.task_index is None:
+            return repository
+        return IndexedTaskRepository(self._repositories(repository), self.task_index)
+
+    @staticmethod
+    def _repositories(repository):
+        """Returns the TaskRepository of every configured database."""
+        return getattr(repository, "repositories", [repository])
+
+    def _create_notion_repository(self):
+        """Creates the repository that queries the configured databases."""
+        database_ids = self.env_handler.settings.notion_database_ids
+        filter_properties = self.env_handler.notion_database_filter_properties
+        streaming = self.env_handler.settings.notion_streaming_parse
+        typed_decoding = self.env_handler.settings.notion_typed_decoding
+        scan = {
+            "scan_partitions": self.env_handler.settings.notion_scan_partitions,
+            "scan_days": self.env_handler.settings.notion_scan_days,
+        }
+
+        if len(database_ids) > 1:
+            return MultiDatabaseTaskRepository(
+                self.notion_client,
+                database_ids,
+                filter_properties,
+                query_cache=get_query_cache(),
+                streaming=streaming,
+                typed_decoding=typed_decoding,
+                **scan,
+            )
+
+        return TaskRepository(
+            self.notion_client,
             self.env_handler.notion_database_id,
-            self.env_handler.notion_database_filter_properties,
+            filter_properties,
+            query_cache=get_query_cache(),
+            streaming=streaming,
+            typed_decoding=typed_decoding,
+            **scan,
         )
-        self.email_adapter = EmailAdapter()
-        self.ses_client = SesClient()
 
     def notion_lambda_function(self):
         """
@@ -35,27 +102,167 @@ class NotionLambda:
 
         # Getting tasks from Notion API
         tasks = self.task_repository.get_pending_tasks()
-
         logger.debug(f"Retrieved {len(tasks)} pending tasks")
-        logger.info(f"Tasks:\n{json.dumps(tasks, indent=2, ensure_ascii=False)}")
 
-        # Convert tasks to email format
-        subject, email_content = self.email_adapter.convert_to_email_format(tasks)
+        response = {
+            "statusCode": 200,
+            "headers": {"Content-Type": "application/json"},
+            "body": {
+                "message": "Process executed successfully from NotionLambda"
+                + f" in {self.env_handler.environment} environment."
+            },
+        }
+
+        settings = self.env_handler.settings
+        state = previous = snapshot = None
+        if settings.digest_diff_mode != "off":
+            state = DigestState(settings.digest_state_path)
+            previous = state.load()
+            snapshot = DigestSnapshot.from_tasks(tasks)
+            if previous is not None and previous.fingerprint == snapshot.fingerprint:
+                logger.info("Pending tasks unchanged since the last digest; not sent")
+                response["body"]["digest"] = "unchanged"
+                return response
+
+        if previous is None or settings.digest_diff_mode == "skip":
+            kind, sent_tasks = "full", tasks
+            self._add_page_content(tasks)
+            logger.info(f"Tasks:\n{get_json_codec().dumps_pretty(tasks)}")
+            email = self.email_adapter.render_digest(tasks)
+        else:
+            diff = previous.diff(tasks)
+            kind, sent_tasks = "changes", diff.changed_tasks
+            logger.info(
+                f"Pending tasks changed since the last digest: {diff.summary()}"
+            )
+            self._add_page_content(sent_tasks)
+            email = self.email_adapter.render_changes(diff, len(tasks))
+
         sender, receiver = self.env_handler.ses_sender_and_receiver
         self.ses_client.send_email(
             sender=sender,
             receiver=[receiver],
-            subject=subject,
-            body=email_content,
+            subject=email.subject,
+            body=email.html_body,
+            text_body=email.text_body,
         )
+        update_result = self._mark_tasks_notified(sent_tasks)
+        if update_result is not None:
+            response["body"]["updates"] = update_result.summary()
+            if snapshot is not None:
+                # Tasks moved out of the pending status are not "removed" next time
+                snapshot = snapshot.without(
+                    update_result.succeeded + update_result.skipped
+                )
+        if state is not None:
+            state.save(snapshot)
+            response["body"]["digest"] = kind
+        logger.info("Request processed successfully")
+        return response
 
-        response = {
+    def notion_lambda_webhook(self, deliveries):
+        """
+        Handler for Notion webhook deliveries (page created, updated or deleted).
+
+        Only the pages named by the events are read and applied to the task index
+        (see PageEventProcessor), instead of querying the whole database. Tasks
+        that become urgent (NOTION_URGENT_DAYS) are emailed right away.
+
+        Args:
+            deliveries: Decoded webhook payloads (see webhooks.read_deliveries).
+        """
+        settings = self.env_handler.settings
+        events = []
+        for payload in deliveries:
+            if "verification_token" in payload:
+                # Sent once when the subscription is created, to be confirmed in Notion
+                logger.warning(
+                    "Webhook verification token received; confirm the subscription "
+                    "and set NOTION_WEBHOOK_VERIFICATION_TOKEN to "
+                    f"{payload['verification_token']}"
+                )
+                continue
+            events.extend(parse_page_events(payload))
+
+        processor = PageEventProcessor(
+            self.notion_client,
+            self._repositories(self.task_repository),
+            index=self.task_index,
+            query_cache=get_query_cache(),
+            urgent_days=settings.notion_urgent_days,
+            notified=get_urgent_notifications(settings.notion_urgent_debounce_seconds),
+        )
+        result = processor.process(events)
+        if result.urgent:
+            self._send_urgent_tasks(result.urgent)
+
+        return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json"},
             "body": {
-                "message": "Process executed successfully from NotionLambda"
-                + f" in {self.env_handler.environment} environment."
+                "message": "Webhook processed successfully from NotionLambda"
+                + f" in {self.env_handler.environment} environment.",
+                "events": result.summary(),
             },
         }
-        logger.info("Request processed successfully")
-        return response
+
+    def _send_urgent_tasks(self, tasks):
+        """Emails tasks that just became urgent, without waiting for the digest."""
+        logger.info(f"Sending {len(tasks)} urgent tasks")
+        self._add_page_content(tasks)
+        email = self.email_adapter.render_digest(tasks)
+        sender, receiver = self.env_handler.ses_sender_and_receiver
+        self.ses_client.send_email(
+            sender=sender,
+            receiver=[receiver],
+            subject=f"Urgent: {email.subject}",
+            body=email.html_body,
+            text_body=email.text_body,
+        )
+        self._mark_tasks_notified(tasks)
+
+    def _add_page_content(self, tasks):
+        """
+        Adds each task's page body summary when NOTION_PAGE_CONTENT_ENABLED is set.
+
+        Pages are read concurrently through the shared NotionClient, so the
+        rate limiter still applies.
+        """
+        settings = self.env_handler.settings
+        if not settings.notion_page_content_enabled:
+            return
+
+        PageContentFetcher(
+            self.notion_client,
+            max_depth=settings.notion_page_content_max_depth,
+            max_chars=settings.notion_page_content_max_chars,
+            max_workers=settings.notion_max_workers,
+            cache=get_page_content_cache(),
+        ).enrich(tasks)
+
+    def _mark_tasks_notified(self, tasks):
+        """
+        Sets the NOTION_NOTIFIED_STATUS status on every task in the digest.
+
+        Failures are logged and reported rather than raised: the email was
+        already sent, and failing the invocation would make Lambda retry it.
+        Re-running with the same NOTION_UPDATE_CHECKPOINT only patches the
+        pages that were not updated yet.
+
+        Returns:
+            Optional[BulkUpdateResult]: The outcome per page, or None when the
+            feature is disabled.
+        """
+        settings = self.env_handler.settings
+        if not settings.notion_notified_status:
+            return None
+
+        update = status_update(settings.notion_notified_status)
+        result = self.task_repository.bulk_update(
+            {task["id"]: update for task in tasks},
+            checkpoint=UpdateCheckpoint(settings.notion_update_checkpoint),
+            max_workers=settings.notion_max_workers,
+        )
+        for page_id, error in result.failed.items():
+            logger.error(f"Could not update task {page_id}: {error}")
+        return result
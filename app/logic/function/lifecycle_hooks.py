@@ -0,0 +1,54 @@
+import random
+from app.common.adapter.email_adapter import EmailAdapter
+from app.common.adapter.row_cache import get_row_cache
+from app.common.environment.environment_handler import environment_handler
+from app.common.integrations.notion.notion_client import (
+    get_notion_client,
+    reset_notion_client,
+)
+from app.common.integrations.ses.ses_client import get_ses_client, reset_ses_client
+from app.common.lifecycle.lifecycle import lifecycle
+from app.common.logger.logger import get_logger
+from app.common.serialization.json_codec import get_json_codec
+
+logger = get_logger(__name__)
+
+
+@lifecycle.before_snapshot
+def warm_up():
+    """
+    Builds the shared clients, the configuration snapshot and the email template.
+
+    Skipped when required variables are missing; the handler reports them on the
+    first invocation.
+    """
+    settings = environment_handler.settings
+    if settings.missing_vars:
+        logger.warning(
+            f"Skipping warm-up, missing variables: {', '.join(settings.missing_vars)}"
+        )
+        return
+
+    get_json_codec()
+    get_notion_client()
+    get_ses_client()
+    # Reads the compiled template and primes the date service
+    EmailAdapter(row_cache=get_row_cache()).render_digest([])
+
+
+@lifecycle.after_restore
+def restore():
+    """
+    Rebuilds the state a restored environment must not share with other copies.
+
+    Random state is reseeded from the OS, the SES client (and its connection pool)
+    and the Notion client (rate limiter and cache clocks) are rebuilt, and cached
+    secrets are fetched again on first use.
+    """
+    random.seed()
+    environment_handler.reset_secrets_providers()
+    reset_ses_client()
+    reset_notion_client()
+    if not environment_handler.settings.missing_vars:
+        get_notion_client()
+        get_ses_client()
@@ -0,0 +1,235 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from app.common.cache.lru_cache import LRUCache
+from app.common.dates.date_service import get_date_service
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.task_index import TASK_FIELDS, task_row
+from app.common.integrations.notion.task_repository import PENDING_STATUS
+from app.common.integrations.notion.webhooks import (
+    PageEvent,
+    coalesce,
+    edit_minute,
+    normalize_id,
+    page_database_id,
+)
+from app.common.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PageEventResult:
+    """
+    Outcome of processing a batch of page events.
+
+    Attributes:
+        applied: Pages read and stored.
+        deleted: Pages removed.
+        skipped: Events for other databases, or already processed.
+        urgent: Tasks that just became urgent, to notify now.
+    """
+
+    applied: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    urgent: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the counts per outcome."""
+        return {
+            "applied": self.applied,
+            "deleted": self.deleted,
+            "skipped": self.skipped,
+            "urgent": len(self.urgent),
+        }
+
+
+class PageEventProcessor:
+    """
+    Applies page change events to the local task state.
+
+    Events are coalesced to the latest one per page, so a burst of edits costs
+    one page read. With a TaskIndex the changed row is upserted (or deleted) in
+    place; without one the query cache is cleared so the next digest queries
+    Notion again. A task that becomes pending within urgent_days of today is
+    reported for an immediate notification, at most once per page within the
+    debounce window of the notified cache.
+    """
+
+    def __init__(
+        self,
+        notion_client,
+        repositories: Sequence,
+        index=None,
+        query_cache=None,
+        urgent_days: Optional[int] = None,
+        processed: Optional[LRUCache] = None,
+        notified: Optional[LRUCache] = None,
+    ):
+        """
+        Initialize the PageEventProcessor.
+
+        Args:
+            notion_client: The NotionClient pages are read with.
+            repositories: The TaskRepository of each configured database; events
+                for pages of other databases are skipped.
+            index: The TaskIndex to update, if configured.
+            query_cache: The QueryResultCache cleared when there is no index.
+            urgent_days: Days ahead of today a pending task counts as urgent; None
+                disables urgent notifications.
+            processed: Latest event timestamp handled per page, shared between
+                warm invocations to drop redelivered and out-of-order events.
+            notified: Pages notified recently; entries expire after the debounce
+                window.
+        """
+        self.notion_client = notion_client
+        self.repositories = {
+            normalize_id(repository.database_id): repository
+            for repository in repositories
+        }
+        self.index = index
+        self.query_cache = query_cache
+        self.urgent_days = urgent_days
+        self.processed = processed if processed is not None else get_processed_events()
+        self.notified = notified if notified is not None else LRUCache()
+        self.logger = logger
+
+    def process(self, events: Iterable[PageEvent]) -> PageEventResult:
+        """
+        Applies a batch of events.
+
+        Args:
+            events: Events in the order they were received.
+
+        Returns:
+            PageEventResult: Counts per outcome and the newly urgent tasks.
+
+        Raises:
+            NotionApiError: If a page cannot be read.
+        """
+        result = PageEventResult()
+        for event in coalesce(events):
+            key = normalize_id(event.page_id)
+            if self._already_processed(key, event):
+                result.skipped += 1
+                continue
+            self._apply(event, result)
+            if event.timestamp:
+                self.processed.set(key, event.timestamp)
+
+        changed = result.applied or result.deleted
+        if changed and self.index is None and self.query_cache is not None:
+            self.query_cache.clear()
+        self.logger.info(f"Processed page events: {result.summary()}")
+        return result
+
+    def _already_processed(self, key: str, event: PageEvent) -> bool:
+        last = self.processed.get(key, record=False)
+        minute, last_minute = event.edited_minute, edit_minute(last)
+        if minute is None or last_minute is None:
+            return False
+        if minute != last_minute:
+            return minute < last_minute
+        # Automation events only carry the minute of the edit, so within a minute
+        # only a redelivered subscription event is known to be old
+        return not event.automation and event.timestamp == last
+
+    def _apply(self, event: PageEvent, result: PageEventResult):
+        if event.database_id and self._repository(event.database_id) is None:
+            result.skipped += 1
+            return
+        page = None if event.deleted else self._read_page(event.page_id)
+        if page is None or page.get("in_trash") or page.get("archived"):
+            self._delete(event.page_id)
+            result.deleted += 1
+            return
+
+        repository = self._repository(page_database_id(page))
+        if repository is None:
+            result.skipped += 1
+            return
+        row = task_row(repository, page)
+        previous = None
+        if self.index is not None:
+            previous = self.index.get(row["id"])
+            self.index.upsert(repository.database_id, [row])
+        result.applied += 1
+
+        today = get_date_service().today()
+        if self._newly_urgent(row, previous, today):
+            result.urgent.append({name: row[name] for name in TASK_FIELDS})
+
+    def _repository(self, database_id: Optional[str]):
+        return self.repositories.get(normalize_id(database_id))
+
+    def _read_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        endpoint = f"pages/{page_id}"
+        # The event means any cached copy of the page is stale
+        self.notion_client.invalidate(endpoint)
+        try:
+            return self.notion_client.get(endpoint)
+        except NotionApiError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def _delete(self, page_id: str):
+        if self.index is not None:
+            self.index.delete([page_id])
+
+    def _urgent(self, row: Optional[Dict[str, Any]], today: date) -> bool:
+        if row is None or row["status"] != PENDING_STATUS or not row["fecha"]:
+            return False
+        deadline = today + timedelta(days=self.urgent_days)
+        return row["fecha"][:10] <= deadline.isoformat()
+
+    def _newly_urgent(
+        self, row: Dict[str, Any], previous: Optional[Dict[str, Any]], today: date
+    ) -> bool:
+        if self.urgent_days is None or not self._urgent(row, today):
+            return False
+        # Edits to a task that was already urgent are not notified again
+        if self._urgent(previous, today):
+            return False
+        key = normalize_id(row["id"])
+        if key in self.notified:
+            return False
+        self.notified.set(key, True)
+        return True
+
+
+# Lazy singletons - shared between invocations of a warm container
+_processed_events_instance = None
+_urgent_notifications_instance = None
+
+
+def get_processed_events() -> LRUCache:
+    """
+    Get the shared record of processed page events.
+
+    Returns:
+        LRUCache: Latest event timestamp handled per page.
+    """
+    global _processed_events_instance
+    if _processed_events_instance is None:
+        _processed_events_instance = LRUCache(max_entries=4096)
+    return _processed_events_instance
+
+
+def get_urgent_notifications(debounce_seconds: float) -> LRUCache:
+    """
+    Get the shared record of recent urgent notifications.
+
+    Args:
+        debounce_seconds: Seconds a page is not notified again.
+
+    Returns:
+        LRUCache: Notified pages, expiring after debounce_seconds.
+    """
+    global _urgent_notifications_instance
+    if _urgent_notifications_instance is None:
+        _urgent_notifications_instance = LRUCache(
+            max_entries=4096, default_ttl=debounce_seconds
+        )
+    return _urgent_notifications_instance
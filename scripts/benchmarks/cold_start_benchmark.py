@@ -0,0 +1,146 @@
+"""
+Compares cold-start import times of the deployment code with and without shipped bytecode.
+
+Each run starts a fresh interpreter with PYTHONDONTWRITEBYTECODE=1, like Lambda's
+read-only /var/task and /opt, and imports the handler module. With --code (and
+optionally --layer) the built lambda.zip / layer.zip are measured; otherwise app/ is
+staged from the working tree. Bytecode is only used when it was compiled for the
+interpreter running the benchmark, e.g. run it with python3.12 for a python3.12 build.
+
+Usage:
+    python -m scripts.benchmarks.cold_start_benchmark [--code lambda.zip]
+        [--layer layer.zip] [--runs 10] [--python python3.12]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from scripts.precompile import remove_bytecode_caches
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PROBE = """
+import sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import app.lambda_function
+print(time.perf_counter() - start)
+"""
+
+
+def _stage_working_tree(target: Path) -> Path:
+    shutil.copytree(
+        ROOT / "app", target / "app", ignore=shutil.ignore_patterns("__pycache__")
+    )
+    return target
+
+
+def _extract(archive: Path, target: Path) -> Path:
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(target)
+    return target
+
+
+def _cache_tag(python: str) -> str:
+    result = subprocess.run(
+        [python, "-c", "import sys; print(sys.implementation.cache_tag)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def _has_sources(root: Path) -> bool:
+    return next(root.rglob("*.py"), None) is not None
+
+
+def _measure(python: str, paths, runs: int):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    code = PROBE.format(paths=[str(path) for path in paths])
+    times = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [python, "-s", "-c", code],
+            env=env,
+            cwd=tempfile.gettempdir(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def _variants(tmp: Path, code_zip, layer_zip, python: str):
+    """Returns {name: [sys.path entries]} with bytecode stripped from one variant."""
+    built_code = tmp / "built" / "task"
+    if code_zip:
+        _extract(code_zip, built_code)
+    else:
+        _stage_working_tree(built_code)
+        # Compiled for the benchmark's interpreter, like a build for its runtime
+        subprocess.run(
+            [python, "-m", "scripts.precompile", str(built_code / "app")],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    built = [built_code]
+    if layer_zip:
+        built.append(_extract(layer_zip, tmp / "built" / "opt") / "python")
+
+    sources = []
+    for path in built:
+        copy = tmp / "sources" / path.relative_to(tmp / "built")
+        shutil.copytree(path, copy)
+        remove_bytecode_caches(copy)
+        sources.append(copy)
+    if not all(_has_sources(path) for path in sources):
+        # A sourceless build cannot be measured without its bytecode
+        return {"precompiled": built}
+    return {"sources only": sources, "precompiled": built}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--code", type=Path, help="lambda.zip built by package_code.sh")
+    parser.add_argument("--layer", type=Path, help="layer.zip built by build_layer.sh")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        variants = _variants(Path(tmp_dir), args.code, args.layer, args.python)
+        print(f"Importing app.lambda_function, {args.runs} cold starts per variant")
+        print(f"{'variant':<14}{'median ms':>11}{'min ms':>9}{'max ms':>9}")
+        medians = {}
+        for name, paths in variants.items():
+            times = _measure(args.python, paths, args.runs)
+            medians[name] = statistics.median(times)
+            print(
+                f"{name:<14}{medians[name] * 1000:>11.1f}"
+                f"{min(times) * 1000:>9.1f}{max(times) * 1000:>9.1f}"
+            )
+
+    if len(medians) == 2:
+        saved = medians["sources only"] - medians["precompiled"]
+        print(f"Saved per cold start: {saved * 1000:.1f} ms")
+    # __pycache__ files are named per interpreter, so bytecode built for another
+    # runtime is silently ignored and both variants compile at import
+    if args.code:
+        with zipfile.ZipFile(args.code) as zf:
+            cached = [name for name in zf.namelist() if "__pycache__/" in name]
+        tag = _cache_tag(args.python)
+        if cached and not any(f".{tag}." in name for name in cached):
+            print(f"WARNING: {args.code} has no {tag} bytecode; run with its runtime")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares rendering the full digest with diffing it against the previous one.
+
+For each backlog size, pending tasks are mapped from a synthetic workspace
+(scripts.notion_workspace) and --changes of them are edited. The full digest is
+rendered without a row cache; the diff path builds the snapshot, compares it with
+the previous one and renders only the changes email. Both email sizes are the
+HTML body in bytes.
+
+Usage:
+    python -m scripts.benchmarks.digest_diff_benchmark [--sizes 1000,10000,100000]
+        [--changes 10]
+"""
+
+import argparse
+import os
+import time
+
+ENVIRONMENT = {
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_DATABASE_ID": "benchmark",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    # Before the first import of app, which reads the environment once
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    from app.common.adapter.digest_diff import DigestSnapshot
+    from app.common.adapter.email_adapter import EmailAdapter
+    from app.common.integrations.notion.task_repository import TaskRepository
+    from scripts.notion_workspace import WorkspaceSpec, generate_pages
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--changes", type=int, default=10, help="Tasks edited")
+    args = parser.parse_args()
+
+    repository = TaskRepository(None, "benchmark")
+    adapter = EmailAdapter()
+    print(f"{args.changes} changed tasks per run")
+    print(
+        f"{'tasks':>8}{'full s':>9}{'full KiB':>10}{'diff s':>9}{'changes KiB':>13}"
+        f"{'speedup':>9}"
+    )
+    for size in (int(size) for size in args.sizes.split(",")):
+        tasks = [
+            repository.map_task(page) for page in generate_pages(WorkspaceSpec(size))
+        ]
+        previous = DigestSnapshot.from_tasks(tasks)
+        # Reschedule some tasks and edit the notes of others
+        for index, task in enumerate(tasks[: args.changes]):
+            key = "fecha" if index % 2 else "notas"
+            tasks[index] = {**task, key: f"{task[key] or ''} edited"}
+
+        full, full_seconds = _timed(lambda: adapter.render_digest(tasks))
+
+        def render_changes():
+            snapshot = DigestSnapshot.from_tasks(tasks)
+            assert snapshot.fingerprint != previous.fingerprint
+            return adapter.render_changes(previous.diff(tasks), len(tasks))
+
+        changes, diff_seconds = _timed(render_changes)
+        print(
+            f"{size:>8}{full_seconds:>9.3f}{len(full.html_body.encode()) / 1024:>10.0f}"
+            f"{diff_seconds:>9.3f}{len(changes.html_body.encode()) / 1024:>13.1f}"
+            f"{full_seconds / diff_seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
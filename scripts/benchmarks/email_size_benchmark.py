@@ -0,0 +1,88 @@
+"""
+Compares the size of digests rendered with the source template and indented rows
+against the compiled template and minified rows.
+
+Usage:
+    python -m scripts.benchmarks.email_size_benchmark [--rows 1000]
+"""
+
+import argparse
+import gzip
+import html
+from app.common.adapter.email_adapter import EmailAdapter
+from app.common.adapter.linkify import linkify
+from app.common.dates.date_service import DateService
+from app.common.integrations.notion.task_repository import TaskRepository
+from scripts.benchmarks.notion_fixtures import make_query_response
+
+# Maximum size of a message sent with SES SendEmail
+SES_MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+
+class LegacyEmailAdapter(EmailAdapter):
+    """Renders the source template with the indented rows used before compilation."""
+
+    TEMPLATE_PATH = EmailAdapter.SOURCE_TEMPLATE_PATH
+
+    def _generate_task_rows(self, tasks):
+        html_rows, text_rows = super()._generate_task_rows(tasks)
+        return html_rows.replace("</tr><tr", "</tr>\n<tr"), text_rows
+
+    def _generate_task_row(self, task, date_display=None):
+        if date_display is None:
+            date_display = self._format_date(task.get("fecha"))
+        notes = task.get("notas", "")
+        notes_html = (
+            f"""
+        <div class="task-notes">{linkify(notes)}</div>"""
+            if notes
+            else ""
+        )
+        return f"""<tr class="task-row">
+                        <td class="date-cell">
+                            <span class="date-pill">{date_display}</span>
+                        </td>
+                        <td>
+                            <span class="task-title">{html.escape(task.get("titulo"))}</span>{notes_html}
+                        </td>
+                    </tr>"""
+
+
+def _sizes(adapter, tasks):
+    body = adapter.render_digest(tasks).html_body.encode("utf-8")
+    empty = len(adapter.render_digest([]).html_body.encode("utf-8"))
+    per_row = (len(body) - empty) / max(len(tasks), 1)
+    return len(body), len(gzip.compress(body)), empty, per_row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    repository = TaskRepository(notion_client=None, database_id="benchmark")
+    tasks = repository._map_response(make_query_response(args.rows))
+    date_service = DateService()
+
+    print(f"Digest of {len(tasks)} tasks")
+    print(
+        f"{'template':<10}{'body KiB':>10}{'gzip KiB':>10}"
+        f"{'shell B':>9}{'row B':>8}{'rows in 10 MiB':>16}"
+    )
+    results = {}
+    for name, adapter in (
+        ("source", LegacyEmailAdapter(date_service=date_service)),
+        ("compiled", EmailAdapter(date_service=date_service)),
+    ):
+        body, compressed, empty, per_row = _sizes(adapter, tasks)
+        results[name] = body
+        max_rows = int((SES_MAX_MESSAGE_BYTES - empty) / per_row)
+        print(
+            f"{name:<10}{body / 1024:>10.1f}{compressed / 1024:>10.1f}"
+            f"{empty:>9}{per_row:>8.0f}{max_rows:>16}"
+        )
+    print(f"Body size reduction: {1 - results['compiled'] / results['source']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compares the JSON codecs on representative Notion query responses.
+
+Usage:
+    python -m scripts.benchmarks.json_codec_benchmark [--rows 100] [--iterations 200]
+"""
+
+import argparse
+import importlib.util
+import time
+from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.serialization.json_codec import StdlibJsonCodec, create_json_codec
+from scripts.benchmarks.notion_fixtures import make_query_response
+
+
+def _per_second(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    response = make_query_response(args.rows)
+    body = StdlibJsonCodec().dumps(response)
+    repository = TaskRepository(notion_client=None, database_id="benchmark")
+    tasks = repository._map_response(response)
+    query = {"filter": {"and": []}, "sorts": [{"property": "Fecha"}]}
+
+    names = ["stdlib"] + [
+        name for name in ("orjson", "msgspec") if importlib.util.find_spec(name)
+    ]
+    print(f"Response: {args.rows} rows, {len(body) / 1024:.1f} KiB")
+    print(
+        f"{'codec':<10}{'decode/s':>12}{'MiB/s':>10}{'encode/s':>12}"
+        f"{'query/s':>12}{'log/s':>10}"
+    )
+    for name in names:
+        codec = create_json_codec(name)
+        decode = _per_second(lambda: codec.loads(body), args.iterations)
+        encode = _per_second(lambda: codec.dumps(response), args.iterations)
+        request = _per_second(lambda: codec.dumps(query), args.iterations * 50)
+        pretty = _per_second(lambda: codec.dumps_pretty(tasks), args.iterations)
+        print(
+            f"{name:<10}{decode:>12.0f}{decode * len(body) / 2**20:>10.1f}"
+            f"{encode:>12.0f}{request:>12.0f}{pretty:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
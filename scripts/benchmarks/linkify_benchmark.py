@@ -0,0 +1,98 @@
+"""
+Compares the single-pass linkify with the previous escape-then-substitute notes renderer.
+
+Notes whose URLs end in whitespace or at the end of the text must render byte for
+byte as before. Notes with a URL followed by punctuation or a closing bracket are
+counted separately: those are the cases the new engine renders differently on purpose.
+
+Usage:
+    python -m scripts.benchmarks.linkify_benchmark [--notes 20000] [--iterations 5]
+"""
+
+import argparse
+import html
+import random
+import re
+import time
+from app.common.adapter.linkify import linkify
+from scripts.benchmarks.notion_fixtures import WORDS
+
+URLS = (
+    "https://example.com/tasks/42",
+    "http://intranet.local/a?b=1&c=2",
+    "www.notion.so/workspace/page",
+    "https://docs.example.org/guide#section",
+)
+EDGE_SUFFIXES = (".", ",", ")", "!", "?")
+
+
+def legacy_linkify(notes: str) -> str:
+    """The notes renderer before the single-pass engine (escape, then re.sub)."""
+    escaped_notes = html.escape(notes)
+    url_pattern = r'(https?://[^\s<>"]+|www\.[^\s<>"]+)'
+
+    def replace_url(match):
+        url = match.group(1)
+        href = url if url.startswith("http") else f"https://{url}"
+        return f'<a href="{href}" class="link-text">{url}</a>'
+
+    return re.sub(url_pattern, replace_url, escaped_notes)
+
+
+def make_note(rng: random.Random, edge: bool) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 120))]
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(URLS))
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words) + 1), '<b>&"quoted"</b>')
+    if edge:
+        words.insert(
+            rng.randrange(len(words) + 1), rng.choice(URLS) + rng.choice(EDGE_SUFFIXES)
+        )
+    return " ".join(words)
+
+
+def _timed(fn, corpus, iterations):
+    """Returns the best time of one pass over the corpus."""
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for note in corpus:
+            fn(note)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--notes", type=int, default=20000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    plain = [make_note(rng, edge=False) for _ in range(args.notes)]
+    edge = [make_note(rng, edge=True) for _ in range(args.notes // 10)]
+
+    mismatches = [note for note in plain if linkify(note) != legacy_linkify(note)]
+    changed = sum(linkify(note) != legacy_linkify(note) for note in edge)
+    print(f"Byte-for-byte identical: {len(plain) - len(mismatches)}/{len(plain)} notes")
+    print(
+        f"Trailing punctuation/bracket notes rendered differently: {changed}/{len(edge)}"
+    )
+    if mismatches:
+        print(f"First mismatch: {mismatches[0]!r}")
+
+    corpus = plain + edge
+    size = sum(len(note) for note in corpus)
+    legacy = _timed(legacy_linkify, corpus, args.iterations)
+    single_pass = _timed(linkify, corpus, args.iterations)
+    print(f"{'engine':<14}{'seconds':>10}{'MiB/s':>10}")
+    print(f"{'legacy':<14}{legacy:>10.3f}{size / legacy / 2**20:>10.1f}")
+    print(f"{'single-pass':<14}{single_pass:>10.3f}{size / single_pass / 2**20:>10.1f}")
+    print(f"Speedup: {legacy / single_pass:.2f}x")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
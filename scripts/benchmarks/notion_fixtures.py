@@ -0,0 +1,88 @@
+"""Representative Notion API payloads for the benchmarks."""
+
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+WORDS = (
+    "review deploy invoice meeting draft budget follow-up design report sync "
+    "reunión café informe presupuesto revisión"
+).split()
+
+
+def _rich_text(text: str) -> Dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": text, "link": None},
+        "annotations": {
+            "bold": False,
+            "italic": False,
+            "strikethrough": False,
+            "underline": False,
+            "code": False,
+            "color": "default",
+        },
+        "plain_text": text,
+        "href": None,
+    }
+
+
+def make_page(index: int, rng: random.Random, database_id: str) -> Dict[str, Any]:
+    """Builds one database page shaped like a Notion query result."""
+    page_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+    notes = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+    if rng.random() < 0.3:
+        notes += " https://example.com/tasks/" + str(index)
+    day = date(2025, 1, 1) + timedelta(days=rng.randint(0, 365))
+    timestamp = f"{day.isoformat()}T{rng.randint(0, 23):02d}:00:00.000Z"
+    user = {"object": "user", "id": str(uuid.UUID(int=rng.getrandbits(128)))}
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": timestamp,
+        "last_edited_time": timestamp,
+        "created_by": user,
+        "last_edited_by": user,
+        "cover": None,
+        "icon": {"type": "emoji", "emoji": "📌"} if rng.random() < 0.5 else None,
+        "parent": {"type": "database_id", "database_id": database_id},
+        "archived": False,
+        "in_trash": False,
+        "properties": {
+            "Fecha": {
+                "id": "%3AKzB",
+                "type": "date",
+                "date": {"start": day.isoformat(), "end": None, "time_zone": None},
+            },
+            "Notas": {
+                "id": "Y%3DQm",
+                "type": "rich_text",
+                "rich_text": [_rich_text(notes)] if notes else [],
+            },
+            "Tarea": {"id": "title", "type": "title", "title": [_rich_text(title)]},
+        },
+        "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        "public_url": None,
+    }
+
+
+def make_pages(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Builds count pages from a fixed seed."""
+    rng = random.Random(seed)
+    database_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    return [make_page(i, rng, database_id) for i in range(count)]
+
+
+def make_query_response(count: int = 100, seed: int = 42) -> Dict[str, Any]:
+    """Builds a databases/{id}/query response with count results."""
+    return {
+        "object": "list",
+        "results": make_pages(count, seed),
+        "next_cursor": None,
+        "has_more": False,
+        "type": "page_or_database",
+        "page_or_database": {},
+        "request_id": "00000000-0000-0000-0000-000000000000",
+    }
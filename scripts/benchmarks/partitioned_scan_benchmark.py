@@ -0,0 +1,104 @@
+"""
+Compares a serial cursor scan of pending tasks with partitioned scans.
+
+The pending-tasks query runs against the in-process API stand-in
+(scripts.notion_workspace) with a fixed latency per request, through NotionClient
+and TaskRepository with NOTION_SCAN_PARTITIONS-style Fecha ranges. Pages are
+generated and every partition filter is evaluated in an untimed first run, so the
+timed run measures the request chains. With --rate the shared RateLimiter caps the
+combined request rate, as Notion does (about 3 requests per second).
+
+Usage:
+    python -m scripts.benchmarks.partitioned_scan_benchmark [--pages 20000]
+        [--latency 0.1] [--rate 0] [--partitions 1,2,4,8,16]
+"""
+
+import argparse
+import os
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+ENVIRONMENT = {
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_DATABASE_ID": "benchmark",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def _scan(api, spec, partitions: int, rate: float):
+    from app.common.integrations.notion.notion_client import NotionClient
+    from app.common.integrations.notion.rate_limiter import RateLimiter
+    from app.common.integrations.notion.task_repository import TaskRepository
+
+    client = NotionClient(
+        rate_limiter=RateLimiter(rate) if rate else None, transport=api.transport
+    )
+    repository = TaskRepository(
+        client,
+        spec.resolved_database_id(),
+        scan_partitions=partitions,
+        scan_days=spec.days,
+    )
+
+    requests_before = api.requests
+    start = time.perf_counter()
+    tasks = repository.get_pending_tasks()
+    return tasks, time.perf_counter() - start, api.requests - requests_before
+
+
+def main():
+    # Before the first import of app, which reads the environment once
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    from app.common.dates.date_service import DateService
+    from scripts.notion_workspace import (
+        LocalNotionApi,
+        add_spec_arguments,
+        spec_from_args,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_spec_arguments(parser)
+    parser.set_defaults(pages=20000)
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="Seconds per request"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0, help="Requests per second; 0 for no limit"
+    )
+    parser.add_argument("--partitions", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    # "Today" is the last day of the workspace, so the ranges cover its dates
+    today = spec.start_date + timedelta(days=spec.days - 1)
+    patch.object(DateService, "today", return_value=today).start()
+    api = LocalNotionApi(spec, latency=args.latency, cache_pages=True)
+    counts = [int(count) for count in args.partitions.split(",")]
+    print(
+        f"{spec.pages} pages, {args.latency * 1000:.0f} ms per request, "
+        f"rate limit {args.rate or 'none'}"
+    )
+    print(
+        f"{'partitions':>10}{'seconds':>9}{'requests':>10}{'tasks':>8}{'speedup':>9}  same result"
+    )
+
+    baseline = None
+    for count in counts:
+        _scan(api, spec, count, 0)
+        tasks, elapsed, requests = _scan(api, spec, count, args.rate)
+        ids = [task["id"] for task in tasks]
+        if baseline is None:
+            baseline = (ids, elapsed)
+        print(
+            f"{count:>10}{elapsed:>9.2f}{requests:>10}{len(tasks):>8}"
+            f"{baseline[1] / elapsed:>8.1f}x  {ids == baseline[0]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Simulates SnapStart locally: compares a restored start (fork after the before-snapshot
+hooks) with a plain cold start.
+
+A cold start runs a new interpreter that imports app.lambda_function (which warms up
+during init) and renders a digest. A restored start forks a process that already ran
+the before-snapshot hooks, runs the after-restore hooks and renders the same digest.
+Both include process creation and exit. No requests are sent: the configuration is
+a placeholder and the tasks are synthetic. Requires os.fork (Linux or macOS).
+
+Usage:
+    python -m scripts.benchmarks.snapstart_benchmark [--runs 10] [--rows 50]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+ENVIRONMENT = {
+    "ENVIRONMENT": "BENCHMARK",
+    "LOG_LEVEL": "WARNING",
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_DATABASE_ID": "benchmark",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+    "AWS_REGION": "us-east-1",
+    "EMAIL_ROW_CACHE_ENABLED": "false",
+}
+
+COLD_START = """
+from app.lambda_function import lambda_handler
+from scripts.benchmarks.snapstart_benchmark import render_digest
+render_digest({rows})
+"""
+
+
+def render_digest(rows: int):
+    """The work of a first invocation that needs no network: mapping and rendering."""
+    from app.common.adapter.email_adapter import EmailAdapter
+    from app.common.integrations.notion.task_repository import TaskRepository
+    from scripts.benchmarks.notion_fixtures import make_query_response
+
+    repository = TaskRepository(notion_client=None, database_id="benchmark")
+    tasks = repository._map_response(make_query_response(rows))
+    EmailAdapter().render_digest(tasks)
+
+
+def cold_start(rows: int) -> float:
+    env = dict(os.environ, **ENVIRONMENT, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", COLD_START.format(rows=rows)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def restored_start(lifecycle, rows: int) -> float:
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            lifecycle.run_after_restore()
+            render_digest(rows)
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    if status != 0:
+        raise SystemExit("Restored start failed")
+    return time.perf_counter() - start
+
+
+def _report(name: str, times):
+    print(
+        f"{name:<10}{statistics.median(times) * 1000:>11.1f}"
+        f"{min(times) * 1000:>9.1f}{max(times) * 1000:>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.update(ENVIRONMENT)
+    cold = [cold_start(args.rows) for _ in range(args.runs)]
+
+    # The "snapshot": imported and warmed up once, then forked for every restore
+    snapshot_start = time.perf_counter()
+    from app.common.lifecycle.lifecycle import lifecycle
+    import app.lambda_function  # noqa: F401 - runs the before-snapshot hooks
+
+    snapshot_time = time.perf_counter() - snapshot_start
+    restored = [restored_start(lifecycle, args.rows) for _ in range(args.runs)]
+
+    print(f"Start to rendered digest of {args.rows} tasks, {args.runs} runs")
+    print(
+        f"Snapshot preparation (import + before-snapshot): {snapshot_time * 1000:.1f} ms"
+    )
+    print(f"{'start':<10}{'median ms':>11}{'min ms':>9}{'max ms':>9}")
+    _report("cold", cold)
+    _report("restored", restored)
+    print(f"Speedup: {statistics.median(cold) / statistics.median(restored):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the pending-tasks query against Notion with a digest served from TaskIndex.
+
+Runs against the in-process API stand-in (scripts.notion_workspace) with a fixed
+latency per request; pages are generated in an untimed first query. The index is
+built by a full sync, then read after an incremental sync with no changes and after
+--edits pages were updated through the API, as a warm container would between
+digests. Every digest is checked against the Notion query.
+
+Usage:
+    python -m scripts.benchmarks.task_index_benchmark [--pages 20000]
+        [--latency 0.1] [--edits 50]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+ENVIRONMENT = {
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_DATABASE_ID": "benchmark",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def _timed(api, run):
+    requests_before = api.requests
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start, api.requests - requests_before
+
+
+def main():
+    # Before the first import of app, which reads the environment once
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    from app.common.dates.date_service import DateService
+    from app.common.integrations.notion.bulk_update import status_update
+    from app.common.integrations.notion.notion_client import NotionClient
+    from app.common.integrations.notion.task_index import (
+        IndexedTaskRepository,
+        TaskIndex,
+    )
+    from app.common.integrations.notion.task_repository import TaskRepository
+    from scripts.notion_workspace import (
+        LocalNotionApi,
+        add_spec_arguments,
+        spec_from_args,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_spec_arguments(parser)
+    parser.set_defaults(pages=20000)
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="Seconds per request"
+    )
+    parser.add_argument("--edits", type=int, default=50, help="Pages updated")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    api = LocalNotionApi(spec, latency=args.latency, cache_pages=True)
+    # "Today" is the last day of the workspace, so most dated tasks are pending
+    today = spec.start_date + timedelta(days=spec.days - 1)
+    patch.object(DateService, "today", return_value=today).start()
+    repository = TaskRepository(
+        NotionClient(transport=api.transport),
+        spec.resolved_database_id(),
+        "Fecha,Tarea,Notas",
+    )
+
+    directory = tempfile.TemporaryDirectory()
+    index = TaskIndex(os.path.join(directory.name, "tasks.sqlite"))
+    indexed = IndexedTaskRepository([repository], index)
+
+    print(f"{spec.pages} pages, {args.latency * 1000:.0f} ms per request")
+    print(f"{'run':<24}{'seconds':>9}{'requests':>10}{'tasks':>8}  same result")
+
+    def report(label, tasks, elapsed, requests, expected):
+        ids = sorted(task["id"] for task in tasks)
+        print(
+            f"{label:<24}{elapsed:>9.3f}{requests:>10}{len(tasks):>8}  {ids == expected}"
+        )
+
+    repository.get_pending_tasks()
+    tasks, elapsed, requests = _timed(api, repository.get_pending_tasks)
+    expected = sorted(task["id"] for task in tasks)
+    report("notion query", tasks, elapsed, requests, expected)
+
+    _, elapsed, requests = _timed(api, lambda: index.sync(repository, full=True))
+    print(f"{'full sync':<24}{elapsed:>9.3f}{requests:>10}")
+
+    tasks, elapsed, requests = _timed(api, indexed.get_pending_tasks)
+    report("index, no changes", tasks, elapsed, requests, expected)
+
+    edited = [task["id"] for task in tasks[: args.edits]]
+    repository.bulk_update({page_id: status_update("Done") for page_id in edited})
+    expected = sorted(task["id"] for task in repository.get_pending_tasks())
+    tasks, elapsed, requests = _timed(api, indexed.get_pending_tasks)
+    report(f"index, {len(edited)} edits", tasks, elapsed, requests, expected)
+
+    index.close()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares typed msgspec decoding with decoding to dicts and mapping them.
+
+Usage:
+    python -m scripts.benchmarks.typed_decoding_benchmark [--sizes 100,10000,100000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from app.common.integrations.notion.page_structs import (
+    TypedQueryDecoder,
+    typed_decoding_available,
+)
+from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.serialization.json_codec import create_json_codec
+from scripts.benchmarks.notion_fixtures import make_query_response
+
+
+def _measure(fn):
+    """Returns (seconds, peak traced bytes) of one call; memory is traced in a second run."""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _candidates(repository):
+    candidates = {
+        "stdlib + map": lambda body: repository._map_response(json.loads(body)),
+    }
+    try:
+        orjson = create_json_codec("orjson")
+        candidates["orjson + map"] = lambda body: repository._map_response(
+            orjson.loads(body)
+        )
+    except ImportError:
+        pass
+    if typed_decoding_available():
+        decoder = TypedQueryDecoder()
+        candidates["msgspec typed"] = lambda body: decoder.decode(body)[0]
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000,100000")
+    args = parser.parse_args()
+
+    repository = TaskRepository(notion_client=None, database_id="benchmark")
+    candidates = _candidates(repository)
+    if not typed_decoding_available():
+        print("msgspec is not installed; only the dict mappers are measured")
+
+    print(
+        f"{'pages':>8}  {'decoder':<15}{'seconds':>10}{'pages/s':>12}{'peak MiB':>10}"
+    )
+    for size in (int(value) for value in args.sizes.split(",")):
+        body = json.dumps(make_query_response(size)).encode("utf-8")
+        for name, decode in candidates.items():
+            elapsed, peak = _measure(lambda: decode(body))
+            print(
+                f"{size:>8}  {name:<15}{elapsed:>10.3f}{size / elapsed:>12.0f}"
+                f"{peak / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Runs the digest pipeline against synthetic workspaces of increasing size.
+
+For each size a workspace is generated (scripts.notion_workspace) and served by the
+in-process API stand-in: the pending-tasks query is scanned once, then fetched page
+by page through NotionClient and TaskRepository (JSON encoding, decoding and
+mapping included) and rendered by EmailAdapter. Sizes run in increasing order, so
+the peak RSS column is the high-water mark up to that size.
+
+Usage:
+    python -m scripts.benchmarks.workspace_benchmark [--sizes 1000,100000,1000000]
+        [--seed 42] [--notes-words 30] [--missing-rate 0.05] ...
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+
+ENVIRONMENT = {
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_DATABASE_ID": "benchmark",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+    "LOG_LEVEL": "WARNING",
+}
+
+# Maximum size of a message sent with SES SendEmail
+SES_MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+
+class _CountingSink:
+    """Text stream that only counts the UTF-8 bytes written to it."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str):
+        self.bytes += len(text.encode("utf-8"))
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (peak if sys.platform == "darwin" else peak * 1024) / 2**20
+
+
+def _timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_size(spec) -> dict:
+    """Generates, queries and renders one workspace; returns the measurements."""
+    from app.common.adapter.email_adapter import EmailAdapter
+    from app.common.integrations.notion.notion_client import NotionClient
+    from app.common.integrations.notion.task_repository import TaskRepository
+    from scripts.notion_workspace import LocalNotionApi, write_jsonl
+
+    sink = _CountingSink()
+    _, generate = _timed(lambda: write_jsonl(spec, sink))
+
+    api = LocalNotionApi(spec)
+    repository = TaskRepository(
+        NotionClient(transport=api.transport), spec.resolved_database_id()
+    )
+    _, scan = _timed(lambda: api._matching(repository._create_pending_tasks_payload()))
+    tasks, fetch = _timed(repository.get_pending_tasks)
+    email, render = _timed(lambda: EmailAdapter().render_digest(tasks))
+    return {
+        "pages": spec.pages,
+        "jsonl_mib": sink.bytes / 2**20,
+        "generate": generate,
+        "scan": scan,
+        "fetch": fetch,
+        "requests": api.requests,
+        "tasks": len(tasks),
+        "render": render,
+        "html_mib": len(email.html_body.encode("utf-8")) / 2**20,
+        "peak_rss_mib": _peak_rss_mib(),
+    }
+
+
+def main():
+    # Before the first import of app, which reads the environment once
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    from scripts.notion_workspace import add_spec_arguments, spec_from_args
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    add_spec_arguments(parser, pages=False)
+    args = parser.parse_args()
+
+    print(
+        f"{'pages':>9}{'JSONL MiB':>11}{'gen s':>8}{'scan s':>8}{'fetch s':>9}"
+        f"{'requests':>10}{'tasks':>9}{'render s':>10}{'HTML MiB':>10}{'peak RSS':>10}"
+    )
+    for size in sorted(int(size) for size in args.sizes.split(",")):
+        args.pages = size
+        result = run_size(spec_from_args(args))
+        over = (
+            " (over the SES limit)"
+            if result["html_mib"] * 2**20 > SES_MAX_MESSAGE_BYTES
+            else ""
+        )
+        print(
+            f"{result['pages']:>9}{result['jsonl_mib']:>11.1f}{result['generate']:>8.2f}"
+            f"{result['scan']:>8.2f}{result['fetch']:>9.2f}{result['requests']:>10}"
+            f"{result['tasks']:>9}{result['render']:>10.2f}{result['html_mib']:>10.1f}"
+            f"{result['peak_rss_mib']:>10.0f}{over}"
+        )
+
+
+if __name__ == "__main__":
+    main()
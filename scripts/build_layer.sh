@@ -4,11 +4,17 @@ set -euo pipefail
 # Build an AWS Lambda Layer from requirements.txt using Docker (Amazon Linux compatible)
 # - Uses AWS SAM builder image to avoid Lambda runtime entrypoint issues
 # - Produces: layer/python (on disk) and layer.zip (zip with python/ at root)
+# - boto3/botocore are provided by the Lambda runtime and left out unless INCLUDE_BOTO3=true
+# - Ships bytecode compiled by the runtime's interpreter, so cold starts do not compile
 #
 # Config via env vars (override as needed):
 #   RUNTIME=python3.12         # Python runtime
 #   LAMBDA_ARCH=x86_64         # or arm64
 #   AWS_PROFILE=lambda         # optional
+#   INCLUDE_BOTO3=false        # true to bundle boto3/botocore (e.g. to pin a newer version)
+#   BOTOCORE_SERVICES=ses      # service models kept when boto3 is bundled
+#   OPTIMIZE_LEVELS=0          # e.g. "0 2" when the function sets PYTHONOPTIMIZE=2
+#   SOURCELESS=false           # true to ship .pyc only (no .py sources)
 #
 # Usage:
 #   scripts/build_layer.sh [requirements_file]
@@ -16,8 +22,13 @@ set -euo pipefail
 RUNTIME=${RUNTIME:-python3.12}
 LAMBDA_ARCH=${LAMBDA_ARCH:-x86_64}
 REQ_FILE=${1:-requirements.txt}
+INCLUDE_BOTO3=${INCLUDE_BOTO3:-false}
+BOTOCORE_SERVICES=${BOTOCORE_SERVICES:-ses}
+OPTIMIZE_LEVELS=${OPTIMIZE_LEVELS:-0}
+SOURCELESS=${SOURCELESS:-false}
 LAYER_DIR="layer"
 SITE_DIR="${LAYER_DIR}/python"
+LAYER_REQ_FILE="${LAYER_DIR}/requirements.txt"
 
 # Map Lambda arch to Docker platform
 case "$LAMBDA_ARCH" in
@@ -36,7 +47,20 @@ command -v docker >/dev/null 2>&1 || { echo "[build-layer] Docker is required" >
 rm -rf "$LAYER_DIR" layer.zip
 mkdir -p "$SITE_DIR"
 
-if [[ ! -f "$REQ_FILE" ]] || [[ ! -s "$REQ_FILE" ]]; then
+PRECOMPILE_ARGS=(--runtime "$RUNTIME" --optimize ${=OPTIMIZE_LEVELS})
+[[ "$SOURCELESS" == "true" ]] && PRECOMPILE_ARGS+=(--sourceless)
+
+if [[ -f "$REQ_FILE" ]]; then
+  if [[ "$INCLUDE_BOTO3" == "true" ]]; then
+    cp "$REQ_FILE" "$LAYER_REQ_FILE"
+    PRECOMPILE_ARGS+=(--keep-botocore-services "$BOTOCORE_SERVICES")
+  else
+    # Already in the Lambda runtime
+    grep -viE '^(boto3|botocore|s3transfer|jmespath)([<>=!~ ;[]|$)' "$REQ_FILE" > "$LAYER_REQ_FILE" || true
+  fi
+fi
+
+if [[ ! -s "$LAYER_REQ_FILE" ]]; then
   echo "[build-layer] WARNING: $REQ_FILE missing or empty. Building an empty layer."
 else
   echo "[build-layer] Installing dependencies into $SITE_DIR using $IMAGE"
@@ -44,13 +68,15 @@ else
     --platform "$DOCKER_PLATFORM" \
     -v "$PWD":/var/task -w /var/task \
     "$IMAGE" \
-    bash -lc "python -m pip install --upgrade pip --root-user-action=ignore && pip install --root-user-action=ignore -r '$REQ_FILE' -t '$SITE_DIR'"
+    bash -lc "python -m pip install --upgrade pip --root-user-action=ignore && pip install --root-user-action=ignore --no-compile -r '$LAYER_REQ_FILE' -t '$SITE_DIR' && python -m scripts.precompile '$SITE_DIR' ${(j: :)${(q)PRECOMPILE_ARGS}}"
 fi
+rm -f "$LAYER_REQ_FILE"
 
 echo "[build-layer] Creating layer.zip"
 (
   cd "$LAYER_DIR"
-  zip -r ../layer.zip python -x "*.DS_Store" "*__pycache__*" "*.pyc" >/dev/null
+  # Bytecode is kept: Lambda cannot write it to the read-only /opt at runtime
+  zip -r ../layer.zip python -x "*.DS_Store" >/dev/null
 )
 
 echo "[build-layer] Done: layer.zip created"
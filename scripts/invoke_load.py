@@ -0,0 +1,384 @@
+"""
+Replays events against lambda_handler in warm worker processes at a target rate.
+
+Each worker imitates a warm Lambda container: it imports the handler once and keeps
+module state (clients, caches) between invocations, so its first invocation is the
+cold one. Events are dispatched open-loop at --rate per second, so when every worker
+is busy they queue and the latency (scheduled to finished) grows past the handler
+duration. The handler talks to the services configured in the environment (.env).
+
+Usage:
+    python -m scripts.invoke_load EVENTS [--workers 4] [--rate 5] [--count 100]
+        [--handler app.lambda_function.lambda_handler] [--json report.json]
+        [--result-timeout 300]
+
+EVENTS is a JSONL file with one event per line, or a JSON file with one event
+(e.g. scripts/event.json). Events are replayed in order and cycled up to --count.
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import time
+import traceback
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Invocation:
+    """Outcome of one replayed event."""
+
+    index: int
+    worker: int
+    cold: bool
+    scheduled_at: float
+    started_at: float
+    finished_at: float
+    rss_bytes: int
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds spent in the handler."""
+        return self.finished_at - self.started_at
+
+    @property
+    def latency(self) -> float:
+        """Seconds from the scheduled dispatch to the end, including queueing."""
+        return self.finished_at - self.scheduled_at
+
+
+class LocalContext:
+    """The subset of the Lambda context object the handler may read."""
+
+    def __init__(self, function_name: str, timeout_seconds: float, memory_mb: int):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.memory_limit_in_mb = memory_mb
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self._deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def load_events(path: Path) -> List[Dict[str, Any]]:
+    """
+    Reads the events to replay.
+
+    Args:
+        path: A JSONL file, or a JSON file holding a single event.
+
+    Returns:
+        List[Dict[str, Any]]: The events, in file order.
+    """
+    text = path.read_text(encoding="utf-8").strip()
+    if not text:
+        return [{}]
+    try:
+        return [json.loads(text)]
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def current_rss() -> int:
+    """Returns the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS where /proc is unavailable; KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _load_handler(path: str):
+    module_name, _, function_name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def worker_main(worker: int, handler_path: str, options: dict, tasks, results):
+    """
+    Runs in each worker process: imports the handler once, then serves events.
+
+    Sends ("ready", worker, rss_before_import, rss_after_import) and then one
+    Invocation per event to results. Stops on a None task. If the worker itself
+    fails (e.g. the handler cannot be imported), sends ("failed", worker, traceback).
+    """
+    try:
+        _serve(worker, handler_path, options, tasks, results)
+    except Exception:
+        results.put(("failed", worker, traceback.format_exc()))
+
+
+def _serve(worker: int, handler_path: str, options: dict, tasks, results):
+    rss_before = current_rss()
+    handler = _load_handler(handler_path)
+    results.put(("ready", worker, rss_before, current_rss()))
+
+    cold = True
+    for index, event, scheduled_at in iter(tasks.get, None):
+        context = LocalContext(
+            options["function_name"], options["timeout"], options["memory_mb"]
+        )
+        started_at = time.time()
+        error = None
+        try:
+            handler(event, context)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.put(
+            Invocation(
+                index=index,
+                worker=worker,
+                cold=cold,
+                scheduled_at=scheduled_at,
+                started_at=started_at,
+                finished_at=time.time(),
+                rss_bytes=current_rss(),
+                error=error,
+            )
+        )
+        cold = False
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (pct between 0 and 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _next_result(results, processes, timeout: float):
+    """
+    Waits for the next worker message.
+
+    Raises:
+        RuntimeError: If a worker failed or exited, or nothing arrived in timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            message = results.get(
+                timeout=max(0.0, min(1.0, deadline - time.monotonic()))
+            )
+        except queue.Empty:
+            crashed = [p.exitcode for p in processes if p.exitcode not in (None, 0)]
+            if crashed:
+                raise RuntimeError(f"A worker exited with code {crashed[0]}")
+            if all(p.exitcode is not None for p in processes):
+                raise RuntimeError("Every worker exited before sending its results")
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"No worker result within {timeout} s")
+            continue
+        if isinstance(message, tuple) and message[0] == "failed":
+            raise RuntimeError(f"Worker {message[1]} failed:\n{message[2]}")
+        return message
+
+
+def run(
+    events: List[Dict[str, Any]],
+    handler_path: str,
+    workers: int,
+    rate: float,
+    count: int,
+    options: dict,
+    result_timeout: float = 300.0,
+    mp=None,
+):
+    """
+    Starts the workers, dispatches count events at rate per second and collects results.
+
+    Args:
+        result_timeout: Seconds to wait for any worker message before giving up.
+        mp: The multiprocessing context; defaults to spawn. multiprocessing.dummy
+            runs the workers as threads of this process.
+
+    Returns:
+        tuple: (invocations, {worker: (rss_before_import, rss_after_import)}, wall seconds)
+
+    Raises:
+        RuntimeError: If a worker fails, exits early or stops answering.
+    """
+    mp = mp or multiprocessing.get_context("spawn")
+    tasks, results = mp.Queue(), mp.Queue()
+    processes = [
+        mp.Process(
+            target=worker_main,
+            args=(worker, handler_path, options, tasks, results),
+        )
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.daemon = True
+        process.start()
+
+    # Containers are initialized before the load starts, as with provisioned workers
+    startup = {}
+    while len(startup) < workers:
+        _, worker, rss_before, rss_after = _next_result(
+            results, processes, result_timeout
+        )
+        startup[worker] = (rss_before, rss_after)
+
+    start = time.time()
+    for index, event in zip(range(count), itertools.cycle(events)):
+        scheduled_at = start + index / rate if rate > 0 else time.time()
+        delay = scheduled_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        tasks.put((index, event, scheduled_at))
+    for _ in processes:
+        tasks.put(None)
+
+    invocations = [
+        _next_result(results, processes, result_timeout) for _ in range(count)
+    ]
+    wall = max(i.finished_at for i in invocations) - start if invocations else 0.0
+    for process in processes:
+        process.join()
+    return sorted(invocations, key=lambda i: i.index), startup, wall
+
+
+def build_report(invocations: List[Invocation], startup: dict, wall: float) -> dict:
+    """Summarizes throughput, latency percentiles, cold/warm counts and memory."""
+    report = {
+        "invocations": len(invocations),
+        "errors": sum(1 for i in invocations if i.error),
+        "cold": sum(1 for i in invocations if i.cold),
+        "warm": sum(1 for i in invocations if not i.cold),
+        "wall_seconds": wall,
+        "throughput_per_second": len(invocations) / wall if wall else 0.0,
+    }
+    for name, attribute in (("latency_ms", "latency"), ("duration_ms", "duration")):
+        values = [getattr(i, attribute) * 1000 for i in invocations]
+        report[name] = {
+            f"p{pct}": percentile(values, pct) for pct in (50, 90, 95, 99, 100)
+        }
+    for kind in ("cold", "warm"):
+        durations = [
+            i.duration * 1000 for i in invocations if i.cold == (kind == "cold")
+        ]
+        report[f"{kind}_duration_p50_ms"] = percentile(durations, 50)
+
+    report["workers"] = {}
+    for worker, (rss_before, rss_after_import) in sorted(startup.items()):
+        served = [i for i in invocations if i.worker == worker]
+        entry = {
+            "invocations": len(served),
+            "rss_import_mib": (rss_after_import - rss_before) / 2**20,
+        }
+        if served:
+            # Growth after the first invocation, which builds clients and caches
+            entry["rss_after_first_mib"] = served[0].rss_bytes / 2**20
+            entry["rss_last_mib"] = served[-1].rss_bytes / 2**20
+            entry["rss_growth_warm_mib"] = (
+                served[-1].rss_bytes - served[0].rss_bytes
+            ) / 2**20
+        report["workers"][worker] = entry
+    error_types = {}
+    for invocation in invocations:
+        if invocation.error:
+            error_types[invocation.error] = error_types.get(invocation.error, 0) + 1
+    report["error_types"] = error_types
+    return report
+
+
+def print_report(report: dict):
+    print(
+        f"Invocations: {report['invocations']} ({report['cold']} cold, "
+        f"{report['warm']} warm, {report['errors']} errors) in "
+        f"{report['wall_seconds']:.2f} s -> {report['throughput_per_second']:.2f}/s"
+    )
+    print(f"{'ms':<10}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name in ("latency_ms", "duration_ms"):
+        values = report[name]
+        print(
+            f"{name.split('_')[0]:<10}"
+            + "".join(
+                f"{values[key]:>9.1f}" for key in ("p50", "p90", "p95", "p99", "p100")
+            )
+        )
+    print(
+        f"Handler p50: cold {report['cold_duration_p50_ms']:.1f} ms, "
+        f"warm {report['warm_duration_p50_ms']:.1f} ms"
+    )
+    print(
+        f"{'worker':<8}{'calls':>7}{'import MiB':>12}{'first MiB':>11}{'last MiB':>10}{'growth':>9}"
+    )
+    for worker, entry in report["workers"].items():
+        print(
+            f"{worker:<8}{entry['invocations']:>7}{entry['rss_import_mib']:>12.1f}"
+            f"{entry.get('rss_after_first_mib', 0):>11.1f}"
+            f"{entry.get('rss_last_mib', 0):>10.1f}"
+            f"{entry.get('rss_growth_warm_mib', 0):>9.2f}"
+        )
+    for error, count in report["error_types"].items():
+        print(f"{count} x {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("events", type=Path)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Events per second; 0 sends them all at once",
+    )
+    parser.add_argument("--count", type=int, help="Events to send (default: one pass)")
+    parser.add_argument("--handler", default="app.lambda_function.lambda_handler")
+    parser.add_argument("--function-name", default="Notion_Lambda_Service")
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="Context deadline in seconds"
+    )
+    parser.add_argument("--memory-mb", type=int, default=128)
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    parser.add_argument(
+        "--result-timeout",
+        type=float,
+        default=300,
+        help="Seconds to wait for any worker result before giving up",
+    )
+    args = parser.parse_args()
+
+    events = load_events(args.events)
+    options = {
+        "function_name": args.function_name,
+        "timeout": args.timeout,
+        "memory_mb": args.memory_mb,
+    }
+    invocations, startup, wall = run(
+        events,
+        args.handler,
+        args.workers,
+        args.rate,
+        args.count or len(events),
+        options,
+        args.result_timeout,
+    )
+    report = build_report(invocations, startup, wall)
+    print_report(report)
+    if args.json:
+        report["results"] = [
+            {**asdict(i), "duration": i.duration, "latency": i.latency}
+            for i in invocations
+        ]
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,598 @@
+"""
+Generates a synthetic Notion workspace of task pages and serves it like the Notion API.
+
+Pages have the properties the service reads (Tarea title, Notas rich text, Fecha
+date) plus Status and Responsable (people), with multi-segment rich text, long
+notes with URLs, unicode and missing fields in configurable proportions. Page i is
+generated from (seed, i) alone, so a workspace is reproducible and any page can be
+rebuilt without generating the ones before it: nothing is held in memory.
+
+Usage:
+    python -m scripts.notion_workspace --pages 100000 [--seed 42] --out pages.jsonl
+    python -m scripts.notion_workspace --pages 1000 --serve 8765 [--latency 0.3]
+
+--out writes one page per line. --serve answers database queries (filters, sorts,
+pagination, filter_properties), page reads and updates and block children on
+http://127.0.0.1:PORT/v1; point the service at it with
+NOTION_BASE_URL=http://127.0.0.1:PORT/v1 and the printed NOTION_DATABASE_ID.
+In code, pass LocalNotionApi(spec).transport to NotionClient(transport=...).
+"""
+
+import argparse
+import functools
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import requests
+from app.common.integrations.notion.query_builder import (
+    UnsupportedFilterError,
+    evaluate_filter,
+    property_value,
+)
+
+WORDS = (
+    "review deploy invoice meeting draft budget follow-up design report sync call "
+    "plan email client release backlog roadmap hiring onboarding audit"
+).split()
+
+UNICODE_WORDS = (
+    "reunión café informe presupuesto revisión Müller naïve façade "
+    "会議 報告 予算 встреча отчёт اجتماع 📌 ✅ 🚀 ⚠️ 👩‍💻"
+).split()
+
+STATUSES = (("Not Started", 0.5), ("In progress", 0.2), ("Done", 0.3))
+
+# Low 48 bits of every page id hold the page index, so ids map back to pages
+INDEX_BITS = 48
+
+MAX_PAGE_SIZE = 100
+
+# Property types whose empty value is [] rather than None
+LIST_TYPES = ("title", "rich_text", "people")
+
+PROPERTY_IDS = {
+    "Fecha": "%3AKzB",
+    "Notas": "Y%3DQm",
+    "Tarea": "title",
+    "Status": "s%7Dkt",
+    "Responsable": "p%5Eqe",
+}
+
+
+@dataclass(frozen=True)
+class WorkspaceSpec:
+    """Size and distributions of a synthetic workspace."""
+
+    pages: int = 1000
+    seed: int = 42
+    database_id: Optional[str] = None
+    start_date: date = date(2025, 1, 1)
+    days: int = 365
+    statuses: Tuple[Tuple[str, float], ...] = STATUSES
+    people: int = 8
+    # Mean words of the notes; lengths are exponentially distributed
+    notes_words: float = 30.0
+    max_segments: int = 4
+    url_rate: float = 0.3
+    unicode_rate: float = 0.2
+    missing_rate: float = 0.05
+
+    def resolved_database_id(self) -> str:
+        """Returns database_id, or an id derived from the seed."""
+        return self.database_id or _derived_ids(self.seed, "database", 1)[0]
+
+    def person_ids(self) -> Tuple[str, ...]:
+        """Returns the ids of the workspace users, derived from the seed."""
+        return _derived_ids(self.seed, "people", self.people)
+
+
+@functools.lru_cache(maxsize=64)
+def _derived_ids(seed: int, name: str, count: int) -> Tuple[str, ...]:
+    rng = random.Random(f"{seed}:{name}")
+    return tuple(str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(count))
+
+
+def page_index(page_id: str) -> int:
+    """Returns the index of a generated page from its id."""
+    return int(page_id.replace("-", ""), 16) & ((1 << INDEX_BITS) - 1)
+
+
+def _segment(
+    text: str, rng: random.Random, link: Optional[str] = None
+) -> Dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": text, "link": {"url": link} if link else None},
+        "annotations": {
+            "bold": rng.random() < 0.1,
+            "italic": rng.random() < 0.1,
+            "strikethrough": False,
+            "underline": False,
+            "code": rng.random() < 0.02,
+            "color": "default",
+        },
+        "plain_text": text,
+        "href": link,
+    }
+
+
+def _words(rng: random.Random, count: int, spec: WorkspaceSpec) -> List[str]:
+    return [
+        rng.choice(UNICODE_WORDS if rng.random() < spec.unicode_rate else WORDS)
+        for _ in range(count)
+    ]
+
+
+def _rich_text(rng: random.Random, words: List[str], spec: WorkspaceSpec) -> List[dict]:
+    """Splits words into up to max_segments segments, some of them links."""
+    if not words:
+        return []
+    cuts = sorted(
+        rng.sample(
+            range(1, len(words)),
+            min(len(words) - 1, rng.randint(0, spec.max_segments - 1)),
+        )
+    )
+    segments = []
+    for start, end in zip([0] + cuts, cuts + [len(words)]):
+        text = " ".join(words[start:end]) + (" " if end < len(words) else "")
+        link = None
+        if rng.random() < spec.url_rate / spec.max_segments:
+            link = f"https://example.com/docs/{rng.getrandbits(32):08x}"
+        segments.append(_segment(text, rng, link))
+    return segments
+
+
+def _notes(rng: random.Random, index: int, spec: WorkspaceSpec) -> List[dict]:
+    words = _words(rng, int(rng.expovariate(1 / spec.notes_words)), spec)
+    if words and rng.random() < spec.url_rate:
+        # Bare URLs in the text, as typed in Notion without a link annotation
+        words.insert(
+            rng.randrange(len(words) + 1),
+            f"https://example.com/tasks/{index}?ref=notion&page=1",
+        )
+    return _rich_text(rng, words, spec)
+
+
+def _date(rng: random.Random, spec: WorkspaceSpec) -> Optional[Dict[str, Any]]:
+    day = spec.start_date + timedelta(days=rng.randrange(spec.days))
+    if rng.random() < 0.2:
+        start = f"{day.isoformat()}T{rng.randrange(24):02d}:{rng.choice((0, 15, 30, 45)):02d}:00.000+00:00"
+        return {"start": start, "end": None, "time_zone": None}
+    end = (
+        (day + timedelta(days=rng.randint(1, 5))).isoformat()
+        if rng.random() < 0.05
+        else None
+    )
+    return {"start": day.isoformat(), "end": end, "time_zone": None}
+
+
+def _timestamps(rng: random.Random, spec: WorkspaceSpec) -> Tuple[str, str]:
+    start = datetime.combine(spec.start_date, datetime.min.time(), tzinfo=timezone.utc)
+    created = start + timedelta(minutes=rng.randrange(spec.days * 24 * 60))
+    edited = created + timedelta(minutes=int(rng.expovariate(1 / 2880)))
+    return tuple(t.strftime("%Y-%m-%dT%H:%M:00.000Z") for t in (created, edited))
+
+
+def _status(rng: random.Random, spec: WorkspaceSpec) -> Dict[str, Any]:
+    names = [name for name, _ in spec.statuses]
+    name = rng.choices(names, weights=[weight for _, weight in spec.statuses])[0]
+    return {"id": f"status-{names.index(name)}", "name": name, "color": "default"}
+
+
+def _property(name: str, kind: str, value: Any) -> Dict[str, Any]:
+    return {"id": PROPERTY_IDS[name], "type": kind, kind: value}
+
+
+def make_page(index: int, spec: WorkspaceSpec) -> Dict[str, Any]:
+    """
+    Builds page index of the workspace, shaped like a Notion query result.
+
+    Args:
+        index: Page number, from 0 to spec.pages - 1.
+        spec: The workspace.
+
+    Returns:
+        Dict[str, Any]: The page JSON. The same (spec, index) gives the same page.
+    """
+    rng = random.Random(f"{spec.seed}:{index}")
+    page_id = str(
+        uuid.UUID(int=(rng.getrandbits(128 - INDEX_BITS) << INDEX_BITS) | index)
+    )
+    created, edited = _timestamps(rng, spec)
+    people = spec.person_ids()
+    owner = {"object": "user", "id": rng.choice(people)}
+    title_words = _words(rng, rng.randint(1, 8), spec)
+    if rng.random() < spec.missing_rate:
+        title_words = []
+    properties = {
+        "Fecha": _property("Fecha", "date", _date(rng, spec)),
+        "Notas": _property("Notas", "rich_text", _notes(rng, index, spec)),
+        "Tarea": _property("Tarea", "title", _rich_text(rng, title_words, spec)),
+        "Status": _property("Status", "status", _status(rng, spec)),
+        "Responsable": _property(
+            "Responsable", "people", [owner] if rng.random() < 0.8 else []
+        ),
+    }
+    for name in ("Fecha", "Notas", "Status", "Responsable"):
+        if rng.random() < spec.missing_rate:
+            # Either absent (as with filter_properties) or present without a value
+            if rng.random() < 0.5:
+                del properties[name]
+            else:
+                kind = properties[name]["type"]
+                properties[name][kind] = [] if kind in LIST_TYPES else None
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": created,
+        "last_edited_time": edited,
+        "created_by": owner,
+        "last_edited_by": owner,
+        "cover": None,
+        "icon": {"type": "emoji", "emoji": "📌"} if rng.random() < 0.3 else None,
+        "parent": {"type": "database_id", "database_id": spec.resolved_database_id()},
+        "archived": False,
+        "in_trash": False,
+        "properties": properties,
+        "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        "public_url": None,
+    }
+
+
+def generate_pages(spec: WorkspaceSpec) -> Iterator[Dict[str, Any]]:
+    """Yields the pages of the workspace in index order, one at a time."""
+    for index in range(spec.pages):
+        yield make_page(index, spec)
+
+
+def write_jsonl(spec: WorkspaceSpec, out) -> int:
+    """
+    Writes the workspace as JSONL, one page per line.
+
+    Args:
+        spec: The workspace.
+        out: A text stream.
+
+    Returns:
+        int: The number of pages written.
+    """
+    count = 0
+    for page in generate_pages(spec):
+        out.write(json.dumps(page, ensure_ascii=False, separators=(",", ":")))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def sort_pages(pages: List[Dict[str, Any]], sorts: List[Dict[str, Any]]):
+    """Sorts pages in place by Notion query sorts; pages without a value go last."""
+    # Stable sorts from the last criterion to the first; ties keep creation order
+    for sort in reversed(sorts):
+        descending = sort.get("direction") == "descending"
+
+        def key(page, sort=sort):
+            if "timestamp" in sort:
+                value = page.get(sort["timestamp"])
+            else:
+                value = property_value(page["properties"].get(sort["property"]))
+            return (value is None) != descending, value or ""
+
+        pages.sort(key=key, reverse=descending)
+
+
+# Local API stand-in
+
+_PAGE_PATH = re.compile(r"^/pages/([0-9a-f-]{32,36})$")
+_QUERY_PATH = re.compile(r"^/databases/([0-9a-f-]{32,36})/query$")
+_CHILDREN_PATH = re.compile(r"^/blocks/([0-9a-f-]{32,36})/children$")
+
+
+class LocalNotionApi:
+    """
+    Answers Notion API requests from a generated workspace.
+
+    Pages are rebuilt from the spec on each read and property updates are kept as
+    overrides, so memory stays small at a million pages; the matching page indexes
+    of a query are computed once and reused for its following cursors. Requests can
+    be slowed down by a fixed latency to imitate the network.
+    """
+
+    def __init__(
+        self,
+        spec: WorkspaceSpec,
+        latency: float = 0.0,
+        sleep: Callable = time.sleep,
+        cache_pages: bool = False,
+    ):
+        """
+        Initialize the LocalNotionApi.
+
+        Args:
+            spec: The workspace to serve.
+            latency: Seconds added to every request.
+            sleep: Sleep function used for the latency, injectable for benchmarks.
+            cache_pages: Keep generated pages in memory, so serving them costs no
+                generation time (for benchmarks of the client side).
+        """
+        self.spec = spec
+        self.database_id = spec.resolved_database_id()
+        self.latency = latency
+        self.sleep = sleep
+        self.requests = 0
+        self._overrides: Dict[int, Dict[str, Any]] = {}
+        self._pages: Optional[Dict[int, Dict[str, Any]]] = {} if cache_pages else None
+        self._queries: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def page(self, index: int) -> Dict[str, Any]:
+        """Returns page index with its updates applied."""
+        if self._pages is None:
+            page = make_page(index, self.spec)
+        else:
+            cached = self._pages.get(index)
+            if cached is None:
+                cached = self._pages.setdefault(index, make_page(index, self.spec))
+            page = {**cached, "properties": dict(cached["properties"])}
+        override = self._overrides.get(index)
+        if override:
+            page["properties"].update(override["properties"])
+            page["last_edited_time"] = override["last_edited_time"]
+        return page
+
+    def handle(
+        self, method: str, url: str, body: Optional[dict] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Answers one request.
+
+        Args:
+            method: The HTTP method.
+            url: The request URL; only the path after /v1 and the query string are used.
+            body: The decoded JSON body, if any.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: The status code and the JSON response.
+        """
+        with self._lock:
+            self.requests += 1
+        parts = urlsplit(url)
+        path = parts.path.split("/v1", 1)[-1].rstrip("/")
+        query = parse_qs(parts.query)
+        route = (
+            (method == "POST" and _QUERY_PATH.match(path), self._query),
+            (method == "GET" and _PAGE_PATH.match(path), self._get_page),
+            (method == "PATCH" and _PAGE_PATH.match(path), self._patch_page),
+            (method == "GET" and _CHILDREN_PATH.match(path), self._children),
+        )
+        for match, handler in route:
+            if match:
+                try:
+                    return handler(match.group(1), body or {}, query)
+                except UnsupportedFilterError as e:
+                    return _error(400, "validation_error", str(e))
+        return _error(
+            400, "invalid_request_url", f"Invalid request URL: {method} {path}"
+        )
+
+    def transport(
+        self, method: str, url: str, headers=None, data=None, **kwargs
+    ) -> requests.Response:
+        """Sends a request to the stand-in, with the signature of requests.request."""
+        if self.latency:
+            self.sleep(self.latency)
+        status, payload = self.handle(method, url, json.loads(data) if data else None)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        response._content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        response._content_consumed = True
+        return response
+
+    def _matching(self, body: Dict[str, Any]) -> List[int]:
+        key = json.dumps([body.get("filter"), body.get("sorts")], sort_keys=True)
+        with self._lock:
+            cached = self._queries.get(key)
+        if cached is not None:
+            return cached
+        condition = body.get("filter")
+        pages = (self.page(index) for index in range(self.spec.pages))
+        found = [
+            page
+            for page in pages
+            if condition is None or evaluate_filter(condition, page)
+        ]
+        sort_pages(found, body.get("sorts") or [])
+        indexes = [page_index(page["id"]) for page in found]
+        with self._lock:
+            self._queries[key] = indexes
+        return indexes
+
+    def _query(self, database_id: str, body: Dict[str, Any], query: dict):
+        if database_id.replace("-", "") != self.database_id.replace("-", ""):
+            return _error(
+                404,
+                "object_not_found",
+                f"Could not find database with ID: {database_id}.",
+            )
+        indexes = self._matching(body)
+        start = int(body.get("start_cursor") or 0)
+        end = start + min(int(body.get("page_size") or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        wanted = set(query.get("filter_properties", []))
+        results = []
+        for index in indexes[start:end]:
+            page = self.page(index)
+            if wanted:
+                page["properties"] = {
+                    name: prop
+                    for name, prop in page["properties"].items()
+                    if name in wanted or prop["id"] in wanted
+                }
+            results.append(page)
+        has_more = end < len(indexes)
+        return 200, {
+            "object": "list",
+            "results": results,
+            "next_cursor": str(end) if has_more else None,
+            "has_more": has_more,
+            "type": "page_or_database",
+            "page_or_database": {},
+        }
+
+    def _find(self, page_id: str) -> Optional[int]:
+        index = page_index(page_id)
+        if index >= self.spec.pages or self.page(index)["id"].replace(
+            "-", ""
+        ) != page_id.replace("-", ""):
+            return None
+        return index
+
+    def _get_page(self, page_id: str, body: Dict[str, Any], query: dict):
+        index = self._find(page_id)
+        if index is None:
+            return _error(
+                404, "object_not_found", f"Could not find page with ID: {page_id}."
+            )
+        return 200, self.page(index)
+
+    def _patch_page(self, page_id: str, body: Dict[str, Any], query: dict):
+        index = self._find(page_id)
+        if index is None:
+            return _error(
+                404, "object_not_found", f"Could not find page with ID: {page_id}."
+            )
+        properties = {}
+        for name, value in body.get("properties", {}).items():
+            kind = next(iter(value))
+            properties[name] = {
+                "id": PROPERTY_IDS.get(name, name),
+                "type": kind,
+                kind: value[kind],
+            }
+        edited = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:00.000Z")
+        with self._lock:
+            override = self._overrides.setdefault(index, {"properties": {}})
+            override["properties"].update(properties)
+            override["last_edited_time"] = edited
+            # Updated pages may no longer match the cached queries
+            self._queries.clear()
+        return 200, self.page(index)
+
+    def _children(self, block_id: str, body: Dict[str, Any], query: dict):
+        return 200, {
+            "object": "list",
+            "results": [],
+            "next_cursor": None,
+            "has_more": False,
+        }
+
+
+def _error(status: int, code: str, message: str) -> Tuple[int, Dict[str, Any]]:
+    return status, {
+        "object": "error",
+        "status": status,
+        "code": code,
+        "message": message,
+    }
+
+
+def serve(api: LocalNotionApi, port: int, host: str = "127.0.0.1"):
+    """Serves the stand-in over HTTP until interrupted."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            data = self.rfile.read(length) if length else None
+            if api.latency:
+                api.sleep(api.latency)
+            status, payload = api.handle(
+                self.command, self.path, json.loads(data) if data else None
+            )
+            content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PATCH = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"NOTION_BASE_URL=http://{host}:{port}/v1")
+    print(f"NOTION_DATABASE_ID={api.database_id}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def spec_from_args(args: argparse.Namespace) -> WorkspaceSpec:
+    """Builds a WorkspaceSpec from the options added by add_spec_arguments."""
+    return WorkspaceSpec(
+        pages=args.pages,
+        seed=args.seed,
+        database_id=args.database_id,
+        days=args.days,
+        notes_words=args.notes_words,
+        url_rate=args.url_rate,
+        unicode_rate=args.unicode_rate,
+        missing_rate=args.missing_rate,
+    )
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser, pages: bool = True):
+    """Adds the workspace options to a parser (shared with the benchmarks)."""
+    if pages:
+        parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-id")
+    parser.add_argument("--days", type=int, default=365, help="Span of the Fecha dates")
+    parser.add_argument(
+        "--notes-words", type=float, default=30.0, help="Mean words of the notes"
+    )
+    parser.add_argument("--url-rate", type=float, default=0.3)
+    parser.add_argument("--unicode-rate", type=float, default=0.2)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_spec_arguments(parser)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", type=Path, help="JSONL file, or - for stdout")
+    target.add_argument("--serve", type=int, metavar="PORT")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per request"
+    )
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    if args.serve:
+        serve(LocalNotionApi(spec, latency=args.latency), args.serve)
+    elif str(args.out) == "-":
+        write_jsonl(spec, sys.stdout)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            count = write_jsonl(spec, f)
+        print(f"Wrote {count} pages to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,26 @@ set -euo pipefail
 
 # Package only the source code (app/) into lambda.zip
 # Ensures app/ is at zip root and excludes caches/tests
+# The code is staged in build/code and shipped with bytecode compiled for the
+# Lambda runtime, because /var/task is read-only and cannot cache it at runtime.
+#
+# Config via env vars:
+#   RUNTIME=python3.12         # Python runtime the bytecode is compiled for
+#   LAMBDA_ARCH=x86_64         # or arm64 (only used when compiling in Docker)
+#   PRECOMPILE=true            # false to ship sources only
+#   OPTIMIZE_LEVELS=0          # e.g. "0 2" when the function sets PYTHONOPTIMIZE=2
+#   SOURCELESS=false           # true to ship .pyc only (no .py sources)
 # Usage:
 #   scripts/package_code.sh
 
 ZIP_NAME=${ZIP_NAME:-lambda.zip}
 SRC_DIR=app
+RUNTIME=${RUNTIME:-python3.12}
+LAMBDA_ARCH=${LAMBDA_ARCH:-x86_64}
+PRECOMPILE=${PRECOMPILE:-true}
+OPTIMIZE_LEVELS=${OPTIMIZE_LEVELS:-0}
+SOURCELESS=${SOURCELESS:-false}
+STAGE_DIR="build/code"
 
 if [[ ! -d "$SRC_DIR" ]]; then
   echo "[package-code] $SRC_DIR directory not found" >&2
@@ -16,14 +31,52 @@ fi
 
 rm -f "$ZIP_NAME"
 
-echo "[package-code] Creating $ZIP_NAME from $SRC_DIR"
-zip -r "$ZIP_NAME" "$SRC_DIR" \
-  -x "*.DS_Store" \
-     "${SRC_DIR}/**/__pycache__/*" \
-     "${SRC_DIR}/**/*.pyc" \
-     "${SRC_DIR}/**/tests/*" \
-     "tests/*" \
-     "layer/*" \
-     "$ZIP_NAME" >/dev/null
+# Determine Python executable (prefer venv)
+PYTHON_CMD="python3"
+if [[ -f ".venv/bin/python" ]]; then
+    PYTHON_CMD=".venv/bin/python"
+fi
+
+echo "[package-code] Compiling email template"
+$PYTHON_CMD -m app.common.adapter.template_compiler
+
+echo "[package-code] Staging $SRC_DIR in $STAGE_DIR"
+rm -rf "$STAGE_DIR"
+mkdir -p "$STAGE_DIR"
+cp -R "$SRC_DIR" "$STAGE_DIR/"
+find "$STAGE_DIR" -type d \( -name "__pycache__" -o -name "tests" \) -prune -exec rm -rf {} +
+find "$STAGE_DIR" -type f \( -name "*.pyc" -o -name ".DS_Store" \) -delete
+
+if [[ "$PRECOMPILE" == "true" ]]; then
+  PRECOMPILE_ARGS=(--runtime "$RUNTIME" --optimize ${=OPTIMIZE_LEVELS})
+  [[ "$SOURCELESS" == "true" ]] && PRECOMPILE_ARGS+=(--sourceless)
+  LOCAL_RUNTIME=$($PYTHON_CMD -c 'import sys; print(f"python{sys.version_info.major}.{sys.version_info.minor}")')
+
+  if [[ "$LOCAL_RUNTIME" == "$RUNTIME" ]]; then
+    echo "[package-code] Precompiling with $PYTHON_CMD"
+    $PYTHON_CMD -m scripts.precompile "$STAGE_DIR/$SRC_DIR" "${PRECOMPILE_ARGS[@]}"
+  elif command -v docker >/dev/null 2>&1; then
+    case "$LAMBDA_ARCH" in
+      x86_64) DOCKER_PLATFORM=linux/amd64 ;;
+      arm64)  DOCKER_PLATFORM=linux/arm64 ;;
+      *) echo "[package-code] Unknown LAMBDA_ARCH: $LAMBDA_ARCH (use x86_64 or arm64)" >&2; exit 1 ;;
+    esac
+    IMAGE="public.ecr.aws/sam/build-${RUNTIME}"
+    echo "[package-code] Precompiling with $IMAGE ($LOCAL_RUNTIME does not match $RUNTIME)"
+    docker run --rm \
+      --platform "$DOCKER_PLATFORM" \
+      -v "$PWD":/var/task -w /var/task \
+      "$IMAGE" \
+      python -m scripts.precompile "$STAGE_DIR/$SRC_DIR" "${PRECOMPILE_ARGS[@]}"
+  else
+    echo "[package-code] WARNING: $LOCAL_RUNTIME does not match $RUNTIME and Docker is not available; shipping sources only"
+  fi
+fi
+
+echo "[package-code] Creating $ZIP_NAME from $STAGE_DIR/$SRC_DIR"
+(
+  cd "$STAGE_DIR"
+  zip -r "../../$ZIP_NAME" "$SRC_DIR" >/dev/null
+)
 
 echo "[package-code] Done: $ZIP_NAME"
@@ -0,0 +1,133 @@
+"""
+Precompiles a deployment directory to bytecode and trims unused botocore data.
+
+Lambda extracts the code and layers to read-only directories, so bytecode that is
+not shipped is compiled again on every cold start. The .pyc files are written with
+unchecked hashes: the runtime loads them without comparing source timestamps,
+which zip extraction does not preserve reliably.
+
+Must run on the same Python version as the Lambda runtime, since bytecode is
+version specific (scripts/build_layer.sh runs it inside the runtime's build image).
+
+Usage:
+    python -m scripts.precompile DIR [--runtime python3.12] [--optimize 0 [1 2]]
+        [--sourceless] [--keep-botocore-services ses,sts]
+"""
+
+import argparse
+import compileall
+import py_compile
+import shutil
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+def check_runtime(runtime: str):
+    """
+    Fails unless the running interpreter matches the Lambda runtime.
+
+    Args:
+        runtime: Lambda runtime identifier, e.g. "python3.12".
+
+    Raises:
+        SystemExit: When the versions differ.
+    """
+    current = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    if current != runtime:
+        raise SystemExit(
+            f"Bytecode for {runtime} cannot be built with {current}; "
+            "run this inside the runtime's build image"
+        )
+
+
+def precompile(
+    root: Path, optimize: Iterable[int] = (0,), sourceless: bool = False
+) -> bool:
+    """
+    Compiles every module under root.
+
+    Args:
+        root: Directory to compile, e.g. layer/python or a staged app/.
+        optimize: Optimization levels to write. Lambda loads level 0 unless the
+            function sets PYTHONOPTIMIZE.
+        sourceless: Writes module.pyc next to module.py and deletes the source, so
+            imports find the bytecode without a __pycache__ lookup. Tracebacks no
+            longer show source lines.
+
+    Returns:
+        bool: True when every module compiled.
+    """
+    ok = compileall.compile_dir(
+        str(root),
+        quiet=1,
+        legacy=sourceless,
+        optimize=list(optimize),
+        workers=0,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+    if sourceless and ok:
+        for source in root.rglob("*.py"):
+            if source.with_suffix(".pyc").exists():
+                source.unlink()
+    return bool(ok)
+
+
+def trim_botocore(site_dir: Path, keep_services: Iterable[str]) -> int:
+    """
+    Deletes the botocore and boto3 service models of services the code does not call.
+
+    Only service directories are removed; shared files such as endpoints.json stay.
+
+    Args:
+        site_dir: Directory the packages were installed to.
+        keep_services: Service names whose models are kept, e.g. ("ses",).
+
+    Returns:
+        int: Number of service directories removed.
+    """
+    keep = set(keep_services)
+    removed = 0
+    for data_dir in (site_dir / "botocore" / "data", site_dir / "boto3" / "data"):
+        if not data_dir.is_dir():
+            continue
+        for entry in data_dir.iterdir():
+            if entry.is_dir() and entry.name not in keep:
+                shutil.rmtree(entry)
+                removed += 1
+    return removed
+
+
+def remove_bytecode_caches(root: Path):
+    """Deletes __pycache__ directories, e.g. the timestamp-based ones left by pip."""
+    for cache_dir in list(root.rglob("__pycache__")):
+        shutil.rmtree(cache_dir)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--runtime", help="Fail unless running on this runtime")
+    parser.add_argument("--optimize", type=int, nargs="+", default=[0])
+    parser.add_argument("--sourceless", action="store_true")
+    parser.add_argument(
+        "--keep-botocore-services",
+        help="Comma-separated services whose botocore models are kept; "
+        "all models are kept when omitted",
+    )
+    args = parser.parse_args(argv)
+
+    if args.runtime:
+        check_runtime(args.runtime)
+    if args.keep_botocore_services is not None:
+        services = [s for s in args.keep_botocore_services.split(",") if s]
+        removed = trim_botocore(args.root, services)
+        print(f"[precompile] Removed {removed} unused botocore/boto3 service models")
+    remove_bytecode_caches(args.root)
+    if not precompile(args.root, args.optimize, args.sourceless):
+        raise SystemExit(f"[precompile] Compilation failed in {args.root}")
+    print(f"[precompile] Compiled {args.root} (optimize={args.optimize})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from app.common.adapter.digest_diff import DigestSnapshot, DigestState
+
+
+def _task(task_id, fecha="2025-03-01", notas="", editado="2025-03-01T10:00:00.000Z"):
+    return {
+        "id": task_id,
+        "titulo": f"Task {task_id}",
+        "fecha": fecha,
+        "notas": notas,
+        "editado": editado,
+    }
+
+
+class TestDigestSnapshot(unittest.TestCase):
+    def test_fingerprint_ignores_order_and_page_content(self):
+        """Test that the same tasks in any order have the same fingerprint"""
+        tasks = [_task("a"), _task("b")]
+        reordered = [{**tasks[1], "contenido": "body"}, tasks[0]]
+
+        self.assertEqual(
+            DigestSnapshot.from_tasks(tasks).fingerprint,
+            DigestSnapshot.from_tasks(reordered).fingerprint,
+        )
+        self.assertNotEqual(
+            DigestSnapshot.from_tasks(tasks).fingerprint,
+            DigestSnapshot.from_tasks([_task("a"), _task("b", notas="x")]).fingerprint,
+        )
+
+    def test_diff_classifies_changes(self):
+        """Test that the diff finds added, rescheduled, updated and removed tasks"""
+        previous = DigestSnapshot.from_tasks(
+            [_task("same"), _task("moved"), _task("edited"), _task("done")]
+        )
+        current = [
+            _task("same"),
+            _task("new"),
+            _task("moved", fecha="2025-03-05"),
+            _task("edited", editado="2025-03-02T08:00:00.000Z"),
+        ]
+
+        diff = previous.diff(current)
+
+        self.assertEqual([task["id"] for task in diff.added], ["new"])
+        self.assertEqual([task["id"] for task in diff.rescheduled], ["moved"])
+        self.assertEqual([task["id"] for task in diff.updated], ["edited"])
+        self.assertEqual(
+            diff.removed, [{"id": "done", "fecha": "2025-03-01", "titulo": "Task done"}]
+        )
+        self.assertEqual(len(diff.changed_tasks), 3)
+
+    def test_tasks_dropped_from_snapshot_are_not_removed(self):
+        """Test that without() drops tasks from the fingerprint and the diff"""
+        previous = DigestSnapshot.from_tasks([_task("a"), _task("notified")])
+
+        snapshot = previous.without(["notified"])
+
+        self.assertEqual(snapshot, DigestSnapshot.from_tasks([_task("a")]))
+        self.assertEqual(snapshot.diff([_task("a")]).summary()["removed"], 0)
+
+
+class TestDigestState(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "state", "digest.json")
+
+    def test_snapshot_round_trip(self):
+        """Test that a saved snapshot is loaded back unchanged"""
+        snapshot = DigestSnapshot.from_tasks([_task("a"), _task("b", fecha=None)])
+        DigestState(self.path).save(snapshot)
+
+        self.assertEqual(DigestState(self.path).load(), snapshot)
+
+    def test_unreadable_state_is_ignored(self):
+        """Test that a missing or corrupt file means no previous digest"""
+        self.assertIsNone(DigestState(self.path).load())
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        with self.assertLogs("app.common.adapter.digest_diff", level="WARNING"):
+            self.assertIsNone(DigestState(self.path).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+from unittest.mock import patch
+from app.common.adapter.digest_diff import DigestDiff
 from app.common.adapter.email_adapter import EmailAdapter
+from app.common.dates.date_service import DateService
 
 
 class TestEmailAdapter(unittest.TestCase):
@@ -65,10 +68,19 @@ class TestEmailAdapter(unittest.TestCase):
 
     def test_generate_task_rows_returns_html(self):
         """Test that _generate_task_rows returns HTML string."""
-        result = self.adapter._generate_task_rows(self.sample_tasks)
+        result, _ = self.adapter._generate_task_rows(self.sample_tasks)
         self.assertIn("<tr", result)
         self.assertIn("task-row", result)
 
+    def test_generate_task_row_is_minified(self):
+        """Test that task rows carry no indentation or line breaks."""
+        result = self.adapter._generate_task_row(self.sample_tasks[0])
+        self.assertTrue(
+            result.startswith('<tr class="task-row"><td class="date-cell">')
+        )
+        self.assertNotIn("\n", result)
+        self.assertNotIn("  ", result)
+
     def test_generate_task_row_contains_date_pill(self):
         """Test that task row contains date pill element."""
         task = self.sample_tasks[0]
@@ -129,6 +141,12 @@ class TestEmailAdapter(unittest.TestCase):
         result = self.adapter._format_date("invalid-date")
         self.assertEqual(result, "Invalid")
 
+    def test_format_date_handles_notion_datetimes(self):
+        """Test that _format_date renders datetimes with an offset instead of 'Invalid'."""
+        adapter = EmailAdapter(date_service=DateService("UTC"))
+        result = adapter._format_date("2025-01-01T10:00:00.000+02:00")
+        self.assertEqual(result, "Jan 01 08:00")
+
     def test_format_date_handles_different_months(self):
         """Test that _format_date handles different months correctly."""
         self.assertEqual(self.adapter._format_date("2024-01-15"), "Jan 15")
@@ -192,6 +210,82 @@ class TestEmailAdapter(unittest.TestCase):
         self.assertNotIn("Test Task 1", body2)
         self.assertIn("Item", subject2)
 
+    def test_page_content_rendered_with_line_breaks(self):
+        """Test that the page body summary is escaped, linkified and keeps its lines."""
+        tasks = [
+            {
+                "id": "1",
+                "titulo": "Task",
+                "fecha": "2024-12-05",
+                "notas": "",
+                "contenido": "Step <1>\nSee https://example.com",
+            }
+        ]
+        _, body = self.adapter.convert_to_email_format(tasks)
+        self.assertIn('class="task-notes task-content"', body)
+        self.assertIn("Step &lt;1&gt;<br>See ", body)
+        self.assertIn('<a href="https://example.com" class="link-text">', body)
+
+    def test_page_content_omitted_when_empty(self):
+        """Test that no content block is rendered without a page body summary."""
+        _, body = self.adapter.convert_to_email_format(self.sample_tasks)
+        self.assertNotIn("task-content", body)
+
+    def test_render_digest_matches_convert_to_email_format(self):
+        """Test that render_digest returns the same subject and HTML as convert_to_email_format."""
+        email = self.adapter.render_digest(self.sample_tasks)
+        self.assertEqual(
+            (email.subject, email.html_body),
+            self.adapter.convert_to_email_format(self.sample_tasks),
+        )
+
+    def test_render_digest_text_body(self):
+        """Test that the plain-text body lists each task with its date and indented notes."""
+        tasks = self.sample_tasks + [
+            {
+                "id": "task-3",
+                "titulo": "A <b>raw</b> title",
+                "fecha": None,
+                "notas": "",
+                "contenido": "Line one\nhttps://example.com",
+            }
+        ]
+        text = self.adapter.render_digest(tasks).text_body
+        self.assertTrue(text.startswith("Task Digest\nYou have 3 pending items"))
+        self.assertIn("- [Nov 24] Test Task 1\n    Some notes here\n\n", text)
+        self.assertIn("- [Dec 01] Test Task 2\n\n", text)
+        self.assertIn(
+            "- [No Date] A <b>raw</b> title\n    Line one\n    https://example.com\n",
+            text,
+        )
+        self.assertNotIn("<tr", text)
+
+    def test_render_digest_formats_each_date_once(self):
+        """Test that both bodies are rendered from a single date label per task."""
+        with patch.object(
+            self.adapter, "_format_date", wraps=self.adapter._format_date
+        ) as format_date:
+            self.adapter.render_digest(self.sample_tasks)
+        self.assertEqual(format_date.call_count, len(self.sample_tasks))
+
+    def test_render_changes_lists_only_changed_tasks(self):
+        """Test that the changes email has one section per kind of change."""
+        diff = DigestDiff(
+            added=[self.sample_tasks[0]],
+            removed=[{"id": "old", "titulo": "Done task", "fecha": "2024-11-20"}],
+        )
+
+        email = self.adapter.render_changes(diff, 5)
+
+        self.assertEqual(
+            email.subject, "Task List: 5 Items Pending (1 new, 1 no longer pending)"
+        )
+        self.assertIn(">New (1)</td>", email.html_body)
+        self.assertIn("Test Task 1", email.html_body)
+        self.assertNotIn("Test Task 2", email.html_body)
+        self.assertIn("No longer pending (1)\n- [Nov 20] Done task", email.text_body)
+        self.assertIn("You have 5 pending items", email.text_body)
+
 
 if __name__ == "__main__":
     unittest.main()
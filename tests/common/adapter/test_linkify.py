@@ -0,0 +1,78 @@
+import html
+import re
+import unittest
+from app.common.adapter.linkify import linkify
+
+
+def legacy_linkify(notes):
+    """The escape-then-substitute implementation linkify replaces."""
+    escaped_notes = html.escape(notes)
+    url_pattern = r'(https?://[^\s<>"]+|www\.[^\s<>"]+)'
+
+    def replace_url(match):
+        url = match.group(1)
+        href = url if url.startswith("http") else f"https://{url}"
+        return f'<a href="{href}" class="link-text">{url}</a>'
+
+    return re.sub(url_pattern, replace_url, escaped_notes)
+
+
+class TestLinkify(unittest.TestCase):
+    def test_matches_legacy_output_without_edge_cases(self):
+        """Test that output is byte-for-byte identical where the old output was right."""
+        notes = [
+            "",
+            "No links here & <b>markup</b> \"quoted\" 'single'",
+            "See https://example.com/path?a=1&b=2 for details",
+            "Visit www.example.com\nand http://test.org/x#frag",
+            "café https://例え.jp/パス ok",
+            "two https://a.com https://b.com/c",
+        ]
+        for note in notes:
+            with self.subTest(note=note):
+                self.assertEqual(linkify(note), legacy_linkify(note))
+
+    def test_trailing_punctuation_is_not_linked(self):
+        """Test that sentence punctuation after a URL stays outside the link."""
+        self.assertEqual(
+            linkify("Go to https://example.com/a. Then www.b.com, ok?"),
+            'Go to <a href="https://example.com/a" class="link-text">'
+            "https://example.com/a</a>. Then "
+            '<a href="https://www.b.com" class="link-text">www.b.com</a>, ok?',
+        )
+
+    def test_unbalanced_parenthesis_is_not_linked(self):
+        """Test that a closing parenthesis around a URL stays outside the link."""
+        self.assertEqual(
+            linkify("(see https://example.com)"),
+            '(see <a href="https://example.com" class="link-text">'
+            "https://example.com</a>)",
+        )
+
+    def test_balanced_parentheses_are_kept(self):
+        """Test that parentheses belonging to the URL are linked."""
+        url = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+        self.assertIn(f">{url}</a>", linkify(f"Read {url}."))
+
+    def test_angle_brackets_end_the_url(self):
+        """Test that <url> is linked without the escaped brackets."""
+        self.assertEqual(
+            linkify("<https://example.com>"),
+            '&lt;<a href="https://example.com" class="link-text">'
+            "https://example.com</a>&gt;",
+        )
+
+    def test_bare_prefix_is_not_linked(self):
+        """Test that a prefix without a host is left as text."""
+        self.assertEqual(linkify("www. and http://."), "www. and http://.")
+
+    def test_url_is_escaped_in_href_and_text(self):
+        """Test that special characters inside URLs are escaped."""
+        self.assertIn(
+            'href="https://a.com/?q=1&amp;r=&#x27;x&#x27;z"',
+            linkify("https://a.com/?q=1&r='x'z"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.common.adapter.email_adapter import EmailAdapter
+from app.common.adapter.row_cache import RowFragmentCache
+
+
+def _task(task_id="1", edited="2025-01-01T10:00:00.000Z", **fields):
+    return {
+        "id": task_id,
+        "titulo": fields.get("titulo", "Task"),
+        "fecha": fields.get("fecha", "2025-01-02"),
+        "notas": fields.get("notas", "See www.example.com"),
+        "editado": edited,
+    }
+
+
+class TestRowFragmentCache(unittest.TestCase):
+    def test_unchanged_rows_are_not_rendered_again(self):
+        """Test that a second digest reuses the rows of unedited tasks."""
+        adapter = EmailAdapter(row_cache=RowFragmentCache())
+        tasks = [_task("1"), _task("2")]
+        _, first = adapter.convert_to_email_format(tasks)
+
+        with patch.object(
+            adapter, "_generate_task_row", wraps=adapter._generate_task_row
+        ) as render:
+            _, second = adapter.convert_to_email_format(
+                [_task("1"), _task("2", edited="2025-01-03T08:00:00.000Z")]
+            )
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_cached_rows_match_uncached_rendering(self):
+        """Test that the cache does not change the generated email."""
+        tasks = [_task("1"), _task("2", notas="<b>x</b> https://a.b/c")]
+        cached = EmailAdapter(row_cache=RowFragmentCache())
+        cached.convert_to_email_format(tasks)
+
+        self.assertEqual(
+            cached.convert_to_email_format(tasks),
+            EmailAdapter().convert_to_email_format(tasks),
+        )
+
+    def test_content_change_within_same_edit_time_is_rendered(self):
+        """Test that a row is re-rendered when its fields changed but the edit time did not."""
+        cache = RowFragmentCache()
+        adapter = EmailAdapter(row_cache=cache)
+        adapter.convert_to_email_format([_task(titulo="Old")])
+
+        _, body = adapter.convert_to_email_format([_task(titulo="New")])
+
+        self.assertIn("New", body)
+        self.assertNotIn("Old", body)
+
+    def test_template_version_is_part_of_the_key(self):
+        """Test that rows rendered by another template version are not reused."""
+        cache = RowFragmentCache()
+        cache.set(_task(), "1", "<tr>v1</tr>")
+
+        self.assertEqual(cache.get(_task(), "1"), "<tr>v1</tr>")
+        self.assertIsNone(cache.get(_task(), "2"))
+
+    def test_tasks_without_edit_time_are_not_cached(self):
+        """Test that tasks missing last_edited_time are always rendered."""
+        cache = RowFragmentCache()
+        cache.set(_task(edited=None), "1", "<tr></tr>")
+
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_is_bounded(self):
+        """Test that least recently used rows are dropped beyond max_entries."""
+        cache = RowFragmentCache(max_entries=2)
+        for task_id in ("1", "2", "3"):
+            cache.set(_task(task_id), "1", task_id)
+
+        self.assertIsNone(cache.get(_task("1"), "1"))
+        self.assertEqual(cache.get(_task("3"), "1"), "3")
+
+    def test_rows_persist_to_file(self):
+        """Test that saved rows are loaded by a new cache instance."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "rows.json")
+            cache = RowFragmentCache(path=path)
+            cache.set(_task(), "1", "<tr>row</tr>")
+            cache.save()
+
+            restored = RowFragmentCache(path=path)
+
+            self.assertEqual(restored.get(_task(), "1"), "<tr>row</tr>")
+
+    def test_multi_part_rows_persist_as_tuples(self):
+        """Test that (html, text) rows are restored as tuples."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "rows.json")
+            cache = RowFragmentCache(path=path)
+            cache.set(_task(), "1", ("<tr>row</tr>", "- row"))
+            cache.save()
+
+            restored = RowFragmentCache(path=path)
+
+            self.assertEqual(restored.get(_task(), "1"), ("<tr>row</tr>", "- row"))
+
+    def test_unreadable_file_is_ignored(self):
+        """Test that a corrupt cache file starts an empty cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "rows.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{not json")
+
+            self.assertEqual(len(RowFragmentCache(path=path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
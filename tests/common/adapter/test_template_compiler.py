@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from app.common.adapter.email_adapter import EmailAdapter
+from app.common.adapter.template_compiler import (
+    build,
+    compile_template,
+    is_up_to_date,
+    minify_css,
+)
+
+TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        /* Layout */
+        body { margin: 0; }
+        .header { color: red; padding: 4px 8px; }
+        .header h1 { color: blue; }
+        h1 { font-size: 20px; }
+        .row td { padding: 1px; }
+        .row:last-child td { border: none; }
+        .cell { width: 10px !important; }
+    </style>
+</head>
+<body>
+    <div class="header extra" style="color: green;">
+        <h1>Title</h1>
+        <p>You have <strong>{{count}}</strong> tasks.</p>
+    </div>
+    <table>
+        <tbody>
+            {{rows}}
+        </tbody>
+    </table>
+</body>
+</html>
+"""
+
+
+class TestTemplateCompiler(unittest.TestCase):
+    def setUp(self):
+        self.compiled = compile_template(TEMPLATE)
+
+    def test_minify_css_removes_comments_and_whitespace(self):
+        """Test that comments, spaces around punctuation and final semicolons are removed."""
+        self.assertEqual(
+            minify_css("/* x */ .a , .b {\n  color : red ;\n  margin: 0 auto; }"),
+            ".a,.b{color:red;margin:0 auto}",
+        )
+
+    def test_rules_are_inlined_by_specificity(self):
+        """Test that matching rules are inlined in specificity order before the own style."""
+        self.assertIn('<body style="margin:0">', self.compiled)
+        self.assertIn(
+            '<div style="color:red;padding:4px 8px;color:green">', self.compiled
+        )
+        self.assertIn('<h1 style="font-size:20px;color:blue">Title</h1>', self.compiled)
+
+    def test_runtime_and_unsupported_rules_stay_in_style_block(self):
+        """Test that row, pseudo-class, !important and bare tag rules are kept in <style>."""
+        self.assertIn(
+            "<style>h1{font-size:20px}.row td{padding:1px}"
+            ".row:last-child td{border:none}.cell{width:10px !important}</style>",
+            self.compiled,
+        )
+        self.assertNotIn(".header", self.compiled)
+        self.assertNotIn("body{", self.compiled)
+
+    def test_whitespace_is_collapsed_and_placeholders_kept(self):
+        """Test that indentation is dropped while inline spacing and placeholders remain."""
+        self.assertIn(
+            "<p>You have <strong>{{count}}</strong> tasks.</p>", self.compiled
+        )
+        self.assertIn("<tbody>{{rows}}</tbody>", self.compiled)
+        self.assertNotIn("\n", self.compiled)
+        self.assertTrue(self.compiled.startswith("<!DOCTYPE html><html><head>"))
+
+    def test_compiled_template_is_up_to_date(self):
+        """Test that the committed compiled template was built from the current source."""
+        self.assertTrue(
+            is_up_to_date(),
+            "Run python -m app.common.adapter.template_compiler",
+        )
+
+    def test_build_writes_compiled_template(self):
+        """Test that build writes the compiled template next to its source."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "template.html"
+            compiled = Path(tmp_dir) / "template.min.html"
+            source.write_text(TEMPLATE, encoding="utf-8")
+
+            build(source, compiled)
+
+            self.assertTrue(is_up_to_date(source, compiled))
+            source.write_text(TEMPLATE.replace("Title", "Other"), encoding="utf-8")
+            self.assertFalse(is_up_to_date(source, compiled))
+
+    def test_adapter_falls_back_to_source_template(self):
+        """Test that EmailAdapter loads the source template when no build exists."""
+        adapter = EmailAdapter()
+        adapter.TEMPLATE_PATH = os.path.join(tempfile.gettempdir(), "missing.min.html")
+
+        self.assertIn("<style>", adapter._load_template())
+        self.assertIn("{{task_rows}}", adapter._load_template())
+
+
+if __name__ == "__main__":
+    unittest.main()
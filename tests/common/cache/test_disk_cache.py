@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from app.common.cache.disk_cache import DiskCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test cases for DiskCache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.clock = FakeClock()
+        self.cache = DiskCache(self.tmp_dir.name, clock=self.clock)
+
+    def test_round_trip(self):
+        self.cache.set("key", {"a": [1, 2]})
+        self.assertEqual(self.cache.get("key"), {"a": [1, 2]})
+
+    def test_survives_new_instance(self):
+        """Test that entries are shared by caches on the same directory."""
+        self.cache.set("key", "value")
+        other = DiskCache(self.tmp_dir.name, clock=self.clock)
+        self.assertEqual(other.get("key"), "value")
+
+    def test_expired_entries_are_removed(self):
+        self.cache.set("key", "value", ttl=10)
+        self.clock.now += 10
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_delete_where_matches_keys(self):
+        self.cache.set("v1|pages/1", 1)
+        self.cache.set("v1|pages/2", 2)
+        removed = self.cache.delete_where(lambda key: key.endswith("/1"))
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.cache.get("v1|pages/1"))
+        self.assertEqual(self.cache.get("v1|pages/2"), 2)
+
+    def test_unserializable_value_is_ignored(self):
+        self.cache.set("key", object())
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_clear(self):
+        self.cache.set("a", 1)
+        self.cache.delete("missing")
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
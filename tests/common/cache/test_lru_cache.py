@@ -0,0 +1,75 @@
+import unittest
+from app.common.cache.lru_cache import CacheStats, LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for LRUCache."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_entries=2, clock=self.clock)
+
+    def test_get_returns_stored_value(self):
+        self.cache.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_get_missing_returns_default(self):
+        self.assertEqual(self.cache.get("missing", "default"), "default")
+        self.assertEqual(self.cache.stats.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        """Test that the size bound evicts the least recently used key."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.set("a", 1, ttl=10)
+        self.clock.now += 9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.clock.now += 1
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats.expirations, 1)
+
+    def test_default_ttl_applies(self):
+        cache = LRUCache(max_entries=2, default_ttl=5, clock=self.clock)
+        cache.set("a", 1)
+        self.clock.now += 5
+        self.assertIsNone(cache.get("a"))
+
+    def test_delete_and_delete_where(self):
+        self.cache.set("page:1", 1)
+        self.cache.set("page:2", 2)
+        self.assertTrue(self.cache.delete("page:1"))
+        self.assertFalse(self.cache.delete("page:1"))
+        self.assertEqual(self.cache.delete_where(lambda k: k.startswith("page:")), 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats.invalidations, 2)
+
+    def test_rejects_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(max_entries=0)
+
+    def test_hit_ratio(self):
+        stats = CacheStats(hits=3, misses=1)
+        self.assertEqual(stats.hit_ratio, 0.75)
+        self.assertEqual(CacheStats().hit_ratio, 0.0)
+        self.assertEqual(stats.as_dict()["hit_ratio"], 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+from app.common.cache.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def setUp(self):
+        self.flight = SingleFlight()
+
+    def _run_concurrently(self, count, fn):
+        results, errors = [], []
+        started = threading.Barrier(count)
+
+        def worker():
+            started.wait()
+            try:
+                results.append(self.flight.do("key", fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+
+    def test_concurrent_calls_execute_once(self):
+        """Test that a burst of identical calls runs the function once."""
+        calls = []
+        release = threading.Event()
+
+        def fn():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "result"
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self._run_concurrently(5, fn)
+        timer.cancel()
+
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+
+    def test_errors_are_shared_with_waiters(self):
+        release = threading.Event()
+
+        def fn():
+            release.wait(timeout=5)
+            raise RuntimeError("boom")
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self._run_concurrently(3, fn)
+        timer.cancel()
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+
+    def test_sequential_calls_execute_again(self):
+        """Test that the key is released after completion."""
+        self.assertEqual(self.flight.do("key", lambda: 1), 1)
+        self.assertEqual(self.flight.do("key", lambda: 2), 2)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
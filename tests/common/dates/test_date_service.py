@@ -0,0 +1,88 @@
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from app.common.dates import date_service
+from app.common.dates.date_service import DateService, get_date_service
+
+
+def _fixed_now(value):
+    return lambda tz: value.astimezone(tz)
+
+
+class TestDateService(unittest.TestCase):
+    def test_today_uses_configured_timezone(self):
+        """Test that today is computed in the configured timezone, not UTC."""
+        utc_now = datetime(2025, 1, 1, 23, 30, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            DateService("UTC", now=_fixed_now(utc_now)).today_iso(), "2025-01-01"
+        )
+        self.assertEqual(
+            DateService("Europe/Madrid", now=_fixed_now(utc_now)).today_iso(),
+            "2025-01-02",
+        )
+        self.assertEqual(
+            DateService("America/Bogota", now=_fixed_now(utc_now)).today(),
+            date(2025, 1, 1),
+        )
+
+    def test_parse_date_fast_path(self):
+        """Test that YYYY-MM-DD values parse to dates."""
+        self.assertEqual(DateService().parse("2025-03-09"), date(2025, 3, 9))
+
+    def test_parse_datetime_converts_to_timezone(self):
+        """Test that Notion datetimes with an offset are converted to the timezone."""
+        service = DateService("UTC")
+
+        parsed = service.parse("2025-01-01T10:00:00.000+02:00")
+
+        self.assertEqual(parsed, datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc))
+        self.assertEqual(service.parse("2025-01-01T10:00:00.000Z").hour, 10)
+
+    def test_label_formats_dates_and_datetimes(self):
+        """Test that labels are 'Mon DD', with the local time for datetimes."""
+        service = DateService("Europe/Madrid")
+
+        self.assertEqual(service.label("2024-11-24"), "Nov 24")
+        self.assertEqual(service.label("2025-01-01T10:00:00.000+02:00"), "Jan 01 09:00")
+        self.assertEqual(service.label("2025-07-04T23:30:00"), "Jul 04 23:30")
+
+    def test_label_handles_missing_and_invalid_values(self):
+        """Test that empty and unparseable values get fixed labels."""
+        service = DateService()
+
+        self.assertEqual(service.label(None), "No Date")
+        self.assertEqual(service.label(""), "No Date")
+        self.assertEqual(service.label("invalid-date"), "Invalid")
+        self.assertEqual(service.label("2025-02-30"), "Invalid")
+
+    def test_labels_are_memoized(self):
+        """Test that each distinct value is parsed once."""
+        service = DateService()
+        with patch.object(service, "parse", wraps=service.parse) as parse:
+            for _ in range(3):
+                service.label("2025-05-01")
+                service.label("2025-05-02")
+
+        self.assertEqual(parse.call_count, 2)
+
+    def test_unknown_timezone_raises_value_error(self):
+        """Test that an unknown timezone is rejected."""
+        with self.assertRaises(ValueError):
+            DateService("Mars/Olympus_Mons")
+
+    def test_get_date_service_follows_configured_timezone(self):
+        """Test that the shared service is rebuilt when TIMEZONE changes."""
+        with patch.object(
+            date_service, "environment_handler"
+        ) as mock_env, patch.object(date_service, "_date_service_instance", None):
+            mock_env.settings.timezone = "UTC"
+            first = get_date_service()
+            self.assertIs(get_date_service(), first)
+
+            mock_env.settings.timezone = "Asia/Tokyo"
+            self.assertEqual(get_date_service().timezone, "Asia/Tokyo")
+
+
+if __name__ == "__main__":
+    unittest.main()
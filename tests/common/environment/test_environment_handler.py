@@ -1,9 +1,25 @@
 import unittest
+from pathlib import Path
 from unittest.mock import patch
-from app.common.environment.environment_handler import environment_handler
+from app.common.environment.environment_handler import (
+    EnvironmentHandler,
+    Settings,
+    environment_handler,
+)
+
+REQUIRED_ENV = {
+    "NOTION_API_KEY": "secret",
+    "NOTION_DATABASE_ID": "db-id",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+}
 
 
 class TestEnvironmentHandler(unittest.TestCase):
+    def setUp(self):
+        # The snapshot outlives patch.dict, so rebuild it after every test
+        self.addCleanup(environment_handler.reload)
+
     def test_environment_handler_init(self):
         # Since it's a singleton, we check the existing instance
         self.assertEqual(environment_handler.environment, "LOCAL")
@@ -12,56 +28,176 @@ class TestEnvironmentHandler(unittest.TestCase):
         "os.environ", {"AWS_LAMBDA_FUNCTION_NAME": "test_function", "ENVIRONMENT": ""}
     )
     def test_log_level_lambda_default(self):
+        environment_handler.reload()
+        self.assertEqual(environment_handler.environment, "PRODUCTION")
         self.assertEqual(environment_handler.log_level, "INFO")
 
     def test_log_level_local_default(self):
         # Ensure environment is clean
         with patch.dict("os.environ", clear=True):
+            environment_handler.reload()
             self.assertEqual(environment_handler.log_level, "DEBUG")
 
     @patch.dict("os.environ", {"LOG_LEVEL": "WARNING"})
     def test_log_level_custom(self):
+        environment_handler.reload()
         self.assertEqual(environment_handler.log_level, "WARNING")
 
-    @patch.dict(
-        "os.environ",
-        {
-            "SES_SENDER_EMAIL": "sender@example.com",
-            "SES_RECEIVER_EMAIL": "receiver@example.com",
-        },
-    )
+    @patch.dict("os.environ", REQUIRED_ENV)
     def test_validate_success(self):
         """Test validate() passes when required variables are present"""
+        environment_handler.reload()
         try:
             environment_handler.validate()
         except ValueError:
             self.fail("validate() raised ValueError unexpectedly")
 
+    @patch.dict("os.environ", {**REQUIRED_ENV, "TIMEZONE": "Nowhere/City"})
+    def test_validate_with_unknown_timezone(self):
+        """Test validate() raises ValueError when TIMEZONE is not a known zone"""
+        environment_handler.reload()
+        with self.assertRaises(ValueError) as cm:
+            environment_handler.validate()
+
+        self.assertIn("TIMEZONE", str(cm.exception))
+
+    @patch.dict(
+        "os.environ",
+        {**REQUIRED_ENV, "CASSETTE_PATH": "digest.json.gz", "CASSETTE_MODE": "rewind"},
+    )
+    def test_validate_with_unknown_cassette_mode(self):
+        """Test validate() raises ValueError when CASSETTE_MODE is unknown"""
+        environment_handler.reload()
+        with self.assertRaises(ValueError) as cm:
+            environment_handler.validate()
+
+        self.assertIn("CASSETTE_MODE", str(cm.exception))
+
+    @patch.dict(
+        "os.environ",
+        {**REQUIRED_ENV, "NOTION_MAX_WORKERS": "three", "NOTION_RATE_LIMIT": "3/s"},
+    )
+    def test_validate_with_malformed_number(self):
+        """Test that a malformed number is reported by validate(), not on first use"""
+        settings = environment_handler.reload()
+        self.assertEqual(settings.notion_max_workers, 3)
+
+        with self.assertRaises(ValueError) as cm:
+            environment_handler.validate()
+
+        self.assertIn("NOTION_RATE_LIMIT, NOTION_MAX_WORKERS", str(cm.exception))
+
+    def test_validate_with_malformed_cache_ttls(self):
+        """Test that malformed NOTION_CACHE_TTLS is reported by validate()"""
+        for value in ("pages=abc", "pages", "pages=60,databases"):
+            with self.subTest(value=value), patch.dict(
+                "os.environ", {**REQUIRED_ENV, "NOTION_CACHE_TTLS": value}
+            ):
+                settings = environment_handler.reload()
+                self.assertIsNone(settings.notion_cache_ttls)
+
+                with self.assertRaises(ValueError) as cm:
+                    environment_handler.validate()
+
+                self.assertIn("NOTION_CACHE_TTLS", str(cm.exception))
+
+    @patch.dict("os.environ", {**REQUIRED_ENV, "DIGEST_DIFF_MODE": "always"})
+    def test_validate_with_unknown_digest_diff_mode(self):
+        """Test validate() raises ValueError when DIGEST_DIFF_MODE is unknown"""
+        environment_handler.reload()
+        with self.assertRaises(ValueError) as cm:
+            environment_handler.validate()
+
+        self.assertIn("DIGEST_DIFF_MODE", str(cm.exception))
+
     def test_validate_with_missing_vars(self):
         """Test validate() raises ValueError when required vars are missing"""
         # Ensure specific vars are missing
         with patch.dict("os.environ", clear=True):
-            # We need to re-instantiate or just call validate on the existing one,
-            # but os.getenv will look at the patched environ.
+            environment_handler.reload()
             with self.assertRaises(ValueError) as cm:
                 environment_handler.validate()
 
             self.assertIn("Missing required environment variables", str(cm.exception))
             self.assertIn("SES_SENDER_EMAIL", str(cm.exception))
+            self.assertIn("NOTION_API_KEY", str(cm.exception))
+            self.assertIn("NOTION_DATABASE_ID", str(cm.exception))
 
     @patch.dict(
         "os.environ",
         {
-            "SES_SENDER_EMAIL": "sender@example.com",
+            "SES_SENDER_EMAIL": " sender@example.com ",
             "SES_RECEIVER_EMAIL": "receiver@example.com",
         },
     )
     def test_ses_sender_and_receiver(self):
+        environment_handler.reload()
         self.assertEqual(
             environment_handler.ses_sender_and_receiver,
             ("sender@example.com", "receiver@example.com"),
         )
 
+    def test_settings_are_read_once(self):
+        """Test that later environment changes are ignored until reload()"""
+        handler = EnvironmentHandler(dotenv_path=Path("/nonexistent/.env"))
+        with patch.dict("os.environ", {"NOTION_DATABASE_ID": "first"}):
+            self.assertEqual(handler.notion_database_id, "first")
+        with patch.dict("os.environ", {"NOTION_DATABASE_ID": "second"}):
+            self.assertEqual(handler.notion_database_id, "first")
+            handler.reload()
+            self.assertEqual(handler.notion_database_id, "second")
+
+    def test_settings_snapshot_is_frozen(self):
+        """Test that the settings snapshot cannot be mutated"""
+        settings = Settings.from_environ(REQUIRED_ENV)
+        with self.assertRaises(AttributeError):
+            settings.region = "eu-west-1"
+
+    def test_settings_from_environ_defaults(self):
+        """Test default values when optional variables are not set"""
+        settings = Settings.from_environ({})
+        self.assertEqual(settings.environment, "LOCAL")
+        self.assertEqual(settings.notion_version, "2022-06-28")
+        self.assertEqual(settings.notion_base_url, "https://api.notion.com/v1")
+        self.assertEqual(settings.region, "us-east-1")
+        self.assertEqual(len(settings.missing_vars), 4)
+
+    def test_settings_urgent_notifications(self):
+        """Test that urgent notifications are disabled unless NOTION_URGENT_DAYS is set"""
+        self.assertIsNone(Settings.from_environ({}).notion_urgent_days)
+        settings = Settings.from_environ(
+            {"NOTION_URGENT_DAYS": "2", "NOTION_URGENT_DEBOUNCE_SECONDS": "60"}
+        )
+        self.assertEqual(settings.notion_urgent_days, 2)
+        self.assertEqual(settings.notion_urgent_debounce_seconds, 60)
+
+    def test_dotenv_is_resolved_from_project_root(self):
+        """Test that .env loading does not depend on the working directory"""
+        with patch(
+            "app.common.environment.environment_handler.load_dotenv"
+        ) as mock_load_dotenv:
+            handler = EnvironmentHandler(dotenv_path=Path(__file__))
+            handler.reload()
+
+        mock_load_dotenv.assert_called_once_with(Path(__file__))
+
+    @patch.dict(
+        "os.environ",
+        {"NOTION_API_KEY_SOURCE": "env:ROTATED_KEY", "ROTATED_KEY": "from-provider"},
+    )
+    def test_notion_api_key_from_secret_source(self):
+        """Test that NOTION_API_KEY_SOURCE resolves the key through the provider"""
+        handler = EnvironmentHandler(dotenv_path=Path("/nonexistent/.env"))
+        self.assertEqual(handler.notion_api_key, "from-provider")
+        self.assertNotIn("NOTION_API_KEY", handler.settings.missing_vars)
+
+    @patch.dict("os.environ", dict(REQUIRED_ENV, NOTION_API_KEY_SOURCE="vault:key"))
+    def test_validate_rejects_unknown_secret_source(self):
+        """Test validate() raises ValueError for an unknown secret backend"""
+        handler = EnvironmentHandler(dotenv_path=Path("/nonexistent/.env"))
+        with self.assertRaises(ValueError):
+            handler.validate()
+
 
 if __name__ == "__main__":
     unittest.main()
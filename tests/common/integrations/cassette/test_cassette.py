@@ -0,0 +1,195 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, PropertyMock, patch
+import requests
+from app.common.integrations.cassette.cassette import (
+    REDACTED,
+    Cassette,
+    CassetteError,
+    scrub_emails,
+)
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.notion_client import NotionClient
+
+BASE_URL = "https://api.notion.com/v1"
+
+
+def _response(status_code=200, body=b"{}", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {"Content-Type": "application/json"})
+    return response
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "cassettes" / "digest.json.gz"
+
+        for name, value in (
+            ("notion_api_key", "secret_token"),
+            ("notion_version", "2022-06-28"),
+            ("notion_base_url", BASE_URL),
+        ):
+            patcher = patch(
+                f"app.common.environment.environment_handler.EnvironmentHandler.{name}",
+                new_callable=PropertyMock,
+                return_value=value,
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _record(self, *responses):
+        """Records one query per response through a NotionClient and saves."""
+        send = MagicMock(side_effect=list(responses))
+        cassette = Cassette(self.path, mode="record")
+        client = NotionClient(transport=cassette.notion_transport(send))
+        for _ in responses:
+            try:
+                client.post("databases/db/query", {"page_size": 100})
+            except NotionApiError:
+                pass
+        cassette.save()
+        return send
+
+    def _document(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_record_then_replay_notion(self):
+        """Test that replayed Notion responses match the recorded ones without sending"""
+        body = json.dumps({"results": [{"id": "page-1"}], "has_more": False})
+        self._record(_response(body=body.encode("utf-8")))
+
+        cassette = Cassette(self.path, mode="replay")
+        client = NotionClient(transport=cassette.notion_transport())
+        with patch("requests.request") as mock_request:
+            result = client.post("databases/db/query", {"page_size": 100})
+
+        mock_request.assert_not_called()
+        self.assertEqual(result, {"results": [{"id": "page-1"}], "has_more": False})
+        self.assertEqual(len(cassette), 1)
+
+    def test_authorization_header_is_redacted(self):
+        """Test that the API key is never written to the cassette"""
+        self._record(_response())
+
+        interaction = self._document()["interactions"][0]
+        self.assertEqual(interaction["request"]["headers"]["Authorization"], REDACTED)
+        self.assertNotIn(
+            "secret_token", json.dumps(self._document(), ensure_ascii=False)
+        )
+
+    def test_emails_are_scrubbed(self):
+        """Test that email addresses are replaced by stable placeholders"""
+        body = json.dumps({"results": [{"email": "Jane.Doe@example.com"}]})
+        self._record(_response(body=body.encode("utf-8")))
+
+        text = json.dumps(self._document())
+        self.assertNotIn("Jane.Doe@example.com", text)
+        self.assertIn(scrub_emails("jane.doe@example.com"), text)
+        self.assertNotEqual(
+            scrub_emails("a@example.com"), scrub_emails("b@example.com")
+        )
+
+    def test_recorded_errors_are_replayed(self):
+        """Test that a recorded error status is raised again on replay"""
+        self._record(_response(429, b'{"code":"rate_limited"}', {"Retry-After": "2"}))
+
+        client = NotionClient(transport=Cassette(self.path).notion_transport())
+        with self.assertRaises(NotionApiError) as cm:
+            client.post("databases/db/query", {"page_size": 100})
+
+        self.assertEqual(cm.exception.status_code, 429)
+        self.assertEqual(cm.exception.retry_after, 2.0)
+
+    def test_replay_realtime_sleeps_recorded_duration(self):
+        """Test that realtime replay waits the recorded duration of each call"""
+        self._record(_response())
+        sleep = MagicMock()
+
+        cassette = Cassette(self.path, mode="replay_realtime", sleep=sleep)
+        NotionClient(transport=cassette.notion_transport()).post(
+            "databases/db/query", {"page_size": 100}
+        )
+
+        duration = self._document()["interactions"][0]["duration"]
+        sleep.assert_called_once_with(duration)
+
+    def test_replay_without_interaction_raises(self):
+        """Test that a request with no unused recorded interaction raises CassetteError"""
+        self._record(_response())
+        transport = Cassette(self.path).notion_transport()
+        body = b'{"page_size": 100}'
+        transport("POST", f"{BASE_URL}/databases/db/query", data=body)
+
+        with self.assertRaises(CassetteError):
+            transport("POST", f"{BASE_URL}/databases/db/query", data=body)
+        with self.assertRaises(CassetteError):
+            transport("GET", f"{BASE_URL}/pages/page-1")
+
+    def test_replay_matches_the_request_body(self):
+        """Test that queries to the same URL get the response of their own payload"""
+        send = MagicMock(
+            side_effect=[
+                _response(body=b'{"results": [1], "next_cursor": "c1"}'),
+                _response(body=b'{"results": [2], "next_cursor": null}'),
+            ]
+        )
+        cassette = Cassette(self.path, mode="record")
+        client = NotionClient(transport=cassette.notion_transport(send))
+        client.post("databases/db/query", {"page_size": 100})
+        client.post("databases/db/query", {"page_size": 100, "start_cursor": "c1"})
+        cassette.save()
+
+        client = NotionClient(transport=Cassette(self.path).notion_transport())
+        second = client.post(
+            "databases/db/query", {"start_cursor": "c1", "page_size": 100}
+        )
+        first = client.post("databases/db/query", {"page_size": 100})
+
+        self.assertEqual(second["results"], [2])
+        self.assertEqual(first["results"], [1])
+        with self.assertRaises(CassetteError):
+            client.post("databases/db/query", {"page_size": 50})
+
+    def test_streamed_response_is_replayed(self):
+        """Test that post_stream decodes a replayed body"""
+        body = json.dumps({"results": [{"id": "a"}, {"id": "b"}], "has_more": False})
+        self._record(_response(body=body.encode("utf-8")))
+
+        client = NotionClient(transport=Cassette(self.path).notion_transport())
+        stream = client.post_stream("databases/db/query", {"page_size": 100})
+
+        self.assertEqual([page["id"] for page in stream], ["a", "b"])
+
+    def test_ses_calls_are_recorded_and_replayed(self):
+        """Test that SES operations are recorded with scrubbed addresses and replayed"""
+        boto_client = MagicMock()
+        boto_client.send_email.return_value = {
+            "MessageId": "message-1",
+            "ResponseMetadata": {"RequestId": "request-1"},
+        }
+        cassette = Cassette(self.path, mode="record")
+        ses = cassette.wrap_ses(boto_client)
+        ses.send_email(Source="sender@example.com", Destination={"ToAddresses": []})
+        cassette.save()
+
+        self.assertNotIn("sender@example.com", json.dumps(self._document()))
+
+        replayed = Cassette(self.path).wrap_ses(None)
+        self.assertEqual(replayed.send_email(Source="x"), {"MessageId": "message-1"})
+
+    def test_unknown_mode_raises(self):
+        """Test that an unknown mode raises ValueError"""
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode="rewind")
+
+
+if __name__ == "__main__":
+    unittest.main()
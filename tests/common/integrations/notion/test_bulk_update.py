@@ -0,0 +1,193 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from app.common.integrations.notion.bulk_update import (
+    BulkUpdater,
+    UpdateCheckpoint,
+    date_update,
+    status_update,
+)
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.task_repository import TaskRepository
+
+
+class StandInPatchClient:
+    """Records PATCH calls and fails selected pages."""
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.patched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def patch(self, endpoint, payload):
+        page_id = endpoint.split("/")[1]
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            errors = self.failures.get(page_id)
+            if errors:
+                raise errors.pop(0)
+            with self.lock:
+                self.patched.append(page_id)
+            return {"id": page_id}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestBulkUpdater(unittest.TestCase):
+    """Test cases for BulkUpdater."""
+
+    def setUp(self):
+        self.sleeps = []
+        self.updates = {f"page-{i}": status_update("Notified") for i in range(10)}
+
+    def _updater(self, client, **kwargs):
+        return BulkUpdater(client, sleep=self.sleeps.append, **kwargs)
+
+    def test_updates_every_page(self):
+        client = StandInPatchClient()
+
+        result = self._updater(client).run(self.updates)
+
+        self.assertEqual(sorted(result.succeeded), sorted(self.updates))
+        self.assertTrue(result.complete)
+        self.assertEqual(result.summary(), {"succeeded": 10, "failed": 0, "skipped": 0})
+
+    def test_requests_are_pipelined_up_to_max_workers(self):
+        """Test that PATCHes overlap but never exceed the worker bound."""
+        client = StandInPatchClient(delay=0.02)
+
+        self._updater(client, max_workers=4).run(self.updates)
+
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 4)
+
+    def test_reports_failures_per_page(self):
+        client = StandInPatchClient(
+            failures={"page-3": [NotionApiError("Not found", status_code=404)]}
+        )
+
+        result = self._updater(client).run(self.updates)
+
+        self.assertEqual(list(result.failed), ["page-3"])
+        self.assertIn("Not found", result.failed["page-3"])
+        self.assertEqual(len(result.succeeded), 9)
+
+    def test_retries_transient_errors_honoring_retry_after(self):
+        client = StandInPatchClient(
+            failures={
+                "page-1": [
+                    NotionApiError("Rate limited", status_code=429, retry_after=2),
+                    NotionApiError("Unavailable", status_code=503),
+                ]
+            }
+        )
+
+        result = self._updater(client, backoff_seconds=0.5).run({"page-1": {}})
+
+        self.assertEqual(result.succeeded, ["page-1"])
+        self.assertEqual(self.sleeps, [2, 1.0])
+
+    def test_gives_up_after_max_retries(self):
+        client = StandInPatchClient(
+            failures={"page-1": [NotionApiError("Busy", status_code=429)] * 5}
+        )
+
+        result = self._updater(client, max_retries=2).run({"page-1": {}})
+
+        self.assertIn("page-1", result.failed)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_resumes_from_checkpoint_after_partial_failure(self):
+        """Test that a second run only patches the pages that failed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoint.log")
+            client = StandInPatchClient(
+                failures={"page-7": [NotionApiError("Bad", status_code=400)]}
+            )
+
+            first = self._updater(client).run(self.updates, UpdateCheckpoint(path))
+            self.assertFalse(first.complete)
+            self.assertTrue(os.path.exists(path))
+
+            client.patched.clear()
+            second = self._updater(client).run(self.updates, UpdateCheckpoint(path))
+
+            self.assertEqual(client.patched, ["page-7"])
+            self.assertEqual(len(second.skipped), 9)
+            self.assertTrue(second.complete)
+            self.assertFalse(os.path.exists(path))
+
+    def test_checkpoint_is_keyed_by_payload(self):
+        """Test that a page completed with one payload is patched again with another"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoint.log")
+            checkpoint = UpdateCheckpoint(path)
+            checkpoint.mark_done("page-1", status_update("Notified"))
+            checkpoint.flush()
+
+            reloaded = UpdateCheckpoint(path)
+
+            self.assertTrue(reloaded.is_done("page-1", status_update("Notified")))
+            self.assertFalse(reloaded.is_done("page-1", status_update("Done")))
+
+    def test_checkpoint_appends_in_batches(self):
+        """Test that completed pages are appended flush_every at a time"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoint.log")
+            checkpoint = UpdateCheckpoint(path, flush_every=3)
+            for index in range(4):
+                checkpoint.mark_done(f"page-{index}", {})
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+            checkpoint.flush()
+
+            self.assertEqual(len(UpdateCheckpoint(path).completed), 4)
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write("not json")
+        self.addCleanup(lambda: os.path.exists(f.name) and os.remove(f.name))
+
+        self.assertEqual(UpdateCheckpoint(f.name).completed, set())
+
+
+class TestPayloadBuilders(unittest.TestCase):
+    def test_status_update(self):
+        self.assertEqual(
+            status_update("Done"),
+            {"properties": {"Status": {"status": {"name": "Done"}}}},
+        )
+
+    def test_date_update(self):
+        self.assertEqual(
+            date_update("2025-01-02"),
+            {"properties": {"Fecha": {"date": {"start": "2025-01-02"}}}},
+        )
+
+
+class TestTaskRepositoryBulkUpdate(unittest.TestCase):
+    def test_bulk_update_patches_pages(self):
+        notion_client = Mock()
+        repository = TaskRepository(notion_client, "db")
+
+        result = repository.bulk_update({"p1": status_update("Notified")})
+
+        notion_client.patch.assert_called_once_with(
+            "pages/p1", status_update("Notified")
+        )
+        self.assertEqual(result.succeeded, ["p1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
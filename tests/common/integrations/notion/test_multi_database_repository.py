@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import Mock
+from app.common.integrations.notion.exceptions import (
+    NotionApiError,
+    NotionDataNotFoundError,
+)
+from app.common.integrations.notion.multi_database_repository import (
+    MultiDatabaseTaskRepository,
+)
+from app.common.integrations.notion.query_cache import QueryResultCache
+
+
+def _page(page_id, fecha):
+    return {
+        "id": page_id,
+        "properties": {
+            "Tarea": {"title": [{"plain_text": page_id}]},
+            "Fecha": {"date": {"start": fecha} if fecha else None},
+        },
+    }
+
+
+class StandInNotionClient:
+    """Serves sorted, paginated query results per database."""
+
+    def __init__(self, pages_by_database, page_size=2):
+        self.pages_by_database = pages_by_database
+        self.page_size = page_size
+        self.calls = []
+
+    def post(self, endpoint, payload):
+        database_id = endpoint.split("/")[1]
+        self.calls.append((database_id, payload.get("start_cursor")))
+        if database_id == "broken":
+            raise NotionApiError("Unauthorized", status_code=401)
+        pages = self.pages_by_database[database_id]
+        start = int(payload.get("start_cursor") or 0)
+        end = start + self.page_size
+        return {
+            "results": pages[start:end],
+            "has_more": end < len(pages),
+            "next_cursor": str(end) if end < len(pages) else None,
+        }
+
+
+class TestMultiDatabaseTaskRepository(unittest.TestCase):
+    """Test cases for MultiDatabaseTaskRepository."""
+
+    def setUp(self):
+        self.client = StandInNotionClient(
+            {
+                "team": [
+                    _page("t1", "2025-01-01"),
+                    _page("t2", "2025-01-05"),
+                    _page("t3", "2025-01-09"),
+                ],
+                "project": [_page("p1", "2025-01-03"), _page("p2", "2025-01-07")],
+                "empty": [],
+            }
+        )
+
+    def test_merges_databases_in_date_order(self):
+        """Test that sorted streams are merged into one ordered stream."""
+        repository = MultiDatabaseTaskRepository(self.client, ["team", "project"])
+
+        tasks = repository.get_pending_tasks()
+
+        self.assertEqual([t["id"] for t in tasks], ["t1", "p1", "t2", "p2", "t3"])
+
+    def test_follows_pagination_for_every_database(self):
+        repository = MultiDatabaseTaskRepository(self.client, ["team", "project"])
+
+        repository.get_pending_tasks()
+
+        self.assertIn(("team", "2"), self.client.calls)
+        self.assertEqual(len(self.client.calls), 3)
+
+    def test_empty_database_is_skipped(self):
+        repository = MultiDatabaseTaskRepository(self.client, ["empty", "project"])
+        self.assertEqual(len(repository.get_pending_tasks()), 2)
+
+    def test_raises_not_found_when_all_databases_are_empty(self):
+        repository = MultiDatabaseTaskRepository(self.client, ["empty"])
+        with self.assertRaises(NotionDataNotFoundError):
+            repository.get_pending_tasks()
+
+    def test_propagates_api_errors(self):
+        repository = MultiDatabaseTaskRepository(self.client, ["team", "broken"])
+        with self.assertRaises(NotionApiError):
+            repository.get_pending_tasks()
+
+    def test_undated_tasks_sort_last(self):
+        self.client.pages_by_database["undated"] = [_page("u1", None)]
+        repository = MultiDatabaseTaskRepository(self.client, ["undated", "project"])
+
+        tasks = repository.get_pending_tasks()
+
+        self.assertEqual(tasks[-1]["id"], "u1")
+
+    def test_early_stop_releases_readers(self):
+        """Test that closing the stream stops the background readers."""
+        repository = MultiDatabaseTaskRepository(
+            self.client, ["team", "project"], max_buffered=1
+        )
+
+        stream = repository.iter_pending_tasks()
+        self.assertEqual(next(stream)["id"], "t1")
+        stream.close()
+
+    def test_uses_query_cache(self):
+        cache = QueryResultCache()
+        repository = MultiDatabaseTaskRepository(
+            self.client, ["team", "project"], query_cache=cache
+        )
+
+        repository.get_pending_tasks()
+        repository.get_pending_tasks()
+
+        self.assertEqual(len(self.client.calls), 3)
+
+    def test_requires_a_database(self):
+        with self.assertRaises(ValueError):
+            MultiDatabaseTaskRepository(Mock(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
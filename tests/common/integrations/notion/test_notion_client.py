@@ -1,8 +1,10 @@
+import json
 import unittest
 import requests
 from unittest.mock import patch, MagicMock, PropertyMock
 from app.common.integrations.notion.notion_client import NotionClient
 from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.response_cache import ResponseCache
 
 
 class TestNotionClient(unittest.TestCase):
@@ -42,10 +44,14 @@ class TestNotionClient(unittest.TestCase):
         with self.assertRaises(ValueError):
             NotionClient()
 
+    def test_headers_pick_up_rotated_api_key(self):
+        self.mock_api_key.return_value = "rotated_key"
+        self.assertEqual(self.client.headers["Authorization"], "Bearer rotated_key")
+
     @patch("requests.request")
     def test_make_request_success(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"id": "123"}
+        mock_response.content = json.dumps({"id": "123"}).encode()
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
 
@@ -60,13 +66,24 @@ class TestNotionClient(unittest.TestCase):
                 "Notion-Version": "2022-06-28",
                 "Content-Type": "application/json",
             },
-            json=None,
+            data=None,
         )
 
+    @patch("requests.request")
+    def test_requests_go_through_rate_limiter(self, mock_request):
+        mock_request.return_value.content = b"{}"
+        rate_limiter = MagicMock()
+        client = NotionClient(rate_limiter=rate_limiter)
+
+        client.post("pages", {})
+        client.get("pages/1")
+
+        self.assertEqual(rate_limiter.acquire.call_count, 2)
+
     @patch("requests.request")
     def test_get_method(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"results": []}
+        mock_response.content = json.dumps({"results": []}).encode()
         mock_request.return_value = mock_response
 
         self.client.get("databases")
@@ -74,13 +91,13 @@ class TestNotionClient(unittest.TestCase):
             "GET",
             "https://api.notion.com/v1/databases",
             headers=self.client.headers,
-            json=None,
+            data=None,
         )
 
     @patch("requests.request")
     def test_post_method(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"id": "new"}
+        mock_response.content = json.dumps({"id": "new"}).encode()
         mock_request.return_value = mock_response
 
         payload = {"title": "Test"}
@@ -89,13 +106,13 @@ class TestNotionClient(unittest.TestCase):
             "POST",
             "https://api.notion.com/v1/pages",
             headers=self.client.headers,
-            json=payload,
+            data=json.dumps(payload, separators=(",", ":")).encode(),
         )
 
     @patch("requests.request")
     def test_patch_method(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"id": "updated"}
+        mock_response.content = json.dumps({"id": "updated"}).encode()
         mock_request.return_value = mock_response
 
         payload = {"archived": True}
@@ -104,13 +121,13 @@ class TestNotionClient(unittest.TestCase):
             "PATCH",
             "https://api.notion.com/v1/pages/123",
             headers=self.client.headers,
-            json=payload,
+            data=json.dumps(payload, separators=(",", ":")).encode(),
         )
 
     @patch("requests.request")
     def test_delete_method(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"id": "deleted"}
+        mock_response.content = json.dumps({"id": "deleted"}).encode()
         mock_request.return_value = mock_response
 
         self.client.delete("blocks/123")
@@ -118,7 +135,7 @@ class TestNotionClient(unittest.TestCase):
             "DELETE",
             "https://api.notion.com/v1/blocks/123",
             headers=self.client.headers,
-            json=None,
+            data=None,
         )
 
     @patch("requests.request")
@@ -150,3 +167,118 @@ class TestNotionClient(unittest.TestCase):
             self.client._make_request("GET", "any_endpoint")
 
         self.assertIn("connection error", str(context.exception).lower())
+
+    @patch("requests.request")
+    def test_invalid_json_raises_notion_api_error(self, mock_request):
+        """Test that a malformed response body raises NotionApiError."""
+        mock_request.return_value.content = b'{"results": ['
+
+        with self.assertRaises(NotionApiError) as context:
+            self.client.post("databases/db/query", {})
+
+        self.assertIn("Invalid JSON", str(context.exception))
+
+
+class TestNotionClientResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.api_key_patcher = patch(
+            "app.common.environment.environment_handler.EnvironmentHandler.notion_api_key",
+            new_callable=PropertyMock,
+            return_value="test_api_key",
+        )
+        self.api_key_patcher.start()
+        self.addCleanup(self.api_key_patcher.stop)
+        self.cache = ResponseCache()
+        self.client = NotionClient(response_cache=self.cache)
+
+    def _response(self, body, status_code=200, etag=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.content = json.dumps(body).encode()
+        response.headers = {"ETag": etag} if etag else {}
+        return response
+
+    @patch("requests.request")
+    def test_get_is_served_from_cache(self, mock_request):
+        mock_request.return_value = self._response({"id": "db"})
+
+        first = self.client.get("databases/db")
+        second = self.client.get("databases/db")
+
+        self.assertEqual(first, second)
+        mock_request.assert_called_once()
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(self.cache.stats.misses, 1)
+
+    @patch("requests.request")
+    def test_patch_invalidates_cached_page(self, mock_request):
+        mock_request.return_value = self._response({"id": "p1"})
+
+        self.client.get("pages/p1")
+        self.client.patch("pages/p1", {"archived": True})
+        self.client.get("pages/p1")
+
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch("requests.request")
+    def test_delete_invalidates_cached_block(self, mock_request):
+        mock_request.return_value = self._response({"results": []})
+
+        self.client.get("blocks/b1/children")
+        self.client.delete("blocks/b1")
+        self.client.get("blocks/b1/children")
+
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch("requests.request")
+    def test_stale_entry_is_revalidated_with_etag(self, mock_request):
+        mock_request.return_value = self._response({"id": "p1"}, etag='"v1"')
+        self.client.get("pages/p1")
+
+        self.cache.clock = lambda: 10**12
+        mock_request.return_value = self._response(None, status_code=304)
+        body = self.client.get("pages/p1")
+
+        self.assertEqual(body, {"id": "p1"})
+        _, kwargs = mock_request.call_args
+        self.assertEqual(kwargs["headers"]["If-None-Match"], '"v1"')
+
+
+class TestNotionClientStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.api_key_patcher = patch(
+            "app.common.environment.environment_handler.EnvironmentHandler.notion_api_key",
+            new_callable=PropertyMock,
+            return_value="test_api_key",
+        )
+        self.api_key_patcher.start()
+        self.addCleanup(self.api_key_patcher.stop)
+        self.client = NotionClient()
+
+    @patch("requests.request")
+    def test_post_stream_decodes_results_and_closes_response(self, mock_request):
+        """Test that post_stream streams the results array and releases the response."""
+        body = b'{"object": "list", "results": [{"id": "1"}, {"id": "2"}], "has_more": false}'
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [body[:20], body[20:]]
+        mock_request.return_value = mock_response
+
+        stream = self.client.post_stream("databases/db/query", {})
+
+        self.assertEqual(list(stream), [{"id": "1"}, {"id": "2"}])
+        self.assertEqual(stream.metadata["has_more"], False)
+        self.assertTrue(mock_request.call_args.kwargs["stream"])
+        mock_response.close.assert_called_once()
+
+    @patch("requests.request")
+    def test_post_stream_invalid_body_raises_notion_api_error(self, mock_request):
+        """Test that a malformed streamed body raises NotionApiError."""
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [b'{"results": [{"id": ']
+        mock_request.return_value = mock_response
+
+        with self.assertRaises(NotionApiError):
+            list(self.client.post_stream("databases/db/query", {}))
+        mock_response.close.assert_called_once()
@@ -0,0 +1,141 @@
+import threading
+import time
+import unittest
+from app.common.cache.lru_cache import LRUCache
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.page_content import PageContentFetcher
+
+
+def _block(block_id, text, block_type="paragraph", has_children=False, **extra):
+    content = {"rich_text": [{"plain_text": text}], **extra}
+    return {
+        "id": block_id,
+        "type": block_type,
+        block_type: content,
+        "has_children": has_children,
+    }
+
+
+class StandInBlocksClient:
+    """Serves block children per parent ID, split into pages of two blocks."""
+
+    def __init__(self, children, delay=0.0, failing=()):
+        self.children = children
+        self.delay = delay
+        self.failing = set(failing)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, endpoint):
+        with self.lock:
+            self.requests.append(endpoint)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            block_id = endpoint.split("/")[1]
+            if block_id in self.failing:
+                raise NotionApiError("Not found", status_code=404)
+            start = 0
+            if "start_cursor=" in endpoint:
+                start = int(endpoint.split("start_cursor=")[1])
+            blocks = self.children.get(block_id, [])
+            end = start + 2
+            return {
+                "results": blocks[start:end],
+                "has_more": end < len(blocks),
+                "next_cursor": str(end) if end < len(blocks) else None,
+            }
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestPageContentFetcher(unittest.TestCase):
+    def test_fetch_follows_pagination_and_formats_blocks(self):
+        """Test that every page of children is read and block types are formatted."""
+        client = StandInBlocksClient(
+            {
+                "page": [
+                    _block("b1", "Intro"),
+                    _block("b2", "Item", "bulleted_list_item"),
+                    _block("b3", "Done", "to_do", checked=True),
+                    _block("b4", "Open", "to_do", checked=False),
+                ]
+            }
+        )
+        fetcher = PageContentFetcher(client)
+
+        self.assertEqual(fetcher.fetch("page"), "Intro\n• Item\n[x] Done\n[ ] Open")
+        self.assertEqual(len(client.requests), 2)
+
+    def test_fetch_stops_at_max_depth(self):
+        """Test that nested blocks are indented and not read beyond max_depth."""
+        client = StandInBlocksClient(
+            {
+                "page": [_block("b1", "Parent", has_children=True)],
+                "b1": [_block("b2", "Child", has_children=True)],
+                "b2": [_block("b3", "Grandchild")],
+            }
+        )
+        fetcher = PageContentFetcher(client, max_depth=2)
+
+        self.assertEqual(fetcher.fetch("page"), "Parent\n  Child")
+        self.assertNotIn("blocks/b2/children?page_size=100", client.requests)
+
+    def test_fetch_truncates_long_content(self):
+        """Test that summaries are cut at max_chars."""
+        client = StandInBlocksClient({"page": [_block("b1", "x" * 50)]})
+        fetcher = PageContentFetcher(client, max_chars=10)
+
+        self.assertEqual(fetcher.fetch("page"), "x" * 10 + "…")
+
+    def test_fetch_limits_block_count(self):
+        """Test that no more than max_blocks blocks are read."""
+        blocks = [_block(f"b{i}", f"Line {i}") for i in range(6)]
+        client = StandInBlocksClient({"page": blocks})
+        fetcher = PageContentFetcher(client, max_blocks=3)
+
+        self.assertEqual(fetcher.fetch("page").count("\n"), 2)
+        self.assertEqual(len(client.requests), 2)
+
+    def test_enrich_fetches_pages_concurrently(self):
+        """Test that several pages are read in parallel."""
+        children = {f"p{i}": [_block(f"b{i}", f"Body {i}")] for i in range(4)}
+        client = StandInBlocksClient(children, delay=0.05)
+        tasks = [{"id": f"p{i}", "editado": "t"} for i in range(4)]
+
+        PageContentFetcher(client, max_workers=4).enrich(tasks)
+
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertEqual(
+            [t["contenido"] for t in tasks], [f"Body {i}" for i in range(4)]
+        )
+
+    def test_enrich_uses_cache_until_page_is_edited(self):
+        """Test that summaries are reused until last_edited_time changes."""
+        client = StandInBlocksClient({"p1": [_block("b1", "Body")]})
+        fetcher = PageContentFetcher(client, cache=LRUCache(max_entries=10))
+
+        fetcher.enrich([{"id": "p1", "editado": "2025-01-01T00:00:00.000Z"}])
+        fetcher.enrich([{"id": "p1", "editado": "2025-01-01T00:00:00.000Z"}])
+        self.assertEqual(len(client.requests), 1)
+
+        fetcher.enrich([{"id": "p1", "editado": "2025-01-02T00:00:00.000Z"}])
+        self.assertEqual(len(client.requests), 2)
+
+    def test_enrich_leaves_empty_content_on_error(self):
+        """Test that an unreadable page does not fail the enrichment."""
+        client = StandInBlocksClient({"p2": [_block("b1", "Body")]}, failing={"p1"})
+        tasks = [{"id": "p1", "editado": "t"}, {"id": "p2", "editado": "t"}]
+
+        PageContentFetcher(client).enrich(tasks)
+
+        self.assertEqual(tasks[0]["contenido"], "")
+        self.assertEqual(tasks[1]["contenido"], "Body")
+
+
+if __name__ == "__main__":
+    unittest.main()
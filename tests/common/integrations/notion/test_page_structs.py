@@ -0,0 +1,89 @@
+import json
+import unittest
+from unittest.mock import Mock
+from app.common.integrations.notion.page_structs import (
+    TypedQueryDecoder,
+    typed_decoding_available,
+)
+from app.common.integrations.notion.task_repository import TaskRepository
+
+
+def _page(page_id, title="Task", date="2025-01-02", notes=("a", "b")):
+    return {
+        "object": "page",
+        "id": page_id,
+        "last_edited_time": "2025-01-01T10:00:00.000Z",
+        "parent": {"type": "database_id", "database_id": "db"},
+        "icon": {"type": "emoji", "emoji": "📌"},
+        "url": "https://www.notion.so/x",
+        "properties": {
+            "Tarea": {
+                "id": "title",
+                "type": "title",
+                "title": [{"plain_text": title, "annotations": {"bold": True}}],
+            },
+            "Fecha": {"type": "date", "date": {"start": date} if date else None},
+            "Notas": {
+                "type": "rich_text",
+                "rich_text": [{"plain_text": text, "href": None} for text in notes],
+            },
+        },
+    }
+
+
+@unittest.skipUnless(typed_decoding_available(), "msgspec is not installed")
+class TestTypedQueryDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = TypedQueryDecoder()
+        self.mapper = TaskRepository(Mock(), "db")
+
+    def test_records_match_dict_mapper(self):
+        """Test that typed decoding builds the same records as map_task."""
+        response = {
+            "object": "list",
+            "results": [
+                _page("1"),
+                _page("2", title="Café", date=None, notes=()),
+                {"id": "3", "properties": {}},
+            ],
+            "next_cursor": "c1",
+            "has_more": True,
+            "request_id": "r",
+        }
+
+        tasks, metadata = self.decoder.decode(json.dumps(response).encode())
+
+        self.assertEqual(tasks, self.mapper._map_response(response))
+        self.assertEqual(metadata, {"next_cursor": "c1", "has_more": True})
+
+    def test_invalid_body_raises_value_error(self):
+        """Test that malformed or mistyped responses raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.decoder.decode(b'{"results": [')
+        with self.assertRaises(ValueError):
+            self.decoder.decode(b'{"results": [{"id": 1}]}')
+
+    def test_repository_uses_raw_body_when_enabled(self):
+        """Test that TaskRepository decodes raw bytes and follows pagination."""
+        bodies = [
+            {"results": [_page("1")], "has_more": True, "next_cursor": "c1"},
+            {"results": [_page("2")], "has_more": False, "next_cursor": None},
+        ]
+        client = Mock()
+        client.post_raw.side_effect = [json.dumps(b).encode() for b in bodies]
+        repository = TaskRepository(client, "db", typed_decoding=True)
+
+        tasks = repository.get_pending_tasks()
+
+        self.assertEqual([task["id"] for task in tasks], ["1", "2"])
+        self.assertEqual(client.post_raw.call_args_list[1][0][1]["start_cursor"], "c1")
+        client.post.assert_not_called()
+
+    def test_streaming_takes_precedence(self):
+        """Test that typed decoding is not used together with streaming."""
+        repository = TaskRepository(Mock(), "db", streaming=True, typed_decoding=True)
+        self.assertIsNone(repository.typed_decoder)
+
+
+if __name__ == "__main__":
+    unittest.main()
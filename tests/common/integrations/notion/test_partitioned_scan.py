@@ -0,0 +1,198 @@
+import time
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import Mock, patch
+from app.common.dates.date_service import DateService
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.partitioned_scan import (
+    PartitionedScan,
+    created_time_partitions,
+    date_partitions,
+)
+from app.common.integrations.notion.query_builder import Query, evaluate_filter
+from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.integrations.notion.task_stream import fecha_sort_key
+
+
+def _filter(predicate):
+    return Query().where(predicate).compile("2025-01-01").payload["filter"]
+
+
+def _dated_page(start):
+    return {
+        "id": start,
+        "created_time": "2025-01-01T00:00:00.000Z",
+        "properties": {
+            "Fecha": {"type": "date", "date": {"start": start} if start else None}
+        },
+    }
+
+
+class FakeRepository:
+    """Returns canned tasks per partition and records the queries."""
+
+    database_id = "db"
+
+    def __init__(self, tasks_by_partition):
+        self.tasks_by_partition = tasks_by_partition
+        self.queries = []
+
+    def iter_tasks(self, query):
+        self.queries.append(query)
+        partition = query.predicate
+        result = self.tasks_by_partition[partition]
+        if isinstance(result, Exception):
+            raise result
+        return iter(result)
+
+
+class TestPartitions(unittest.TestCase):
+    def test_date_partitions_are_disjoint_and_cover_every_date(self):
+        """Test that every date, inside the range or not, is in exactly one range"""
+        partitions = date_partitions(
+            "Fecha", date(2025, 1, 1), date(2025, 3, 1), 4, include_empty=True
+        )
+        filters = [_filter(partition) for partition in partitions]
+
+        for start in (
+            "2024-06-01",
+            "2025-01-01",
+            "2025-01-15T23:30:00.000+00:00",
+            "2025-01-16",
+            "2025-02-28",
+            "2026-01-01",
+            None,
+        ):
+            page = _dated_page(start)
+            with self.subTest(start=start):
+                matched = [f for f in filters if evaluate_filter(f, page)]
+                self.assertEqual(len(matched), 1)
+        self.assertEqual(len(partitions), 5)
+
+    def test_date_partitions_with_one_range(self):
+        """Test that a single partition reads every dated page"""
+        (partition,) = date_partitions("Fecha", date(2025, 1, 1), date(2025, 2, 1), 1)
+
+        self.assertEqual(
+            _filter(partition), {"property": "Fecha", "date": {"is_not_empty": True}}
+        )
+
+    def test_created_time_partitions_use_notion_timestamps(self):
+        """Test that created_time windows compare like Notion's timestamps"""
+        partitions = created_time_partitions(
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+            datetime(2025, 1, 3, tzinfo=timezone.utc),
+            2,
+        )
+
+        self.assertEqual(
+            _filter(partitions[1]),
+            {
+                "timestamp": "created_time",
+                "created_time": {"on_or_after": "2025-01-02T00:00:00.000Z"},
+            },
+        )
+
+
+class TestPartitionedScan(unittest.TestCase):
+    def setUp(self):
+        self.partitions = date_partitions(
+            "Fecha", date(2025, 1, 1), date(2025, 1, 3), 2
+        )
+
+    def test_concatenates_partitions_in_order_without_duplicates(self):
+        """Test that partitions are read in order and repeated pages dropped"""
+        repository = FakeRepository(
+            {
+                self.partitions[0]: [{"id": "a", "fecha": "2024-12-31"}],
+                self.partitions[1]: [
+                    {"id": "b", "fecha": "2025-01-02"},
+                    {"id": "a", "fecha": "2025-01-02"},
+                ],
+            }
+        )
+
+        tasks = list(PartitionedScan(repository, self.partitions).iter_tasks(Query()))
+
+        self.assertEqual([task["id"] for task in tasks], ["a", "b"])
+        self.assertEqual(len(repository.queries), 2)
+
+    def test_merges_partitions_by_key(self):
+        """Test that a merge key interleaves sorted partitions"""
+        repository = FakeRepository(
+            {
+                self.partitions[0]: [{"id": "a", "fecha": "2025-01-01"}],
+                self.partitions[1]: [
+                    {"id": "b", "fecha": "2024-12-01"},
+                    {"id": "c", "fecha": "2025-02-01"},
+                ],
+            }
+        )
+        scan = PartitionedScan(repository, self.partitions, merge_key=fecha_sort_key)
+
+        tasks = list(scan.iter_tasks(Query()))
+
+        self.assertEqual([task["id"] for task in tasks], ["b", "a", "c"])
+
+    def test_later_partitions_read_ahead_a_bounded_number_of_tasks(self):
+        """Test that a partition waits for the consumer instead of buffering it all"""
+        produced = []
+
+        def later_partition():
+            for index in range(100):
+                produced.append(index)
+                yield {"id": f"b{index}", "fecha": "2025-01-02"}
+
+        repository = FakeRepository(
+            {
+                self.partitions[0]: [{"id": "a", "fecha": "2024-12-31"}],
+                self.partitions[1]: later_partition(),
+            }
+        )
+        tasks = PartitionedScan(repository, self.partitions, max_buffered=5).iter_tasks(
+            Query()
+        )
+
+        self.assertEqual(next(tasks)["id"], "a")
+        time.sleep(0.3)
+        # The buffer, plus one task held by the producer while it waits
+        self.assertLessEqual(len(produced), 7)
+        self.assertEqual(len(list(tasks)), 100)
+
+    def test_partition_error_is_raised(self):
+        """Test that a failing partition fails the scan"""
+        repository = FakeRepository(
+            {
+                self.partitions[0]: [],
+                self.partitions[1]: NotionApiError("boom", status_code=500),
+            }
+        )
+
+        with self.assertRaises(NotionApiError):
+            list(PartitionedScan(repository, self.partitions).iter_tasks(Query()))
+
+
+class TestTaskRepositoryScan(unittest.TestCase):
+    @patch.object(DateService, "today", return_value=date(2025, 3, 10))
+    def test_pending_tasks_are_scanned_in_partitions(self, _):
+        """Test that scan_partitions splits the pending query into Fecha ranges"""
+        client = Mock()
+        client.post.side_effect = lambda endpoint, body: {
+            "results": [{"id": "page-1", "properties": {}}],
+            "has_more": False,
+        }
+        repository = TaskRepository(client, "db", scan_partitions=3, scan_days=30)
+
+        tasks = repository.get_pending_tasks()
+
+        self.assertEqual([task["id"] for task in tasks], ["page-1"])
+        self.assertEqual(client.post.call_count, 3)
+        for call in client.post.call_args_list:
+            conditions = call[0][1]["filter"]["and"]
+            self.assertEqual(conditions[0]["status"], {"equals": "Not Started"})
+            self.assertEqual(conditions[1]["date"], {"on_or_before": "2025-03-10"})
+            self.assertGreater(len(conditions), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+import unittest
+from datetime import date
+from unittest.mock import Mock, patch
+from app.common.dates.date_service import DateService
+from app.common.integrations.notion.query_builder import (
+    Predicate,
+    Property,
+    Query,
+    UnsupportedFilterError,
+    Where,
+    days_from_today,
+    evaluate_filter,
+    today,
+)
+from app.common.integrations.notion.task_repository import TaskRepository
+
+LOGGER = "app.common.integrations.notion.query_builder"
+
+STATUS = Property.status("Status")
+FECHA = Property.date("Fecha")
+TAREA = Property.title("Tarea")
+
+
+def _page(page_id, title="", status=None, fecha=None):
+    return {
+        "id": page_id,
+        "last_edited_time": "2025-03-01T10:00:00.000Z",
+        "properties": {
+            "Tarea": {"type": "title", "title": [{"plain_text": title}]},
+            "Status": {
+                "type": "status",
+                "status": {"name": status} if status else None,
+            },
+            "Fecha": {"type": "date", "date": {"start": fecha} if fecha else None},
+        },
+    }
+
+
+class TestQueryBuilder(unittest.TestCase):
+    def test_compiles_pending_tasks_filter(self):
+        """Test that predicates compile to Notion's compound filter JSON"""
+        query = (
+            Query()
+            .where(STATUS.equals("Not Started"), FECHA.on_or_before(today()))
+            .sort_by("Fecha")
+        )
+
+        compiled = query.compile("2025-03-10")
+
+        self.assertEqual(
+            compiled.payload,
+            {
+                "filter": {
+                    "and": [
+                        {"property": "Status", "status": {"equals": "Not Started"}},
+                        {"property": "Fecha", "date": {"on_or_before": "2025-03-10"}},
+                    ]
+                },
+                "sorts": [{"property": "Fecha", "direction": "ascending"}],
+            },
+        )
+        self.assertIsNone(compiled.client_predicate)
+
+    def test_relative_dates_timestamps_and_projection(self):
+        """Test that relative dates resolve at compile time and options are sent"""
+        query = (
+            Query()
+            .where(Property.last_edited_time().on_or_after(days_from_today(-7)))
+            .sort_by_timestamp("last_edited_time", descending=True)
+            .select("Tarea", "Fecha")
+            .page_size(50)
+        )
+
+        compiled = query.compile("2025-03-10")
+
+        self.assertEqual(
+            compiled.payload["filter"],
+            {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": "2025-03-03"},
+            },
+        )
+        self.assertEqual(
+            compiled.payload["sorts"],
+            [{"timestamp": "last_edited_time", "direction": "descending"}],
+        )
+        self.assertEqual(compiled.payload["page_size"], 50)
+        self.assertEqual(compiled.filter_properties, ("Tarea", "Fecha"))
+
+    def test_negation_is_pushed_down(self):
+        """Test that ~ inverts conditions and keeps empty dates for comparisons"""
+        compiled = Query().where(~(STATUS.equals("Done") & FECHA.before("2025-01-01")))
+
+        self.assertEqual(
+            compiled.compile("2025-03-10").payload["filter"],
+            {
+                "or": [
+                    {"property": "Status", "status": {"does_not_equal": "Done"}},
+                    {"property": "Fecha", "date": {"on_or_after": "2025-01-01"}},
+                    {"property": "Fecha", "date": {"is_empty": True}},
+                ]
+            },
+        )
+
+    def test_unsupported_predicate_runs_client_side_with_warning(self):
+        """Test that a predicate Notion cannot evaluate is kept and logged"""
+        query = Query().where(STATUS.equals("Not Started"), TAREA.matches(r"^deploy"))
+
+        with self.assertLogs(LOGGER, level="WARNING") as logs:
+            compiled = query.compile("2025-03-10")
+
+        self.assertEqual(
+            compiled.payload["filter"],
+            {"property": "Status", "status": {"equals": "Not Started"}},
+        )
+        self.assertIn("Tarea matches", logs.output[0])
+        self.assertTrue(compiled.matches(_page("1", "deploy api", "Not Started")))
+        self.assertFalse(compiled.matches(_page("2", "review deploy", "Not Started")))
+
+    def test_or_with_client_side_part_is_not_pushed_down(self):
+        """Test that an Or containing a client-side part is evaluated whole"""
+        custom = Where(lambda page: page["id"] == "2", "id is 2")
+        query = Query().where(STATUS.equals("Done") | custom)
+
+        with self.assertLogs(LOGGER, level="WARNING"):
+            compiled = query.compile("2025-03-10")
+
+        self.assertNotIn("filter", compiled.payload)
+        self.assertTrue(compiled.matches(_page("1", status="Done")))
+        self.assertTrue(compiled.matches(_page("2")))
+        self.assertFalse(compiled.matches(_page("3")))
+
+    def test_compounds_nested_too_deep_run_client_side(self):
+        """Test that compounds beyond Notion's two nesting levels are not sent"""
+        inner = STATUS.equals("A") | STATUS.equals("B")
+        middle = inner & FECHA.is_not_empty()
+        query = Query().where(middle | TAREA.contains("x"))
+
+        with self.assertLogs(LOGGER, level="WARNING"):
+            compiled = query.compile("2025-03-10")
+
+        self.assertEqual(
+            compiled.payload["filter"],
+            {
+                "or": [
+                    {"property": "Fecha", "date": {"is_not_empty": True}},
+                    {"property": "Tarea", "title": {"contains": "x"}},
+                ]
+            },
+        )
+        self.assertTrue(compiled.matches(_page("1", status="A", fecha="2025-01-01")))
+        self.assertFalse(compiled.matches(_page("2", status="C", fecha="2025-01-01")))
+
+    def test_page_size_is_validated(self):
+        """Test that page_size outside 1..100 raises ValueError"""
+        with self.assertRaises(ValueError):
+            Query().page_size(101)
+
+    def test_predicate_must_implement_matches(self):
+        """Test that a predicate without matches() cannot be created"""
+
+        class NoMatches(Predicate):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoMatches()
+
+    def test_evaluate_filter(self):
+        """Test that filter JSON is evaluated against pages like Notion does"""
+        page = _page("1", "Deploy", "Not Started", "2025-03-10T09:30:00.000+00:00")
+
+        self.assertTrue(
+            evaluate_filter(
+                {"property": "Fecha", "date": {"on_or_before": "2025-03-10"}}, page
+            )
+        )
+        self.assertFalse(
+            evaluate_filter(
+                {"property": "Fecha", "date": {"before": "2025-03-10"}}, page
+            )
+        )
+        self.assertTrue(
+            evaluate_filter(
+                {"property": "Missing", "rich_text": {"is_empty": True}}, page
+            )
+        )
+        with self.assertRaises(UnsupportedFilterError):
+            evaluate_filter({"property": "Tarea", "title": {"sounds_like": "x"}}, page)
+
+
+class TestTaskRepositoryQueries(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.repository = TaskRepository(self.client, "db")
+        patcher = patch.object(DateService, "today", return_value=date(2025, 3, 10))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_iter_tasks_pushes_filter_and_projection(self):
+        """Test that iter_tasks sends the compiled filter and selected properties"""
+        self.client.post.return_value = {
+            "results": [_page("1", "a")],
+            "has_more": False,
+        }
+
+        tasks = list(
+            self.repository.iter_tasks(
+                Query().where(STATUS.equals("Done")).select("Tarea")
+            )
+        )
+
+        endpoint, body = self.client.post.call_args[0]
+        self.assertEqual(endpoint, "databases/db/query?filter_properties=Tarea")
+        self.assertEqual(
+            body, {"filter": {"property": "Status", "status": {"equals": "Done"}}}
+        )
+        self.assertEqual([task["id"] for task in tasks], ["1"])
+
+    def test_iter_tasks_filters_pages_client_side(self):
+        """Test that the client-side remainder drops pages before mapping"""
+        self.client.post.return_value = {
+            "results": [_page("1", "deploy api"), _page("2", "review")],
+            "has_more": False,
+        }
+
+        with self.assertLogs(LOGGER, level="WARNING"):
+            tasks = list(
+                self.repository.iter_tasks(Query().where(TAREA.matches("deploy")))
+            )
+
+        endpoint, body = self.client.post.call_args[0]
+        self.assertEqual(endpoint, "databases/db/query")
+        self.assertEqual(body, {})
+        self.assertEqual([task["id"] for task in tasks], ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
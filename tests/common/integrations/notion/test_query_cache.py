@@ -0,0 +1,157 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from app.common.environment.environment_handler import Settings
+from app.common.integrations.notion import query_cache
+from app.common.integrations.notion.query_cache import QueryResultCache
+from app.common.integrations.notion.task_repository import TaskRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+PAYLOAD = {
+    "filter": {"property": "Status", "status": {"equals": "Not Started"}},
+    "sorts": [{"property": "Fecha", "direction": "ascending"}],
+}
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """Test cases for QueryResultCache."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = QueryResultCache(ttl_seconds=60, clock=self.clock)
+
+    def test_make_key_is_canonical(self):
+        """Test that key order and property order do not change the key."""
+        reordered = {"sorts": PAYLOAD["sorts"], "filter": PAYLOAD["filter"]}
+        self.assertEqual(
+            QueryResultCache.make_key("db", PAYLOAD, "Fecha,Tarea"),
+            QueryResultCache.make_key("db", reordered, "Tarea, Fecha"),
+        )
+
+    def test_make_key_depends_on_database_and_filter(self):
+        key = QueryResultCache.make_key("db", PAYLOAD, "Fecha")
+        self.assertNotEqual(key, QueryResultCache.make_key("other", PAYLOAD, "Fecha"))
+        self.assertNotEqual(
+            key, QueryResultCache.make_key("db", {"filter": {}}, "Fecha")
+        )
+
+    def test_results_are_reused_within_ttl(self):
+        fetch = Mock(return_value=[{"id": "1"}])
+
+        self.cache.get_or_fetch("key", fetch)
+        self.clock.now += 59
+        result = self.cache.get_or_fetch("key", fetch)
+
+        self.assertEqual(result, [{"id": "1"}])
+        fetch.assert_called_once()
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_results_expire_after_ttl(self):
+        fetch = Mock(return_value=[{"id": "1"}])
+
+        self.cache.get_or_fetch("key", fetch)
+        self.clock.now += 60
+        self.cache.get_or_fetch("key", fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_returned_tasks_are_copies(self):
+        self.cache.get_or_fetch("key", lambda: [{"id": "1"}])[0]["id"] = "changed"
+        self.assertEqual(self.cache.get_or_fetch("key", Mock()), [{"id": "1"}])
+
+    def test_concurrent_identical_queries_make_one_fetch(self):
+        """Test that a burst of identical digests shares one round trip."""
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return [{"id": "1"}]
+
+        threads = [
+            threading.Thread(target=self.cache.get_or_fetch, args=("key", fetch))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        threading.Timer(0.2, release.set).start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+
+
+class TestTaskRepositoryQueryCache(unittest.TestCase):
+    """Test cases for TaskRepository with a query cache."""
+
+    def test_identical_queries_hit_notion_once(self):
+        notion_client = Mock()
+        notion_client.post.return_value = {"results": [{"id": "1", "properties": {}}]}
+        cache = QueryResultCache()
+        first = TaskRepository(notion_client, "db", query_cache=cache)
+        second = TaskRepository(notion_client, "db", query_cache=cache)
+
+        self.assertEqual(first.get_pending_tasks(), second.get_pending_tasks())
+        notion_client.post.assert_called_once()
+
+    def test_empty_results_are_not_cached(self):
+        notion_client = Mock()
+        notion_client.post.return_value = {"results": []}
+        repository = TaskRepository(notion_client, "db", query_cache=QueryResultCache())
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                repository.get_pending_tasks()
+
+        self.assertEqual(notion_client.post.call_count, 2)
+
+    def test_bulk_update_clears_cached_results(self):
+        """Test that tasks marked by a bulk update are queried again"""
+        notion_client = Mock()
+        notion_client.post.return_value = {"results": [{"id": "1", "properties": {}}]}
+        repository = TaskRepository(notion_client, "db", query_cache=QueryResultCache())
+        repository.get_pending_tasks()
+
+        repository.bulk_update({"1": {"properties": {}}})
+        repository.get_pending_tasks()
+
+        self.assertEqual(notion_client.post.call_count, 2)
+
+
+class TestGetQueryCache(unittest.TestCase):
+    """Test cases for get_query_cache."""
+
+    def setUp(self):
+        patcher = patch.object(query_cache, "_query_cache_instance", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_returns_shared_instance(self):
+        with patch.object(query_cache, "environment_handler") as mock_env:
+            mock_env.settings.notion_query_cache_ttl = 120
+            cache = query_cache.get_query_cache()
+            self.assertIsInstance(cache, QueryResultCache)
+            self.assertIs(query_cache.get_query_cache(), cache)
+
+    def test_disabled_with_zero_ttl(self):
+        with patch.object(query_cache, "environment_handler") as mock_env:
+            mock_env.settings.notion_query_cache_ttl = 0
+            self.assertIsNone(query_cache.get_query_cache())
+
+    def test_disabled_by_default(self):
+        """Test that the cache is opt-in"""
+        settings = Settings.from_environ({})
+        self.assertEqual(settings.notion_query_cache_ttl, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
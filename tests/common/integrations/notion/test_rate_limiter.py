@@ -0,0 +1,68 @@
+import threading
+import unittest
+from app.common.integrations.notion.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.sleeps.append(seconds)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            rate_per_second=3, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_burst_does_not_wait(self):
+        waits = [self.limiter.acquire() for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+    def test_requests_beyond_burst_are_spaced(self):
+        """Test that queued requests are scheduled 1/rate apart."""
+        waits = [self.limiter.acquire() for _ in range(6)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        for expected, actual in zip([1 / 3, 2 / 3, 1.0], waits[3:]):
+            self.assertAlmostEqual(expected, actual)
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.limiter.acquire()
+        self.clock.now += 1.0
+        self.assertEqual(self.limiter.acquire(), 0.0)
+
+    def test_refill_is_capped_at_burst(self):
+        self.clock.now += 100
+        waits = [self.limiter.acquire() for _ in range(4)]
+        self.assertGreater(waits[3], 0)
+
+    def test_shared_between_threads(self):
+        """Test that concurrent callers share one budget."""
+        threads = [threading.Thread(target=self.limiter.acquire) for _ in range(9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(self.clock.sleeps), 6)
+        self.assertAlmostEqual(max(self.clock.sleeps), 2.0)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate_per_second=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from app.common.integrations.notion.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=10, clock=self.clock)
+
+    def test_fresh_hit_returns_copy_of_body(self):
+        """Test that hits return the body and callers cannot mutate the cache."""
+        self.cache.store("databases/db1", "v1", {"id": "db1"})
+
+        body, etag = self.cache.lookup("databases/db1", "v1")
+        body["id"] = "mutated"
+
+        self.assertIsNone(etag)
+        self.assertEqual(self.cache.lookup("databases/db1", "v1")[0], {"id": "db1"})
+        self.assertEqual(self.cache.stats.hits, 2)
+
+    def test_key_includes_notion_version(self):
+        self.cache.store("users", "v1", {"results": []})
+        self.assertEqual(self.cache.lookup("users", "v2"), (None, None))
+
+    def test_ttl_depends_on_endpoint(self):
+        self.assertEqual(self.cache.ttl_for("databases/abc"), 3600)
+        self.assertEqual(self.cache.ttl_for("/pages/abc"), 300)
+        self.assertEqual(self.cache.ttl_for("search"), 60)
+
+    def test_stale_entry_without_etag_is_a_miss(self):
+        self.cache.store("pages/p1", "v1", {"id": "p1"})
+        self.clock.now += 300
+        self.assertEqual(self.cache.lookup("pages/p1", "v1"), (None, None))
+        self.assertEqual(self.cache.stats.expirations, 1)
+
+    def test_stale_entry_with_etag_can_be_revalidated(self):
+        self.cache.store("pages/p1", "v1", {"id": "p1"}, etag='"abc"')
+        self.clock.now += 300
+
+        self.assertEqual(self.cache.lookup("pages/p1", "v1"), (None, '"abc"'))
+        self.assertEqual(self.cache.revalidate("pages/p1", "v1"), {"id": "p1"})
+        self.assertEqual(self.cache.lookup("pages/p1", "v1"), ({"id": "p1"}, None))
+
+    def test_invalidate_resource_matches_object_id(self):
+        """Test that all endpoints of the modified object are dropped."""
+        self.cache.store("pages/p1", "v1", {"id": "p1"})
+        self.cache.store("blocks/p1/children", "v1", {"results": []})
+        self.cache.store("pages/p2", "v1", {"id": "p2"})
+
+        removed = self.cache.invalidate_resource("pages/p1")
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(self.cache.lookup("blocks/p1/children", "v1"), (None, None))
+        self.assertIsNotNone(self.cache.lookup("pages/p2", "v1")[0])
+
+    def test_invalidate_resource_without_id_is_noop(self):
+        self.assertEqual(self.cache.invalidate_resource("pages"), 0)
+
+    def test_disk_tier_fills_memory_tier(self):
+        """Test that a new cache on the same directory reads the disk tier."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = ResponseCache(disk_directory=tmp_dir, clock=self.clock)
+            first.store("users/u1", "v1", {"id": "u1"})
+
+            second = ResponseCache(disk_directory=tmp_dir, clock=self.clock)
+            self.assertEqual(second.lookup("users/u1", "v1")[0], {"id": "u1"})
+
+            second.invalidate_resource("users/u1")
+            third = ResponseCache(disk_directory=tmp_dir, clock=self.clock)
+            self.assertEqual(third.lookup("users/u1", "v1"), (None, None))
+
+    def test_parse_ttls_merges_overrides(self):
+        ttls = ResponseCache.parse_ttls("pages=30, search=5")
+        self.assertEqual(ttls["pages"], 30)
+        self.assertEqual(ttls["search"], 5)
+        self.assertEqual(ttls["databases"], 3600)
+
+    def test_parse_ttls_rejects_malformed_entry(self):
+        with self.assertRaises(ValueError):
+            ResponseCache.parse_ttls("pages")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import Mock, patch
+from app.common.dates.date_service import DateService
+from app.common.integrations.notion.bulk_update import BulkUpdateResult, status_update
+from app.common.integrations.notion.exceptions import (
+    NotionApiError,
+    NotionDataNotFoundError,
+)
+from app.common.integrations.notion.task_index import IndexedTaskRepository, TaskIndex
+from app.common.integrations.notion.task_repository import TaskRepository
+
+
+def _page(page_id, fecha, status="Not Started", people=(), edited="2025-03-01T10:00"):
+    return {
+        "id": page_id,
+        "last_edited_time": f"{edited}:00.000Z",
+        "properties": {
+            "Tarea": {"type": "title", "title": [{"plain_text": f"Task {page_id}"}]},
+            "Fecha": {"type": "date", "date": {"start": fecha} if fecha else None},
+            "Notas": {"type": "rich_text", "rich_text": []},
+            "Status": {"type": "status", "status": {"name": status}},
+            "Responsable": {
+                "type": "people",
+                "people": [{"object": "user", "id": person} for person in people],
+            },
+        },
+    }
+
+
+def _response(*pages):
+    return {"results": list(pages), "has_more": False}
+
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.index = TaskIndex(os.path.join(directory.name, "index", "tasks.sqlite"))
+        self.addCleanup(self.index.close)
+        self.client = Mock()
+        self.repository = TaskRepository(self.client, "db")
+        patcher = patch.object(DateService, "today", return_value=date(2025, 3, 10))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_first_sync_reads_every_page(self):
+        """Test that the first sync reads all pages with the indexed properties"""
+        self.client.post.return_value = _response(
+            _page("b", "2025-03-10T09:30:00.000+00:00"),
+            _page("a", "2025-03-01"),
+            _page("c", "2025-03-11"),
+            _page("d", "2025-03-02", status="Done"),
+        )
+
+        self.assertEqual(self.index.sync(self.repository), 4)
+        tasks = self.index.pending_tasks(["db"], "2025-03-10")
+
+        endpoint, body = self.client.post.call_args[0]
+        self.assertIn("filter_properties=Status", endpoint)
+        self.assertIn("filter_properties=Responsable", endpoint)
+        self.assertEqual(
+            body,
+            {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]},
+        )
+        self.assertEqual([task["id"] for task in tasks], ["a", "b"])
+        self.assertEqual(
+            tasks[0],
+            {
+                "id": "a",
+                "titulo": "Task a",
+                "fecha": "2025-03-01",
+                "notas": "",
+                "editado": "2025-03-01T10:00:00.000Z",
+            },
+        )
+
+    def test_incremental_sync_reads_pages_edited_since_the_last_sync(self):
+        """Test that later syncs filter on the newest last_edited_time seen"""
+        self.client.post.return_value = _response(
+            _page("a", "2025-03-01"),
+            _page("b", "2025-03-02", edited="2025-03-05T08:15"),
+        )
+        self.index.sync(self.repository)
+        self.client.post.return_value = _response(
+            _page("a", "2025-03-01", status="Done", edited="2025-03-06T12:00")
+        )
+
+        self.index.sync(self.repository)
+
+        body = self.client.post.call_args[0][1]
+        self.assertEqual(
+            body["filter"],
+            {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": "2025-03-05T08:15:00.000Z"},
+            },
+        )
+        tasks = self.index.pending_tasks(["db"], "2025-03-10")
+        self.assertEqual([task["id"] for task in tasks], ["b"])
+
+    def test_full_sync_drops_pages_no_longer_returned(self):
+        """Test that a full sync deletes rows of pages removed from Notion"""
+        self.client.post.return_value = _response(
+            _page("a", "2025-03-01"), _page("b", "2025-03-02", people=["u1"])
+        )
+        self.index.sync(self.repository)
+        self.client.post.return_value = _response(_page("a", "2025-03-01"))
+
+        self.index.sync(self.repository, full=True)
+
+        self.assertEqual([task["id"] for task in self.index.tasks()], ["a"])
+        self.assertEqual(self.index.counts("assignee"), {})
+
+    def test_failed_sync_keeps_the_previous_state(self):
+        """Test that a failing request rolls the sync back"""
+        self.client.post.return_value = _response(_page("a", "2025-03-01"))
+        self.index.sync(self.repository)
+        self.client.post.side_effect = [
+            {
+                **_response(_page("a", "2025-03-01", status="Done")),
+                "has_more": True,
+                "next_cursor": "c1",
+            },
+            NotionApiError("boom", status_code=500),
+        ]
+
+        with self.assertRaises(NotionApiError):
+            self.index.sync(self.repository)
+
+        self.assertEqual(self.index.counts(), {"Not Started": 1})
+
+    def test_sync_does_not_hold_the_database_during_requests(self):
+        """Test that no lock or transaction is held while pages are read"""
+        held = []
+
+        def post(endpoint, body):
+            held.append(
+                self.index._lock.locked() or self.index._connection.in_transaction
+            )
+            return _response(_page("a", "2025-03-01"))
+
+        self.client.post.side_effect = post
+        self.index.sync(self.repository)
+
+        self.assertEqual(held, [False])
+        self.assertEqual(len(self.index.tasks()), 1)
+
+    def test_reports_by_assignee_status_and_date(self):
+        """Test that ad-hoc reports are answered from the index"""
+        self.client.post.return_value = _response(
+            _page("a", "2025-03-01", people=["u1", "u2"]),
+            _page("b", "2025-03-05", people=["u1"], status="Done"),
+            _page("c", None, people=["u2"]),
+        )
+        self.index.sync(self.repository)
+
+        tasks = self.index.tasks(assignee="u1", fecha_from="2025-03-01")
+
+        self.assertEqual([task["id"] for task in tasks], ["a", "b"])
+        self.assertEqual(tasks[0]["responsables"], ["u1", "u2"])
+        self.assertEqual(tasks[1]["status"], "Done")
+        self.assertEqual(self.index.counts("assignee"), {"u1": 2, "u2": 2})
+        self.assertEqual(self.index.counts(), {"Not Started": 2, "Done": 1})
+        with self.assertRaises(ValueError):
+            self.index.counts("fecha")
+
+
+class TestIndexedTaskRepository(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.index = TaskIndex(os.path.join(directory.name, "tasks.sqlite"))
+        self.addCleanup(self.index.close)
+        self.client = Mock()
+        self.repositories = [
+            TaskRepository(self.client, "db1"),
+            TaskRepository(self.client, "db2"),
+        ]
+        patcher = patch.object(DateService, "today", return_value=date(2025, 3, 10))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = IndexedTaskRepository(self.repositories, self.index)
+
+    def test_pending_tasks_merge_every_database(self):
+        """Test that each database is synced and the digest read from the index"""
+        self.client.post.side_effect = lambda endpoint, body: (
+            _response(_page("a", "2025-03-03"))
+            if endpoint.startswith("databases/db1")
+            else _response(_page("b", "2025-03-01"))
+        )
+
+        tasks = self.repository.get_pending_tasks()
+
+        self.assertEqual([task["id"] for task in tasks], ["b", "a"])
+        self.assertEqual(self.client.post.call_count, 2)
+
+    def test_no_pending_tasks_raises(self):
+        """Test that an empty digest raises NotionDataNotFoundError"""
+        self.client.post.return_value = _response(_page("a", "2025-03-01", "Done"))
+
+        with self.assertRaises(NotionDataNotFoundError):
+            self.repository.get_pending_tasks()
+
+    def test_bulk_update_applies_status_to_the_index(self):
+        """Test that notified tasks leave the pending tasks before the next sync"""
+        self.client.post.return_value = _response(_page("a", "2025-03-01"))
+        self.repository.sync()
+        result = BulkUpdateResult(succeeded=["a"])
+
+        with patch.object(TaskRepository, "bulk_update", return_value=result):
+            self.repository.bulk_update({"a": status_update("Notified")})
+
+        self.assertEqual(self.index.pending_tasks(["db1"], "2025-03-10"), [])
+        self.assertEqual(self.index.counts(), {"Notified": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import Mock, patch
+from app.common.dates.date_service import DateService
 from app.common.integrations.notion.task_repository import TaskRepository
 from app.common.integrations.notion.exceptions import (
     NotionApiError,
@@ -7,6 +9,14 @@ from app.common.integrations.notion.exceptions import (
 )
 
 
+class StandInStream(list):
+    """A decoded result list carrying the response metadata, like JsonArrayStream."""
+
+    def __init__(self, results, metadata):
+        super().__init__(results)
+        self.metadata = metadata
+
+
 class TestTaskRepository(unittest.TestCase):
     """Test cases for TaskRepository class."""
 
@@ -121,15 +131,48 @@ class TestTaskRepository(unittest.TestCase):
 
         self.assertIn("No tasks found in Notion", str(context.exception))
 
-    @patch("app.common.integrations.notion.task_repository.datetime")
-    def test_get_current_date_returns_formatted_date(self, mock_datetime):
-        """Test that _get_current_date returns date in YYYY-MM-DD format."""
-        mock_datetime.now.return_value.strftime.return_value = "2025-12-05"
+    def test_get_pending_tasks_follows_pagination(self):
+        """Test that get_pending_tasks requests every page using next_cursor."""
+        self.mock_notion_client.post.side_effect = [
+            {
+                "results": [{"id": "1", "properties": {}}],
+                "has_more": True,
+                "next_cursor": "cursor-2",
+            },
+            {"results": [{"id": "2", "properties": {}}], "has_more": False},
+        ]
+
+        result = self.task_repository.get_pending_tasks()
+
+        self.assertEqual([task["id"] for task in result], ["1", "2"])
+        second_payload = self.mock_notion_client.post.call_args_list[1][0][1]
+        self.assertEqual(second_payload["start_cursor"], "cursor-2")
+        self.assertIn("filter", second_payload)
+
+    def test_iter_pending_tasks_streams_mapped_tasks(self):
+        """Test that iter_pending_tasks yields mapped tasks lazily."""
+        self.mock_notion_client.post.return_value = {
+            "results": [{"id": "1", "properties": {}}]
+        }
+
+        stream = self.task_repository.iter_pending_tasks()
+
+        self.mock_notion_client.post.assert_not_called()
+        self.assertEqual(next(stream)["id"], "1")
+
+    @patch("app.common.integrations.notion.task_repository.get_date_service")
+    def test_get_current_date_returns_formatted_date(self, mock_get_date_service):
+        """Test that _get_current_date returns the configured timezone's date."""
+        mock_get_date_service.return_value = DateService(
+            "America/New_York",
+            now=lambda tz: datetime(2025, 12, 6, 3, 30, tzinfo=timezone.utc).astimezone(
+                tz
+            ),
+        )
 
         result = self.task_repository._get_current_date()
 
         self.assertEqual(result, "2025-12-05")
-        mock_datetime.now.return_value.strftime.assert_called_once_with("%Y-%m-%d")
 
     def test_map_response_returns_mapped_tasks(self):
         """Test that _map_response returns a list of mapped tasks."""
@@ -163,7 +206,7 @@ class TestTaskRepository(unittest.TestCase):
         self.assertEqual(result, [])
 
     def test_map_task_extracts_all_fields(self):
-        """Test that _map_task extracts id, titulo, fecha, and notas."""
+        """Test that map_task extracts id, titulo, fecha, and notas."""
         task = {
             "id": "abc-123",
             "properties": {
@@ -173,7 +216,7 @@ class TestTaskRepository(unittest.TestCase):
             },
         }
 
-        result = self.task_repository._map_task(task)
+        result = self.task_repository.map_task(task)
 
         self.assertEqual(result["id"], "abc-123")
         self.assertEqual(result["titulo"], "My Task")
@@ -261,6 +304,27 @@ class TestTaskRepository(unittest.TestCase):
 
         self.assertEqual(result, "filter_properties=Status")
 
+    def test_streaming_maps_pages_and_follows_cursor(self):
+        """Test that streaming mode maps decoded pages and paginates with metadata."""
+        pages = [
+            ([{"id": "1", "properties": {}}], {"has_more": True, "next_cursor": "c1"}),
+            ([{"id": "2", "properties": {}}], {"has_more": False, "next_cursor": None}),
+        ]
+
+        def post_stream(endpoint, body):
+            results, metadata = pages.pop(0)
+            return StandInStream(results, metadata)
+
+        self.mock_notion_client.post_stream.side_effect = post_stream
+        repo = TaskRepository(self.mock_notion_client, self.database_id, streaming=True)
+
+        tasks = repo.get_pending_tasks()
+
+        self.assertEqual([task["id"] for task in tasks], ["1", "2"])
+        second_body = self.mock_notion_client.post_stream.call_args_list[1][0][1]
+        self.assertEqual(second_body["start_cursor"], "c1")
+        self.mock_notion_client.post.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
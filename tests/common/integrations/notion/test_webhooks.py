@@ -0,0 +1,153 @@
+import base64
+import hashlib
+import hmac
+import json
+import unittest
+from app.common.integrations.notion.webhooks import (
+    PageEvent,
+    WebhookError,
+    coalesce,
+    parse_page_events,
+    read_deliveries,
+)
+
+TOKEN = "secret_token"
+SECRET = "automation_secret"
+
+
+def _signature(body: bytes) -> str:
+    return "sha256=" + hmac.new(TOKEN.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _subscription_event(
+    event_type, page_id="page-1", timestamp="2025-03-10T09:00:00.000Z"
+):
+    return {
+        "id": "event-1",
+        "timestamp": timestamp,
+        "type": event_type,
+        "entity": {"id": page_id, "type": "page"},
+        "data": {"parent": {"id": "db-1", "type": "database"}},
+    }
+
+
+class TestReadDeliveries(unittest.TestCase):
+    def test_http_delivery_is_verified(self):
+        """Test that a signed Function URL delivery is decoded"""
+        body = json.dumps(_subscription_event("page.created")).encode()
+        event = {
+            "headers": {"X-Notion-Signature": _signature(body)},
+            "body": base64.b64encode(body).decode(),
+            "isBase64Encoded": True,
+        }
+
+        deliveries = read_deliveries(event, TOKEN)
+
+        self.assertEqual(deliveries[0]["type"], "page.created")
+
+    def test_invalid_signature_is_rejected(self):
+        """Test that a delivery not signed with the token raises a 401 error"""
+        event = {"headers": {"x-notion-signature": "sha256=00"}, "body": "{}"}
+
+        with self.assertRaises(WebhookError) as cm:
+            read_deliveries(event, TOKEN)
+
+        self.assertEqual(cm.exception.status_code, 401)
+
+    def test_without_token_only_the_verification_request_is_accepted(self):
+        """Test that unauthenticated deliveries are rejected until a token is set"""
+        handshake = {"headers": {}, "body": '{"verification_token": "secret_x"}'}
+        event = {"headers": {}, "body": json.dumps(_subscription_event("page.created"))}
+
+        self.assertEqual(
+            read_deliveries(handshake), [{"verification_token": "secret_x"}]
+        )
+        with self.assertRaises(WebhookError) as cm:
+            read_deliveries(event)
+        self.assertEqual(cm.exception.status_code, 401)
+
+    def test_automation_delivery_needs_the_secret_header(self):
+        """Test that unsigned automation deliveries are accepted with the secret"""
+        body = json.dumps({"data": {"object": "page", "id": "page-1"}})
+
+        deliveries = read_deliveries(
+            {"headers": {"X-Webhook-Secret": SECRET}, "body": body}, TOKEN, SECRET
+        )
+        self.assertEqual(deliveries[0]["data"]["id"], "page-1")
+        for headers in ({"X-Webhook-Secret": "wrong"}, {}):
+            with self.assertRaises(WebhookError):
+                read_deliveries({"headers": headers, "body": body}, TOKEN, SECRET)
+
+    def test_sqs_records_and_other_events(self):
+        """Test that SQS records are deliveries and scheduled events are not"""
+        event = {
+            "Records": [
+                {"eventSource": "aws:sqs", "body": json.dumps({"n": 1})},
+                {"eventSource": "aws:sqs", "body": json.dumps({"n": 2})},
+            ]
+        }
+
+        self.assertEqual(read_deliveries(event), [{"n": 1}, {"n": 2}])
+        self.assertIsNone(read_deliveries({}))
+        self.assertIsNone(read_deliveries({"source": "aws.events", "detail": {}}))
+        with self.assertRaises(WebhookError):
+            read_deliveries({"headers": {}, "body": "not json"})
+
+
+class TestPageEvents(unittest.TestCase):
+    def test_subscription_events(self):
+        """Test that page events name the page and its database"""
+        events = parse_page_events(_subscription_event("page.deleted"))
+
+        self.assertEqual(
+            events,
+            [PageEvent("page-1", "2025-03-10T09:00:00.000Z", True, "db-1")],
+        )
+        self.assertEqual(parse_page_events(_subscription_event("comment.created")), [])
+
+    def test_automation_events_only_name_the_page(self):
+        """Test that an automation webhook's page is to be read, not trusted"""
+        page = {
+            "object": "page",
+            "id": "page-1",
+            "last_edited_time": "2025-03-10T09:00:00.000Z",
+            "parent": {"type": "database_id", "database_id": "db-1"},
+            "properties": {},
+        }
+
+        (event,) = parse_page_events({"source": {"type": "automation"}, "data": page})
+
+        self.assertEqual(event.database_id, "db-1")
+        self.assertTrue(event.automation)
+        self.assertFalse(event.deleted)
+
+    def test_coalesce_keeps_the_latest_event_per_page(self):
+        """Test that a burst of events becomes one event per page"""
+        events = [
+            PageEvent("page-1", "2025-03-10T09:00:00.000Z"),
+            PageEvent("page-2", "2025-03-10T09:00:01.000Z"),
+            PageEvent("PAGE1", "2025-03-10T09:00:05.000Z"),
+            PageEvent("page-1", "2025-03-10T09:00:02.000Z"),
+        ]
+
+        self.assertEqual(coalesce(events), [events[2], events[1]])
+
+    def test_coalesce_compares_subscription_and_automation_events_by_minute(self):
+        """Test that a same-minute automation event received later is kept"""
+        subscription = PageEvent("page-1", "2025-03-10T12:05:30.379Z")
+        automation = PageEvent("page-1", "2025-03-10T12:05:00.000Z", automation=True)
+        older = PageEvent("page-1", "2025-03-10T12:04:59.000Z")
+
+        self.assertEqual(coalesce([subscription, automation, older]), [automation])
+
+    def test_coalesce_keeps_events_without_timestamp(self):
+        """Test that an event that cannot be ordered is not replaced"""
+        undated = PageEvent("page-1", "")
+        dated = PageEvent("page-1", "2025-03-10T12:05:00.000Z")
+
+        self.assertEqual(coalesce([dated, undated]), [undated])
+        self.assertEqual(coalesce([undated, dated]), [undated])
+
+
+if __name__ == "__main__":
+    unittest.main()
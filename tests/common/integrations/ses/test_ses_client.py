@@ -1,6 +1,10 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from app.common.integrations.ses.ses_client import SesClient
+from app.common.integrations.ses.ses_client import (
+    SesClient,
+    get_ses_client,
+    reset_ses_client,
+)
 
 
 class TestSesClient(unittest.TestCase):
@@ -45,6 +49,35 @@ class TestSesClient(unittest.TestCase):
             },
         )
 
+    @patch("app.common.integrations.ses.ses_client.boto3")
+    def test_send_email_with_text_body(self, mock_boto3):
+        """Test that a provided plain-text body is sent as the Text part."""
+        mock_client = MagicMock()
+        mock_boto3.client.return_value = mock_client
+
+        SesClient().send_email(
+            "sender@example.com",
+            ["receiver@example.com"],
+            "Subject",
+            "<p>Body</p>",
+            text_body="Body",
+        )
+
+        message = mock_client.send_email.call_args.kwargs["Message"]
+        self.assertEqual(message["Body"]["Text"], {"Data": "Body", "Charset": "UTF-8"})
+        self.assertEqual(message["Body"]["Html"]["Data"], "<p>Body</p>")
+
+    @patch("app.common.integrations.ses.ses_client.boto3")
+    def test_get_ses_client_is_shared_until_reset(self, mock_boto3):
+        """Test that the shared client is reused until reset_ses_client is called."""
+        reset_ses_client()
+        first = get_ses_client()
+
+        self.assertIs(get_ses_client(), first)
+        reset_ses_client()
+        self.assertIsNot(get_ses_client(), first)
+        reset_ses_client()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import Mock, patch
+from app.common.lifecycle.lifecycle import Lifecycle
+
+
+class TestLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.lifecycle = Lifecycle()
+        self.calls = []
+
+    def test_hooks_run_in_registration_order(self):
+        """Test that each phase runs only its own hooks, in registration order."""
+        self.lifecycle.before_snapshot(lambda: self.calls.append("warm 1"))
+        self.lifecycle.before_snapshot(lambda: self.calls.append("warm 2"))
+        self.lifecycle.after_restore(lambda: self.calls.append("restore"))
+
+        self.lifecycle.run_before_snapshot()
+        self.assertEqual(self.calls, ["warm 1", "warm 2"])
+
+        self.lifecycle.run_after_restore()
+        self.assertEqual(self.calls, ["warm 1", "warm 2", "restore"])
+
+    def test_registration_works_as_decorator(self):
+        """Test that registering returns the hook unchanged."""
+
+        @self.lifecycle.after_restore
+        def hook():
+            self.calls.append("hook")
+
+        hook()
+        self.assertEqual(self.calls, ["hook"])
+        self.assertEqual(self.lifecycle.after_restore_hooks, [hook])
+
+    def test_failing_hook_raises_and_stops_the_phase(self):
+        """Test that a failing hook fails the phase so the runtime can retry it."""
+        self.lifecycle.before_snapshot(Mock(side_effect=RuntimeError("boom")))
+        later = self.lifecycle.before_snapshot(Mock())
+
+        with self.assertRaises(RuntimeError):
+            self.lifecycle.run_before_snapshot()
+        later.assert_not_called()
+
+    def test_install_without_runtime_support(self):
+        """Test that install reports False outside a SnapStart runtime."""
+        with patch("app.common.lifecycle.lifecycle.snapshot_restore_py", None):
+            self.assertFalse(self.lifecycle.install())
+
+    def test_install_registers_with_runtime(self):
+        """Test that install registers both phases with snapshot_restore_py."""
+        runtime = Mock()
+        with patch("app.common.lifecycle.lifecycle.snapshot_restore_py", runtime):
+            self.assertTrue(self.lifecycle.install())
+
+        runtime.register_before_snapshot.assert_called_once_with(
+            self.lifecycle.run_before_snapshot
+        )
+        runtime.register_after_restore.assert_called_once_with(
+            self.lifecycle.run_after_restore
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
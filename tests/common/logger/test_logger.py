@@ -2,6 +2,7 @@ import unittest
 import os
 import logging
 from unittest.mock import patch
+from app.common.environment.environment_handler import environment_handler
 from app.common.logger.logger import get_logger
 
 
@@ -13,6 +14,8 @@ class TestLogger(unittest.TestCase):
             del os.environ["AWS_LAMBDA_FUNCTION_NAME"]
         if "LOG_LEVEL" in os.environ:
             del os.environ["LOG_LEVEL"]
+        environment_handler.reload()
+        self.addCleanup(environment_handler.reload)
 
     def test_get_logger_local(self):
         """Test logger configuration for local environment"""
@@ -31,6 +34,7 @@ class TestLogger(unittest.TestCase):
         with patch.dict(
             os.environ, {"AWS_LAMBDA_FUNCTION_NAME": "my-function", "ENVIRONMENT": ""}
         ):
+            environment_handler.reload()
             logger = get_logger("test_lambda")
 
             self.assertEqual(logger.level, logging.INFO)
@@ -40,6 +44,7 @@ class TestLogger(unittest.TestCase):
     def test_get_logger_custom_level(self):
         """Test logger configuration with custom log level"""
         with patch.dict(os.environ, {"LOG_LEVEL": "WARNING"}):
+            environment_handler.reload()
             logger = get_logger("test_custom")
             self.assertEqual(logger.level, logging.WARNING)
 
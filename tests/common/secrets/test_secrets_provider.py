@@ -0,0 +1,221 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from app.common.secrets.exceptions import SecretNotFoundError
+from app.common.secrets.secrets_provider import (
+    CachedSecretsProvider,
+    EnvSecretBackend,
+    FileSecretBackend,
+    SecretBackend,
+    SecretsManagerBackend,
+    SsmParameterBackend,
+    create_secrets_provider,
+    parse_secret_source,
+)
+
+
+class StandInSecretBackend(SecretBackend):
+    """Local stand-in for a remote secret store, with controllable values."""
+
+    def __init__(self, values):
+        self.values = dict(values)
+        self.fetches = 0
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch(self, name):
+        self.release.wait(timeout=5)
+        self.fetches += 1
+        if self.fail:
+            raise SecretNotFoundError("backend unavailable", name)
+        return self.values[name]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachedSecretsProvider(unittest.TestCase):
+    """Test cases for CachedSecretsProvider."""
+
+    def setUp(self):
+        self.backend = StandInSecretBackend({"notion": "key-v1"})
+        self.clock = FakeClock()
+        self.provider = CachedSecretsProvider(
+            self.backend, ttl_seconds=100, refresh_ahead_seconds=20, clock=self.clock
+        )
+
+    def _wait_for_refresh(self, name):
+        thread = self.provider._refreshing.get(name)
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def test_first_get_fetches_from_backend(self):
+        """Test that the first read fetches synchronously."""
+        self.assertEqual(self.provider.get("notion"), "key-v1")
+        self.assertEqual(self.backend.fetches, 1)
+
+    def test_get_within_ttl_uses_cache(self):
+        """Test that reads inside the TTL do not hit the backend."""
+        self.provider.get("notion")
+        self.clock.now = 50
+        self.provider.get("notion")
+        self.assertEqual(self.backend.fetches, 1)
+
+    def test_get_in_refresh_window_returns_cached_value_and_refreshes(self):
+        """Test that reads near expiry return immediately and refresh in the background."""
+        self.provider.get("notion")
+        self.backend.values["notion"] = "key-v2"
+        self.backend.release.clear()
+        self.clock.now = 85
+
+        # The backend is blocked, so this only succeeds if the read does not wait on it
+        self.assertEqual(self.provider.get("notion"), "key-v1")
+
+        self.backend.release.set()
+        self._wait_for_refresh("notion")
+        self.assertEqual(self.provider.get("notion"), "key-v2")
+        self.assertEqual(self.backend.fetches, 2)
+
+    def test_only_one_background_refresh_per_secret(self):
+        """Test that concurrent reads in the refresh window start a single refresh."""
+        self.provider.get("notion")
+        self.backend.release.clear()
+        self.clock.now = 90
+
+        for _ in range(5):
+            self.provider.get("notion")
+
+        self.backend.release.set()
+        self._wait_for_refresh("notion")
+        self.assertEqual(self.backend.fetches, 2)
+
+    def test_failed_background_refresh_keeps_cached_value(self):
+        """Test that a failing refresh does not evict the cached value."""
+        self.provider.get("notion")
+        self.backend.fail = True
+        self.clock.now = 90
+
+        self.assertEqual(self.provider.get("notion"), "key-v1")
+        self._wait_for_refresh("notion")
+        self.assertEqual(self.provider.get("notion"), "key-v1")
+
+    def test_expired_value_is_fetched_synchronously(self):
+        """Test that an expired value is refetched on the request path."""
+        self.provider.get("notion")
+        self.backend.values["notion"] = "key-v2"
+        self.clock.now = 150
+
+        self.assertEqual(self.provider.get("notion"), "key-v2")
+
+    def test_expired_value_raises_when_backend_fails(self):
+        """Test that errors surface once the cached value has expired."""
+        self.provider.get("notion")
+        self.backend.fail = True
+        self.clock.now = 150
+
+        with self.assertRaises(SecretNotFoundError):
+            self.provider.get("notion")
+
+    def test_invalidate_forces_refetch(self):
+        """Test that invalidate() drops cached values."""
+        self.provider.get("notion")
+        self.provider.invalidate("notion")
+        self.provider.get("notion")
+        self.provider.invalidate()
+        self.provider.get("notion")
+        self.assertEqual(self.backend.fetches, 3)
+
+
+class TestSecretBackends(unittest.TestCase):
+    """Test cases for the concrete secret backends."""
+
+    def test_backend_without_fetch_cannot_be_created(self):
+        class IncompleteBackend(SecretBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+
+    @patch.dict("os.environ", {"MY_SECRET": "value"})
+    def test_env_backend_reads_variable(self):
+        self.assertEqual(EnvSecretBackend().fetch("MY_SECRET"), "value")
+
+    def test_env_backend_raises_when_missing(self):
+        with patch.dict("os.environ", clear=True):
+            with self.assertRaises(SecretNotFoundError):
+                EnvSecretBackend().fetch("MY_SECRET")
+
+    def test_file_backend_reads_stripped_content(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as f:
+            f.write("file-secret\n")
+        self.addCleanup(os.remove, f.name)
+
+        self.assertEqual(FileSecretBackend().fetch(f.name), "file-secret")
+
+    def test_file_backend_raises_when_missing(self):
+        with self.assertRaises(SecretNotFoundError):
+            FileSecretBackend().fetch("/nonexistent/secret")
+
+    def test_secrets_manager_backend(self):
+        client = MagicMock()
+        client.get_secret_value.return_value = {"SecretString": "sm-secret"}
+
+        backend = SecretsManagerBackend("us-east-1", client=client)
+
+        self.assertEqual(backend.fetch("notion/api-key"), "sm-secret")
+        client.get_secret_value.assert_called_once_with(SecretId="notion/api-key")
+
+    def test_secrets_manager_backend_not_found(self):
+        client = MagicMock()
+        client.exceptions.ResourceNotFoundException = KeyError
+        client.get_secret_value.side_effect = KeyError("missing")
+
+        with self.assertRaises(SecretNotFoundError):
+            SecretsManagerBackend("us-east-1", client=client).fetch("missing")
+
+    def test_ssm_backend_decrypts_parameter(self):
+        client = MagicMock()
+        client.get_parameter.return_value = {"Parameter": {"Value": "ssm-secret"}}
+
+        backend = SsmParameterBackend("us-east-1", client=client)
+
+        self.assertEqual(backend.fetch("/notion/api-key"), "ssm-secret")
+        client.get_parameter.assert_called_once_with(
+            Name="/notion/api-key", WithDecryption=True
+        )
+
+    @patch("boto3.client")
+    def test_create_secrets_provider_builds_aws_backend(self, mock_client):
+        provider = create_secrets_provider("ssm", "eu-west-1", ttl_seconds=60)
+
+        mock_client.assert_called_once_with("ssm", region_name="eu-west-1")
+        self.assertIsInstance(provider.backend, SsmParameterBackend)
+        self.assertEqual(provider.ttl_seconds, 60)
+
+
+class TestParseSecretSource(unittest.TestCase):
+    """Test cases for parse_secret_source."""
+
+    def test_parses_kind_and_name(self):
+        self.assertEqual(
+            parse_secret_source("ssm:/notion/key", "DEFAULT"), ("ssm", "/notion/key")
+        )
+
+    def test_uses_default_name_for_bare_kind(self):
+        self.assertEqual(parse_secret_source("env", "DEFAULT"), ("env", "DEFAULT"))
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            parse_secret_source("vault:key", "DEFAULT")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import importlib.util
+import unittest
+from unittest.mock import patch
+from app.common.serialization import json_codec
+from app.common.serialization.json_codec import (
+    StdlibJsonCodec,
+    create_json_codec,
+    get_json_codec,
+)
+
+DOCUMENT = {
+    "results": [{"id": "1", "title": "Café ☕", "done": False, "n": 1.5, "x": None}],
+    "has_more": False,
+}
+
+
+class TestJsonCodecs(unittest.TestCase):
+    def _available_codecs(self):
+        names = ["stdlib"]
+        names += [
+            name for name in ("orjson", "msgspec") if importlib.util.find_spec(name)
+        ]
+        return [create_json_codec(name) for name in names]
+
+    def test_codecs_round_trip(self):
+        """Test that every installed codec decodes what it encodes."""
+        for codec in self._available_codecs():
+            with self.subTest(codec=codec.name):
+                encoded = codec.dumps(DOCUMENT)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(codec.loads(encoded), DOCUMENT)
+                self.assertEqual(codec.loads(encoded.decode("utf-8")), DOCUMENT)
+
+    def test_codecs_encode_compact_utf8(self):
+        """Test that every codec produces the same compact UTF-8 bytes."""
+        expected = StdlibJsonCodec().dumps(DOCUMENT)
+        self.assertIn("Café ☕".encode("utf-8"), expected)
+        for codec in self._available_codecs():
+            with self.subTest(codec=codec.name):
+                self.assertEqual(codec.dumps(DOCUMENT), expected)
+
+    def test_dumps_pretty_keeps_non_ascii(self):
+        """Test that the log representation is indented and not escaped."""
+        for codec in self._available_codecs():
+            with self.subTest(codec=codec.name):
+                pretty = codec.dumps_pretty(DOCUMENT)
+                self.assertIn('\n  "results"', pretty)
+                self.assertIn("Café ☕", pretty)
+
+    def test_invalid_json_raises_value_error(self):
+        """Test that malformed documents raise ValueError for every codec."""
+        for codec in self._available_codecs():
+            with self.subTest(codec=codec.name):
+                with self.assertRaises(ValueError):
+                    codec.loads(b'{"results": [')
+
+    def test_codec_must_implement_dumps_and_loads(self):
+        """Test that a codec missing loads() cannot be created."""
+
+        class EncodeOnlyCodec(json_codec.JsonCodec):
+            def dumps(self, obj):
+                return b""
+
+        with self.assertRaises(TypeError):
+            EncodeOnlyCodec()
+
+    def test_auto_falls_back_to_stdlib(self):
+        """Test that auto selects stdlib when no fast library is importable."""
+
+        def unavailable():
+            raise ImportError("not installed")
+
+        with patch.dict(
+            json_codec.CODECS,
+            {"orjson": unavailable, "msgspec": unavailable},
+        ):
+            self.assertEqual(create_json_codec("auto").name, "stdlib")
+
+    def test_unknown_codec_raises_value_error(self):
+        """Test that an unknown codec name is rejected."""
+        with self.assertRaises(ValueError):
+            create_json_codec("yaml")
+
+    def test_get_json_codec_is_a_singleton(self):
+        """Test that the configured codec is created once."""
+        with patch.object(json_codec, "_json_codec_instance", None):
+            self.assertIs(get_json_codec(), get_json_codec())
+
+
+if __name__ == "__main__":
+    unittest.main()
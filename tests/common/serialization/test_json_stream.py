@@ -0,0 +1,94 @@
+import json
+import unittest
+from app.common.serialization.json_stream import JsonArrayStream
+
+
+def _chunked(document, size):
+    data = document.encode("utf-8")
+    starts = range(0, len(data), size)
+    return [data[start:][:size] for start in starts]
+
+
+class TestJsonArrayStream(unittest.TestCase):
+    def setUp(self):
+        self.document = {
+            "object": "list",
+            "results": [
+                {
+                    "id": "1",
+                    "properties": {"Tarea": {"title": [{"plain_text": "Café"}]}},
+                },
+                {"id": "2", "nested": [1, 2.5, None, True, "a,b]}"]},
+                {"id": "3", "properties": {}},
+            ],
+            "next_cursor": "abc",
+            "has_more": True,
+        }
+
+    def test_yields_elements_and_collects_metadata(self):
+        """Test that array elements are yielded and other members kept as metadata."""
+        stream = JsonArrayStream(_chunked(json.dumps(self.document), 4096))
+
+        self.assertEqual(list(stream), self.document["results"])
+        self.assertEqual(
+            stream.metadata, {"object": "list", "next_cursor": "abc", "has_more": True}
+        )
+
+    def test_tiny_chunks_split_tokens_and_multibyte_characters(self):
+        """Test that values and UTF-8 sequences split across chunks decode correctly."""
+        document = json.dumps(self.document, ensure_ascii=False, indent=2)
+        for size in (1, 2, 3, 7):
+            stream = JsonArrayStream(_chunked(document, size))
+            self.assertEqual(list(stream), self.document["results"])
+            self.assertTrue(stream.metadata["has_more"])
+
+    def test_numbers_at_chunk_boundaries(self):
+        """Test that numbers are not cut short at the end of a chunk."""
+        stream = JsonArrayStream(
+            [b'{"results": [12', b"34, 5", b"6], ", b'"n": 7', b"8}"]
+        )
+
+        self.assertEqual(list(stream), [1234, 56])
+        self.assertEqual(stream.metadata, {"n": 78})
+
+    def test_elements_are_decoded_lazily(self):
+        """Test that only the chunks needed for the first element are read."""
+        reads = []
+        document = json.dumps({"results": [{"id": str(i)} for i in range(200)]})
+
+        def chunks():
+            for chunk in _chunked(document, 16):
+                reads.append(chunk)
+                yield chunk
+
+        first = next(iter(JsonArrayStream(chunks())))
+
+        self.assertEqual(first["id"], "0")
+        self.assertLess(sum(len(c) for c in reads), len(document) / 10)
+
+    def test_empty_array_and_object(self):
+        """Test that empty arrays and documents are handled."""
+        stream = JsonArrayStream([b'{"results": [], "has_more": false}'])
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.metadata, {"has_more": False})
+
+        self.assertEqual(list(JsonArrayStream([b"{ }"])), [])
+
+    def test_truncated_document_raises(self):
+        """Test that a document cut short raises JSONDecodeError."""
+        stream = JsonArrayStream([b'{"results": [{"id": "1"}, {"id": '])
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(stream)
+
+    def test_stream_can_only_be_iterated_once(self):
+        """Test that a second iteration is rejected."""
+        stream = JsonArrayStream([b'{"results": []}'])
+        list(stream)
+
+        with self.assertRaises(RuntimeError):
+            iter(stream)
+
+
+if __name__ == "__main__":
+    unittest.main()
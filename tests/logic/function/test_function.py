@@ -1,13 +1,18 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
+from app.common.cache.lru_cache import LRUCache
 from app.logic.function.function import NotionLambda
 
 
 class TestNotionLambda(unittest.TestCase):
 
-    @patch("app.logic.function.function.SesClient")
+    @patch("app.logic.function.function.get_query_cache", Mock(return_value=None))
+    @patch("app.logic.function.function.get_row_cache", Mock(return_value=None))
+    @patch("app.logic.function.function.get_ses_client")
     @patch("app.logic.function.function.environment_handler")
-    def setUp(self, mock_env_handler, mock_ses_client_class):
+    def setUp(self, mock_env_handler, mock_get_ses_client):
         """Set up test fixtures"""
         self.mock_env_handler = mock_env_handler
         # Configure env handler mocking
@@ -18,8 +23,16 @@ class TestNotionLambda(unittest.TestCase):
         self.mock_env_handler.notion_database_id = "test_db_id"
         self.mock_env_handler.environment = "TEST"
         self.mock_env_handler.notion_database_filter_properties = "test_props"
+        self.mock_env_handler.settings.notion_database_ids = ("test_db_id",)
+        self.mock_env_handler.settings.notion_notified_status = None
+        self.mock_env_handler.settings.notion_page_content_enabled = False
+        self.mock_env_handler.settings.notion_streaming_parse = False
+        self.mock_env_handler.settings.notion_typed_decoding = False
+        self.mock_env_handler.settings.notion_scan_partitions = 1
+        self.mock_env_handler.settings.notion_scan_days = 365
+        self.mock_env_handler.settings.digest_diff_mode = "off"
 
-        self.mock_ses_client = mock_ses_client_class.return_value
+        self.mock_ses_client = mock_get_ses_client.return_value
 
         self.mock_notion_client = Mock()
         # Configure the mock to return a proper response structure
@@ -38,6 +51,25 @@ class TestNotionLambda(unittest.TestCase):
         self.assertEqual(notion_lambda.env_handler, mock_env_handler_instance)
         self.assertEqual(notion_lambda.notion_client, mock_client)
 
+    @patch("app.logic.function.function.get_ses_client")
+    @patch("app.logic.function.function.environment_handler")
+    def test_init_uses_multi_database_repository(self, mock_env_handler, _):
+        """Test that several configured databases are merged into one digest"""
+        mock_env_handler.settings.notion_database_ids = ("db1", "db2")
+        notion_lambda = NotionLambda(Mock())
+        self.assertEqual(notion_lambda.task_repository.database_ids, ["db1", "db2"])
+
+    @patch("app.logic.function.function.get_task_index")
+    @patch("app.logic.function.function.get_ses_client")
+    @patch("app.logic.function.function.environment_handler")
+    def test_init_uses_task_index(self, mock_env_handler, _, mock_get_task_index):
+        """Test that TASK_INDEX_PATH serves every database from the local index"""
+        mock_env_handler.settings.notion_database_ids = ("db1", "db2")
+        notion_lambda = NotionLambda(Mock())
+        repository = notion_lambda.task_repository
+        self.assertEqual(repository.index, mock_get_task_index.return_value)
+        self.assertEqual(repository.database_ids, ["db1", "db2"])
+
     def test_notion_lambda_function_returns_success_response(self):
         """Test that notion_lambda_function returns a successful response"""
         response = self.notion_lambda.notion_lambda_function()
@@ -79,6 +111,147 @@ class TestNotionLambda(unittest.TestCase):
         self.assertEqual(kwargs["receiver"], ["receiver@example.com"])
         self.assertEqual(kwargs["subject"], "Task List: 1 Item Pending")
         self.assertIsInstance(kwargs["body"], str)
+        self.assertIn("You have 1 pending item in your queue.", kwargs["text_body"])
+
+    def test_notion_lambda_function_does_not_update_tasks_by_default(self):
+        """Test that tasks are not patched unless NOTION_NOTIFIED_STATUS is set"""
+        response = self.notion_lambda.notion_lambda_function()
+
+        self.mock_notion_client.patch.assert_not_called()
+        self.assertNotIn("updates", response["body"])
+
+    def test_notion_lambda_function_marks_tasks_notified(self):
+        """Test that sent tasks are moved to the configured status"""
+        settings = self.mock_env_handler.settings
+        settings.notion_notified_status = "Notified"
+        settings.notion_update_checkpoint = None
+        settings.notion_max_workers = 2
+
+        response = self.notion_lambda.notion_lambda_function()
+
+        self.mock_notion_client.patch.assert_called_once_with(
+            "pages/1", {"properties": {"Status": {"status": {"name": "Notified"}}}}
+        )
+        self.assertEqual(response["body"]["updates"]["succeeded"], 1)
+
+    @patch("app.logic.function.function.get_page_content_cache")
+    def test_notion_lambda_function_adds_page_content(self, mock_get_cache):
+        """Test that page bodies are fetched and rendered when enabled"""
+        mock_get_cache.return_value = None
+        settings = self.mock_env_handler.settings
+        settings.notion_page_content_enabled = True
+        settings.notion_page_content_max_depth = 1
+        settings.notion_page_content_max_chars = 100
+        settings.notion_max_workers = 2
+        self.mock_notion_client.get.return_value = {
+            "results": [
+                {
+                    "type": "paragraph",
+                    "paragraph": {"rich_text": [{"plain_text": "Body text"}]},
+                }
+            ],
+            "has_more": False,
+        }
+
+        self.notion_lambda.notion_lambda_function()
+
+        self.mock_notion_client.get.assert_called_once_with(
+            "blocks/1/children?page_size=100"
+        )
+        body = self.mock_ses_client.send_email.call_args.kwargs["body"]
+        self.assertIn("Body text", body)
+
+    @patch("app.logic.function.page_events.get_processed_events", LRUCache)
+    @patch("app.logic.function.function.get_query_cache", Mock(return_value=None))
+    @patch("app.logic.function.function.get_urgent_notifications")
+    def test_notion_lambda_webhook_sends_urgent_tasks(self, mock_get_notified):
+        """Test that a webhook event for an overdue task is emailed right away"""
+        mock_get_notified.return_value = LRUCache()
+        settings = self.mock_env_handler.settings
+        settings.notion_urgent_days = 0
+        self.mock_notion_client.get.return_value = {
+            "object": "page",
+            "id": "page-1",
+            "last_edited_time": "2025-03-10T09:00:00.000Z",
+            "parent": {"type": "database_id", "database_id": "test_db_id"},
+            "properties": {
+                "Fecha": {"type": "date", "date": {"start": "2000-01-01"}},
+                "Status": {"type": "status", "status": {"name": "Not Started"}},
+            },
+        }
+        # The payload's copy of the page is not trusted; it is read by ID
+        stale = {**self.mock_notion_client.get.return_value, "properties": {}}
+
+        response = self.notion_lambda.notion_lambda_webhook(
+            [{"verification_token": "token"}, {"data": stale}]
+        )
+
+        self.assertEqual(response["body"]["events"]["urgent"], 1)
+        self.mock_notion_client.get.assert_called_once_with("pages/page-1")
+        self.mock_notion_client.post.assert_not_called()
+        kwargs = self.mock_ses_client.send_email.call_args.kwargs
+        self.assertEqual(kwargs["subject"], "Urgent: Task List: 1 Item Pending")
+
+    def _enable_digest_diff(self, mode):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = self.mock_env_handler.settings
+        settings.digest_diff_mode = mode
+        settings.digest_state_path = os.path.join(directory.name, "digest.json")
+
+    def test_unchanged_digest_is_not_sent(self):
+        """Test that DIGEST_DIFF_MODE=skip sends a digest only when tasks changed"""
+        self._enable_digest_diff("skip")
+
+        first = self.notion_lambda.notion_lambda_function()
+        second = self.notion_lambda.notion_lambda_function()
+
+        self.assertEqual(first["body"]["digest"], "full")
+        self.assertEqual(second["body"]["digest"], "unchanged")
+        self.mock_ses_client.send_email.assert_called_once()
+
+    def test_changes_email_lists_only_changes(self):
+        """Test that DIGEST_DIFF_MODE=changes sends what changed after the first digest"""
+        self._enable_digest_diff("changes")
+        self.notion_lambda.notion_lambda_function()
+        self.mock_notion_client.post.return_value = {
+            "results": [
+                {"id": "1", "properties": {}},
+                {
+                    "id": "2",
+                    "properties": {
+                        "Tarea": {"title": [{"plain_text": "New task"}]},
+                    },
+                },
+            ]
+        }
+
+        response = self.notion_lambda.notion_lambda_function()
+
+        self.assertEqual(response["body"]["digest"], "changes")
+        kwargs = self.mock_ses_client.send_email.call_args.kwargs
+        self.assertEqual(kwargs["subject"], "Task List: 2 Items Pending (1 new)")
+        self.assertIn("New (1)\n- [No Date] New task", kwargs["text_body"])
+
+    def test_tasks_marked_notified_are_not_listed_as_removed(self):
+        """Test that tasks moved to NOTION_NOTIFIED_STATUS are not reported next time"""
+        self._enable_digest_diff("changes")
+        settings = self.mock_env_handler.settings
+        settings.notion_notified_status = "Notified"
+        settings.notion_update_checkpoint = None
+        settings.notion_max_workers = 2
+        self.notion_lambda.notion_lambda_function()
+        # Task 1 is no longer pending once it was marked notified
+        self.mock_notion_client.post.return_value = {
+            "results": [{"id": "2", "properties": {}}]
+        }
+
+        response = self.notion_lambda.notion_lambda_function()
+
+        self.assertEqual(response["body"]["digest"], "changes")
+        text_body = self.mock_ses_client.send_email.call_args.kwargs["text_body"]
+        self.assertIn("New (1)", text_body)
+        self.assertNotIn("No longer pending", text_body)
 
 
 if __name__ == "__main__":
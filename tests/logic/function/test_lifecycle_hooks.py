@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+from app.common.lifecycle.lifecycle import lifecycle
+from app.logic.function import lifecycle_hooks
+
+MODULE = "app.logic.function.lifecycle_hooks"
+
+
+class TestLifecycleHooks(unittest.TestCase):
+    def test_hooks_are_registered(self):
+        """Test that importing the module registers the service hooks."""
+        self.assertIn(lifecycle_hooks.warm_up, lifecycle.before_snapshot_hooks)
+        self.assertIn(lifecycle_hooks.restore, lifecycle.after_restore_hooks)
+
+    @patch(f"{MODULE}.get_ses_client")
+    @patch(f"{MODULE}.get_notion_client")
+    @patch(f"{MODULE}.environment_handler")
+    def test_warm_up_is_skipped_without_configuration(
+        self, mock_env_handler, mock_get_notion_client, mock_get_ses_client
+    ):
+        """Test that warm-up builds nothing when required variables are missing."""
+        mock_env_handler.settings.missing_vars = ("NOTION_API_KEY",)
+
+        lifecycle_hooks.warm_up()
+
+        mock_get_notion_client.assert_not_called()
+        mock_get_ses_client.assert_not_called()
+
+    @patch(f"{MODULE}.EmailAdapter")
+    @patch(f"{MODULE}.get_row_cache")
+    @patch(f"{MODULE}.get_ses_client")
+    @patch(f"{MODULE}.get_notion_client")
+    @patch(f"{MODULE}.environment_handler")
+    def test_warm_up_builds_clients_and_template(
+        self,
+        mock_env_handler,
+        mock_get_notion_client,
+        mock_get_ses_client,
+        mock_get_row_cache,
+        mock_email_adapter,
+    ):
+        """Test that warm-up builds the clients and renders an empty digest."""
+        mock_env_handler.settings.missing_vars = ()
+
+        lifecycle_hooks.warm_up()
+
+        mock_get_notion_client.assert_called_once()
+        mock_get_ses_client.assert_called_once()
+        mock_email_adapter.assert_called_once_with(
+            row_cache=mock_get_row_cache.return_value
+        )
+        mock_email_adapter.return_value.render_digest.assert_called_once_with([])
+
+    @patch(f"{MODULE}.random")
+    @patch(f"{MODULE}.reset_notion_client")
+    @patch(f"{MODULE}.reset_ses_client")
+    @patch(f"{MODULE}.get_ses_client")
+    @patch(f"{MODULE}.get_notion_client")
+    @patch(f"{MODULE}.environment_handler")
+    def test_restore_rebuilds_unshareable_state(
+        self,
+        mock_env_handler,
+        mock_get_notion_client,
+        mock_get_ses_client,
+        mock_reset_ses_client,
+        mock_reset_notion_client,
+        mock_random,
+    ):
+        """Test that restore reseeds, drops secrets and rebuilds both clients."""
+        mock_env_handler.settings.missing_vars = ()
+
+        lifecycle_hooks.restore()
+
+        mock_random.seed.assert_called_once_with()
+        mock_env_handler.reset_secrets_providers.assert_called_once()
+        mock_reset_ses_client.assert_called_once()
+        mock_reset_notion_client.assert_called_once()
+        mock_get_notion_client.assert_called_once()
+        mock_get_ses_client.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from app.common.cache.lru_cache import LRUCache
+from app.common.dates.date_service import DateService
+from app.common.integrations.notion.exceptions import NotionApiError
+from app.common.integrations.notion.task_index import TaskIndex
+from app.common.integrations.notion.task_repository import TaskRepository
+from app.common.integrations.notion.webhooks import PageEvent
+from app.logic.function.page_events import PageEventProcessor
+
+
+def _page(page_id, fecha, status="Not Started", database_id="db-1"):
+    return {
+        "object": "page",
+        "id": page_id,
+        "last_edited_time": "2025-03-10T09:00:00.000Z",
+        "parent": {"type": "database_id", "database_id": database_id},
+        "properties": {
+            "Tarea": {"type": "title", "title": [{"plain_text": f"Task {page_id}"}]},
+            "Fecha": {"type": "date", "date": {"start": fecha}},
+            "Status": {"type": "status", "status": {"name": status}},
+        },
+    }
+
+
+def _event(page_id, timestamp="2025-03-10T09:00:00.000Z", **kwargs):
+    return PageEvent(page_id, timestamp, database_id="db1", **kwargs)
+
+
+class TestPageEventProcessor(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.index = TaskIndex(os.path.join(directory.name, "tasks.sqlite"))
+        self.addCleanup(self.index.close)
+        self.client = Mock()
+        repository = TaskRepository(self.client, "db-1")
+        patcher = patch(
+            "app.logic.function.page_events.get_date_service",
+            return_value=DateService(now=lambda tz: datetime(2025, 3, 10, tzinfo=tz)),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.processor = PageEventProcessor(
+            self.client,
+            [repository],
+            index=self.index,
+            urgent_days=1,
+            processed=LRUCache(),
+            notified=LRUCache(),
+        )
+
+    def test_changed_page_is_read_once_and_indexed(self):
+        """Test that a burst of events reads the page once and upserts it"""
+        self.client.get.return_value = _page("p1", "2025-03-20")
+
+        result = self.processor.process(
+            [_event("p1"), _event("p1", "2025-03-10T09:00:03.000Z")]
+        )
+
+        self.client.invalidate.assert_called_once_with("pages/p1")
+        self.client.get.assert_called_once_with("pages/p1")
+        self.assertEqual(result.summary()["applied"], 1)
+        self.assertEqual(self.index.get("p1")["fecha"], "2025-03-20")
+        self.assertEqual(result.urgent, [])
+
+    def test_newly_urgent_task_is_reported_once(self):
+        """Test that a task becoming due is notified once, not on later edits"""
+        self.client.get.return_value = _page("p1", "2025-03-11")
+
+        first = self.processor.process([_event("p1", "2025-03-10T09:00:00.000Z")])
+        second = self.processor.process([_event("p1", "2025-03-10T09:05:00.000Z")])
+
+        self.assertEqual([task["id"] for task in first.urgent], ["p1"])
+        self.assertEqual(
+            set(first.urgent[0]), {"id", "titulo", "fecha", "notas", "editado"}
+        )
+        self.assertEqual(second.urgent, [])
+
+    def test_redelivered_and_foreign_events_are_skipped(self):
+        """Test that old events and pages of other databases cost no request"""
+        self.client.get.return_value = _page("p1", "2025-04-01")
+        self.processor.process([_event("p1", "2025-03-10T09:05:00.000Z")])
+        self.client.get.reset_mock()
+
+        result = self.processor.process(
+            [
+                _event("p1", "2025-03-10T09:05:00.000Z"),
+                PageEvent("p2", "2025-03-10T09:06:00.000Z", database_id="other"),
+            ]
+        )
+
+        self.client.get.assert_not_called()
+        self.assertEqual(result.summary()["skipped"], 2)
+
+    def test_subscription_and_automation_events_compare_by_minute(self):
+        """Test that a later automation edit is applied after a subscription event"""
+        self.client.get.return_value = _page("p1", "2025-04-01")
+        self.processor.process([_event("p1", "2025-03-10T12:05:30.379Z")])
+        # Edited at 12:05:50; last_edited_time only has the minute
+        self.client.get.return_value = _page("p1", "2025-03-11")
+
+        result = self.processor.process(
+            [_event("p1", "2025-03-10T12:05:00.000Z", automation=True)]
+        )
+
+        self.assertEqual(result.summary()["applied"], 1)
+        self.assertEqual(self.index.get("p1")["fecha"], "2025-03-11")
+        self.assertEqual([task["id"] for task in result.urgent], ["p1"])
+
+    def test_events_without_timestamp_are_never_skipped(self):
+        """Test that an event with no timestamp is applied every time"""
+        self.client.get.return_value = _page("p1", "2025-04-01")
+
+        first = self.processor.process([_event("p1", "")])
+        second = self.processor.process([_event("p1", "")])
+
+        self.assertEqual(first.summary()["applied"], 1)
+        self.assertEqual(second.summary()["applied"], 1)
+        self.assertEqual(self.client.get.call_count, 2)
+
+    def test_deleted_and_missing_pages_leave_the_index(self):
+        """Test that deleted events and 404 responses remove the task"""
+        self.index.upsert(
+            "db-1",
+            [
+                {
+                    "id": page_id,
+                    "titulo": "",
+                    "fecha": "2025-03-01",
+                    "notas": "",
+                    "editado": None,
+                    "status": "Not Started",
+                    "responsables": [],
+                }
+                for page_id in ("p1", "p2")
+            ],
+        )
+        self.client.get.side_effect = NotionApiError("gone", status_code=404)
+
+        result = self.processor.process([_event("p1", deleted=True), _event("p2")])
+
+        self.assertEqual(result.deleted, 2)
+        self.assertEqual(self.index.tasks(), [])
+
+    def test_without_index_the_query_cache_is_cleared(self):
+        """Test that changes invalidate cached digests when there is no index"""
+        query_cache = Mock()
+        processor = PageEventProcessor(
+            self.client,
+            self.processor.repositories.values(),
+            query_cache=query_cache,
+            processed=LRUCache(),
+        )
+
+        self.client.get.return_value = _page("p1", "2025-03-01")
+
+        processor.process([_event("p1")])
+
+        query_cache.clear.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
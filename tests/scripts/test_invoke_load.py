@@ -0,0 +1,49 @@
+import multiprocessing.dummy
+import unittest
+from scripts.invoke_load import Invocation, build_report, run
+
+OPTIONS = {"function_name": "test", "timeout": 5, "memory_mb": 128}
+
+
+def handler(event, context):
+    if event.get("fail"):
+        raise ValueError("bad event")
+    return {"statusCode": 200}
+
+
+class TestInvokeLoad(unittest.TestCase):
+    def _run(self, handler_path, count=4):
+        return run(
+            [{}, {"fail": True}],
+            handler_path,
+            workers=2,
+            rate=0,
+            count=count,
+            options=OPTIONS,
+            result_timeout=5,
+            mp=multiprocessing.dummy,
+        )
+
+    def test_run_reports_every_invocation(self):
+        """Test that each event yields one Invocation and the report counts them"""
+        invocations, startup, wall = self._run(f"{__name__}.handler")
+        report = build_report(invocations, startup, wall)
+
+        self.assertEqual([i.index for i in invocations], [0, 1, 2, 3])
+        self.assertTrue(all(isinstance(i, Invocation) for i in invocations))
+        self.assertEqual(set(startup), {0, 1})
+        self.assertEqual(report["invocations"], 4)
+        self.assertEqual(report["errors"], 2)
+        self.assertEqual(report["error_types"], {"ValueError: bad event": 2})
+        self.assertEqual(report["cold"] + report["warm"], 4)
+
+    def test_worker_failure_is_raised_instead_of_hanging(self):
+        """Test that a handler that cannot be imported fails the run"""
+        with self.assertRaises(RuntimeError) as cm:
+            self._run(f"{__name__}.missing_handler")
+
+        self.assertIn("AttributeError", str(cm.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
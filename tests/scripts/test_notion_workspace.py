@@ -0,0 +1,121 @@
+import unittest
+from app.common.integrations.notion.query_builder import Property, Query
+from scripts.notion_workspace import (
+    LocalNotionApi,
+    WorkspaceSpec,
+    generate_pages,
+    make_page,
+    page_index,
+)
+
+SPEC = WorkspaceSpec(pages=300, seed=7, missing_rate=0.1)
+
+
+def _status(page):
+    prop = page["properties"].get("Status") or {}
+    return (prop.get("status") or {}).get("name")
+
+
+def _fecha(page):
+    prop = page["properties"].get("Fecha") or {}
+    return (prop.get("date") or {}).get("start")
+
+
+class TestWorkspace(unittest.TestCase):
+    def test_pages_are_determined_by_seed_and_index(self):
+        """Test that a page is rebuilt identically and its id maps back to it"""
+        pages = list(generate_pages(SPEC))
+
+        self.assertEqual(len(pages), 300)
+        self.assertEqual(make_page(123, SPEC), pages[123])
+        self.assertEqual(page_index(pages[123]["id"]), 123)
+        self.assertNotEqual(
+            make_page(123, WorkspaceSpec(pages=300, seed=8)), pages[123]
+        )
+        self.assertEqual(len({page["id"] for page in pages}), 300)
+
+
+class TestLocalNotionApi(unittest.TestCase):
+    def setUp(self):
+        self.api = LocalNotionApi(SPEC)
+        self.endpoint = f"/v1/databases/{self.api.database_id}/query"
+
+    def _query_all(self, payload, page_size=7):
+        results, cursor, requests = [], None, 0
+        while True:
+            body = {**payload, "page_size": page_size}
+            if cursor:
+                body["start_cursor"] = cursor
+            status, response = self.api.handle("POST", self.endpoint, body)
+            self.assertEqual(status, 200)
+            self.assertLessEqual(len(response["results"]), page_size)
+            results.extend(response["results"])
+            requests += 1
+            if not response["has_more"]:
+                self.assertIsNone(response["next_cursor"])
+                return results, requests
+            cursor = response["next_cursor"]
+
+    def test_compiled_query_filters_and_sorts_like_notion(self):
+        """Test that a compiled filter returns exactly the matching pages by Fecha"""
+        compiled = (
+            Query()
+            .where(
+                Property.status("Status").equals("Not Started"),
+                Property.date("Fecha").on_or_before("2025-06-30"),
+            )
+            .sort_by("Fecha")
+            .compile("2025-06-30")
+        )
+        expected = [
+            page
+            for page in generate_pages(SPEC)
+            if _status(page) == "Not Started"
+            and _fecha(page)
+            and _fecha(page)[:10] <= "2025-06-30"
+        ]
+
+        results, requests = self._query_all(compiled.payload)
+
+        self.assertIsNone(compiled.client_predicate)
+        self.assertEqual(
+            sorted(page["id"] for page in results),
+            sorted(page["id"] for page in expected),
+        )
+        fechas = [_fecha(page) for page in results]
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertEqual(requests, -(-len(expected) // 7))
+
+    def test_pages_without_the_sort_value_come_last(self):
+        """Test that ascending and descending sorts put missing values last"""
+        for direction in ("ascending", "descending"):
+            with self.subTest(direction=direction):
+                sorts = [{"property": "Fecha", "direction": direction}]
+                results, _ = self._query_all({"sorts": sorts}, page_size=100)
+                fechas = [_fecha(page) for page in results]
+                present = [fecha for fecha in fechas if fecha]
+
+                self.assertEqual(len(results), SPEC.pages)
+                self.assertEqual(fechas[: len(present)], present)
+                self.assertEqual(
+                    present, sorted(present, reverse=direction == "descending")
+                )
+
+    def test_updates_are_visible_to_reads_and_queries(self):
+        """Test that a PATCHed status is read back and changes query results"""
+        page_id = make_page(5, SPEC)["id"]
+        body = {"properties": {"Status": {"status": {"name": "Archived"}}}}
+        condition = {"property": "Status", "status": {"equals": "Archived"}}
+
+        status, _ = self.api.handle("PATCH", f"/v1/pages/{page_id}", body)
+        _, page = self.api.handle("GET", f"/v1/pages/{page_id}")
+        results, _ = self._query_all({"filter": condition})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(_status(page), "Archived")
+        self.assertEqual([result["id"] for result in results], [page_id])
+        self.assertEqual(self.api.handle("GET", f"/v1/pages/{'0' * 32}")[0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
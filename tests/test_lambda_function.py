@@ -1,10 +1,24 @@
+import importlib
 import unittest
 from unittest.mock import Mock, patch
+import app.lambda_function
+from app.common.environment.environment_handler import environment_handler
+from app.common.lifecycle.lifecycle import lifecycle
 from app.lambda_function import lambda_handler
 
+REQUIRED_ENV = {
+    "NOTION_API_KEY": "secret",
+    "NOTION_DATABASE_ID": "db-id",
+    "SES_SENDER_EMAIL": "sender@example.com",
+    "SES_RECEIVER_EMAIL": "receiver@example.com",
+}
+
 
 class TestLambdaFunction(unittest.TestCase):
 
+    def setUp(self):
+        self.addCleanup(environment_handler.reload)
+
     @patch("app.lambda_function.get_notion_client")
     @patch("app.lambda_function.NotionLambda")
     def test_lambda_handler(self, mock_notion_lambda_class, mock_get_notion_client):
@@ -19,13 +33,8 @@ class TestLambdaFunction(unittest.TestCase):
         context = Mock()
 
         # Execute
-        with patch.dict(
-            "os.environ",
-            {
-                "SES_SENDER_EMAIL": "sender@example.com",
-                "SES_RECEIVER_EMAIL": "receiver@example.com",
-            },
-        ):
+        with patch.dict("os.environ", REQUIRED_ENV):
+            environment_handler.reload()
             response = lambda_handler(event, context)
 
         # Verify
@@ -65,18 +74,64 @@ class TestLambdaFunction(unittest.TestCase):
         context = Mock()
 
         # Execute and verify exception is re-raised
-        with patch.dict(
-            "os.environ",
-            {
-                "SES_SENDER_EMAIL": "sender@example.com",
-                "SES_RECEIVER_EMAIL": "receiver@example.com",
-            },
-        ):
+        with patch.dict("os.environ", REQUIRED_ENV):
+            environment_handler.reload()
             with self.assertRaises(Exception) as cm:
                 lambda_handler(event, context)
 
         self.assertIn("Test error", str(cm.exception))
 
+    @patch("app.lambda_function.get_notion_client")
+    @patch("app.lambda_function.NotionLambda")
+    def test_lambda_handler_routes_webhook_deliveries(
+        self, mock_notion_lambda_class, mock_get_notion_client
+    ):
+        """Test that Function URL deliveries are handled as page events"""
+        mock_instance = mock_notion_lambda_class.return_value
+        env = {**REQUIRED_ENV, "NOTION_WEBHOOK_AUTOMATION_SECRET": "secret"}
+        event = {
+            "headers": {"X-Webhook-Secret": "secret"},
+            "body": '{"type": "page.created"}',
+        }
+
+        with patch.dict("os.environ", env):
+            environment_handler.reload()
+            response = lambda_handler(event, Mock())
+
+        mock_instance.notion_lambda_webhook.assert_called_once_with(
+            [{"type": "page.created"}]
+        )
+        mock_instance.notion_lambda_function.assert_not_called()
+        self.assertEqual(response, mock_instance.notion_lambda_webhook.return_value)
+
+    @patch("app.lambda_function.NotionLambda")
+    def test_lambda_handler_rejects_unsigned_webhook(self, mock_notion_lambda_class):
+        """Test that a delivery without a valid signature is answered with 401"""
+        env = {**REQUIRED_ENV, "NOTION_WEBHOOK_VERIFICATION_TOKEN": "token"}
+        event = {"headers": {}, "body": "{}"}
+
+        with patch.dict("os.environ", env):
+            environment_handler.reload()
+            response = lambda_handler(event, Mock())
+
+        self.assertEqual(response["statusCode"], 401)
+        mock_notion_lambda_class.assert_not_called()
+
+    def test_failing_warm_up_does_not_break_the_import(self):
+        """Test that an exception in a before-snapshot hook is logged, not raised"""
+        hook = Mock(side_effect=RuntimeError("SSM unavailable"), __qualname__="hook")
+
+        logger = Mock()
+
+        with patch.object(lifecycle, "before_snapshot_hooks", [hook]), patch(
+            "app.common.logger.logger.get_logger", return_value=logger
+        ):
+            importlib.reload(app.lambda_function)
+        self.addCleanup(importlib.reload, app.lambda_function)
+
+        hook.assert_called_once_with()
+        self.assertIn("SSM unavailable", logger.warning.call_args.args[0])
+
 
 if __name__ == "__main__":
     unittest.main()